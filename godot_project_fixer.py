@@ -5,17 +5,93 @@
 ====================================================================
 Script Python pour corriger automatiquement tous les problèmes du projet Godot.
 
-Usage: python godot_project_fixer_fixed.py
+Usage: python godot_project_fixer_fixed.py [chemin_projet] [--incremental]
+       python godot_project_fixer_fixed.py batch <projets|motifs glob...> [--jobs N] [--report rapport.json]
+       python godot_project_fixer_fixed.py plan [chemin_projet] [--output plan.json] [--diff] [--check]
+       python godot_project_fixer_fixed.py apply plan.json [--incremental]
+       python godot_project_fixer_fixed.py data [chemin_projet] [--fix] [--canonical] [--json]
+       python godot_project_fixer_fixed.py bundle [chemin_projet] [--output data/data_bundle.bin] [--check]
+       python godot_project_fixer_fixed.py index [chemin_projet] [--output data/data_index.json] [--strict]
+       python godot_project_fixer_fixed.py combat [chemin_projet] [--encounters N] [--policy mixed,attack] [--json]
+       python godot_project_fixer_fixed.py magic [chemin_projet] [--sessions N] [--hours H] [--casts-per-minute R] [--json]
+       python godot_project_fixer_fixed.py evolution [chemin_projet] [--schedules N] [--hours H] [--styles casual,scientist] [--json]
+       python godot_project_fixer_fixed.py economy [chemin_projet] [--runs N] [--years Y] [--tier neutral] [--json]
+       python godot_project_fixer_fixed.py reputation [chemin_projet] [--output data/reputation_matrix.json] [--replay session.json]
+       python godot_project_fixer_fixed.py dialogue [chemin_projet] [--output data/dialogue_compiled.json] [--tree ID]
+       python godot_project_fixer_fixed.py quests [chemin_projet] [--count N] [--seed S] [--output quests.jsonl] [--set variable=valeur]
+       python godot_project_fixer_fixed.py saves <fichier.sbsave|dossier>... [--migrate] [--compact] [--chunked] [--output DOSSIER | --in-place]
+       python godot_project_fixer_fixed.py gdindex [chemin_projet] [--find NOM] [--class NOM] [--lookups [CHEMIN]]
+       python godot_project_fixer_fixed.py autoloads [chemin_projet] [--fix] [--fix-scripts] [--json]
+       python godot_project_fixer_fixed.py signals [chemin_projet] [--dot graphe.dot] [--json graphe.json] [--top N]
+       python godot_project_fixer_fixed.py scene <fichier.tscn|dossier>... [--tree] [--dedupe] [--output FICHIER | --in-place]
+       python godot_project_fixer_fixed.py stress [chemin_projet] [--creatures 100,500,1000] [--npcs 25,100,250] [--layout grid|random] [--report DOSSIER]
+       python godot_project_fixer_fixed.py xp [chemin_projet] [--source stored|formula|fit] [--output data/xp_table.json] [--rates quests=1.5,combat=4] [--check]
+       python godot_project_fixer_fixed.py enchantments [chemin_projet] [--max-stack N] [--output data/enchantment_table.json] [--top N] [--json]
+       python godot_project_fixer_fixed.py codegen [chemin_projet] [--spec variantes.json] [--from-data] [--copies N] [--output-dir scripts/generated] [--dry-run]
+       python godot_project_fixer_fixed.py stubs [chemin_projet] [--class UIManager,AudioManager] [--instrument none|counters|timing] [--override | --clear-override]
+       python godot_project_fixer_fixed.py profile [chemin_projet] (--instrument | --strip | --check | --report [DUMP...]) [--probe Classe.fonction] [--folded FICHIER]
 """
 
+import io
 import os
+import sys
+import glob
 import json
+import time
 import shutil
+import contextlib
+import difflib
+import hashlib
+import argparse
+import tempfile
+import importlib
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+# Manifeste des empreintes des fichiers générés (mode incrémental)
+MANIFEST_FILENAME = ".fixer_manifest.json"
+
+# Version du format JSON des plans de correction
+PLAN_FORMAT_VERSION = 1
+
+# AutoLoads recommandés quand project.godot n'en déclare aucun
+DEFAULT_AUTOLOADS = [
+    ("Game", "res://scripts/managers/GameManager.gd"),
+    ("Data", "res://scripts/managers/DataManager.gd"),
+    ("Observation", "res://scripts/managers/ObservationManager.gd"),
+    ("Dialogue", "res://scripts/managers/DialogueManager.gd"),
+    ("Quest", "res://scripts/managers/QuestManager.gd"),
+    ("UI", "res://scripts/stubs/UIManager.gd"),
+    ("Audio", "res://scripts/stubs/AudioManager.gd")
+]
+
+# Sous-commandes fournies par le paquet sb_tools (chargées à la demande)
+TOOL_COMMANDS = {
+    "data": "sb_tools.data_pipeline",
+    "bundle": "sb_tools.data_bundle",
+    "index": "sb_tools.data_index",
+    "combat": "sb_tools.combat_sim",
+    "magic": "sb_tools.magic_sim",
+    "evolution": "sb_tools.evolution_sim",
+    "economy": "sb_tools.economy_sim",
+    "reputation": "sb_tools.reputation_matrix",
+    "dialogue": "sb_tools.dialogue_compiler",
+    "quests": "sb_tools.quest_generator",
+    "saves": "sb_tools.save_inspector",
+    "gdindex": "sb_tools.gd_index",
+    "autoloads": "sb_tools.autoload_check",
+    "signals": "sb_tools.signal_graph",
+    "scene": "sb_tools.tscn_model",
+    "stress": "sb_tools.stress_scene",
+    "xp": "sb_tools.xp_curve",
+    "enchantments": "sb_tools.enchant_resolver",
+    "codegen": "sb_tools.gd_codegen",
+    "stubs": "sb_tools.stub_generator",
+    "profile": "sb_tools.profiler"
+}
+
 class GodotProjectFixer:
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", incremental: bool = False):
         """Initialise le correcteur de projet Godot."""
         self.project_root = Path(project_root)
         self.scripts_path = self.project_root / "scripts"
@@ -25,23 +101,128 @@ class GodotProjectFixer:
         self.files_created = []
         self.errors = []
         
+        # Mode incrémental : n'écrit que les fichiers dont le contenu change
+        self.incremental = incremental
+        self.manifest_path = self.project_root / MANIFEST_FILENAME
+        self.manifest: Dict[str, Dict] = self.load_manifest() if incremental else {}
+        self.file_statuses: Dict[str, str] = {}
+        
+        # Planification : les générateurs déclarent dossiers et fichiers sans toucher le disque
+        self.planning = False
+        self.planned_directories: List[str] = []
+        self.planned_files: Dict[str, str] = {}
+        self.autoloads: List[Tuple[str, str]] = list(DEFAULT_AUTOLOADS)
+        
         print("🔧 Godot Project Fixer - Sortilèges & Bestioles")
         print("=" * 60)
     
     def run_all_fixes(self):
         """Exécute toutes les corrections."""
+        try:
+            plan = self.build_plan()
+            self.apply_plan(plan)
+            if self.incremental:
+                self.save_manifest()
+            self.print_summary()
+            
+        except Exception as e:
+            self.errors.append(f"Erreur critique: {str(e)}")
+            print(f"❌ Erreur: {e}")
+    
+    def build_plan(self) -> Dict:
+        """Construit en mémoire le plan de tous les dossiers et fichiers à produire, avec diffs."""
+        self.planned_directories = []
+        self.planned_files = {}
+        self.planning = True
         try:
             self.create_directory_structure()
             self.create_stub_managers()
             self.create_core_scripts()
             self.create_test_scene()
             self.create_input_instructions()
+            self.check_autoloads()
             self.generate_autoload_instructions()
-            self.print_summary()
-            
-        except Exception as e:
-            self.errors.append(f"Erreur critique: {str(e)}")
-            print(f"❌ Erreur: {e}")
+        finally:
+            self.planning = False
+        
+        directories = [
+            {"path": dir_path, "exists": (self.project_root / dir_path).is_dir()}
+            for dir_path in self.planned_directories
+        ]
+        files = [self.plan_file_entry(path, content) for path, content in self.planned_files.items()]
+        
+        return {
+            "version": PLAN_FORMAT_VERSION,
+            "project_root": str(self.project_root),
+            "directories": directories,
+            "files": files,
+            "changes": sum(1 for entry in files if entry["action"] != "unchanged")
+        }
+    
+    def plan_file_entry(self, relative_path: str, content: str) -> Dict:
+        """Compare un fichier planifié avec le disque et produit son entrée de plan."""
+        file_path = self.project_root / relative_path
+        old_content = None
+        if file_path.exists():
+            old_content = file_path.read_bytes().decode('utf-8', errors='replace')
+        
+        if old_content is None:
+            action = "create"
+        elif old_content == content:
+            action = "unchanged"
+        else:
+            action = "update"
+        
+        diff = ""
+        if action != "unchanged":
+            diff = "".join(difflib.unified_diff(
+                (old_content or "").splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f"a/{relative_path}" if old_content is not None else "/dev/null",
+                tofile=f"b/{relative_path}"
+            ))
+        
+        return {
+            "path": relative_path,
+            "action": action,
+            "base_sha256": hashlib.sha256(file_path.read_bytes()).hexdigest() if old_content is not None else None,
+            "sha256": hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            "diff": diff,
+            "content": content
+        }
+    
+    def apply_plan(self, plan: Dict):
+        """Applique un plan en une seule passe d'écriture."""
+        if plan.get("version") != PLAN_FORMAT_VERSION:
+            raise ValueError(f"Version de plan non supportée: {plan.get('version')}")
+        
+        for directory in plan["directories"]:
+            (self.project_root / directory["path"]).mkdir(parents=True, exist_ok=True)
+            self.fixes_applied.append(f"📁 Dossier créé: {directory['path']}")
+        
+        for entry in plan["files"]:
+            # Refuser d'écraser un fichier modifié depuis la planification
+            file_path = self.project_root / entry["path"]
+            current = hashlib.sha256(file_path.read_bytes()).hexdigest() if file_path.exists() else None
+            if current != entry["base_sha256"]:
+                self.errors.append(f"Plan périmé pour {entry['path']}: fichier modifié depuis la planification")
+                continue
+            self.write_file(entry["path"], entry["content"])
+    
+    def print_plan_summary(self, plan: Dict, show_diff: bool = False):
+        """Affiche le résumé d'un plan (et ses diffs si demandé)."""
+        print(f"\n📋 PLAN ({plan['changes']} changement(s)):")
+        for directory in plan["directories"]:
+            if not directory["exists"]:
+                print(f"  mkdir     {directory['path']}")
+        for entry in plan["files"]:
+            print(f"  {entry['action']:<9} {entry['path']}")
+        
+        if show_diff:
+            for entry in plan["files"]:
+                if entry["diff"]:
+                    print()
+                    print(entry["diff"], end="" if entry["diff"].endswith("\n") else "\n")
             
     def create_directory_structure(self):
         """Crée la structure de dossiers nécessaire."""
@@ -54,96 +235,37 @@ class GodotProjectFixer:
         ]
         
         for dir_path in directories:
+            if self.planning:
+                self.planned_directories.append(dir_path)
+                continue
             full_path = self.project_root / dir_path
             full_path.mkdir(parents=True, exist_ok=True)
             self.fixes_applied.append(f"📁 Dossier créé: {dir_path}")
     
     def create_stub_managers(self):
-        """Crée les managers stub temporaires."""
+        """Crée les stubs UIManager / AudioManager, dérivés des vrais managers quand ils existent."""
+        from sb_tools.stub_generator import generate_stubs
         
-        # UIManager Stub
-        ui_content = self.get_ui_manager_stub()
-        self.write_file("scripts/stubs/UIManager.gd", ui_content)
+        fallbacks = {"UIManager": self.get_ui_manager_stub, "AudioManager": self.get_audio_manager_stub}
+        stubs, missing = generate_stubs(self.project_root, list(fallbacks))
         
-        # AudioManager Stub  
-        audio_content = self.get_audio_manager_stub()
-        self.write_file("scripts/stubs/AudioManager.gd", audio_content)
+        # Stubs headless : la vraie implémentation n'est jamais écrasée
+        for path, content in stubs.items():
+            self.write_file(path, content)
+        
+        # Aucune implémentation : stub minimal à l'emplacement de l'AutoLoad
+        for class_name in missing:
+            self.write_file(f"scripts/stubs/{class_name}.gd", fallbacks[class_name]())
     
     def get_ui_manager_stub(self):
         """Retourne le contenu du UIManager stub."""
-        return """# ============================================================================
-# 📱 UIManager.gd - Gestionnaire Interface Utilisateur (STUB TEMPORAIRE)
-# ============================================================================
-
-class_name UIManager
-extends CanvasLayer
-
-signal ui_element_shown(element_name: String)
-signal ui_element_hidden(element_name: String)
-signal manager_initialized()
-
-var is_initialized: bool = false
-
-func _ready() -> void:
-	print("📱 UIManager: Stub temporaire initialisé")
-	is_initialized = true
-	manager_initialized.emit()
-
-func toggle_pause_menu() -> void:
-	print("📱 UIManager: Menu pause toggled (stub)")
-
-func show_panel(panel_name: String) -> void:
-	print("📱 UIManager: Affichage panneau ", panel_name, " (stub)")
-	ui_element_shown.emit(panel_name)
-
-func hide_panel(panel_name: String) -> void:
-	print("📱 UIManager: Masquage panneau ", panel_name, " (stub)")
-	ui_element_hidden.emit(panel_name)
-
-func show_notification(message: String, type: String = "info") -> void:
-	print("📱 Notification [", type, "]: ", message)
-
-func start_transition(transition_type) -> void:
-	print("📱 UIManager: Transition démarrée (stub)")
-	await get_tree().create_timer(0.3).timeout
-
-func complete_transition() -> void:
-	print("📱 UIManager: Transition terminée (stub)")
-"""
+        from sb_tools.gd_codegen import render_base_script
+        return render_base_script("ui_manager_stub")
 
     def get_audio_manager_stub(self):
         """Retourne le contenu du AudioManager stub."""
-        return """# ============================================================================
-# 🔊 AudioManager.gd - Gestionnaire Audio (STUB TEMPORAIRE)
-# ============================================================================
-
-class_name AudioManager
-extends Node
-
-signal audio_started(audio_type: String, track_name: String)
-signal audio_stopped(audio_type: String)
-signal manager_initialized()
-
-var is_initialized: bool = false
-var master_volume: float = 1.0
-var music_volume: float = 0.8
-
-func _ready() -> void:
-	print("🔊 AudioManager: Stub temporaire initialisé")
-	is_initialized = true
-	manager_initialized.emit()
-
-func play_music(track_name: String, fade_time: float = 1.0) -> void:
-	print("🔊 AudioManager: Musique ", track_name, " (stub)")
-	audio_started.emit("music", track_name)
-
-func play_sfx(sfx_name: String, position: Vector2 = Vector2.ZERO) -> void:
-	print("🔊 AudioManager: SFX ", sfx_name, " (stub)")
-	audio_started.emit("sfx", sfx_name)
-
-func update_volume_settings(settings: Dictionary) -> void:
-	print("🔊 AudioManager: Volumes mis à jour (stub)")
-"""
+        from sb_tools.gd_codegen import render_base_script
+        return render_base_script("audio_manager_stub")
     
     def create_core_scripts(self):
         """Crée les scripts core corrigés."""
@@ -162,955 +284,79 @@ func update_volume_settings(settings: Dictionary) -> void:
     
     def get_player_script(self):
         """Retourne le script Player.gd corrigé."""
-        return """# ============================================================================
-# 🎮 Player.gd - Contrôleur Joueur Principal (CORRIGÉ)
-# ============================================================================
-
-class_name Player
-extends CharacterBody2D
-
-# ============================================================================
-# SIGNAUX
-# ============================================================================
-
-signal movement_started()
-signal movement_stopped()
-signal interaction_started(target: Node, interaction_type: String)
-signal observation_started(target: Node)
-signal observation_ended(target: Node, duration: float)
-signal player_state_changed(old_state: String, new_state: String)
-
-# ============================================================================
-# CONFIGURATION
-# ============================================================================
-
-@export_group("Movement")
-@export var base_speed: float = 200.0
-@export var run_speed_multiplier: float = 1.8
-
-@export_group("Interaction")
-@export var interaction_range: float = 50.0
-@export var observation_range: float = 80.0
-@export var observation_min_time: float = 2.0
-
-@export_group("Debug")
-@export var debug_mode: bool = false
-@export var show_interaction_range: bool = false
-
-# ============================================================================
-# COMPOSANTS
-# ============================================================================
-
-@onready var sprite: Sprite2D = $Sprite2D
-@onready var collision_shape: CollisionShape2D = $CollisionShape2D
-@onready var interaction_area: Area2D = $InteractionArea
-@onready var observation_area: Area2D = $ObservationArea
-
-# ============================================================================
-# VARIABLES D'ÉTAT
-# ============================================================================
-
-enum PlayerState {
-	IDLE,
-	MOVING,
-	INTERACTING,
-	OBSERVING,
-	IN_DIALOGUE,
-	DISABLED
-}
-
-var current_state: PlayerState = PlayerState.IDLE
-var input_vector: Vector2 = Vector2.ZERO
-var is_running: bool = false
-var is_moving: bool = false
-var is_observing: bool = false
-
-var interactable_objects: Array[Node] = []
-var observable_creatures: Array[Node] = []
-var current_interaction_target: Node = null
-var current_observation_target: Node = null
-var observation_timer: float = 0.0
-
-# Références aux managers (CORRIGÉ: noms AutoLoad)
-var game_manager: GameManager
-var observation_manager: ObservationManager
-var dialogue_manager: DialogueManager
-var ui_manager: UIManager
-var audio_manager: AudioManager
-
-# ============================================================================
-# INITIALISATION
-# ============================================================================
-
-func _ready() -> void:
-	if debug_mode:
-		print("🎮 Player: Initialisation...")
-	
-	await get_tree().process_frame
-	connect_to_managers()
-	setup_initial_state()
-	setup_interaction_areas()
-	
-	if debug_mode:
-		print("🎮 Player: Prêt! Position:", global_position)
-
-func connect_to_managers() -> void:
-	game_manager = get_node_or_null("/root/Game")
-	observation_manager = get_node_or_null("/root/Observation")
-	dialogue_manager = get_node_or_null("/root/Dialogue")
-	ui_manager = get_node_or_null("/root/UI")
-	audio_manager = get_node_or_null("/root/Audio")
-	
-	if dialogue_manager:
-		if dialogue_manager.has_signal("dialogue_started"):
-			dialogue_manager.dialogue_started.connect(_on_dialogue_started)
-		if dialogue_manager.has_signal("dialogue_ended"):
-			dialogue_manager.dialogue_ended.connect(_on_dialogue_ended)
-	
-	if debug_mode:
-		print("🎮 Player: Connexions managers établies")
-
-func setup_initial_state() -> void:
-	current_state = PlayerState.IDLE
-	set_physics_process(true)
-	set_process_input(true)
-	collision_layer = 1
-	collision_mask = 2
-
-func setup_interaction_areas() -> void:
-	if interaction_area:
-		var interaction_shape = CircleShape2D.new()
-		interaction_shape.radius = interaction_range
-		var collision = interaction_area.get_node("CollisionShape2D")
-		if collision:
-			collision.shape = interaction_shape
-		
-		interaction_area.body_entered.connect(_on_interaction_area_entered)
-		interaction_area.body_exited.connect(_on_interaction_area_exited)
-	
-	if observation_area:
-		var observation_shape = CircleShape2D.new()
-		observation_shape.radius = observation_range
-		var collision = observation_area.get_node("CollisionShape2D")
-		if collision:
-			collision.shape = observation_shape
-		
-		observation_area.body_entered.connect(_on_observation_area_entered)
-		observation_area.body_exited.connect(_on_observation_area_exited)
-
-# ============================================================================
-# BOUCLE PRINCIPALE
-# ============================================================================
-
-func _physics_process(delta: float) -> void:
-	if can_move():
-		handle_movement_input()
-		process_movement(delta)
-	else:
-		stop_movement()
-	
-	update_observation(delta)
-
-func _input(event: InputEvent) -> void:
-	if event.is_action_pressed("observe"):
-		start_observation()
-	elif event.is_action_released("observe"):
-		stop_observation()
-	
-	if event.is_action_pressed("interact"):
-		attempt_interaction()
-	
-	if event.is_action_pressed("run"):
-		is_running = true
-	elif event.is_action_released("run"):
-		is_running = false
-
-# ============================================================================
-# SYSTÈME DE MOUVEMENT
-# ============================================================================
-
-func handle_movement_input() -> void:
-	input_vector = Vector2.ZERO
-	
-	if Input.is_action_pressed("move_right"):
-		input_vector.x += 1
-	if Input.is_action_pressed("move_left"):
-		input_vector.x -= 1
-	if Input.is_action_pressed("move_down"):
-		input_vector.y += 1
-	if Input.is_action_pressed("move_up"):
-		input_vector.y -= 1
-	
-	if input_vector.length() > 1:
-		input_vector = input_vector.normalized()
-
-func process_movement(delta: float) -> void:
-	var target_speed = base_speed
-	if is_running:
-		target_speed *= run_speed_multiplier
-	
-	if input_vector != Vector2.ZERO:
-		velocity = velocity.move_toward(input_vector * target_speed, 1000.0 * delta)
-		if not is_moving:
-			start_movement()
-	else:
-		velocity = velocity.move_toward(Vector2.ZERO, 1000.0 * delta)
-		if velocity.length() < 5 and is_moving:
-			stop_movement()
-	
-	move_and_slide()
-
-func start_movement() -> void:
-	is_moving = true
-	change_state(PlayerState.MOVING)
-	movement_started.emit()
-
-func stop_movement() -> void:
-	if is_moving:
-		is_moving = false
-		if current_state == PlayerState.MOVING:
-			change_state(PlayerState.IDLE)
-		movement_stopped.emit()
-
-func can_move() -> bool:
-	return current_state in [PlayerState.IDLE, PlayerState.MOVING, PlayerState.OBSERVING]
-
-# ============================================================================
-# SYSTÈME D'INTERACTION
-# ============================================================================
-
-func attempt_interaction() -> void:
-	if current_state == PlayerState.IN_DIALOGUE:
-		if dialogue_manager and dialogue_manager.has_method("advance_dialogue"):
-			dialogue_manager.advance_dialogue()
-		return
-	
-	var target = find_best_interaction_target()
-	if target:
-		start_interaction(target)
-
-func find_best_interaction_target() -> Node:
-	if interactable_objects.is_empty():
-		return null
-	
-	var best_target: Node = null
-	var best_distance: float = INF
-	
-	for obj in interactable_objects:
-		if obj and is_instance_valid(obj):
-			var distance = global_position.distance_to(obj.global_position)
-			if distance < best_distance:
-				best_distance = distance
-				best_target = obj
-	
-	return best_target
-
-func start_interaction(target: Node) -> void:
-	if not target:
-		return
-	
-	current_interaction_target = target
-	change_state(PlayerState.INTERACTING)
-	interaction_started.emit(target, get_interaction_type(target))
-	
-	process_interaction(target)
-
-func process_interaction(target: Node) -> void:
-	if target.has_method("start_dialogue") or target.is_in_group("npcs"):
-		start_dialogue_with_npc(target)
-	elif target.has_method("observe") or target.is_in_group("creatures"):
-		start_observation_of_creature(target)
-	elif target.has_method("interact"):
-		target.interact(self)
-		end_interaction()
-	else:
-		print("🎮 Interaction avec:", target.name)
-		end_interaction()
-
-func start_dialogue_with_npc(npc: Node) -> void:
-	if dialogue_manager:
-		var npc_id = npc.npc_id if "npc_id" in npc else npc.name.to_lower()
-		if dialogue_manager.has_method("start_dialogue"):
-			dialogue_manager.start_dialogue(npc_id, "default")
-	else:
-		print("⚠️ DialogueManager non disponible")
-		end_interaction()
-
-func end_interaction() -> void:
-	current_interaction_target = null
-	if current_state == PlayerState.INTERACTING:
-		change_state(PlayerState.IDLE)
-
-# ============================================================================
-# SYSTÈME D'OBSERVATION
-# ============================================================================
-
-func start_observation() -> void:
-	if current_state in [PlayerState.IN_DIALOGUE]:
-		return
-	
-	var target = find_best_observation_target()
-	if target:
-		start_observation_of_creature(target)
-	else:
-		change_state(PlayerState.OBSERVING)
-		observation_started.emit(null)
-
-func start_observation_of_creature(creature: Node) -> void:
-	current_observation_target = creature
-	is_observing = true
-	observation_timer = 0.0
-	
-	change_state(PlayerState.OBSERVING)
-	observation_started.emit(creature)
-
-func stop_observation() -> void:
-	if not is_observing:
-		return
-	
-	var duration = observation_timer
-	var target = current_observation_target
-	
-	if duration >= observation_min_time and target:
-		process_creature_observation(target, duration)
-	
-	is_observing = false
-	observation_timer = 0.0
-	observation_ended.emit(target, duration)
-	current_observation_target = null
-	
-	if current_state == PlayerState.OBSERVING:
-		change_state(PlayerState.IDLE)
-
-func process_creature_observation(creature: Node, duration: float) -> void:
-	if observation_manager:
-		var creature_id = creature.creature_id if "creature_id" in creature else creature.name.to_lower()
-		var intensity = min(duration / observation_min_time, 3.0)
-		if observation_manager.has_method("observe_creature"):
-			observation_manager.observe_creature(creature_id, intensity)
-	
-	if debug_mode:
-		print("🔮 Observation:", creature.name, "durée:", duration, "s")
-
-func find_best_observation_target() -> Node:
-	if observable_creatures.is_empty():
-		return null
-	
-	var best_target: Node = null
-	var best_score: float = 0.0
-	
-	for creature in observable_creatures:
-		if creature and is_instance_valid(creature):
-			var distance = global_position.distance_to(creature.global_position)
-			var score = 1.0 / (1.0 + distance / observation_range)
-			
-			if score > best_score:
-				best_score = score
-				best_target = creature
-	
-	return best_target
-
-func update_observation(delta: float) -> void:
-	if is_observing:
-		observation_timer += delta
-
-# ============================================================================
-# GESTION DES ÉTATS
-# ============================================================================
-
-func change_state(new_state: PlayerState) -> void:
-	if new_state == current_state:
-		return
-	
-	var previous_state = current_state
-	current_state = new_state
-	
-	player_state_changed.emit(
-		PlayerState.keys()[previous_state], 
-		PlayerState.keys()[current_state]
-	)
-	
-	if debug_mode:
-		print("🎮 État changé:", PlayerState.keys()[previous_state], "→", PlayerState.keys()[current_state])
-
-# ============================================================================
-# CALLBACKS
-# ============================================================================
-
-func _on_interaction_area_entered(body: Node) -> void:
-	if body == self:
-		return
-	
-	if body.has_method("get_interaction_type") or body.is_in_group("interactables") or body.is_in_group("npcs"):
-		interactable_objects.append(body)
-		if debug_mode:
-			print("🎮 Interaction disponible:", body.name)
-
-func _on_interaction_area_exited(body: Node) -> void:
-	if body in interactable_objects:
-		interactable_objects.erase(body)
-		if body == current_interaction_target:
-			end_interaction()
-
-func _on_observation_area_entered(body: Node) -> void:
-	if body == self:
-		return
-	
-	if body.has_method("observe") or body.is_in_group("creatures"):
-		observable_creatures.append(body)
-		if debug_mode:
-			print("🔮 Créature observable:", body.name)
-
-func _on_observation_area_exited(body: Node) -> void:
-	if body in observable_creatures:
-		observable_creatures.erase(body)
-		if body == current_observation_target:
-			stop_observation()
-
-func _on_dialogue_started(npc_id: String, dialogue_id: String) -> void:
-	change_state(PlayerState.IN_DIALOGUE)
-
-func _on_dialogue_ended(npc_id: String, final_choice: String, relationship_change: float) -> void:
-	end_interaction()
-
-# ============================================================================
-# UTILITAIRES
-# ============================================================================
-
-func get_interaction_type(target: Node) -> String:
-	if target.has_method("get_interaction_type"):
-		return target.get_interaction_type()
-	elif target.is_in_group("npcs"):
-		return "dialogue"
-	elif target.is_in_group("creatures"):
-		return "observation"
-	else:
-		return "generic"
-
-# ============================================================================
-# DEBUG
-# ============================================================================
-
-func _draw() -> void:
-	if not debug_mode or not show_interaction_range:
-		return
-	
-	draw_circle(Vector2.ZERO, interaction_range, Color.BLUE, false, 2)
-	draw_circle(Vector2.ZERO, observation_range, Color.GREEN, false, 2)
-"""
+        from sb_tools.gd_codegen import render_base_script
+        return render_base_script("player")
     
     def get_creature_script(self):
         """Retourne le script Creature.gd corrigé."""
-        return """# ============================================================================
-# 🐾 Creature.gd - Base pour Système d'Évolution (CORRIGÉ)
-# ============================================================================
-
-class_name Creature
-extends CharacterBody2D
-
-# ============================================================================
-# CONFIGURATION
-# ============================================================================
-
-@export_group("Identity")
-@export var creature_id: String = "unknown_creature"
-@export var display_name: String = "Créature Mystérieuse"
-
-@export_group("Evolution")
-@export var current_evolution_stage: int = 0
-@export var observation_count: int = 0
-@export var magic_affinity: float = 1.0
-
-@export_group("Behavior")
-@export var base_speed: float = 50.0
-
-@export_group("Debug")
-@export var debug_mode: bool = false
-
-# ============================================================================
-# COMPOSANTS
-# ============================================================================
-
-@onready var sprite: Sprite2D = $Sprite2D
-@onready var collision_shape: CollisionShape2D = $CollisionShape2D
-
-# ============================================================================
-# VARIABLES
-# ============================================================================
-
-enum CreatureBehavior {
-	IDLE,
-	ROAMING,
-	CURIOUS,
-	EVOLVING
-}
-
-var current_behavior: CreatureBehavior = CreatureBehavior.IDLE
-var home_position: Vector2
-var target_position: Vector2
-var observers: Array[Node] = []
-var current_observer: Node = null
-var is_evolving: bool = false
-var evolution_timer: float = 0.0
-var behavior_timer: float = 0.0
-var is_magical: bool = false
-var magic_timer: float = 0.0
-
-# Références managers (CORRIGÉ)
-var observation_manager: ObservationManager
-
-# ============================================================================
-# INITIALISATION
-# ============================================================================
-
-func _ready() -> void:
-	if debug_mode:
-		print("🐾 Creature:", creature_id, "initialisation...")
-	
-	await get_tree().process_frame
-	connect_to_managers()
-	
-	home_position = global_position
-	target_position = home_position
-	
-	if debug_mode:
-		print("🐾 Creature:", display_name, "prête! Stade:", current_evolution_stage)
-
-func connect_to_managers() -> void:
-	observation_manager = get_node_or_null("/root/Observation")
-	if debug_mode:
-		print("🐾 Creature: Connexions managers établies")
-
-# ============================================================================
-# BOUCLE PRINCIPALE
-# ============================================================================
-
-func _physics_process(delta: float) -> void:
-	behavior_timer += delta
-	magic_timer += delta
-	
-	if is_evolving:
-		evolution_timer += delta
-	
-	process_behavior(delta)
-	process_movement(delta)
-	
-	if is_magical:
-		process_magic_effects(delta)
-
-func process_behavior(delta: float) -> void:
-	match current_behavior:
-		CreatureBehavior.IDLE:
-			if behavior_timer > 3.0 and randf() < 0.3:
-				start_roaming()
-		CreatureBehavior.CURIOUS:
-			if current_observer:
-				look_at_observer()
-			else:
-				change_behavior(CreatureBehavior.IDLE)
-		CreatureBehavior.EVOLVING:
-			if evolution_timer > 2.0:
-				complete_evolution()
-
-func process_movement(delta: float) -> void:
-	if is_evolving:
-		velocity = Vector2.ZERO
-	else:
-		var direction = Vector2.ZERO
-		if current_behavior == CreatureBehavior.ROAMING:
-			direction = (target_position - global_position).normalized()
-		
-		velocity = velocity.move_toward(direction * base_speed, 300.0 * delta)
-	
-	move_and_slide()
-
-func process_magic_effects(delta: float) -> void:
-	if not is_magical:
-		return
-	
-	if magic_timer > 3.0:
-		trigger_magic_event()
-		magic_timer = 0.0
-
-# ============================================================================
-# COMPORTEMENTS
-# ============================================================================
-
-func start_roaming() -> void:
-	change_behavior(CreatureBehavior.ROAMING)
-	choose_new_target()
-
-func choose_new_target() -> void:
-	var angle = randf() * 2 * PI
-	var distance = randf() * 150.0
-	target_position = home_position + Vector2(cos(angle), sin(angle)) * distance
-
-func look_at_observer() -> void:
-	if current_observer and sprite:
-		var direction = (current_observer.global_position - global_position).normalized()
-		sprite.flip_h = direction.x < 0
-
-func change_behavior(new_behavior: CreatureBehavior) -> void:
-	if new_behavior == current_behavior:
-		return
-	
-	current_behavior = new_behavior
-	behavior_timer = 0.0
-	
-	if debug_mode:
-		print("🐾 ", display_name, "comportement:", CreatureBehavior.keys()[current_behavior])
-
-# ============================================================================
-# SYSTÈME D'ÉVOLUTION
-# ============================================================================
-
-func trigger_evolution() -> void:
-	if is_evolving or current_evolution_stage >= 4:
-		return
-	
-	var old_stage = current_evolution_stage
-	current_evolution_stage += 1
-	
-	is_evolving = true
-	evolution_timer = 0.0
-	change_behavior(CreatureBehavior.EVOLVING)
-	
-	if debug_mode:
-		print("🎉 ", display_name, "évolue! Stade", old_stage, "→", current_evolution_stage)
-
-func complete_evolution() -> void:
-	is_evolving = false
-	evolution_timer = 0.0
-	
-	update_visual_for_stage(current_evolution_stage)
-	
-	if current_evolution_stage >= 3:
-		is_magical = true
-	
-	change_behavior(CreatureBehavior.IDLE)
-	
-	if debug_mode:
-		print("✨ ", display_name, "évolution terminée!")
-
-func update_visual_for_stage(stage: int) -> void:
-	if not sprite:
-		return
-	
-	match stage:
-		0: sprite.modulate = Color.WHITE
-		1: sprite.modulate = Color.WHITE.lerp(Color.YELLOW, 0.3)
-		2: sprite.modulate = Color.WHITE.lerp(Color.CYAN, 0.5)
-		3: sprite.modulate = Color.WHITE.lerp(Color.MAGENTA, 0.7)
-		4: sprite.modulate = Color.GOLD
-
-func trigger_magic_event() -> void:
-	if debug_mode:
-		print("✨ ", display_name, "événement magique!")
-
-# ============================================================================
-# INTERFACE PUBLIQUE
-# ============================================================================
-
-func observe(observer: Node, intensity: float = 1.0) -> void:
-	observation_count += 1
-	start_observation(observer, intensity)
-	
-	# Vérifier évolution
-	var thresholds = [0, 3, 7, 12, 20]
-	var next_threshold = thresholds[min(current_evolution_stage + 1, thresholds.size() - 1)]
-	
-	if observation_count >= next_threshold:
-		trigger_evolution()
-
-func start_observation(observer: Node, intensity: float) -> void:
-	if observer in observers:
-		return
-	
-	observers.append(observer)
-	current_observer = observer
-	
-	change_behavior(CreatureBehavior.CURIOUS)
-	
-	if debug_mode:
-		print("🔮 ", display_name, "observée par", observer.name)
-
-func interact(player: Node) -> String:
-	match current_evolution_stage:
-		0: return display_name + " vous regarde curieusement."
-		1: return display_name + " semble vous reconnaître."
-		2: return display_name + " s'approche amicalement."
-		3: return display_name + " brille d'une lueur magique."
-		4: return display_name + " vous communique télépathiquement."
-		_: return "Interaction mystérieuse..."
-
-func get_interaction_type() -> String:
-	return "observe"
-"""
+        from sb_tools.gd_codegen import render_base_script
+        return render_base_script("creature")
     
     def get_npc_script(self):
-        """Retourne le script NPC.gd corrigé.""" 
-        return """# ============================================================================
-# 👥 NPC.gd - Personnages Non-Joueurs (CORRIGÉ)
-# ============================================================================
-
-class_name NPC
-extends CharacterBody2D
-
-# ============================================================================
-# CONFIGURATION
-# ============================================================================
-
-@export_group("Identity")
-@export var npc_id: String = "unknown_npc"
-@export var display_name: String = "Personnage Mystérieux"
-@export var profession: String = "citoyen"
-@export var faction: String = "neutral"
-
-@export_group("Behavior")
-@export var is_stationary: bool = false
-@export var interaction_radius: float = 50.0
-@export var movement_speed: float = 30.0
-
-@export_group("Debug")
-@export var debug_mode: bool = false
-
-# ============================================================================
-# COMPOSANTS
-# ============================================================================
-
-@onready var sprite: Sprite2D = $Sprite2D
-@onready var collision_shape: CollisionShape2D = $CollisionShape2D
-@onready var interaction_area: Area2D = $InteractionArea
-
-# ============================================================================
-# VARIABLES
-# ============================================================================
-
-enum NPCState {
-	IDLE,
-	TALKING,
-	WORKING
-}
-
-var current_state: NPCState = NPCState.IDLE
-var current_interactor: Node = null
-var is_in_conversation: bool = false
-var relationship_level: float = 0.0
-
-# Références managers (CORRIGÉ)
-var dialogue_manager: DialogueManager
-
-# ============================================================================
-# INITIALISATION
-# ============================================================================
-
-func _ready() -> void:
-	if debug_mode:
-		print("👥 NPC:", npc_id, "initialisation...")
-	
-	await get_tree().process_frame
-	connect_to_managers()
-	setup_interaction_areas()
-	
-	if debug_mode:
-		print("👥 NPC:", display_name, "prêt!")
-
-func connect_to_managers() -> void:
-	dialogue_manager = get_node_or_null("/root/Dialogue")
-	if debug_mode:
-		print("👥 NPC: Connexions managers établies")
-
-func setup_interaction_areas() -> void:
-	if interaction_area:
-		var shape = CircleShape2D.new()
-		shape.radius = interaction_radius
-		var collision = interaction_area.get_node("CollisionShape2D")
-		if collision:
-			collision.shape = shape
-		
-		interaction_area.body_entered.connect(_on_interaction_area_entered)
-		interaction_area.body_exited.connect(_on_interaction_area_exited)
-
-# ============================================================================
-# BOUCLE PRINCIPALE
-# ============================================================================
-
-func _physics_process(delta: float) -> void:
-	if current_state == NPCState.TALKING:
-		if current_interactor:
-			look_at_interactor()
-
-func look_at_interactor() -> void:
-	if current_interactor and sprite:
-		var direction = (current_interactor.global_position - global_position).normalized()
-		sprite.flip_h = direction.x < 0
-
-# ============================================================================
-# SYSTÈME D'INTERACTION
-# ============================================================================
-
-func start_interaction(player: Node) -> void:
-	if is_in_conversation:
-		return
-	
-	current_interactor = player
-	is_in_conversation = true
-	change_state(NPCState.TALKING)
-	
-	start_dialogue(player)
-
-func start_dialogue(player: Node) -> void:
-	if dialogue_manager and dialogue_manager.has_method("start_dialogue"):
-		dialogue_manager.start_dialogue(npc_id, "generic_greeting")
-	else:
-		show_simple_message(get_greeting_message())
-		end_interaction()
-
-func end_interaction() -> void:
-	current_interactor = null
-	is_in_conversation = false
-	change_state(NPCState.IDLE)
-
-func get_greeting_message() -> String:
-	var greetings = [
-		"Bonjour ! Comment allez-vous ?",
-		"Salutations, voyageur !",
-		"Bien le bonjour !"
-	]
-	return greetings[randi() % greetings.size()]
-
-func show_simple_message(message: String) -> void:
-	print("💬 ", display_name, ":", message)
-
-# ============================================================================
-# ÉTATS
-# ============================================================================
-
-func change_state(new_state: NPCState) -> void:
-	if new_state == current_state:
-		return
-	
-	current_state = new_state
-	
-	if debug_mode:
-		print("👥 ", display_name, "état:", NPCState.keys()[current_state])
-
-# ============================================================================
-# CALLBACKS
-# ============================================================================
-
-func _on_interaction_area_entered(body: Node) -> void:
-	if body.is_in_group("player"):
-		if debug_mode:
-			print("👥 Joueur détecté:", body.name)
-
-func _on_interaction_area_exited(body: Node) -> void:
-	if body.is_in_group("player"):
-		if is_in_conversation and body == current_interactor:
-			end_interaction()
-
-# ============================================================================
-# INTERFACE PUBLIQUE
-# ============================================================================
-
-func interact(player: Node) -> String:
-	start_interaction(player)
-	return "Interaction démarrée avec " + display_name
-
-func get_interaction_type() -> String:
-	return "dialogue"
-"""
+        """Retourne le script NPC.gd corrigé."""
+        from sb_tools.gd_codegen import render_base_script
+        return render_base_script("npc")
     
     def create_test_scene(self):
         """Crée une scène de test simple."""
-        # Créer un contenu de scène simple qui évite les problèmes de syntaxe
-        scene_lines = [
-            '[gd_scene load_steps=5 format=3 uid="uid://test_scene_sb"]',
-            '',
-            '[ext_resource type="Script" path="res://scripts/core/Player.gd" id="1_player"]',
-            '[ext_resource type="Script" path="res://scripts/core/Creature.gd" id="2_creature"]', 
-            '[ext_resource type="Script" path="res://scripts/core/NPC.gd" id="3_npc"]',
-            '',
-            '[sub_resource type="RectangleShape2D" id="player_shape"]',
-            'size = Vector2(32, 48)',
-            '',
-            '[node name="TestScene" type="Node2D"]',
-            '',
-            '[node name="Background" type="ColorRect" parent="."]',
-            'offset_right = 1000.0',
-            'offset_bottom = 700.0',
-            'color = Color(0.1, 0.2, 0.1, 1)',
-            '',
-            '[node name="Player" type="CharacterBody2D" parent="." groups=["player"]]',
-            'position = Vector2(200, 350)',
-            'script = ExtResource("1_player")',
-            'debug_mode = true',
-            'show_interaction_range = true',
-            '',
-            '[node name="Sprite2D" type="Sprite2D" parent="Player"]',
-            'modulate = Color(0.3, 0.6, 1, 1)',
-            '',
-            '[node name="CollisionShape2D" type="CollisionShape2D" parent="Player"]',
-            'shape = SubResource("player_shape")',
-            '',
-            '[node name="InteractionArea" type="Area2D" parent="Player"]',
-            '',
-            '[node name="CollisionShape2D" type="CollisionShape2D" parent="Player/InteractionArea"]',
-            '',
-            '[node name="ObservationArea" type="Area2D" parent="Player"]',
-            '',
-            '[node name="CollisionShape2D" type="CollisionShape2D" parent="Player/ObservationArea"]',
-            '',
-            '[node name="TestCreature" type="CharacterBody2D" parent="." groups=["creatures"]]',
-            'position = Vector2(500, 250)',
-            'script = ExtResource("2_creature")',
-            'creature_id = "maurice_rat"',
-            'display_name = "Maurice le Rat"',
-            'debug_mode = true',
-            '',
-            '[node name="Sprite2D" type="Sprite2D" parent="TestCreature"]',
-            'modulate = Color(0.8, 0.6, 0.4, 1)',
-            '',
-            '[node name="CollisionShape2D" type="CollisionShape2D" parent="TestCreature"]',
-            'shape = SubResource("player_shape")',
-            '',
-            '[node name="TestNPC" type="CharacterBody2D" parent="." groups=["npcs"]]',
-            'position = Vector2(800, 350)',
-            'script = ExtResource("3_npc")',
-            'npc_id = "madame_simnel"',
-            'display_name = "Madame Simnel"',
-            'debug_mode = true',
-            '',
-            '[node name="Sprite2D" type="Sprite2D" parent="TestNPC"]',
-            'modulate = Color(1, 0.8, 0.6, 1)',
-            '',
-            '[node name="CollisionShape2D" type="CollisionShape2D" parent="TestNPC"]',
-            'shape = SubResource("player_shape")',
-            '',
-            '[node name="InteractionArea" type="Area2D" parent="TestNPC"]',
-            '',
-            '[node name="CollisionShape2D" type="CollisionShape2D" parent="TestNPC/InteractionArea"]',
-            '',
-            '[node name="UI" type="CanvasLayer" parent="."]',
-            '',
-            '[node name="Controls" type="Label" parent="UI"]',
-            'offset_right = 350.0',
-            'offset_bottom = 150.0',
-            'text = "WASD - Bouger\\nE - Interagir\\nSouris - Observer"',
-            'theme_override_colors/font_color = Color(1, 1, 1, 1)',
-            '',
-            '[node name="Info" type="Label" parent="UI"]',
-            'anchors_preset = 1',
-            'anchor_left = 1.0',
-            'anchor_right = 1.0',
-            'offset_left = -300.0',
-            'offset_bottom = 100.0',
-            'text = "TEST SCENE\\nJoueur bleu\\nCreature brune\\nNPC jaune"',
-            'theme_override_colors/font_color = Color(1, 1, 1, 1)'
-        ]
+        from sb_tools.tscn_model import (add_ext_resource, add_node, add_sub_resource, color, ext_ref, get_attr,
+                                         new_scene, read_header, resource_uid, scene_text, scene_uid,
+                                         sub_ref, vector2)
+        
+        # Conserver l'UID d'une scène existante : project.godot la référence par uid://
+        scene_path = "scenes/test/TestScene.tscn"
+        existing = self.project_root / scene_path
+        header = read_header(existing) if existing.exists() else None
+        uid = get_attr(header, "uid") if header else None
+        scene = new_scene(uid or scene_uid(f"res://{scene_path}"))
+        
+        scripts = {}
+        for resource_id, script in (("1_player", "Player"), ("2_creature", "Creature"), ("3_npc", "NPC")):
+            path = f"res://scripts/core/{script}.gd"
+            scripts[script] = add_ext_resource(scene, "Script", path, resource_uid(self.project_root, path), resource_id)
+        # Une seule forme partagée : add_sub_resource réutilise la sub_resource identique
+        shape = lambda: sub_ref(add_sub_resource(scene, "RectangleShape2D", {"size": vector2(32, 48)},
+                                                 resource_id="player_shape"))
+        white = color(1, 1, 1, 1)
+        
+        add_node(scene, "TestScene", "Node2D")
+        add_node(scene, "Background", "ColorRect", ".", {
+            "offset_right": 1000.0, "offset_bottom": 700.0, "color": color(0.1, 0.2, 0.1, 1)})
+        
+        add_node(scene, "Player", "CharacterBody2D", ".", {
+            "position": vector2(200, 350), "script": ext_ref(scripts["Player"]),
+            "debug_mode": True, "show_interaction_range": True}, groups=["player"])
+        add_node(scene, "Sprite2D", "Sprite2D", "Player", {"modulate": color(0.3, 0.6, 1, 1)})
+        add_node(scene, "CollisionShape2D", "CollisionShape2D", "Player", {"shape": shape()})
+        add_node(scene, "InteractionArea", "Area2D", "Player")
+        add_node(scene, "CollisionShape2D", "CollisionShape2D", "Player/InteractionArea")
+        add_node(scene, "ObservationArea", "Area2D", "Player")
+        add_node(scene, "CollisionShape2D", "CollisionShape2D", "Player/ObservationArea")
+        
+        add_node(scene, "TestCreature", "CharacterBody2D", ".", {
+            "position": vector2(500, 250), "script": ext_ref(scripts["Creature"]),
+            "creature_id": "maurice_rat", "display_name": "Maurice le Rat", "debug_mode": True}, groups=["creatures"])
+        add_node(scene, "Sprite2D", "Sprite2D", "TestCreature", {"modulate": color(0.8, 0.6, 0.4, 1)})
+        add_node(scene, "CollisionShape2D", "CollisionShape2D", "TestCreature", {"shape": shape()})
+        
+        add_node(scene, "TestNPC", "CharacterBody2D", ".", {
+            "position": vector2(800, 350), "script": ext_ref(scripts["NPC"]),
+            "npc_id": "madame_simnel", "display_name": "Madame Simnel", "debug_mode": True}, groups=["npcs"])
+        add_node(scene, "Sprite2D", "Sprite2D", "TestNPC", {"modulate": color(1, 0.8, 0.6, 1)})
+        add_node(scene, "CollisionShape2D", "CollisionShape2D", "TestNPC", {"shape": shape()})
+        add_node(scene, "InteractionArea", "Area2D", "TestNPC")
+        add_node(scene, "CollisionShape2D", "CollisionShape2D", "TestNPC/InteractionArea")
         
-        scene_content = '\n'.join(scene_lines)
-        self.write_file("scenes/test/TestScene.tscn", scene_content)
+        add_node(scene, "UI", "CanvasLayer", ".")
+        add_node(scene, "Controls", "Label", "UI", {
+            "offset_right": 350.0, "offset_bottom": 150.0, "theme_override_colors/font_color": white,
+            "text": "WASD - Bouger\nE - Interagir\nSouris - Observer"})
+        add_node(scene, "Info", "Label", "UI", {
+            "anchors_preset": 1, "anchor_left": 1.0, "anchor_right": 1.0, "offset_left": -300.0,
+            "offset_bottom": 100.0, "theme_override_colors/font_color": white,
+            "text": "TEST SCENE\nJoueur bleu\nCreature brune\nNPC jaune"})
+        
+        self.write_file(scene_path, scene_text(scene))
     
     def create_input_instructions(self):
         """Crée les instructions pour configurer l'input map."""
@@ -1150,9 +396,50 @@ Après configuration, sauvegarder le projet.
 """
         self.write_file("INPUT_MAP_INSTRUCTIONS.txt", instructions)
     
+    def check_autoloads(self):
+        """Aligne les AutoLoads de project.godot sur les recherches /root/... des scripts."""
+        project_file = self.project_root / "project.godot"
+        if not project_file.exists():
+            return
+        from sb_tools.autoload_check import apply_project_fixes, check_autoloads, parse_autoloads, rewrite_lookups
+        
+        text = project_file.read_text(encoding='utf-8')
+        generated = {path: content for path, content in self.planned_files.items() if path.endswith(".gd")}
+        report = check_autoloads(self.project_root, text, overrides=generated)
+        fixes = report["fixes"]
+        
+        # Scripts générés ici : leurs recherches prennent directement les noms enregistrés
+        for path, content in generated.items():
+            fixed_content = rewrite_lookups(content, fixes["rewrites"])
+            if fixed_content != content:
+                self.write_file(path, fixed_content)
+        
+        fixed = apply_project_fixes(text, fixes)
+        if fixed != text:
+            self.write_file("project.godot", fixed)
+        autoloads = parse_autoloads(fixed)
+        if autoloads:
+            self.autoloads = [(autoload["name"], autoload["path"]) for autoload in autoloads]
+        
+        for old, new in fixes["renames"].items():
+            self.fixes_applied.append(f"🔌 AutoLoad renommé: {old} -> {new}")
+        for entry in fixes["register"]:
+            self.fixes_applied.append(f"🔌 AutoLoad ajouté: {entry['name']} ({entry['path']})")
+        
+        # Recherches des scripts existants restant sans AutoLoad (voir la sous-commande autoloads)
+        for name, entry in sorted(report["lookups"].items()):
+            refs = [ref for ref in entry["refs"] if ref["script"] not in generated]
+            if entry["status"] != "ok" and refs:
+                target = f"AutoLoad {entry['autoload']}" if entry["autoload"] else "aucun AutoLoad"
+                print(f"⚠️ /root/{name} ({len(refs)} recherche(s)) -> {target}")
+    
     def generate_autoload_instructions(self):
         """Génère les instructions pour configurer les AutoLoads."""
-        instructions = """# CONFIGURATION AUTOLOADS
+        steps = "\n".join(
+            f"{number}. Name: {name}\n   Path: {path}\n   Enable: ✅\n"
+            for number, (name, path) in enumerate(self.autoloads, 1)
+        )
+        instructions = f"""# CONFIGURATION AUTOLOADS
 # ========================
 
 Dans Godot: Project Settings > AutoLoad
@@ -1161,37 +448,12 @@ SUPPRIMER tous les AutoLoads existants qui causent des erreurs.
 
 AJOUTER ces AutoLoads dans l'ordre:
 
-1. Name: Game
-   Path: res://scripts/managers/GameManager.gd
-   Enable: ✅
-
-2. Name: Data  
-   Path: res://scripts/managers/DataManager.gd
-   Enable: ✅
-
-3. Name: Observation
-   Path: res://scripts/managers/ObservationManager.gd
-   Enable: ✅
-
-4. Name: Dialogue
-   Path: res://scripts/managers/DialogueManager.gd
-   Enable: ✅
-
-5. Name: Quest
-   Path: res://scripts/managers/QuestManager.gd
-   Enable: ✅
-
-6. Name: UI
-   Path: res://scripts/stubs/UIManager.gd
-   Enable: ✅
-
-7. Name: Audio
-   Path: res://scripts/stubs/AudioManager.gd
-   Enable: ✅
-
+{steps}
 IMPORTANT:
-- Utilisez exactement ces noms courts
-- PAS GameManager, DataManager, etc. (conflit avec class_name)
+- Utilisez exactement ces noms (ceux des get_node("/root/...") des scripts)
+- Jamais le nom d'un class_name (DataManager, DialogueManager...) : conflit
+
+Vérification: python godot_project_fixer.py autoloads
 
 Après configuration:
 1. Project > Reload Current Project
@@ -1202,18 +464,105 @@ Après configuration:
     
     def write_file(self, relative_path: str, content: str):
         """Écrit un fichier avec gestion d'erreurs."""
+        if self.planning:
+            self.planned_files[relative_path] = content
+            return
+        
         try:
             file_path = self.project_root / relative_path
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if self.incremental:
+                status = self.write_file_incremental(relative_path, file_path, content)
+            else:
+                status = "updated" if file_path.exists() else "created"
+                self.atomic_write(file_path, content.encode('utf-8'))
             
-            self.files_created.append(f"📄 {relative_path}")
+            self.file_statuses[relative_path] = status
+            if status != "unchanged":
+                self.files_created.append(f"📄 {relative_path}")
             
         except Exception as e:
             self.errors.append(f"Erreur écriture {relative_path}: {str(e)}")
     
+    def write_file_incremental(self, relative_path: str, file_path: Path, content: str) -> str:
+        """Écrit le fichier seulement si son contenu diffère. Retourne unchanged/updated/created."""
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        
+        if file_path.exists():
+            stat = file_path.stat()
+            entry = self.manifest.get(relative_path)
+            
+            # Fichier inchangé depuis le dernier passage : pas besoin de le relire
+            if (entry and entry.get("sha256") == digest
+                    and entry.get("size") == stat.st_size
+                    and entry.get("mtime_ns") == stat.st_mtime_ns):
+                return "unchanged"
+            
+            if stat.st_size == len(data) and hashlib.sha256(file_path.read_bytes()).hexdigest() == digest:
+                self.record_manifest_entry(relative_path, file_path, digest)
+                return "unchanged"
+            
+            status = "updated"
+        else:
+            status = "created"
+        
+        self.atomic_write(file_path, data)
+        self.record_manifest_entry(relative_path, file_path, digest)
+        return status
+    
+    def atomic_write(self, file_path: Path, data: bytes):
+        """Écrit dans un fichier temporaire puis le renomme sur la cible."""
+        # mkstemp crée en 0600 : conserver les droits existants ou ceux du umask
+        if file_path.exists():
+            mode = file_path.stat().st_mode & 0o777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        
+        fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_name, mode)
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+    
+    def record_manifest_entry(self, relative_path: str, file_path: Path, digest: str):
+        """Mémorise l'empreinte et le stat d'un fichier généré."""
+        stat = file_path.stat()
+        self.manifest[relative_path] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+    
+    def load_manifest(self) -> Dict[str, Dict]:
+        """Charge le manifeste des empreintes du passage précédent."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest.get("files", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Manifeste illisible, reconstruction complète: {e}")
+            return {}
+    
+    def save_manifest(self):
+        """Sauvegarde le manifeste des empreintes."""
+        try:
+            manifest = {"version": 1, "files": dict(sorted(self.manifest.items()))}
+            content = json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"
+            self.atomic_write(self.manifest_path, content.encode('utf-8'))
+        except Exception as e:
+            self.errors.append(f"Erreur écriture manifeste: {str(e)}")
+    
     def print_summary(self):
         """Affiche le résumé des corrections appliquées."""
         print("\n" + "="*60)
@@ -1225,10 +574,13 @@ Après configuration:
             for fix in self.fixes_applied:
                 print(f"  {fix}")
         
-        if self.files_created:
-            print(f"\n📄 FICHIERS CRÉÉS ({len(self.files_created)}):")
-            for file in self.files_created:
-                print(f"  {file}")
+        if self.file_statuses:
+            counts = {status: list(self.file_statuses.values()).count(status)
+                      for status in ("created", "updated", "unchanged")}
+            print(f"\n📄 FICHIERS (créés: {counts['created']}, mis à jour: {counts['updated']}, "
+                  f"inchangés: {counts['unchanged']}):")
+            for path, status in self.file_statuses.items():
+                print(f"  {status:<9} {path}")
         
         if self.errors:
             print(f"\n❌ ERREURS ({len(self.errors)}):")
@@ -1248,13 +600,164 @@ Après configuration:
         else:
             print(f"  ⚠️ {len(self.errors)} erreur(s) détectée(s)")
 
+def run_fixer_for_project(project_root: str, incremental: bool = False) -> Dict:
+    """Exécute le correcteur sur un projet et retourne un rapport sérialisable (worker batch)."""
+    started = time.perf_counter()
+    result = {
+        "project_root": project_root,
+        "fixes_applied": [],
+        "files_created": [],
+        "file_statuses": {},
+        "errors": []
+    }
+    
+    if not (Path(project_root) / "project.godot").exists():
+        result["errors"].append("Fichier project.godot non trouvé")
+    else:
+        # La sortie console des workers s'entremêlerait : on la capture
+        with contextlib.redirect_stdout(io.StringIO()):
+            fixer = GodotProjectFixer(project_root, incremental=incremental)
+            fixer.run_all_fixes()
+        result["fixes_applied"] = fixer.fixes_applied
+        result["files_created"] = fixer.files_created
+        result["file_statuses"] = fixer.file_statuses
+        result["errors"] = fixer.errors
+    
+    result["duration_s"] = round(time.perf_counter() - started, 4)
+    return result
+
+def expand_project_roots(patterns: List[str]) -> List[str]:
+    """Développe les chemins et motifs glob en une liste de racines de projets uniques."""
+    roots = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            # Un motif glob ne retient que les dossiers contenant un project.godot
+            matches = sorted(glob.glob(pattern, recursive=True))
+            matches = [m for m in matches if (Path(m) / "project.godot").exists()]
+            if not matches:
+                print(f"⚠️ Aucun projet Godot pour le motif: {pattern}", file=sys.stderr)
+        else:
+            matches = [pattern]
+        
+        for match in matches:
+            root = str(Path(match))
+            if root not in roots:
+                roots.append(root)
+    return roots
+
+def run_batch(project_roots: List[str], incremental: bool = False, jobs: int = None) -> Dict:
+    """Exécute le correcteur sur plusieurs projets en parallèle et agrège les résultats."""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    started = time.perf_counter()
+    if len(project_roots) <= 1 or jobs == 1:
+        projects = [run_fixer_for_project(root, incremental) for root in project_roots]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            projects = list(pool.map(run_fixer_for_project, project_roots,
+                                     [incremental] * len(project_roots)))
+    
+    return {
+        "projects": projects,
+        "totals": {
+            "projects": len(projects),
+            "failed_projects": sum(1 for p in projects if p["errors"]),
+            "fixes_applied": sum(len(p["fixes_applied"]) for p in projects),
+            "files_created": sum(len(p["files_created"]) for p in projects),
+            "errors": sum(len(p["errors"]) for p in projects)
+        },
+        "duration_s": round(time.perf_counter() - started, 4)
+    }
+
+def batch_main(argv: List[str]) -> int:
+    """Point d'entrée non interactif pour corriger plusieurs projets."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py batch",
+                                     description="Corrige plusieurs projets Godot en parallèle")
+    parser.add_argument("projects", nargs="+", help="Racines de projets ou motifs glob (ex: 'worktrees/*')")
+    parser.add_argument("--incremental", action="store_true",
+                        help="N'écrit que les fichiers modifiés (manifeste d'empreintes)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--report", help="Fichier JSON du rapport (défaut: sortie standard)")
+    args = parser.parse_args(argv)
+    
+    roots = expand_project_roots(args.projects)
+    report = run_batch(roots, incremental=args.incremental, jobs=args.jobs)
+    
+    content = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.report:
+        Path(args.report).write_text(content + "\n", encoding='utf-8')
+        totals = report["totals"]
+        print(f"📊 {totals['projects']} projet(s), {totals['files_created']} fichier(s), "
+              f"{totals['errors']} erreur(s) -> {args.report}", file=sys.stderr)
+    else:
+        print(content)
+    
+    return 1 if report["totals"]["errors"] else 0
+
+def plan_main(argv: List[str]) -> int:
+    """Calcule le plan de correction sans toucher au disque."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py plan",
+                                     description="Calcule les corrections et leurs diffs sans écrire")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--output", "-o", help="Fichier JSON où enregistrer le plan")
+    parser.add_argument("--diff", action="store_true", help="Affiche les diffs unifiés")
+    parser.add_argument("--check", action="store_true",
+                        help="Code de sortie 1 si des fichiers doivent changer (pre-commit)")
+    args = parser.parse_args(argv)
+    
+    fixer = GodotProjectFixer(args.project_root)
+    plan = fixer.build_plan()
+    fixer.print_plan_summary(plan, show_diff=args.diff)
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(plan, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+        print(f"\n💾 Plan enregistré: {args.output}")
+    
+    return 1 if args.check and plan["changes"] else 0
+
+def apply_main(argv: List[str]) -> int:
+    """Applique un plan enregistré par la commande plan."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py apply",
+                                     description="Applique un plan de correction enregistré")
+    parser.add_argument("plan", help="Fichier JSON produit par la commande plan")
+    parser.add_argument("--incremental", action="store_true",
+                        help="N'écrit que les fichiers modifiés (manifeste d'empreintes)")
+    args = parser.parse_args(argv)
+    
+    with open(args.plan, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    
+    fixer = GodotProjectFixer(plan["project_root"], incremental=args.incremental)
+    try:
+        fixer.apply_plan(plan)
+        if fixer.incremental:
+            fixer.save_manifest()
+    except Exception as e:
+        fixer.errors.append(f"Erreur critique: {str(e)}")
+    fixer.print_summary()
+    
+    return 1 if fixer.errors else 0
+
 def main():
     """Fonction principale du script."""
+    commands = {"batch": batch_main, "plan": plan_main, "apply": apply_main}
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        sys.exit(commands[sys.argv[1]](sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] in TOOL_COMMANDS:
+        tool = importlib.import_module(TOOL_COMMANDS[sys.argv[1]])
+        sys.exit(tool.main(sys.argv[2:]))
+    
+    parser = argparse.ArgumentParser(description="Correcteur de projet Godot - Sortilèges & Bestioles")
+    parser.add_argument("project_root", nargs="?", help="Chemin vers le projet Godot")
+    parser.add_argument("--incremental", action="store_true",
+                        help="N'écrit que les fichiers modifiés (manifeste d'empreintes)")
+    args = parser.parse_args()
+    
     print("Démarrage du correcteur de projet Godot...")
     
     # Détecter le dossier racine du projet
-    project_root = "."
-    if not Path("project.godot").exists():
+    project_root = args.project_root or "."
+    if args.project_root is None and not Path("project.godot").exists():
         print("⚠️ Fichier project.godot non trouvé dans le dossier actuel.")
         print("Assurez-vous d'exécuter le script depuis la racine du projet Godot.")
         project_root = input("Chemin vers le projet Godot (ou Enter pour dossier actuel): ").strip()
@@ -1262,8 +765,8 @@ def main():
             project_root = "."
     
     # Créer et exécuter le correcteur
-    fixer = GodotProjectFixer(project_root)
+    fixer = GodotProjectFixer(project_root, incremental=args.incremental)
     fixer.run_all_fixes()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
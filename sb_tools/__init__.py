@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+🧰 Outils hors-ligne - "Sortilèges & Bestioles"
+===============================================
+Sous-commandes de godot_project_fixer.py qui travaillent sur les données
+et les scripts du projet sans lancer Godot.
+
+Le fichier .gdignore empêche l'éditeur Godot d'importer ce dossier.
+"""
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+🔌 Autoload Check - Cohérence entre project.godot et les recherches /root/...
+=============================================================================
+Lit la section [autoload] de project.godot et vérifie, grâce à l'index GDScript
+(sb_tools.gd_index, mis en cache), que chaque get_node("/root/<Nom>") des
+scripts désigne un AutoLoad réellement enregistré. Une recherche qui ne
+correspond à aucun nom renvoie null à l'exécution et force les chemins de
+secours (setup_fallback_creatures...).
+
+Chaque nom recherché est rattaché à un script (nom d'AutoLoad, class_name, nom
+de fichier, puis nom de base sans Manager/System : /root/Game -> GameManager.gd).
+Corrections proposées :
+  - renommer un AutoLoad vers le nom le plus recherché pour son script, si ce
+    nom n'est ni un class_name (conflit Godot) ni un nom global déjà utilisé
+    dans les scripts (Data.get_creature...) ;
+  - enregistrer un script recherché mais absent de [autoload] ;
+  - (--fix-scripts) réécrire les recherches restantes vers le nom final.
+
+Usage: python godot_project_fixer.py autoloads [chemin_projet] [--fix] [--fix-scripts] [--json]
+"""
+
+import os
+import re
+import sys
+import json
+import tempfile
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sb_tools.gd_index import DEFAULT_CACHE_PATH, build_index, build_lookup, parse_gdscript
+
+AUTOLOAD_SECTION = "autoload"
+SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*$")
+AUTOLOAD_LINE_RE = re.compile(r'^(\w+)="(\*?)([^"]*)"\s*$')
+MANAGER_SUFFIXES = ("Manager", "System")
+RES_PREFIX = "res://"
+
+# ================================
+# PROJECT.GODOT
+# ================================
+
+def parse_autoloads(text: str) -> List[Dict]:
+    """AutoLoads déclarés, dans l'ordre : nom, chemin res://, singleton (*) et ligne."""
+    autoloads, section = [], None
+    for number, line in enumerate(text.splitlines()):
+        match = SECTION_RE.match(line)
+        if match:
+            section = match.group(1)
+            continue
+        if section != AUTOLOAD_SECTION:
+            continue
+        match = AUTOLOAD_LINE_RE.match(line.strip())
+        if match:
+            autoloads.append({"name": match.group(1), "path": match.group(3),
+                              "singleton": match.group(2) == "*", "line": number})
+    return autoloads
+
+def read_autoloads(project_root) -> List[Dict]:
+    """AutoLoads du project.godot d'un projet ([] s'il est absent)."""
+    project_file = Path(project_root) / "project.godot"
+    if not project_file.exists():
+        return []
+    return parse_autoloads(project_file.read_text(encoding="utf-8"))
+
+def apply_project_fixes(text: str, fixes: Dict) -> str:
+    """Applique renommages et enregistrements à project.godot, le reste du fichier intact."""
+    lines = text.split("\n")
+    autoloads = parse_autoloads(text)
+    for autoload in autoloads:
+        new_name = fixes["renames"].get(autoload["name"])
+        if new_name:
+            lines[autoload["line"]] = lines[autoload["line"]].replace(autoload["name"] + "=", new_name + "=", 1)
+
+    added = [f'{entry["name"]}="*{entry["path"]}"' for entry in fixes["register"]]
+    if not added:
+        return "\n".join(lines)
+
+    if autoloads:
+        insert_at = autoloads[-1]["line"] + 1
+    else:
+        # Les sections de project.godot sont triées : [autoload] avant la première section suivante
+        insert_at = len(lines)
+        for number, line in enumerate(lines):
+            match = SECTION_RE.match(line)
+            if match and match.group(1) > AUTOLOAD_SECTION:
+                insert_at = number
+                break
+        added = [f"[{AUTOLOAD_SECTION}]", ""] + added + [""]
+    lines[insert_at:insert_at] = added
+    return "\n".join(lines)
+
+# ================================
+# ANALYSE
+# ================================
+
+def base_name(name: str) -> str:
+    """Nom sans suffixe Manager/System (GameManager -> Game)."""
+    for suffix in MANAGER_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def _script_path(res: str) -> str:
+    return res[len(RES_PREFIX):] if res.startswith(RES_PREFIX) else res
+
+def _resolve_script(name: str, scripts: Dict[str, Dict], autoload_scripts: Dict[str, str]) -> Optional[str]:
+    """Script visé par /root/<name> : AutoLoad du même nom, class_name, nom de fichier, nom de base."""
+    if name in autoload_scripts:
+        return autoload_scripts[name]
+    candidates = [path for path, data in scripts.items() if data["class_name"] == name or Path(path).stem == name]
+    if not candidates:
+        candidates = [path for path in scripts if base_name(Path(path).stem) == base_name(name)]
+    registered = [path for path in candidates if path in autoload_scripts.values()]
+    picked = registered or candidates
+    return picked[0] if len(picked) == 1 else None
+
+def check_autoloads(project_root=".", project_text: str = None, overrides: Dict[str, str] = None,
+                    fix_scripts: bool = False, use_cache: bool = True) -> Dict:
+    """Rapport de cohérence AutoLoads / recherches /root/ et corrections proposées.
+
+    overrides : contenus de scripts à utiliser à la place du disque (fichiers planifiés du fixer).
+    """
+    root = Path(project_root)
+    if project_text is None:
+        project_text = (root / "project.godot").read_text(encoding="utf-8")
+    autoloads = parse_autoloads(project_text)
+
+    index = build_index(str(root), cache_path=DEFAULT_CACHE_PATH if use_cache else None)
+    for path, content in (overrides or {}).items():
+        index["scripts"][path] = parse_gdscript(content)
+    scripts = index["scripts"]
+    lookup = build_lookup(index)
+
+    class_names = set(lookup["classes"])
+    global_refs = Counter()
+    for data in scripts.values():
+        global_refs.update(data["global_refs"])
+    autoload_scripts = {autoload["name"]: _script_path(autoload["path"]) for autoload in autoloads}
+
+    # Recherches /root/<Nom>[/...] regroupées par nom ; "/root/" + variable n'est pas vérifiable
+    lookups, dynamic = {}, []
+    for path, refs in lookup["lookups"].items():
+        if not path.startswith("/root/"):
+            continue
+        name = path[len("/root/"):].split("/", 1)[0]
+        if not name:
+            dynamic.extend(refs)
+            continue
+        entry = lookups.setdefault(name, {"refs": [], "script": _resolve_script(name, scripts, autoload_scripts)})
+        entry["refs"].extend(refs)
+
+    wanted: Dict[str, Counter] = {}
+    for name, entry in lookups.items():
+        if entry["script"]:
+            wanted.setdefault(entry["script"], Counter())[name] += len(entry["refs"])
+
+    issues, renames, register = [], {}, []
+    taken = set(autoload_scripts)
+
+    def valid(name: str, current: str = None) -> bool:
+        return name not in class_names and (name == current or name not in taken)
+
+    final_names: Dict[str, str] = {}
+    for autoload in autoloads:
+        name, script = autoload["name"], autoload_scripts[autoload["name"]]
+        if not (root / script).exists() and script not in scripts:
+            issues.append(f"AutoLoad {name}: script introuvable ({autoload['path']})")
+        conflict = name in class_names
+        if conflict:
+            issues.append(f"AutoLoad {name}: même nom qu'un class_name (conflit Godot)")
+
+        counts = wanted.get(script, Counter())
+        best = name
+        if conflict or global_refs[name] == 0:
+            ranked = [candidate for candidate, _ in counts.most_common() if valid(candidate, name)]
+            if ranked and (conflict or counts[ranked[0]] > counts[name]):
+                best = ranked[0]
+            elif conflict and valid(base_name(Path(script).stem)):
+                best = base_name(Path(script).stem)
+        if best != name:
+            renames[name] = best
+            taken.discard(name)
+            taken.add(best)
+        final_names[script] = best
+
+    # Scripts recherchés mais jamais enregistrés
+    for script, counts in sorted(wanted.items()):
+        if script in final_names or not (root / script).exists():
+            continue
+        ranked = [candidate for candidate, _ in counts.most_common() if valid(candidate)]
+        if ranked:
+            name = ranked[0]
+        elif fix_scripts and valid(base_name(Path(script).stem)):
+            name = base_name(Path(script).stem)
+        else:
+            continue
+        register.append({"name": name, "path": RES_PREFIX + script})
+        taken.add(name)
+        final_names[script] = name
+
+    # Recherches encore sans AutoLoad après corrections
+    rewrites = {}
+    for name, entry in sorted(lookups.items()):
+        final = final_names.get(entry["script"])
+        entry["autoload"] = final
+        if final == name:
+            entry["status"] = "ok"
+        elif final:
+            entry["status"] = "rewrite"
+            rewrites[name] = final
+        else:
+            entry["status"] = "unregistered" if entry["script"] else "unknown"
+
+    return {
+        "autoloads": autoloads,
+        "lookups": lookups,
+        "dynamic": dynamic,
+        "issues": issues,
+        "fixes": {"renames": renames, "register": register, "rewrites": rewrites}
+    }
+
+# ================================
+# CORRECTIONS DES SCRIPTS
+# ================================
+
+def rewrite_lookups(content: str, rewrites: Dict[str, str]) -> str:
+    """Remplace les chaînes "/root/<Ancien>" par "/root/<Nouveau>" dans un script."""
+    for old, new in rewrites.items():
+        content = re.sub(r"([\"'])/root/" + re.escape(old) + r"(?=[\"'/])", r"\1/root/" + new, content)
+    return content
+
+def _atomic_write_text(path: Path, content: str):
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.chmod(temp_name, path.stat().st_mode & 0o777)
+        os.replace(temp_name, path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+def fix_script_files(project_root, report: Dict) -> List[str]:
+    """Applique les réécritures de recherches aux scripts concernés ; renvoie les fichiers modifiés."""
+    rewrites = report["fixes"]["rewrites"]
+    scripts = sorted({ref["script"] for name in rewrites for ref in report["lookups"][name]["refs"]})
+    changed = []
+    for script in scripts:
+        path = Path(project_root) / script
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            content = f.read()
+        fixed = rewrite_lookups(content, rewrites)
+        if fixed != content:
+            _atomic_write_text(path, fixed)
+            changed.append(script)
+    return changed
+
+# ================================
+# CLI
+# ================================
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande autoloads."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py autoloads",
+                                     description="Vérifie les AutoLoads de project.godot contre les recherches /root/ des scripts")
+    parser.add_argument("project", nargs="?", default=".", help="Racine du projet Godot")
+    parser.add_argument("--fix", action="store_true", help="Corrige project.godot sur place")
+    parser.add_argument("--fix-scripts", action="store_true", help="Réécrit aussi les recherches /root/ des scripts")
+    parser.add_argument("--no-cache", action="store_true", help="N'utilise pas le cache de l'index GDScript")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    project_file = Path(args.project) / "project.godot"
+    if not project_file.exists():
+        print(f"❌ project.godot introuvable dans {args.project}")
+        return 1
+
+    text = project_file.read_text(encoding="utf-8")
+    report = check_autoloads(args.project, text, fix_scripts=args.fix_scripts, use_cache=not args.no_cache)
+    fixes = report["fixes"]
+
+    written = []
+    if args.fix or args.fix_scripts:
+        fixed = apply_project_fixes(text, fixes)
+        if fixed != text:
+            _atomic_write_text(project_file, fixed)
+            written.append("project.godot")
+    if args.fix_scripts:
+        written.extend(fix_script_files(args.project, report))
+
+    unresolved = [name for name, entry in report["lookups"].items()
+                  if entry["status"] != "ok" and not (entry["status"] == "rewrite" and args.fix_scripts)]
+
+    if args.json:
+        print(json.dumps(dict(report, written=written), indent=2, ensure_ascii=False))
+        return 1 if unresolved or report["issues"] else 0
+
+    references = sum(len(entry["refs"]) for entry in report["lookups"].values())
+    print(f"🔌 {len(report['autoloads'])} AutoLoad(s), {references} recherche(s) /root/ vers {len(report['lookups'])} nom(s)")
+    for name, entry in sorted(report["lookups"].items()):
+        count = len(entry["refs"])
+        if entry["status"] == "ok":
+            print(f"  ✅ /root/{name} ({count})")
+        elif entry["status"] == "rewrite":
+            print(f"  ❌ /root/{name} ({count}) -> AutoLoad {entry['autoload']} ({entry['script']})")
+        elif entry["status"] == "unregistered":
+            print(f"  ❌ /root/{name} ({count}) : {entry['script']} n'est pas un AutoLoad "
+                  f"(nom pris par un class_name, --fix-scripts l'enregistre sous un autre nom)")
+        else:
+            print(f"  ❓ /root/{name} ({count}) : aucun script correspondant")
+        if entry["status"] != "ok":
+            for ref in entry["refs"][:3]:
+                print(f"     {ref['script']}:{ref['line']}")
+    for ref in report["dynamic"]:
+        print(f"  ⚠️ recherche dynamique non vérifiable: {ref['script']}:{ref['line']}")
+    for issue in report["issues"]:
+        print(f"  ❌ {issue}")
+
+    for old, new in fixes["renames"].items():
+        print(f"🔧 AutoLoad {old} -> {new}")
+    for entry in fixes["register"]:
+        print(f"🔧 AutoLoad ajouté: {entry['name']} = {entry['path']}")
+    if fixes["rewrites"] and not args.fix_scripts:
+        print(f"💡 {len(fixes['rewrites'])} nom(s) à corriger dans les scripts (--fix-scripts)")
+    for path in written:
+        print(f"💾 {path} mis à jour")
+    if (fixes["renames"] or fixes["register"]) and not (args.fix or args.fix_scripts):
+        print("💡 --fix pour corriger project.godot")
+    return 1 if unresolved or report["issues"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
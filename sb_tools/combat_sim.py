@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+"""
+⚔️ Combat Sim - Moteur de combat sans interface pour l'équilibrage
+==================================================================
+Réimplémente la boucle de résolution de CombatSystem.gd (initiative, tours,
+IA, attaques, sorts, chaos Octarine, négociation, fuite) à partir de
+spell_database.json et creature_database.json, puis rejoue des rencontres
+avec graine fixe sur un pool de processus.
+
+Les fonctions encore factices de CombatSystem.gd sont complétées ainsi :
+- calculate_damage lance les dés du template ("1d6 + strength_modifier")
+- get_attack_bonus et calculate_negotiation_difficulty gardent leurs valeurs
+  (5 et 15), modifiables via la configuration
+- les combattants sont tous à portée (place_combatants_initial ne place rien)
+
+Usage: python godot_project_fixer.py combat [chemin_projet] [--encounters N] [--policy mixed,attack] [--json]
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sb_tools.data_pipeline import load_corpus
+
+# Miroirs des enums de CombatSystem.gd
+RESOLUTIONS = [
+    "VICTORY_COMBAT",
+    "VICTORY_NEGOTIATION",
+    "VICTORY_CREATIVE",
+    "DEFEAT_COMBAT",
+    "DEFEAT_FLED",
+    "STALEMATE",
+    "TRANSCENDENCE"
+]
+DAMAGE_PHYSICAL, DAMAGE_MAGICAL, DAMAGE_OCTARINE, DAMAGE_PSYCHOLOGICAL, DAMAGE_NARRATIVE, DAMAGE_CHAOS = range(6)
+TYPE_PLAYER, TYPE_ALLY, TYPE_ENEMY = 0, 1, 2
+
+# Miroir de CombatSystem.combat_config (+ valeurs des fonctions factices)
+DEFAULT_COMBAT_CONFIG = {
+    "max_turns": 50,
+    "octarine_chaos_chance": 0.2,
+    "negotiation_rounds": 3,
+    "flee_difficulty": 10,
+    "attack_bonus": 5,
+    "negotiation_difficulty": 15
+}
+
+# Miroir de CombatSystem.setup_action_templates (attaques)
+ACTION_TEMPLATES = {
+    "attack_melee": {"damage_base": "1d6 + strength_modifier", "damage_type": DAMAGE_PHYSICAL},
+    "attack_ranged": {"damage_base": "1d6 + dex_modifier", "damage_type": DAMAGE_PHYSICAL}
+}
+
+# Miroir de CombatSystem.setup_combat_environment (seul escape_routes influe sur le combat)
+ENVIRONMENT_ESCAPE_ROUTES = {"urban_street": 3}
+
+# Miroir de trigger_octarine_chaos
+CHAOS_EFFECTS = [
+    "spell_reversal",
+    "target_multiplication",
+    "dimension_slip",
+    "time_hiccup",
+    "reality_glitch",
+    "magic_amplification",
+    "spell_transmutation"
+]
+
+SPELL_DAMAGE_TYPES = {
+    "physical": DAMAGE_PHYSICAL,
+    "magical": DAMAGE_MAGICAL,
+    "fire": DAMAGE_MAGICAL,
+    "octarine": DAMAGE_OCTARINE,
+    "psychological": DAMAGE_PSYCHOLOGICAL
+}
+CHAOS_SCHOOL = 4  # MagicSystem.MagicSchool.CHAOS
+
+# Joueur de start_test_combat
+DEFAULT_PLAYER = {
+    "id": "player",
+    "name": "Joueur",
+    "type": TYPE_PLAYER,
+    "max_health": 100,
+    "dexterity": 14,
+    "strength": 12,
+    "charisma": 16,
+    "spells_known": ["octarine_missile", "minor_heal"]
+}
+
+# Poids des actions du joueur par stratégie
+POLICIES = {
+    "attack": {"attack": 1.0},
+    "spell": {"spell": 1.0, "attack": 0.0},
+    "negotiate": {"negotiate": 1.0},
+    "flee": {"flee": 1.0},
+    "mixed": {"attack": 0.5, "spell": 0.3, "negotiate": 0.1, "flee": 0.1}
+}
+
+DICE_PATTERN = re.compile(r"^\s*(\d+)d(\d+)\s*(?:\+\s*(\w+))?\s*$")
+
+def _idiv(a: int, b: int) -> int:
+    """Division entière GDScript (troncature vers zéro)."""
+    return int(a / b)
+
+def _modifier(value: int) -> int:
+    return _idiv(value - 10, 2)
+
+class Combatant:
+    """Miroir de CombatSystem.Combatant."""
+    __slots__ = ("id", "name", "type", "max_health", "current_health", "max_mana", "current_mana",
+                 "initiative", "armor_class", "strength", "dexterity", "constitution", "intelligence",
+                 "wisdom", "charisma", "spells_known", "peaceful", "fled")
+
+    def __init__(self, data: Dict):
+        self.id = data.get("id", "unknown")
+        self.name = data.get("name", "Combattant")
+        self.type = data.get("type", TYPE_ENEMY)
+
+        self.max_health = data.get("max_health", 100)
+        self.current_health = self.max_health
+        self.max_mana = data.get("max_mana", 50)
+        self.current_mana = self.max_mana
+
+        self.strength = data.get("strength", 10)
+        self.dexterity = data.get("dexterity", 10)
+        self.constitution = data.get("constitution", 10)
+        self.intelligence = data.get("intelligence", 10)
+        self.wisdom = data.get("wisdom", 10)
+        self.charisma = data.get("charisma", 10)
+
+        self.initiative = self.dexterity + data.get("initiative_bonus", 0)
+        self.armor_class = 10 + _idiv(self.dexterity - 10, 2) + data.get("armor_bonus", 0)
+        self.spells_known = list(data.get("spells_known", []))
+        self.peaceful = False
+        self.fled = False
+
+    def is_alive(self) -> bool:
+        return self.current_health > 0
+
+    def is_active(self) -> bool:
+        return self.current_health > 0 and not self.fled
+
+    def apply_damage(self, damage: int, damage_type: int) -> int:
+        actual = self.calculate_damage_reduction(damage, damage_type)
+        self.current_health = max(0, self.current_health - actual)
+        return actual
+
+    def calculate_damage_reduction(self, damage: int, damage_type: int) -> int:
+        if damage_type == DAMAGE_PHYSICAL:
+            return max(1, damage - _idiv(self.armor_class, 2))
+        if damage_type == DAMAGE_MAGICAL:
+            return int(damage * (1.0 - self.wisdom * 0.02))
+        if damage_type == DAMAGE_PSYCHOLOGICAL:
+            return int(damage * (1.0 - self.charisma * 0.03))
+        return damage
+
+def combatant_from_creature(creature: Dict, index: int = 0) -> Dict:
+    """Convertit une entrée de creature_database.json en données de combattant."""
+    stats = creature.get("base_stats", {})
+    return {
+        "id": f"{creature['id']}_{index}",
+        "name": creature.get("name", creature["id"]),
+        "type": TYPE_ENEMY,
+        "max_health": stats.get("health", 100),
+        "max_mana": stats.get("magic_affinity", 5) * 10,
+        "dexterity": stats.get("agility", 10),
+        "intelligence": stats.get("intelligence", 10),
+        "charisma": stats.get("charm", 10)
+    }
+
+def compile_spells(spell_db: Dict) -> Dict[str, Dict]:
+    """Réduit spell_database.json aux champs utiles au combat."""
+    compiled = {}
+    for spell_id, spell in spell_db.get("spells", {}).items():
+        effects = spell.get("effects", {})
+        damage = effects.get("damage", 0)
+        heal = effects.get("heal", 0)
+        if not damage and not heal:
+            continue  # Sorts utilitaires sans effet sur l'issue du combat
+        compiled[spell_id] = {
+            "mana_cost": spell.get("mana_cost", 0),
+            "damage": damage,
+            "heal": heal,
+            "damage_type": SPELL_DAMAGE_TYPES.get(effects.get("damage_type", "magical"), DAMAGE_MAGICAL),
+            "octarine_magic": bool(effects.get("octarine_exposure")) or spell.get("school") == CHAOS_SCHOOL
+        }
+    return compiled
+
+class CombatSimulation:
+    """Boucle de résolution de CombatSystem.gd, sans arbre de scène ni signaux."""
+
+    def __init__(self, participants: List[Dict], spells: Dict[str, Dict], policy: Dict[str, float],
+                 config: Dict = None, environment: str = "default", rng: random.Random = None):
+        self.participants_data = participants
+        self.spells = spells
+        self.config = dict(DEFAULT_COMBAT_CONFIG, **(config or {}))
+        self.escape_routes = ENVIRONMENT_ESCAPE_ROUTES.get(environment, 0)
+        self.rng = rng or random.Random()
+        self.policy_actions = [action for action, weight in policy.items() if weight > 0]
+        self.policy_weights = [policy[action] for action in self.policy_actions]
+
+    def run(self) -> Tuple[str, int]:
+        """Joue une rencontre complète. Retourne (résolution, tours écoulés)."""
+        rng = self.rng
+        combatants = [Combatant(data) for data in self.participants_data]
+        players = [c for c in combatants if c.type == TYPE_PLAYER]
+        enemies = [c for c in combatants if c.type == TYPE_ENEMY]
+        negotiation_progress = {}
+
+        # calculate_initiative_order
+        # Jets de dés via int(random() * n) + 1 : deux fois plus rapide que randint
+        order = sorted(combatants, key=lambda c: int(rng.random() * 20) + 1 + c.initiative, reverse=True)
+        turn_number = 0
+
+        while True:
+            extra_turns = []
+            index = 0
+            while index < len(order) or extra_turns:
+                if extra_turns:
+                    actor = extra_turns.pop()
+                else:
+                    actor = order[index]
+                    index += 1
+                if not actor.is_active():
+                    continue
+
+                if actor.type == TYPE_PLAYER:
+                    extra = self.player_turn(actor, enemies, negotiation_progress)
+                else:
+                    extra = self.ai_turn(actor, players)
+                if extra:
+                    extra_turns.append(actor)
+
+                resolution = self.check_end_conditions(players, enemies)
+                if resolution:
+                    return resolution, turn_number
+
+            # Nouveau round (start_next_turn)
+            turn_number += 1
+            if turn_number >= self.config["max_turns"]:
+                return "STALEMATE", turn_number
+
+    def check_end_conditions(self, players: List[Combatant], enemies: List[Combatant]) -> str:
+        """Miroir de check_combat_end_conditions (+ fuite du joueur)."""
+        if not any(p.is_alive() for p in players):
+            return "DEFEAT_COMBAT"
+        if all(p.fled for p in players if p.is_alive()):
+            return "DEFEAT_FLED"
+        if not any(e.is_active() for e in enemies):
+            return "VICTORY_COMBAT"
+        if not any(e.is_active() and not e.peaceful for e in enemies):
+            return "VICTORY_NEGOTIATION"
+        return ""
+
+    def ai_turn(self, actor: Combatant, players: List[Combatant]) -> bool:
+        """Miroir de choose_ai_action : attaquer le joueur le plus proche."""
+        if actor.peaceful:
+            return False
+        targets = [p for p in players if p.is_active()]
+        if targets:
+            self.attack(actor, targets[0], "attack_melee")
+        return False
+
+    def player_turn(self, actor: Combatant, enemies: List[Combatant], negotiation_progress: Dict) -> bool:
+        """Choisit et exécute l'action du joueur selon la stratégie. Retourne True si tour bonus."""
+        targets = [e for e in enemies if e.is_active() and not e.peaceful]
+        if not targets:
+            return False
+        target = targets[0]
+        action = self.rng.choices(self.policy_actions, self.policy_weights)[0]
+
+        if action == "spell":
+            spell_id = self.choose_spell(actor)
+            if spell_id:
+                return self.cast_spell(actor, target, spell_id, enemies)
+            action = "attack"
+
+        if action == "attack":
+            self.attack(actor, target, "attack_melee")
+        elif action == "negotiate":
+            self.negotiate(actor, target, negotiation_progress)
+        elif action == "flee":
+            self.flee(actor)
+        return False
+
+    def choose_spell(self, actor: Combatant) -> str:
+        """Soin si blessé, sinon le sort offensif abordable le plus coûteux."""
+        affordable = [s for s in actor.spells_known
+                      if s in self.spells and self.spells[s]["mana_cost"] <= actor.current_mana]
+        if not affordable:
+            return ""
+        if actor.current_health < actor.max_health // 2:
+            heals = [s for s in affordable if self.spells[s]["heal"]]
+            if heals:
+                return heals[0]
+        damaging = [s for s in affordable if self.spells[s]["damage"]]
+        if not damaging:
+            return ""
+        return max(damaging, key=lambda s: self.spells[s]["mana_cost"])
+
+    def roll_damage(self, actor: Combatant, template: Dict) -> int:
+        """Lance les dés d'un template ("1d6 + strength_modifier")."""
+        match = DICE_PATTERN.match(template["damage_base"])
+        count, sides, modifier = int(match.group(1)), int(match.group(2)), match.group(3)
+        total = sum(int(self.rng.random() * sides) + 1 for _ in range(count))
+        if modifier == "strength_modifier":
+            total += _modifier(actor.strength)
+        elif modifier == "dex_modifier":
+            total += _modifier(actor.dexterity)
+        return max(1, total)
+
+    def attack(self, actor: Combatant, target: Combatant, template_id: str) -> bool:
+        """Miroir de process_attack_action."""
+        template = ACTION_TEMPLATES[template_id]
+        attack_roll = int(self.rng.random() * 20) + 1 + self.config["attack_bonus"]
+        if attack_roll < target.armor_class:
+            return False
+        target.apply_damage(self.roll_damage(actor, template), template["damage_type"])
+        return True
+
+    def cast_spell(self, actor: Combatant, target: Combatant, spell_id: str, enemies: List[Combatant]) -> bool:
+        """Miroir de process_spell_action / trigger_octarine_chaos. Retourne True si tour bonus."""
+        spell = self.spells[spell_id]
+        actor.current_mana -= spell["mana_cost"]
+        spell_target = actor if spell["heal"] and not spell["damage"] else target
+
+        if spell["octarine_magic"] and self.rng.random() < self.config["octarine_chaos_chance"]:
+            effect = CHAOS_EFFECTS[self.rng.randrange(len(CHAOS_EFFECTS))]
+            if effect == "spell_reversal":
+                self.apply_spell(spell, actor, 1.0)
+            elif effect == "target_multiplication":
+                for enemy in enemies:
+                    if enemy.is_active():
+                        self.apply_spell(spell, enemy, 1.0)
+            elif effect == "magic_amplification":
+                self.apply_spell(spell, spell_target, 2.0)
+            return effect == "time_hiccup"
+
+        self.apply_spell(spell, spell_target, 1.0)
+        return False
+
+    def apply_spell(self, spell: Dict, target: Combatant, multiplier: float):
+        if spell["damage"]:
+            target.apply_damage(int(spell["damage"] * multiplier), spell["damage_type"])
+        if spell["heal"]:
+            target.current_health = min(target.max_health, target.current_health + int(spell["heal"] * multiplier))
+
+    def negotiate(self, actor: Combatant, target: Combatant, negotiation_progress: Dict) -> bool:
+        """Miroir de process_negotiation_action."""
+        roll = int(self.rng.random() * 20) + 1 + actor.charisma
+        if roll < self.config["negotiation_difficulty"]:
+            return False
+        progress = negotiation_progress.get(target.id, 0) + 1
+        negotiation_progress[target.id] = progress
+        if progress >= self.config["negotiation_rounds"]:
+            target.peaceful = True
+        return True
+
+    def flee(self, actor: Combatant) -> bool:
+        """Miroir de process_flee_action."""
+        roll = int(self.rng.random() * 20) + 1 + actor.dexterity
+        if roll >= self.config["flee_difficulty"] - self.escape_routes * 2:
+            actor.fled = True
+            return True
+        return False
+
+# ============================================================================
+# BALAYAGES PARALLÈLES
+# ============================================================================
+
+CHUNK_SIZE = 10000
+
+def run_chunk(task: Dict) -> Dict:
+    """Worker : joue un bloc de rencontres avec sa propre graine."""
+    rng = random.Random(task["seed"])
+    sim = CombatSimulation(task["participants"], task["spells"], POLICIES[task["policy"]],
+                           task["config"], task["environment"], rng)
+    resolutions = {}
+    turns = {}
+    for _ in range(task["count"]):
+        resolution, turn_count = sim.run()
+        resolutions[resolution] = resolutions.get(resolution, 0) + 1
+        turns[turn_count] = turns.get(turn_count, 0) + 1
+    return {"scenario": task["scenario"], "resolutions": resolutions, "turns": turns}
+
+def build_tasks(scenarios: List[Dict], encounters: int, seed: int) -> List[Dict]:
+    """Découpe chaque scénario en blocs à graine déterministe (indépendante du nombre de processus)."""
+    tasks = []
+    for scenario_index, scenario in enumerate(scenarios):
+        for chunk_index, start in enumerate(range(0, encounters, CHUNK_SIZE)):
+            task = dict(scenario)
+            task["count"] = min(CHUNK_SIZE, encounters - start)
+            task["seed"] = seed * 1000003 + scenario_index * 7919 + chunk_index
+            tasks.append(task)
+    return tasks
+
+def summarize(resolutions: Dict[str, int], turns: Dict[int, int]) -> Dict:
+    """Taux de résolution et distribution du nombre de tours."""
+    total = sum(resolutions.values())
+    ordered = sorted(turns.items())
+    percentiles = {}
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        threshold = fraction * total
+        cumulative = 0
+        for turn_count, count in ordered:
+            cumulative += count
+            if cumulative >= threshold:
+                percentiles[name] = turn_count
+                break
+
+    victory = resolutions.get("VICTORY_COMBAT", 0) + resolutions.get("VICTORY_CREATIVE", 0)
+    return {
+        "encounters": total,
+        "win_rate": round(victory / total, 4),
+        "negotiation_rate": round(resolutions.get("VICTORY_NEGOTIATION", 0) / total, 4),
+        "flee_rate": round(resolutions.get("DEFEAT_FLED", 0) / total, 4),
+        "defeat_rate": round(resolutions.get("DEFEAT_COMBAT", 0) / total, 4),
+        "stalemate_rate": round(resolutions.get("STALEMATE", 0) / total, 4),
+        "resolutions": {r: resolutions[r] for r in RESOLUTIONS if r in resolutions},
+        "turns_mean": round(sum(t * c for t, c in ordered) / total, 3),
+        "turns_percentiles": percentiles,
+        "turns_histogram": {str(t): c for t, c in ordered}
+    }
+
+def run_sweep(scenarios: List[Dict], encounters: int, seed: int = 0, jobs: int = None) -> List[Dict]:
+    """Joue `encounters` rencontres par scénario et agrège les résultats."""
+    tasks = build_tasks(scenarios, encounters, seed)
+    if len(tasks) <= 1 or jobs == 1:
+        results = [run_chunk(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run_chunk, tasks, chunksize=4))
+
+    merged = {}
+    for result in results:
+        entry = merged.setdefault(result["scenario"], ({}, {}))
+        for key, count in result["resolutions"].items():
+            entry[0][key] = entry[0].get(key, 0) + count
+        for key, count in result["turns"].items():
+            entry[1][key] = entry[1].get(key, 0) + count
+
+    return [dict(scenario=name, **summarize(resolutions, turns)) for name, (resolutions, turns) in merged.items()]
+
+def build_scenarios(corpus: Dict, creature_ids: List[str], policies: List[str], enemy_count: int,
+                    environment: str, player_spells: List[str], config: Dict) -> List[Dict]:
+    """Un scénario par (créature, stratégie) : le joueur de test contre N créatures."""
+    creatures = {key: value for key, value in corpus.get("creatures", {}).items()
+                 if isinstance(value, dict) and "id" in value}
+    spells = compile_spells(corpus.get("spells", {}))
+    player = dict(DEFAULT_PLAYER, spells_known=player_spells or DEFAULT_PLAYER["spells_known"])
+
+    scenarios = []
+    for creature_id in creature_ids or list(creatures):
+        if creature_id not in creatures:
+            raise ValueError(f"Créature inconnue: {creature_id}")
+        enemies = [combatant_from_creature(creatures[creature_id], i) for i in range(enemy_count)]
+        for policy in policies:
+            scenarios.append({
+                "scenario": f"{creature_id}x{enemy_count}/{policy}",
+                "participants": [player] + enemies,
+                "spells": spells,
+                "policy": policy,
+                "config": config,
+                "environment": environment
+            })
+    return scenarios
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande combat."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py combat",
+                                     description="Simule des rencontres de combat pour l'équilibrage")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--encounters", "-n", type=int, default=10000, help="Rencontres par scénario")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de base")
+    parser.add_argument("--creatures", default="", help="Créatures ennemies (défaut: toutes), séparées par des virgules")
+    parser.add_argument("--enemies", type=int, default=1, help="Nombre d'ennemis par rencontre")
+    parser.add_argument("--policy", default="mixed", help=f"Stratégies du joueur: {', '.join(POLICIES)}")
+    parser.add_argument("--player-spells", default="", help="Sorts connus du joueur, séparés par des virgules")
+    parser.add_argument("--environment", default="urban_street", help="Environnement de combat")
+    parser.add_argument("--config", default="{}", help="Surcharges JSON de combat_config")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    policies = [p for p in args.policy.split(",") if p]
+    unknown = [p for p in policies if p not in POLICIES]
+    if unknown:
+        parser.error(f"Stratégie inconnue: {', '.join(unknown)}")
+
+    try:
+        corpus = load_corpus(Path(args.project_root) / "data")
+        scenarios = build_scenarios(corpus, [c for c in args.creatures.split(",") if c], policies,
+                                    args.enemies, args.environment,
+                                    [s for s in args.player_spells.split(",") if s], json.loads(args.config))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    started = time.perf_counter()
+    report = run_sweep(scenarios, args.encounters, args.seed, args.jobs)
+    duration = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({"scenarios": report, "duration_s": round(duration, 3)}, indent=2, ensure_ascii=False))
+        return 0
+
+    total = sum(entry["encounters"] for entry in report)
+    print(f"⚔️ {total} rencontres simulées en {duration:.2f} s")
+    print(f"  {'scénario':<40} {'victoire':>8} {'négo':>6} {'fuite':>6} {'défaite':>8} {'pat':>6} {'tours':>6} {'p90':>4}")
+    for entry in report:
+        print(f"  {entry['scenario']:<40} {entry['win_rate']:>8.1%} {entry['negotiation_rate']:>6.1%} "
+              f"{entry['flee_rate']:>6.1%} {entry['defeat_rate']:>8.1%} {entry['stalemate_rate']:>6.1%} "
+              f"{entry['turns_mean']:>6.2f} {entry['turns_percentiles'].get('p90', 0):>4}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
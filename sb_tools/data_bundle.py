@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+🗜️ Data Bundle - Compilation de data/*.json en un seul bundle binaire
+=====================================================================
+Produit data/data_bundle.bin, lisible par DataManager.gd avec deux
+FileAccess.get_var() : un en-tête court (version, chemins et SHA-256 des
+sources) puis les données. L'éditeur vérifie la fraîcheur sur l'en-tête seul,
+sans décoder les données. Celles-ci sont validées et les post-traitements de
+DataManager (stats dérivées, index inversés, références) sont déjà appliqués.
+
+Export : le bundle n'est pas versionné et Godot n'exporte pas les fichiers
+.bin par défaut. Avant chaque export, lancer cette commande puis ajouter
+data/data_bundle.bin au filtre « fichiers non-ressources » du preset
+(include_filter dans export_presets.cfg). Sans bundle, DataManager relit les
+JSON : le jeu exporté fonctionne, mais sans le gain de chargement.
+
+Usage: python godot_project_fixer.py bundle [chemin_projet] [--output FICHIER] [--check]
+"""
+
+import sys
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from sb_tools.data_pipeline import DATA_FILES, load_json_tolerant
+from sb_tools.data_index import build_index
+from sb_tools.godot_variant import store_var, get_var
+
+# Doit correspondre à DataManager.BUNDLE_FORMAT_VERSION
+BUNDLE_FORMAT_VERSION = 2
+DEFAULT_BUNDLE_PATH = "data/data_bundle.bin"
+HEADER_KEYS = ("format_version", "sources", "source_hashes")
+
+def is_creature_entry(value) -> bool:
+    """Les métadonnées (version, total_creatures...) côtoient les créatures."""
+    return isinstance(value, dict) and "id" in value
+
+def calculate_derived_stats(creature: Dict):
+    """Miroir de DataManager.calculate_derived_stats."""
+    base_stats = creature["base_stats"]
+
+    if "constitution" in base_stats:
+        creature["derived_hp"] = base_stats["constitution"] * 10 + 50
+
+    if "agility" in base_stats:
+        creature["movement_speed"] = base_stats["agility"] * 2 + 100
+
+def validate_evolution_chain(creature_id: str, creature: Dict) -> List[str]:
+    """Miroir de DataManager.validate_evolution_chain, erreurs retournées."""
+    errors = []
+    for stage, evolution in creature.get("evolutions", {}).items():
+        requirements = evolution.get("requirements", {}) if isinstance(evolution, dict) else {}
+        value = requirements.get("observation_count")
+        if "observation_count" in requirements and not (isinstance(value, (int, float))
+                                                        and not isinstance(value, bool)
+                                                        and value == int(value) and value > 0):
+            errors.append(f"Prérequis observation invalide pour {creature_id} ({stage})")
+    return errors
+
+def post_process_creatures(creatures_db: Dict) -> List[str]:
+    """Miroir de DataManager.post_process_creatures_data."""
+    errors = []
+    for creature_id, creature in creatures_db.items():
+        if not is_creature_entry(creature):
+            continue
+        if "base_stats" in creature:
+            calculate_derived_stats(creature)
+        if "evolutions" in creature:
+            errors.extend(validate_evolution_chain(creature_id, creature))
+    return errors
+
+def build_bundle(project_root: Path) -> Dict:
+    """Charge, valide et post-traite le corpus. Retourne le bundle et le rapport."""
+    data_dir = project_root / "data"
+    data = {}
+    sources = {}
+    source_hashes = {}
+    errors = []
+
+    for data_type, filename in DATA_FILES.items():
+        path = data_dir / filename
+        if not path.exists():
+            continue
+        report = load_json_tolerant(path)
+        if report["status"] != "ok":
+            error = report["error"]
+            errors.append(f"{path}:{error['line']}:{error['column']}: {error['message']}"
+                          + (" (réparable avec: data --fix)" if report["status"] == "repaired" else ""))
+            continue
+        data[data_type] = report["data"]
+        sources[data_type] = f"res://data/{filename}"
+        source_hashes[data_type] = hashlib.sha256(path.read_bytes()).hexdigest()
+
+    if "creatures" in data:
+        errors.extend(post_process_creatures(data["creatures"]))
+    # Index inversés des requêtes DataManager + validation des références croisées
+    index = build_index(data)
+
+    bundle = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "sources": sources,
+        "source_hashes": source_hashes,
+        "data": data,
+        "cached_lookups": index["lookups"]
+    }
+    return {"bundle": bundle, "errors": errors, "dangling_references": index["dangling_references"]}
+
+def encode_bundle(bundle: Dict) -> bytes:
+    """En-tête puis données, deux Variants consécutifs (FileAccess.store_var)."""
+    header = {key: bundle[key] for key in HEADER_KEYS}
+    payload = {key: value for key, value in bundle.items() if key not in HEADER_KEYS}
+    # Le parseur JSON de Godot 4 produit des float : on garde la même sémantique
+    return store_var(header, numbers_as_float=True) + store_var(payload, numbers_as_float=True)
+
+def read_bundle_header(path: Path) -> Dict:
+    """Relit l'en-tête seul (version et empreintes des sources)."""
+    header, _ = get_var(path.read_bytes())
+    return header
+
+def read_bundle(path: Path) -> Dict:
+    """Relit un bundle complet écrit par la commande bundle."""
+    raw = path.read_bytes()
+    header, offset = get_var(raw)
+    payload, _ = get_var(raw, offset)
+    return {**header, **payload}
+
+def is_bundle_current(project_root: Path, bundle_path: Path) -> bool:
+    """Vrai si le bundle correspond aux fichiers JSON actuels."""
+    if not bundle_path.exists():
+        return False
+    try:
+        header = read_bundle_header(bundle_path)
+    except Exception:
+        return False
+    if not isinstance(header, dict) or header.get("format_version") != BUNDLE_FORMAT_VERSION:
+        return False
+
+    current = {}
+    for data_type, filename in DATA_FILES.items():
+        path = project_root / "data" / filename
+        if path.exists():
+            current[data_type] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return header.get("source_hashes") == current
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande bundle."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py bundle",
+                                     description="Compile data/*.json en bundle binaire pour DataManager")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--output", "-o", default=DEFAULT_BUNDLE_PATH,
+                        help=f"Chemin du bundle, relatif au projet (défaut: {DEFAULT_BUNDLE_PATH})")
+    parser.add_argument("--check", action="store_true",
+                        help="Vérifie seulement que le bundle est à jour (code de sortie 1 sinon)")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    bundle_path = project_root / args.output
+
+    if args.check:
+        if is_bundle_current(project_root, bundle_path):
+            print(f"✅ Bundle à jour: {bundle_path}")
+            return 0
+        print(f"❌ Bundle absent ou obsolète: {bundle_path}")
+        return 1
+
+    started = time.perf_counter()
+    result = build_bundle(project_root)
+    if result["errors"]:
+        print(f"❌ {len(result['errors'])} erreur(s), bundle non généré:")
+        for error in result["errors"]:
+            print(f"  {error}")
+        return 1
+
+    content = encode_bundle(result["bundle"])
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    bundle_path.write_bytes(content)
+
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    data = result["bundle"]["data"]
+    print(f"🗜️ Bundle généré: {bundle_path} ({len(content) / 1024:.1f} Ko, {len(data)} types, {duration_ms} ms)")
+    # DataManager.validate_all_data refait ces contrôles au chargement
+    for reference in result["dangling_references"]:
+        print(f"  ⚠️ Référence manquante {reference['source']} ({reference['field']}): {reference['target']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
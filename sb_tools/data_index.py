@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+🗂️ Data Index - Index inversés et références croisées du corpus
+===============================================================
+Construit hors-ligne les index utilisés par les requêtes de DataManager
+(habitat, rareté, faction, localisation, références des quêtes) et signale
+les références pendantes entre créatures, personnages, quêtes et dialogues.
+
+Les index sont embarqués dans le bundle (sous-commande bundle) ; sans bundle,
+DataManager les reconstruit au post-traitement des JSON
+(post_process_quests_data, miroir de quest_references). data_index.json est
+le rapport de cette sous-commande, que le jeu ne lit pas.
+
+Usage: python godot_project_fixer.py index [chemin_projet] [--output data/data_index.json] [--strict]
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from sb_tools.data_pipeline import load_corpus
+
+INDEX_FORMAT_VERSION = 1
+DEFAULT_INDEX_PATH = "data/data_index.json"
+
+def _entries(data: Dict) -> Dict[str, Dict]:
+    """Ignore les métadonnées de fichier (version, total_...) mêlées aux entrées."""
+    return {key: value for key, value in data.items() if isinstance(value, dict) and "id" in value}
+
+def _add(index: Dict[str, List[str]], key: str, value: str):
+    ids = index.setdefault(key, [])
+    if value not in ids:
+        ids.append(value)
+
+def _collect_targets(node, field: str, found: List[str]):
+    """Collecte récursivement les valeurs d'un champ (ex: 'target' des objectifs)."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == field and isinstance(value, str):
+                found.append(value)
+            else:
+                _collect_targets(value, field, found)
+    elif isinstance(node, list):
+        for item in node:
+            _collect_targets(item, field, found)
+
+def quest_references(quest: Dict) -> Dict[str, List[str]]:
+    """Références d'une quête vers personnages, créatures et lieux (hors variables {…})."""
+    requirements = quest.get("requirements") or {}
+    params = quest.get("generation_params") or {}
+    targets = []
+    _collect_targets(quest.get("objectives", {}), "target", targets)
+
+    refs = {
+        "characters": list(requirements.get("character_met", [])) + list(params.get("npc_pool", [])),
+        "creatures": list(params.get("creature_pool", [])),
+        "locations": list(params.get("location_pool", [])),
+        "targets": targets
+    }
+    return {kind: [ref for ref in values if not ref.startswith("{")] for kind, values in refs.items()}
+
+def build_index(corpus: Dict[str, Dict]) -> Dict:
+    """Construit les index inversés et la liste des références pendantes."""
+    creatures = _entries(corpus.get("creatures", {}))
+    characters = _entries(corpus.get("characters", {}))
+    dialogues = {key: value for key, value in corpus.get("dialogues", {}).items() if isinstance(value, dict)}
+    quests = corpus.get("quests", {}).get("quest_templates", {})
+
+    lookups = {
+        "creatures_by_habitat": {},
+        "creatures_by_rarity": {},
+        "characters_by_location": {},
+        "characters_by_faction": {},
+        "quest_references": {},
+        "quests_by_reference": {}
+    }
+    dangling = []
+
+    # Mêmes valeurs par défaut que les requêtes de DataManager.gd
+    for creature_id, creature in creatures.items():
+        _add(lookups["creatures_by_habitat"], creature.get("habitat", ""), creature_id)
+        _add(lookups["creatures_by_rarity"], creature.get("rarity", "common"), creature_id)
+        for stage, evolution in creature.get("evolutions", {}).items():
+            target = evolution.get("transforms_to") if isinstance(evolution, dict) else None
+            if target and target not in creatures:
+                dangling.append({"source": f"creatures/{creature_id}/evolutions/{stage}",
+                                 "field": "transforms_to", "target": target})
+
+    for char_id, character in characters.items():
+        _add(lookups["characters_by_location"], character.get("location", "unknown"), char_id)
+        _add(lookups["characters_by_faction"], character.get("faction", "none"), char_id)
+        dialogue_id = character.get("dialogue_tree", "")
+        if dialogue_id and dialogue_id not in dialogues:
+            dangling.append({"source": f"characters/{char_id}", "field": "dialogue_tree", "target": dialogue_id})
+
+    for tree_id, tree in dialogues.items():
+        speaker = tree.get("character")
+        if speaker and speaker not in characters:
+            dangling.append({"source": f"dialogues/{tree_id}", "field": "character", "target": speaker})
+
+    for quest_key, quest in quests.items():
+        refs = quest_references(quest)
+        lookups["quest_references"][quest_key] = refs
+        for kind in ("characters", "creatures", "locations", "targets"):
+            for ref in refs[kind]:
+                _add(lookups["quests_by_reference"], ref, quest_key)
+
+        for ref in refs["characters"]:
+            if ref not in characters:
+                dangling.append({"source": f"quests/{quest_key}", "field": "characters", "target": ref})
+        for ref in refs["creatures"]:
+            if ref not in creatures:
+                dangling.append({"source": f"quests/{quest_key}", "field": "creatures", "target": ref})
+
+    return {"format_version": INDEX_FORMAT_VERSION, "lookups": lookups, "dangling_references": dangling}
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande index."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py index",
+                                     description="Construit les index inversés des données et vérifie les références")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--output", "-o", default=DEFAULT_INDEX_PATH,
+                        help=f"Fichier d'index, relatif au projet (défaut: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--strict", action="store_true", help="Code de sortie 1 si des références sont pendantes")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    try:
+        corpus = load_corpus(project_root / "data", strict=True)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    index = build_index(corpus)
+    output = project_root / args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    lookups = index["lookups"]
+    print(f"🗂️ Index écrit: {output}")
+    for name, table in lookups.items():
+        print(f"  {name}: {len(table)} clé(s)")
+
+    dangling = index["dangling_references"]
+    if dangling:
+        print(f"\n⚠️ {len(dangling)} référence(s) pendante(s):")
+        for ref in dangling:
+            print(f"  {ref['source']} -> {ref['field']}: {ref['target']}")
+
+    return 1 if args.strict and dangling else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+📦 Data Pipeline - Chargement et validation du corpus data/*.json
+=================================================================
+Charge tous les fichiers de données en parallèle, localise les erreurs de
+syntaxe (ligne/colonne) et répare les fautes courantes que le parseur JSON
+de Godot refuse : "+" devant un nombre et virgules finales.
+
+Usage: python godot_project_fixer.py data [chemin_projet] [--fix] [--canonical] [--json]
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Types de données chargés par DataManager.gd (+ données magie/sorts)
+DATA_FILES = {
+    "creatures": "creature_database.json",
+    "dialogues": "dialogue_trees.json",
+    "quests": "quest_templates.json",
+    "characters": "character_data.json",
+    "progression": "progression_tables.json",
+    "economy": "economy_data.json",
+    "factions": "faction_relationships.json",
+    "spells": "spell_database.json",
+    "magic": "magic_system.json",
+    "enchantments": "enchantments.json",
+    "config": "game_config.json"
+}
+
+def repair_json_text(text: str) -> Tuple[str, List[Dict]]:
+    """Répare les fautes courantes hors chaînes de caractères. Retourne (texte, corrections)."""
+    repaired, fixes, _ = _repair_with_origins(text)
+    return repaired, fixes
+
+def _repair_with_origins(text: str) -> Tuple[str, List[Dict], List[int]]:
+    """repair_json_text avec, pour chaque caractère réparé, sa position dans le texte d'origine."""
+    out = []
+    origins = []
+    fixes = []
+    in_string = False
+    escaped = False
+    line, col = 1, 1
+    last_significant = ""
+    length = len(text)
+    i = 0
+
+    if text.startswith("\ufeff"):
+        fixes.append({"line": 1, "column": 1, "fix": "BOM UTF-8 supprimé"})
+        i = 1
+
+    while i < length:
+        char = text[i]
+
+        if in_string:
+            out.append(char)
+            origins.append(i)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                last_significant = char
+        elif char == '"':
+            in_string = True
+            out.append(char)
+            origins.append(i)
+        elif char == "+" and last_significant in (":", ",", "[") and i + 1 < length and (text[i + 1].isdigit() or text[i + 1] == "."):
+            fixes.append({"line": line, "column": col, "fix": "signe '+' superflu supprimé"})
+        elif char == ",":
+            # Virgule finale : le prochain caractère significatif ferme l'objet/tableau
+            j = i + 1
+            while j < length and text[j] in " \t\r\n":
+                j += 1
+            if j < length and text[j] in "}]":
+                fixes.append({"line": line, "column": col, "fix": "virgule finale supprimée"})
+            else:
+                out.append(char)
+                origins.append(i)
+                last_significant = char
+        else:
+            out.append(char)
+            origins.append(i)
+            if not char.isspace():
+                last_significant = char
+
+        if char == "\n":
+            line += 1
+            col = 1
+        else:
+            col += 1
+        i += 1
+
+    return "".join(out), fixes, origins
+
+def original_position(text: str, origins: List[int], position: int) -> Tuple[int, int]:
+    """(ligne, colonne) dans le texte d'origine d'une position du texte réparé."""
+    offset = origins[position] if position < len(origins) else len(text)
+    line = text.count("\n", 0, offset) + 1
+    return line, offset - (text.rfind("\n", 0, offset) + 1) + 1
+
+def canonical_json(data) -> str:
+    """Forme canonique d'écriture des fichiers de données."""
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+def load_json_tolerant(path: str) -> Dict:
+    """Charge un fichier JSON, avec réparation en mémoire si nécessaire."""
+    started = time.perf_counter()
+    report = {
+        "path": str(path),
+        "status": "ok",
+        "error": None,
+        "fixes": [],
+        "data": None
+    }
+
+    try:
+        text = Path(path).read_bytes().decode("utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        report["status"] = "error"
+        report["error"] = {"line": 0, "column": 0, "message": str(e)}
+        return report
+
+    try:
+        report["data"] = json.loads(text)
+    except json.JSONDecodeError as e:
+        report["error"] = {"line": e.lineno, "column": e.colno, "message": e.msg}
+        repaired, fixes, origins = _repair_with_origins(text)
+        try:
+            report["data"] = json.loads(repaired)
+            report["status"] = "repaired"
+            report["fixes"] = fixes
+            report["repaired_text"] = repaired
+        except json.JSONDecodeError as e2:
+            # Position rapportée dans le fichier d'origine, pas dans le texte réparé
+            line, column = original_position(text, origins, e2.pos)
+            report["status"] = "error"
+            report["error"] = {"line": line, "column": column, "message": e2.msg}
+
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return report
+
+def list_data_files(data_dir: Path) -> List[Path]:
+    """Liste les fichiers JSON du dossier data/."""
+    return sorted(data_dir.glob("*.json"))
+
+def load_corpus_reports(data_dir: Path, jobs: int = None) -> List[Dict]:
+    """Charge tout le corpus (en parallèle si plusieurs processus)."""
+    paths = [str(p) for p in list_data_files(data_dir)]
+    if len(paths) <= 1 or jobs == 1:
+        return [load_json_tolerant(p) for p in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(load_json_tolerant, paths))
+
+def load_corpus(data_dir, strict: bool = False) -> Dict[str, Dict]:
+    """Retourne les données par type (creatures, spells...) pour les autres outils."""
+    corpus = {}
+    for data_type, filename in DATA_FILES.items():
+        path = Path(data_dir) / filename
+        if not path.exists():
+            continue
+        report = load_json_tolerant(path)
+        if report["status"] == "error" or (strict and report["status"] == "repaired"):
+            error = report["error"]
+            raise ValueError(f"{path}:{error['line']}:{error['column']}: {error['message']}")
+        corpus[data_type] = report["data"]
+    return corpus
+
+def write_fixes(report: Dict, canonical: bool) -> bool:
+    """Réécrit un fichier réparé (ou canonique). Retourne True si le fichier a changé."""
+    path = Path(report["path"])
+    if canonical:
+        content = canonical_json(report["data"])
+    elif report["status"] == "repaired":
+        content = report["repaired_text"]
+    else:
+        return False
+
+    if path.read_bytes() == content.encode("utf-8"):
+        return False
+    path.write_bytes(content.encode("utf-8"))
+    return True
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande data."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py data",
+                                     description="Valide et répare le corpus data/*.json")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--fix", action="store_true", help="Réécrit les fichiers réparés (mise en forme conservée)")
+    parser.add_argument("--canonical", action="store_true", help="Réécrit tous les fichiers valides en JSON canonique")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    args = parser.parse_args(argv)
+
+    data_dir = Path(args.project_root) / "data"
+    started = time.perf_counter()
+    reports = load_corpus_reports(data_dir, jobs=args.jobs)
+
+    rewritten = []
+    if args.fix or args.canonical:
+        for report in reports:
+            if report["status"] != "error" and write_fixes(report, args.canonical):
+                rewritten.append(report["path"])
+
+    duration_ms = round((time.perf_counter() - started) * 1000, 3)
+    errors = [r for r in reports if r["status"] == "error"]
+    repaired = [r for r in reports if r["status"] == "repaired"]
+
+    if args.json:
+        summary = [{key: value for key, value in r.items() if key not in ("data", "repaired_text")} for r in reports]
+        print(json.dumps({"files": summary, "rewritten": rewritten, "duration_ms": duration_ms},
+                         indent=2, ensure_ascii=False))
+    else:
+        print(f"📦 {len(reports)} fichier(s) de données analysé(s) en {duration_ms} ms")
+        for report in reports:
+            if report["status"] == "ok":
+                print(f"  ✅ {report['path']}")
+                continue
+            error = report["error"]
+            icon = "🔧" if report["status"] == "repaired" else "❌"
+            print(f"  {icon} {report['path']}:{error['line']}:{error['column']}: {error['message']}")
+            for fix in report["fixes"]:
+                print(f"      ligne {fix['line']}, colonne {fix['column']}: {fix['fix']}")
+        for path in rewritten:
+            print(f"  💾 Réécrit: {path}")
+        if repaired and not (args.fix or args.canonical):
+            print("  ℹ️ Relancer avec --fix pour corriger les fichiers réparables")
+
+    # Un fichier réparable mais non réécrit reste cassé pour Godot
+    unresolved = len(errors) + sum(1 for r in repaired if r["path"] not in rewritten)
+    return 1 if unresolved else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
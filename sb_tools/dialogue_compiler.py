@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+💬 Dialogue Compiler - Tables plates et analyse des arbres de dialogue
+=====================================================================
+Compile dialogue_trees.json en tables indexées par entier, lues directement
+par DialogueManager au lieu de reparcourir les dictionnaires imbriqués :
+- node_ids : identifiants internés, la racine en premier (indice 0) ;
+- choice_offsets / choice_targets : adjacence des choix au format CSR, les
+  choix du nœud i occupent [choice_offsets[i], choice_offsets[i + 1]) ;
+  cible -1 = fin de conversation, -2 = nœud inexistant ;
+- choice_indexes : position du choix dans le nœud source (-1 = next_node
+  porté par le nœud lui-même, transition automatique) ;
+- node_conditions / choice_conditions : indices dans la table conditions
+  (atomes "clé=valeur", required_relationship, required_information...).
+
+Analyse des graphes :
+- nœuds inaccessibles depuis la racine, liens vers des nœuds inexistants ;
+- cycles (composantes fortement connexes) et impasses (nœuds d'où aucune
+  fin de conversation n'est atteignable) ;
+- pour chaque jeu de conditions vraies, plus long chemin depuis la racine
+  en nombre de choix (null si un cycle est atteignable) et nœuds bloqués,
+  dont tous les choix sont verrouillés.
+
+Les conditions d'un nœud sont traitées comme conditions d'entrée.
+
+Usage: python godot_project_fixer.py dialogue [chemin_projet] [--output data/dialogue_compiled.json] [--tree ID] [--json]
+"""
+
+import sys
+import json
+import argparse
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sb_tools.data_pipeline import load_corpus
+
+# Doit correspondre à DialogueManager.DIALOGUE_TABLE_FORMAT_VERSION
+TABLE_FORMAT_VERSION = 1
+DEFAULT_TABLE_PATH = "data/dialogue_compiled.json"
+
+END_OF_DIALOGUE = -1
+MISSING_NODE = -2
+
+# Au-delà, seuls les jeux "aucune condition" et "toutes les conditions" sont analysés
+MAX_ENUMERATED_CONDITIONS = 10
+
+# Miroir de DialogueManager.ChoiceType
+CHOICE_TYPES = {1: "skill", 2: "relationship", 3: "observation", 4: "knowledge", 5: "unique"}
+
+def _atom(key: str, value) -> str:
+    if value is True:
+        return key
+    return f"{key}={json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value}"
+
+def node_condition_atoms(node: Dict) -> List[str]:
+    """Conditions d'entrée d'un nœud."""
+    return sorted(_atom(key, value) for key, value in node.get("conditions", {}).items())
+
+def choice_condition_atoms(choice: Dict) -> List[str]:
+    """Conditions d'un choix : requirements des données et types de DialogueManager."""
+    atoms = []
+    for field in ("requirements", "conditions"):
+        atoms.extend(_atom(key, value) for key, value in choice.get(field, {}).items())
+    kind = CHOICE_TYPES.get(choice.get("type", 0))
+    if kind == "skill":
+        atoms.append(f"skill:{choice.get('required_skill', '')}>={choice.get('required_level', 1)}")
+    elif kind == "relationship":
+        atoms.append(f"relationship>={choice.get('required_relationship', 0)}")
+    elif kind == "observation":
+        atoms.extend(f"observed:{creature}" for creature in choice.get("required_observations", []))
+    elif kind == "knowledge":
+        atoms.extend(f"information:{info}" for info in choice.get("required_information", []))
+    elif kind == "unique":
+        atoms.append(f"unique:{choice.get('id', '')}")
+    return sorted(set(atoms))
+
+def tree_root(tree: Dict) -> str:
+    """Racine : root_node des données, "start" pour les arbres de test du script."""
+    return tree.get("root_node") or tree.get("current_node") or "start"
+
+def compile_tree(tree: Dict) -> Dict:
+    """Interne les nœuds et aplatit les choix en tables CSR."""
+    nodes = tree.get("nodes", {})
+    root = tree_root(tree)
+    node_ids = ([root] if root in nodes else []) + [node_id for node_id in nodes if node_id != root]
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    conditions: List[str] = []
+    condition_index: Dict[str, int] = {}
+
+    def intern(atoms: List[str]) -> List[int]:
+        for atom in atoms:
+            if atom not in condition_index:
+                condition_index[atom] = len(conditions)
+                conditions.append(atom)
+        return [condition_index[atom] for atom in atoms]
+
+    node_conditions, choice_offsets, choice_targets = [], [0], []
+    choice_indexes, choice_ids, choice_conditions = [], [], []
+    missing_targets = []
+    for node_id in node_ids:
+        node = nodes[node_id]
+        node_conditions.append(intern(node_condition_atoms(node)))
+        outgoing = [(k, choice) for k, choice in enumerate(node.get("choices", []))]
+        if "next_node" in node or "next" in node:
+            outgoing.append((-1, {"next_node": node.get("next_node", node.get("next"))}))
+        for k, choice in outgoing:
+            target = choice.get("next_node", choice.get("next"))
+            if not target:
+                target_index = END_OF_DIALOGUE
+            elif target in index:
+                target_index = index[target]
+            else:
+                target_index = MISSING_NODE
+                missing_targets.append({"node": node_id, "target": target})
+            choice_targets.append(target_index)
+            choice_indexes.append(k)
+            choice_ids.append(choice.get("id") or (f"{node_id}_{k}" if k >= 0 else f"{node_id}_next"))
+            choice_conditions.append(intern(choice_condition_atoms(choice)) if k >= 0 else [])
+        choice_offsets.append(len(choice_targets))
+
+    return {
+        "root": 0 if root in nodes else MISSING_NODE,
+        "root_id": root,
+        "node_ids": node_ids,
+        "node_conditions": node_conditions,
+        "choice_offsets": choice_offsets,
+        "choice_targets": choice_targets,
+        "choice_indexes": choice_indexes,
+        "choice_ids": choice_ids,
+        "choice_conditions": choice_conditions,
+        "conditions": conditions,
+        "missing_targets": missing_targets
+    }
+
+def _edges(table: Dict, node: int) -> range:
+    return range(table["choice_offsets"][node], table["choice_offsets"][node + 1])
+
+def strongly_connected(table: Dict) -> List[List[int]]:
+    """Composantes fortement connexes (Tarjan itératif) formant des cycles."""
+    size = len(table["node_ids"])
+    order, low, on_stack, stack, cycles = {}, {}, set(), [], []
+    for start in range(size):
+        if start in order:
+            continue
+        work = [(start, iter(_edges(table, start)))]
+        order[start] = low[start] = len(order)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, edges = work[-1]
+            advanced = False
+            for edge in edges:
+                target = table["choice_targets"][edge]
+                if target < 0:
+                    continue
+                if target not in order:
+                    order[target] = low[target] = len(order)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(_edges(table, target))))
+                    advanced = True
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], order[target])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                low[work[-1][0]] = min(low[work[-1][0]], low[node])
+            if low[node] == order[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                self_loop = any(table["choice_targets"][e] == node for e in _edges(table, node))
+                if len(component) > 1 or self_loop:
+                    cycles.append(sorted(component))
+    return cycles
+
+def reachable_nodes(table: Dict, enabled=None) -> List[bool]:
+    """Nœuds atteignables depuis la racine ; enabled filtre conditions (None = tout ouvert)."""
+    seen = [False] * len(table["node_ids"])
+    if table["root"] < 0 or not _open(table["node_conditions"][table["root"]], enabled):
+        return seen
+    seen[table["root"]] = True
+    pending = [table["root"]]
+    while pending:
+        node = pending.pop()
+        for edge in _edges(table, node):
+            target = table["choice_targets"][edge]
+            if (target >= 0 and not seen[target] and _open(table["choice_conditions"][edge], enabled)
+                    and _open(table["node_conditions"][target], enabled)):
+                seen[target] = True
+                pending.append(target)
+    return seen
+
+def _open(condition_ids: List[int], enabled) -> bool:
+    return enabled is None or all(condition in enabled for condition in condition_ids)
+
+def dead_ends(table: Dict, reachable: List[bool]) -> List[int]:
+    """Nœuds atteignables d'où aucune fin de conversation n'est accessible."""
+    size = len(table["node_ids"])
+    predecessors = [[] for _ in range(size)]
+    exits = []
+    for node in range(size):
+        for edge in _edges(table, node):
+            target = table["choice_targets"][edge]
+            if target >= 0:
+                predecessors[target].append(node)
+        edges = _edges(table, node)
+        if not edges or any(table["choice_targets"][e] < 0 for e in edges):
+            exits.append(node)
+    can_exit = [False] * size
+    for node in exits:
+        can_exit[node] = True
+    while exits:
+        node = exits.pop()
+        for source in predecessors[node]:
+            if not can_exit[source]:
+                can_exit[source] = True
+                exits.append(source)
+    return [node for node in range(size) if reachable[node] and not can_exit[node]]
+
+def longest_path(table: Dict, enabled) -> Tuple[int, List[int]]:
+    """Plus long chemin (en choix) depuis la racine ; None si un cycle est atteignable.
+
+    Retourne aussi les nœuds atteints dont tous les choix sont verrouillés.
+    """
+    root = table["root"]
+    if root < 0 or not _open(table["node_conditions"][root], enabled):
+        return 0, []
+    depth: Dict[int, int] = {}
+    active = set()
+    stuck = []
+    work = [(root, False)]
+    while work:
+        node, done = work.pop()
+        if done:
+            active.discard(node)
+            best = None
+            for edge in _edges(table, node):
+                if not _open(table["choice_conditions"][edge], enabled):
+                    continue
+                target = table["choice_targets"][edge]
+                if target >= 0 and not _open(table["node_conditions"][target], enabled):
+                    continue
+                length = 1 + (depth[target] if target >= 0 else 0)
+                best = length if best is None else max(best, length)
+            if best is None and _edges(table, node):
+                stuck.append(node)
+            depth[node] = best or 0
+            continue
+        if node in depth:
+            continue
+        active.add(node)
+        work.append((node, True))
+        for edge in _edges(table, node):
+            target = table["choice_targets"][edge]
+            if (target < 0 or not _open(table["choice_conditions"][edge], enabled)
+                    or not _open(table["node_conditions"][target], enabled)):
+                continue
+            if target in active:
+                return None, sorted(stuck)
+            if target not in depth:
+                work.append((target, False))
+    return depth[root], sorted(stuck)
+
+def condition_sets(table: Dict) -> List[List[int]]:
+    """Tous les sous-ensembles de conditions vraies, ou les deux extrêmes si trop nombreux."""
+    count = len(table["conditions"])
+    if count > MAX_ENUMERATED_CONDITIONS:
+        return [[], list(range(count))]
+    return [list(subset) for size in range(count + 1) for subset in combinations(range(count), size)]
+
+def analyze_tree(table: Dict) -> Dict:
+    """Rapport d'analyse d'un arbre compilé."""
+    names = table["node_ids"]
+    reachable = reachable_nodes(table)
+    paths = []
+    for enabled in condition_sets(table):
+        length, stuck = longest_path(table, set(enabled))
+        root_open = table["root"] >= 0 and _open(table["node_conditions"][table["root"]], set(enabled))
+        paths.append({
+            "conditions": [table["conditions"][c] for c in enabled],
+            "available": root_open,
+            "longest": length,
+            "stuck": [names[node] for node in stuck]
+        })
+    return {
+        "nodes": len(names),
+        "choices": len(table["choice_targets"]),
+        "root_missing": table["root"] < 0,
+        "unreachable": [names[i] for i, seen in enumerate(reachable) if not seen],
+        "missing_targets": table["missing_targets"],
+        "cycles": [[names[node] for node in cycle] for cycle in strongly_connected(table)],
+        "dead_ends": [names[node] for node in dead_ends(table, reachable)],
+        "paths": paths,
+        "truncated": len(table["conditions"]) > MAX_ENUMERATED_CONDITIONS
+    }
+
+def compile_dialogues(dialogues: Dict) -> Dict[str, Dict]:
+    """Compile chaque arbre (entrées dict portant des nœuds) de dialogue_trees.json."""
+    return {tree_id: compile_tree(tree) for tree_id, tree in dialogues.items()
+            if isinstance(tree, dict) and isinstance(tree.get("nodes"), dict)}
+
+def table_document(tables: Dict[str, Dict]) -> Dict:
+    """Fichier lu par DialogueManager.load_dialogue_tables."""
+    runtime_keys = ("root", "node_ids", "choice_offsets", "choice_targets", "choice_indexes",
+                    "choice_ids", "choice_conditions", "node_conditions", "conditions")
+    return {
+        "format_version": TABLE_FORMAT_VERSION,
+        "trees": {tree_id: {key: table[key] for key in runtime_keys} for tree_id, table in tables.items()}
+    }
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande dialogue."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py dialogue",
+                                     description="Compile les arbres de dialogue en tables indexées")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--output", "-o", default=DEFAULT_TABLE_PATH,
+                        help=f"Fichier compilé, relatif au projet (défaut: {DEFAULT_TABLE_PATH})")
+    parser.add_argument("--tree", default="", help="N'analyser qu'un arbre")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    try:
+        corpus = load_corpus(project_root / "data", strict=True)
+        tables = compile_dialogues(corpus.get("dialogues", {}))
+        if args.tree and args.tree not in tables:
+            raise ValueError(f"Arbre de dialogue inconnu: {args.tree}")
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    output = project_root / args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(table_document(tables), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    selected = [args.tree] if args.tree else list(tables)
+    reports = {tree_id: analyze_tree(tables[tree_id]) for tree_id in selected}
+    if args.json:
+        print(json.dumps({"output": str(output), "trees": reports}, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"💬 Tables écrites: {output} ({len(tables)} arbre(s), "
+          f"{sum(len(t['node_ids']) for t in tables.values())} nœud(s))")
+    for tree_id, report in reports.items():
+        issues = len(report["unreachable"]) + len(report["missing_targets"]) + len(report["dead_ends"])
+        print(f"\n{'⚠️' if issues or report['root_missing'] else '✅'} {tree_id}: "
+              f"{report['nodes']} nœud(s), {report['choices']} choix")
+        if report["root_missing"]:
+            print(f"  ❌ Racine inexistante: {tables[tree_id]['root_id']}")
+        if report["unreachable"]:
+            print(f"  🚫 Inaccessibles: {', '.join(report['unreachable'])}")
+        for link in report["missing_targets"]:
+            print(f"  🔗 {link['node']} -> {link['target']} (nœud inexistant)")
+        for cycle in report["cycles"]:
+            print(f"  🔁 Cycle: {' -> '.join(cycle)}")
+        if report["dead_ends"]:
+            print(f"  🧱 Impasses: {', '.join(report['dead_ends'])}")
+        for path in report["paths"]:
+            label = ", ".join(path["conditions"]) or "aucune condition"
+            if not path["available"]:
+                print(f"  [{label}] racine verrouillée")
+                continue
+            longest = "illimité (cycle)" if path["longest"] is None else f"{path['longest']} choix"
+            stuck = f", bloqué sur {', '.join(path['stuck'])}" if path["stuck"] else ""
+            print(f"  [{label}] plus long chemin: {longest}{stuck}")
+        if report["truncated"]:
+            print(f"  ℹ️ Plus de {MAX_ENUMERATED_CONDITIONS} conditions : seuls les extrêmes sont analysés")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+"""
+💰 Economy Sim - Moteur de simulation économique sur economy_data.json
+=====================================================================
+Compile une seule fois les règles d'economy_data.json et de
+faction_relationships.json en tableaux numériques (prix de base et variantes,
+majorations et remises plafonnées des marchands, paliers de réputation,
+calendrier saisonnier, inflation magique), puis simule des milliers d'années
+de jeu en parallèle, jour par jour, avec NumPy.
+
+Signale :
+- les boucles d'arbitrage structurelles : racheter à un marchand plus cher
+  qu'on ne lui a acheté (prix de reprise = prix / majoration × (2 - palier),
+  comme NPC.calculate_price) ;
+- les arbitrages saisonniers : acheter pendant une promotion et revendre
+  plus tard, hors inflation ;
+- les dérives d'inflation : inflation annuelle médiane au-delà du seuil.
+
+Les sélecteurs des fichiers (food_prices, clothing...) sont résolus par
+SELECTOR_ALIASES ; ceux sans objet correspondant sont listés comme sans effet.
+
+NumPy est requis pour cette sous-commande uniquement.
+
+Usage: python godot_project_fixer.py economy [chemin_projet] [--runs N] [--years Y] [--tier neutral] [--json]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # Dépendance optionnelle, vérifiée dans main()
+    np = None
+
+from sb_tools.data_pipeline import load_corpus
+
+DAYS_PER_MONTH = 30
+DAYS_PER_YEAR = 360
+
+# Fenêtres [début, fin) des événements saisonniers dans l'année de jeu
+SEASON_CALENDAR = {
+    "summer_sales": (165, 195),
+    "harvest_season": (240, 270),
+    "soul_cake_days": (300, 307),
+    "hogswatch": (345, 360),
+    "festival_economy": (345, 360)
+}
+
+# Sélecteurs des fichiers de données -> catégories ou objets
+SELECTOR_ALIASES = {
+    "all_items": ["*"],
+    "all_prices": ["*"],
+    "food": ["bread", "cheese"],
+    "food_prices": ["bread", "cheese"],
+    "food_and_drink": ["bread", "cheese", "fine_wine"],
+    "clothing": ["simple_clothing"],
+    "gift_items": ["luxury_goods"]
+}
+
+# Volatilité textuelle -> volatility_factor de supply_demand
+VOLATILITY_FACTORS = {"low": 0.1, "medium": 0.25, "high": 0.5, "very_high": 0.75}
+
+# Tables de variantes : prix absolus si la table contient le prix de base, multiplicateurs sinon
+VARIANT_KEYS = ("quality_variants", "variants", "quality_grades", "rarity_levels", "quality_tiers")
+
+# Dynamique du marché simulé (surchargeable avec --config)
+DEFAULT_SIM_CONFIG = {
+    "magic_mean": 3.0,
+    "magic_reversion": 0.05,
+    "magic_noise": 0.5,
+    "market_reversion": 0.1,
+    "market_noise": 0.05,
+    "trade_pressure": 0.0,
+    "chunk_size": 500
+}
+
+PERCENT_PATTERN = re.compile(r"^(?:up_to_)?([+-]?\d+(?:\.\d+)?)%$")
+
+def require_numpy():
+    """Lève une erreur explicite si NumPy n'est pas installé."""
+    if np is None:
+        raise ValueError("NumPy est requis pour la sous-commande economy (pip install numpy)")
+
+def parse_percent(value) -> float:
+    """'+25%' -> 0.25, 'up_to_20%' -> 0.2, 'normal' -> 0.0. None si illisible."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    if value.strip() == "normal":
+        return 0.0
+    match = PERCENT_PATTERN.match(value.strip())
+    return float(match.group(1)) / 100.0 if match else None
+
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def compile_items(economy: Dict, warnings: List[str]) -> List[Dict]:
+    """Objets et services à prix numérique, une entrée par variante."""
+    items = []
+    for category, data in economy.get("item_categories", {}).items():
+        if not isinstance(data, dict):
+            continue
+        volatility = VOLATILITY_FACTORS.get(data.get("price_volatility"), 0.25)
+        entries = dict(data.get("items", {}))
+        entries.update(data.get("offerings", {}))
+        for item_id, item in entries.items():
+            base_price = item.get("base_price")
+            if not _number(base_price):
+                warnings.append(f"{category}/{item_id}: prix non numérique ({base_price}) ignoré")
+                continue
+            merchants = list(item.get("merchant_types", [])) + list(item.get("providers", []))
+            variants = next((item[key] for key in VARIANT_KEYS if isinstance(item.get(key), dict)), {})
+            absolute = base_price in variants.values()
+            for variant, value in (variants.items() or [("", None)]):
+                price = base_price if value is None else (value if absolute else base_price * value)
+                items.append({
+                    "id": f"{item_id}:{variant}" if variant else item_id,
+                    "item": item_id,
+                    "category": category,
+                    "base_price": float(price),
+                    "volatility": volatility,
+                    "merchants": merchants
+                })
+    return items
+
+def resolve_selector(name: str, items: List[Dict]) -> List[int]:
+    """Indices des objets visés par un sélecteur (catégorie, objet ou alias)."""
+    targets = SELECTOR_ALIASES.get(name, [name])
+    return [index for index, item in enumerate(items)
+            if "*" in targets or item["category"] in targets or item["item"] in targets]
+
+def compile_merchants(economy: Dict) -> Dict[str, Dict]:
+    """Majoration, remise maximale et catégories de stock par type de marchand."""
+    merchant_data = economy.get("merchant_data", {})
+    merchants = {}
+    for merchant_id, data in merchant_data.get("merchant_types", {}).items():
+        merchants[merchant_id] = {
+            "markup": float(data.get("price_markup", 1.0)),
+            "max_discount": parse_percent(data.get("reputation_discount", "0%")) or 0.0,
+            "stock_categories": list(data.get("stock_categories", []))
+        }
+    dibbler = merchant_data.get("dibbler_special", {})
+    if dibbler:
+        pricing = dibbler.get("unique_mechanics", {}).get("enthusiastic_pricing", {})
+        merchants[dibbler.get("merchant_id", "dibbler")] = {
+            "markup": float(pricing.get("base_markup", 1.0)),
+            "max_discount": 0.0,
+            "stock_categories": []
+        }
+    return merchants
+
+def merchant_for(name: str, merchants: Dict[str, Dict]) -> str:
+    """Type de marchand d'un vendeur cité par un objet (baker -> specialized_vendor)."""
+    if name in merchants:
+        return name
+    if "guild" in name and "guild_supplier" in merchants:
+        return "guild_supplier"
+    if "street" in name and "street_vendor" in merchants:
+        return "street_vendor"
+    return "specialized_vendor" if "specialized_vendor" in merchants else None
+
+def compile_reputation_tiers(factions: Dict, warnings: List[str]) -> Dict[str, float]:
+    """Multiplicateur de prix par palier (reputation_effects.*.prices)."""
+    tiers = {}
+    effects = factions.get("faction_system", {}).get("reputation_effects", {})
+    for tier, effect in effects.items():
+        modifier = parse_percent(effect.get("prices", "normal"))
+        if modifier is None:
+            warnings.append(f"réputation {tier}: prix illisible ({effect.get('prices')})")
+            modifier = 0.0
+        tiers[tier] = 1.0 + modifier
+    return tiers or {"neutral": 1.0}
+
+def compile_seasons(economy: Dict, items: List[Dict], warnings: List[str]):
+    """Table (jour de l'année × objet) des multiplicateurs saisonniers."""
+    seasons = dict(economy.get("economic_factors", {}).get("seasonal_fluctuations", {}))
+    for name, market in economy.get("economic_events", {}).get("seasonal_markets", {}).items():
+        seasons[name] = market.get("effects", {})
+
+    table = np.ones((DAYS_PER_YEAR, len(items)))
+    for name, effects in seasons.items():
+        window = SEASON_CALENDAR.get(name)
+        if window is None:
+            warnings.append(f"saison {name}: absente du calendrier, ignorée")
+            continue
+        for selector, value in effects.items():
+            modifier = parse_percent(value)
+            if modifier is None:
+                continue  # Effets qualitatifs ("spawn", "available")
+            targets = resolve_selector(selector, items)
+            if not targets:
+                warnings.append(f"saison {name}: {selector} ne vise aucun objet")
+                continue
+            table[window[0]:window[1], targets] *= 1.0 + modifier
+    return table
+
+def compile_economy(economy: Dict, factions: Dict) -> Dict:
+    """Compile toutes les règles en tableaux NumPy (une seule fois par simulation)."""
+    warnings = []
+    items = compile_items(economy, warnings)
+    if not items:
+        raise ValueError("Aucun objet à prix numérique dans economy_data.json")
+    merchants = compile_merchants(economy)
+    tiers = compile_reputation_tiers(factions, warnings)
+    merchant_ids = list(merchants)
+    tier_ids = list(tiers)
+
+    # Prix d'achat et de reprise relatifs au prix du marché : [marchand, palier]
+    markup = np.array([merchants[m]["markup"] for m in merchant_ids])
+    max_discount = np.array([merchants[m]["max_discount"] for m in merchant_ids])
+    tier_multiplier = np.array([tiers[t] for t in tier_ids])
+    reputation = np.maximum(tier_multiplier[None, :], 1.0 - max_discount[:, None])
+    buy_factor = markup[:, None] * reputation
+    sell_factor = (2.0 - reputation) / markup[:, None]
+
+    # Stock : marchands cités par l'objet + catégories de stock du marchand
+    stock = np.zeros((len(items), len(merchant_ids)), dtype=bool)
+    for index, item in enumerate(items):
+        for name in item["merchants"]:
+            merchant = merchant_for(name, merchants)
+            if merchant:
+                stock[index, merchant_ids.index(merchant)] = True
+        for column, merchant in enumerate(merchant_ids):
+            if item["category"] in merchants[merchant]["stock_categories"]:
+                stock[index, column] = True
+
+    factors = economy.get("economic_factors", {})
+    magic = factors.get("magic_inflation", {})
+    magic_mask = np.zeros(len(items), dtype=bool)
+    for selector in magic.get("affected_categories", []):
+        targets = resolve_selector(selector, items)
+        if not targets:
+            warnings.append(f"magic_inflation: {selector} ne vise aucun objet")
+        magic_mask[targets] = True
+
+    formulas = economy.get("pricing_formulas", {}).get("dynamic_calculation", {}).get("supply_demand", {})
+    inflation = economy.get("balancing_parameters", {}).get("inflation_control", {})
+    monthly_rate = parse_percent(str(inflation.get("base_rate", "0%")).split(" ")[0]) or 0.0
+    magic_influence = parse_percent(str(inflation.get("magic_influence", "0%")).replace("up to ", "").split(" ")[0]) or 0.0
+
+    return {
+        "items": items,
+        "merchants": merchant_ids,
+        "tiers": tier_ids,
+        "base_price": np.array([item["base_price"] for item in items]),
+        "volatility": np.array([item["volatility"] for item in items]),
+        "magic_mask": magic_mask,
+        "magic_max_modifier": float(magic.get("max_modifier", 2.5)),
+        "supply_demand_range": (float(formulas.get("min_value", 0.3)), float(formulas.get("max_value", 3.0))),
+        "monthly_inflation": monthly_rate if economy.get("metadata", {}).get("inflation_enabled", True) else 0.0,
+        "magic_monthly_inflation": magic_influence,
+        "season_table": compile_seasons(economy, items, warnings),
+        "buy_factor": buy_factor,
+        "sell_factor": sell_factor,
+        "stock": stock,
+        "warnings": warnings
+    }
+
+def find_arbitrage_loops(model: Dict) -> List[Dict]:
+    """Boucles achat -> revente au même instant, rentables quel que soit le prix du marché."""
+    loops = []
+    merchants = model["merchants"]
+    stock = model["stock"]
+    # ratio[acheteur, revendeur, palier] : le prix du marché se simplifie
+    ratio = model["sell_factor"][None, :, :] / model["buy_factor"][:, None, :]
+    for buy, sell, tier in zip(*np.nonzero(ratio > 1.0 + 1e-9)):
+        items = [item["id"] for index, item in enumerate(model["items"]) if stock[index, buy] and stock[index, sell]]
+        loops.append({
+            "buy_from": merchants[buy],
+            "sell_to": merchants[sell],
+            "tier": model["tiers"][tier],
+            "gain": round(float(ratio[buy, sell, tier]) - 1.0, 4),
+            "items": items
+        })
+    loops.sort(key=lambda loop: (not loop["items"], -loop["gain"]))
+    return loops
+
+def run_chunk(task: Dict) -> Dict:
+    """Simule un lot de parties jour par jour (exécuté dans un processus)."""
+    model = task["model"]
+    config = task["config"]
+    rng = np.random.default_rng([task["seed"], task["chunk_index"]])
+    runs = task["size"]
+    tier = model["tiers"].index(task["tier"])
+    n_items = model["base_price"].size
+
+    # Meilleur achat / meilleure reprise accessibles pour chaque objet au palier choisi
+    stocked = model["stock"]
+    buy = np.where(stocked, model["buy_factor"][None, :, tier], np.inf).min(axis=1)
+    sell = np.where(stocked, model["sell_factor"][None, :, tier], 0.0).max(axis=1)
+    tradable = np.isfinite(buy) & (sell > 0)
+    buy = np.where(tradable, buy, 1.0)
+
+    low, high = model["supply_demand_range"]
+    inflation = np.ones(runs)
+    magic = np.full(runs, config["magic_mean"])
+    log_demand = np.zeros((runs, n_items))
+    log_supply = np.zeros((runs, n_items))
+    cheapest_real = np.full((runs, n_items), np.inf)
+    # Prix nominaux moyens sur la première et la dernière fenêtre (une année si possible)
+    days = task["days"]
+    window = max(1, min(DAYS_PER_YEAR, days // 2))
+    first_window = np.zeros((runs, n_items))
+    last_window = np.zeros((runs, n_items))
+    best_gain = np.zeros((runs, n_items))
+
+    for day in range(days):
+        if day and day % DAYS_PER_MONTH == 0:
+            inflation *= 1.0 + model["monthly_inflation"] + model["magic_monthly_inflation"] * magic / 10.0
+
+        magic += config["magic_reversion"] * (config["magic_mean"] - magic) + rng.normal(0.0, config["magic_noise"], runs)
+        np.clip(magic, 0.0, 10.0, out=magic)
+
+        # Offre et demande : marches aléatoires ramenées vers l'équilibre, pression d'achat du joueur
+        log_demand += (-config["market_reversion"] * log_demand + config["trade_pressure"]
+                       + rng.normal(0.0, config["market_noise"], (runs, n_items)))
+        log_supply += -config["market_reversion"] * log_supply + rng.normal(0.0, config["market_noise"], (runs, n_items))
+        demand = np.exp(log_demand)
+        supply = np.exp(log_supply)
+        supply_demand = np.clip(1.0 + (demand - supply) / (demand + supply) * model["volatility"], low, high)
+
+        magic_factor = np.where(model["magic_mask"],
+                                np.minimum(1.0 + magic[:, None] * 0.1, model["magic_max_modifier"]), 1.0)
+        real_price = model["base_price"] * magic_factor * supply_demand * model["season_table"][day % DAYS_PER_YEAR]
+
+        # Arbitrage dans le temps, hors inflation : acheter au plus bas puis revendre
+        np.minimum(cheapest_real, real_price * buy, out=cheapest_real)
+        np.maximum(best_gain, real_price * sell / cheapest_real, out=best_gain)
+
+        if day < window:
+            first_window += inflation[:, None] * real_price
+        if day >= days - window:
+            last_window += inflation[:, None] * real_price
+
+    return {
+        "trend": last_window / first_window,
+        "trend_years": (days - window) / DAYS_PER_YEAR,
+        "final_index": inflation[:, None] * real_price / model["base_price"],
+        "best_gain": np.where(tradable, best_gain, 0.0),
+        "inflation": inflation
+    }
+
+def build_tasks(model: Dict, config: Dict, runs: int, years: float, tier: str, seed: int) -> List[Dict]:
+    """Découpe les parties en lots à graines déterministes."""
+    chunk_size = config["chunk_size"]
+    return [{"model": model, "config": config, "tier": tier, "days": int(years * DAYS_PER_YEAR),
+             "seed": seed, "chunk_index": chunk_index, "size": min(chunk_size, runs - start)}
+            for chunk_index, start in enumerate(range(0, runs, chunk_size))]
+
+def summarize(model: Dict, chunks: List[Dict], years: float, runaway_rate: float, arbitrage_margin: float) -> Dict:
+    """Inflation annualisée par objet, dérives et arbitrages saisonniers."""
+    final_index = np.concatenate([chunk["final_index"] for chunk in chunks])
+    best_gain = np.concatenate([chunk["best_gain"] for chunk in chunks])
+    inflation = np.concatenate([chunk["inflation"] for chunk in chunks])
+    trend = np.concatenate([chunk["trend"] for chunk in chunks])
+    annual = np.power(trend, 1.0 / chunks[0]["trend_years"]) - 1.0
+    general = np.power(inflation, 1.0 / years) - 1.0
+    general_p50 = float(np.median(general))
+
+    items = []
+    for index, item in enumerate(model["items"]):
+        median_rate = float(np.median(annual[:, index]))
+        gain = float(np.median(best_gain[:, index])) - 1.0
+        items.append({
+            "id": item["id"],
+            "category": item["category"],
+            "annual_inflation_p50": round(median_rate, 4),
+            "annual_inflation_p90": round(float(np.percentile(annual[:, index], 90)), 4),
+            "price_index_p50": round(float(np.median(final_index[:, index])), 3),
+            "seasonal_arbitrage_p50": round(gain, 4),
+            "runaway": median_rate - general_p50 > runaway_rate,
+            "arbitrage": gain > arbitrage_margin
+        })
+
+    return {
+        "runs": int(final_index.shape[0]),
+        "years": years,
+        "general_inflation_p50": round(general_p50, 4),
+        "general_runaway": general_p50 > runaway_rate,
+        "general_inflation_p90": round(float(np.percentile(general, 90)), 4),
+        "items": items,
+        "runaways": [item["id"] for item in items if item["runaway"]],
+        "seasonal_arbitrage": [item["id"] for item in items if item["arbitrage"]]
+    }
+
+def run_simulation(model: Dict, config: Dict, runs: int, years: float, tier: str,
+                   seed: int = 0, jobs: int = None) -> List[Dict]:
+    """Lance les lots de parties (en parallèle si plusieurs)."""
+    tasks = build_tasks(model, config, runs, years, tier, seed)
+    if len(tasks) <= 1 or jobs == 1:
+        return [run_chunk(task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(run_chunk, tasks))
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande economy."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py economy",
+                                     description="Simule l'économie et détecte inflation et arbitrages")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--runs", "-n", type=int, default=1000, help="Parties simulées")
+    parser.add_argument("--years", type=float, default=5.0, help="Années de jeu par partie")
+    parser.add_argument("--tier", default="neutral", help="Palier de réputation du joueur")
+    parser.add_argument("--runaway-rate", type=float, default=0.10, help="Inflation annuelle signalée comme dérive (générale, ou excès d'un objet sur la générale)")
+    parser.add_argument("--arbitrage-margin", type=float, default=0.05, help="Gain saisonnier signalé comme arbitrage")
+    parser.add_argument("--config", default="{}", help=f"Surcharges JSON ({', '.join(DEFAULT_SIM_CONFIG)})")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de base")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    try:
+        require_numpy()
+        corpus = load_corpus(Path(args.project_root) / "data")
+        model = compile_economy(corpus.get("economy", {}), corpus.get("factions", {}))
+        config = dict(DEFAULT_SIM_CONFIG)
+        config.update(json.loads(args.config))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.tier not in model["tiers"]:
+        parser.error(f"Palier inconnu: {args.tier} ({', '.join(model['tiers'])})")
+
+    started = time.perf_counter()
+    loops = find_arbitrage_loops(model)
+    chunks = run_simulation(model, config, args.runs, args.years, args.tier, args.seed, args.jobs)
+    report = summarize(model, chunks, args.years, args.runaway_rate, args.arbitrage_margin)
+    duration = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({"arbitrage_loops": loops, "simulation": report, "warnings": model["warnings"],
+                          "duration_s": round(duration, 3)}, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"💰 {len(model['items'])} objet(s), {len(model['merchants'])} marchand(s), {len(model['tiers'])} palier(s) "
+          f"compilés ; {report['runs'] * report['years']:g} années simulées en {duration:.2f} s (palier {args.tier})")
+    print(f"  Inflation générale: {report['general_inflation_p50']:.1%}/an (p90 {report['general_inflation_p90']:.1%})"
+          + (f" ⚠️ dérive (> {args.runaway_rate:.0%}/an)" if report["general_runaway"] else ""))
+
+    stocked_loops = [loop for loop in loops if loop["items"]]
+    if loops:
+        print(f"\n🔁 {len(loops)} boucle(s) d'arbitrage achat/reprise, dont {len(stocked_loops)} sur des objets en stock:")
+        for loop in (stocked_loops or loops)[:15]:
+            print(f"  {loop['buy_from']} -> {loop['sell_to']} ({loop['tier']}): +{loop['gain']:.1%}"
+                  f" sur {len(loop['items'])} objet(s)")
+    if report["runaways"]:
+        print(f"\n📈 {len(report['runaways'])} objet(s) en dérive (> {args.runaway_rate:.0%}/an au-delà de l'inflation générale):")
+        for item in report["items"]:
+            if item["runaway"]:
+                print(f"  {item['id']:<36} {item['annual_inflation_p50']:>7.1%}/an, indice {item['price_index_p50']}")
+    if report["seasonal_arbitrage"]:
+        print(f"\n📅 {len(report['seasonal_arbitrage'])} arbitrage(s) saisonnier(s) (> {args.arbitrage_margin:.0%} hors inflation):")
+        for item in report["items"]:
+            if item["arbitrage"]:
+                print(f"  {item['id']:<36} +{item['seasonal_arbitrage_p50']:.1%}")
+    if model["warnings"]:
+        print(f"\n⚠️ {len(model['warnings'])} règle(s) non compilée(s):")
+        for warning in model["warnings"]:
+            print(f"  {warning}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""
+✨ Enchant Resolver - Table précalculée des piles d'enchantements
+=================================================================
+Énumère hors ligne toutes les piles légales d'enchantements (jusqu'à N
+enchantements) d'enchantments.json, résout leurs interactions et écrit
+data/enchantment_table.json : une entrée par pile, clé = identifiants triés
+joints par "+". MagicSystem.apply_enchantment / remove_enchantment retrouvent
+alors les effets cumulés d'une cible par une seule recherche dans le
+dictionnaire au lieu de reparcourir les règles de combinaison.
+
+N borne la table, pas le jeu : MagicSystem cumule à la volée, avec les mêmes
+règles, les piles plus grandes. L'illégalité se décide par paire (classes de
+cible, valeurs exclusives) : "conflicts" liste ces paires, seules refusées.
+
+Règles de résolution :
+  - enchantements (enchantments, cursed_enchantments, legendary_enchantments)
+    regroupés par classe de cible : entité (personnage et équipement porté)
+    ou zone ; une pile ne mélange pas les classes ;
+  - effets de même clé : booléens (ou), listes (union), chaînes identiques ;
+    deux chaînes différentes (elemental_damage fire / ice) rendent la pile
+    illégale ;
+  - nombres : *_multiplier multipliés, *bonus* additionnés, fractions de
+    [0, 1] cumulées sans dépasser 1 (1 - Π(1 - v)), autres additionnés ;
+  - ensembles de enchantment_combinations : synergy_bonus actif si la pile
+    contient tout l'ensemble (facteurs ≥ 1 multipliés, bonus additionnés) ;
+  - malédictions : toujours légales, listées dans l'entrée (cursed) ; un
+    effet de malédiction de signe opposé à un effet béni est signalé.
+
+Rapport : piles illégales, membres redondants (n'ajoutent aucun effet) et
+piles surpuissantes, dont le score dépasse nettement la somme des scores de
+leurs membres (synergies et multiplicateurs).
+
+Usage: python godot_project_fixer.py enchantments [chemin_projet] [--max-stack N] [--output data/enchantment_table.json] [--top N] [--json]
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sb_tools.data_pipeline import load_corpus
+
+# Doit correspondre à MagicSystem.ENCHANTMENT_TABLE_FORMAT_VERSION
+TABLE_FORMAT_VERSION = 1
+DEFAULT_TABLE_PATH = "data/enchantment_table.json"
+DEFAULT_MAX_STACK = 3
+KEY_SEPARATOR = "+"
+
+# Miroir de MagicSystem.EnchantmentType
+TYPE_CONDITIONAL, TYPE_CURSED = 1, 3
+ENCHANTMENT_GROUPS = ("enchantments", "cursed_enchantments", "legendary_enchantments")
+AREA_TARGETS = {"area"}
+
+# Seuils du rapport
+SUPERADDITIVE_RATIO = 1.25
+CAPPED_FRACTION = 0.95
+
+# ================================
+# CATALOGUE
+# ================================
+
+def stack_key(ids) -> str:
+    """Clé de table : identifiants triés (même clé que MagicSystem.get_enchantment_stack_key)."""
+    return KEY_SEPARATOR.join(sorted(ids))
+
+def load_catalog(data: Dict) -> Dict:
+    """Enchantements à plat, classe de cible et ensembles de combinaison."""
+    enchantments = {}
+    for group in ENCHANTMENT_GROUPS:
+        for enchantment_id, entry in data.get(group, {}).items():
+            if not isinstance(entry, dict):
+                continue
+            target = entry.get("application_requirements", {}).get("target_type", "character")
+            enchantments[enchantment_id] = {
+                "id": enchantment_id,
+                "group": group,
+                "type": int(entry.get("type", 0)),
+                "target_class": "area" if target in AREA_TARGETS else "entity",
+                "effects": dict(entry.get("effects", {})),
+                "mana_cost": float(entry.get("application_requirements", {}).get("mana_cost", 0)),
+                "cursed": group == "cursed_enchantments" or int(entry.get("type", 0)) == TYPE_CURSED
+            }
+    combinations_data = {}
+    unknown = {}
+    for set_id, entry in data.get("enchantment_combinations", {}).items():
+        members = list(entry.get("enchantments", []))
+        missing = [member for member in members if member not in enchantments]
+        if missing:
+            unknown[set_id] = missing
+            continue
+        combinations_data[set_id] = {"members": frozenset(members), "synergy": dict(entry.get("synergy_bonus", {}))}
+    return {"enchantments": enchantments, "combinations": combinations_data, "unknown_members": unknown}
+
+# ================================
+# RÉSOLUTION
+# ================================
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def combine_value(key: str, current, value):
+    """Cumule deux valeurs d'un même effet ; lève ValueError si elles s'excluent."""
+    if _is_number(current) and _is_number(value):
+        if key.endswith("_multiplier"):
+            return round(current * value, 6)
+        if "bonus" in key or not (0 <= current <= 1 and 0 <= value <= 1):
+            return round(current + value, 6)
+        return round(1 - (1 - current) * (1 - value), 6)
+    if isinstance(current, list) or isinstance(value, list):
+        merged = list(current) if isinstance(current, list) else [current]
+        for item in (value if isinstance(value, list) else [value]):
+            if item not in merged:
+                merged.append(item)
+        return merged
+    if isinstance(current, bool) or isinstance(value, bool):
+        # Une précision textuelle ("perfect") l'emporte sur un simple true
+        if current is True:
+            return value
+        if value is True:
+            return current
+        return current or value
+    if current != value:
+        raise ValueError(f"{key}: {current} / {value}")
+    return current
+
+def combine_synergy(key: str, current, value):
+    """Cumule deux bonus de synergie : facteurs ≥ 1 multipliés, bonus additionnés."""
+    if _is_number(current) and _is_number(value):
+        if "bonus" not in key and current >= 1 and value >= 1:
+            return round(current * value, 6)
+        return round(current + value, 6)
+    return combine_value(key, current, value)
+
+def fold(resolved: Optional[Dict], enchantment: Dict) -> Dict:
+    """Ajoute un enchantement à une pile résolue (sans les synergies) ; ValueError si illégal."""
+    if resolved is None:
+        resolved = {"ids": [], "effects": {}, "cursed": [], "conditional": [], "mana_cost": 0.0,
+                    "target_class": enchantment["target_class"], "oppositions": []}
+    elif resolved["target_class"] != enchantment["target_class"]:
+        raise ValueError(f"classes de cible {resolved['target_class']} / {enchantment['target_class']}")
+    effects = dict(resolved["effects"])
+    oppositions = list(resolved["oppositions"])
+    for key, value in enchantment["effects"].items():
+        if key in effects:
+            current = effects[key]
+            if (enchantment["cursed"] != bool(resolved["cursed"]) and _is_number(current) and _is_number(value)
+                    and current * value < 0):
+                oppositions.append(key)
+            try:
+                effects[key] = combine_value(key, current, value)
+            except ValueError as e:
+                raise ValueError(f"effets exclusifs {e}")
+        else:
+            effects[key] = value
+    return {
+        "ids": resolved["ids"] + [enchantment["id"]],
+        "effects": effects,
+        "cursed": resolved["cursed"] + ([enchantment["id"]] if enchantment["cursed"] else []),
+        "conditional": resolved["conditional"] + ([enchantment["id"]] if enchantment["type"] == TYPE_CONDITIONAL else []),
+        "mana_cost": resolved["mana_cost"] + enchantment["mana_cost"],
+        "target_class": enchantment["target_class"],
+        "oppositions": oppositions
+    }
+
+def apply_synergies(resolved: Dict, catalog: Dict) -> Tuple[List[str], Dict]:
+    """Ensembles complets contenus dans la pile et leurs bonus cumulés."""
+    ids = set(resolved["ids"])
+    active, synergy = [], {}
+    for set_id, combination in sorted(catalog["combinations"].items()):
+        if combination["members"] <= ids:
+            active.append(set_id)
+            for key, value in combination["synergy"].items():
+                synergy[key] = combine_synergy(key, synergy[key], value) if key in synergy else value
+    return active, synergy
+
+def enumerate_stacks(catalog: Dict, max_stack: int) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """Toutes les piles légales (clé -> pile résolue) et les paires illégales (clé -> raison).
+
+    Une pile n'est étendue que si elle est légale : toute sur-pile d'une pile
+    illégale l'est aussi, l'énumération s'arrête donc à la première exclusion.
+    """
+    enchantments = catalog["enchantments"]
+    ordered = sorted(enchantments)
+    stacks, conflicts = {}, {}
+    frontier = []
+    for enchantment_id in ordered:
+        resolved = fold(None, enchantments[enchantment_id])
+        stacks[enchantment_id] = resolved
+        frontier.append((ordered.index(enchantment_id), resolved))
+
+    for _ in range(1, max_stack):
+        next_frontier = []
+        for last_index, resolved in frontier:
+            for index in range(last_index + 1, len(ordered)):
+                try:
+                    extended = fold(resolved, enchantments[ordered[index]])
+                except ValueError as e:
+                    if len(resolved["ids"]) == 1:
+                        conflicts[stack_key(resolved["ids"] + [ordered[index]])] = str(e)
+                    continue
+                stacks[stack_key(extended["ids"])] = extended
+                next_frontier.append((index, extended))
+        frontier = next_frontier
+    return stacks, conflicts
+
+# ================================
+# SCORE ET RAPPORT
+# ================================
+
+def effect_baselines(catalog: Dict) -> Dict[str, float]:
+    """Plus forte valeur absolue de chaque effet numérique sur un enchantement seul."""
+    baselines = {}
+    for enchantment in catalog["enchantments"].values():
+        for key, value in enchantment["effects"].items():
+            if _is_number(value) and value:
+                baselines[key] = max(baselines.get(key, 0.0), abs(_magnitude(key, value)))
+    return baselines
+
+def _magnitude(key: str, value: float) -> float:
+    """Force d'un effet : écart à 1 pour les multiplicateurs, valeur sinon."""
+    return value - 1.0 if key.endswith("_multiplier") else value
+
+def stack_score(effects: Dict, synergy: Dict, baselines: Dict[str, float]) -> float:
+    """Somme des effets normalisés par leur meilleure valeur isolée, multipliée par les synergies."""
+    score = 0.0
+    for key, value in effects.items():
+        if _is_number(value) and baselines.get(key):
+            score += abs(_magnitude(key, value)) / baselines[key]
+        elif value is True or isinstance(value, (str, list)):
+            score += 0.25
+    factor = 1.0
+    for key, value in synergy.items():
+        if _is_number(value):
+            factor *= value if value >= 1 and "bonus" not in key else 1.0 + value
+    return round(score * factor, 4)
+
+def build_table(catalog: Dict, max_stack: int) -> Dict:
+    """Table complète : entrées par clé, conflits, et rapport de conception."""
+    stacks, conflicts = enumerate_stacks(catalog, max_stack)
+    baselines = effect_baselines(catalog)
+    entries, singles = {}, {}
+    for key, resolved in stacks.items():
+        sets, synergy = apply_synergies(resolved, catalog)
+        entries[key] = {
+            "ids": sorted(resolved["ids"]),
+            "effects": resolved["effects"],
+            "synergy": synergy,
+            "sets": sets,
+            "cursed": sorted(resolved["cursed"]),
+            "conditional": sorted(resolved["conditional"]),
+            "mana_cost": resolved["mana_cost"],
+            "score": stack_score(resolved["effects"], synergy, baselines),
+            "oppositions": sorted(set(resolved["oppositions"]))
+        }
+        if len(resolved["ids"]) == 1:
+            singles[key] = entries[key]["score"]
+
+    redundant, overpowered, capped = [], [], []
+    for key, entry in entries.items():
+        ids = entry["ids"]
+        if len(ids) > 1:
+            members_score = sum(singles[member] for member in ids)
+            ratio = entry["score"] / members_score if members_score else 0.0
+            if ratio >= SUPERADDITIVE_RATIO:
+                overpowered.append({"key": key, "score": entry["score"], "members_score": round(members_score, 4),
+                                    "ratio": round(ratio, 3), "sets": entry["sets"]})
+            for member in ids:
+                rest = stack_key(other for other in ids if other != member)
+                if rest in entries and entries[rest]["effects"] == entry["effects"] and not entry["sets"]:
+                    redundant.append({"key": key, "member": member})
+        maxed = sorted(k for k, v in entry["effects"].items()
+                       if _is_number(v) and 0 < v <= 1 and v >= CAPPED_FRACTION
+                       and all(catalog["enchantments"][i]["effects"].get(k, 0) < CAPPED_FRACTION
+                               for i in ids if _is_number(catalog["enchantments"][i]["effects"].get(k, 0))))
+        if maxed:
+            capped.append({"key": key, "effects": {k: entry["effects"][k] for k in maxed}})
+    overpowered.sort(key=lambda item: (-item["ratio"], item["key"]))
+
+    return {
+        "entries": entries,
+        "conflicts": conflicts,
+        "report": {
+            "stacks": len(entries),
+            "by_size": {size: sum(1 for entry in entries.values() if len(entry["ids"]) == size)
+                        for size in range(1, max_stack + 1)},
+            "conflicts": conflicts,
+            "unknown_set_members": catalog["unknown_members"],
+            "redundant": redundant,
+            "overpowered": overpowered,
+            "capped": capped,
+            "oppositions": {key: entry["oppositions"] for key, entry in entries.items() if entry["oppositions"]},
+            "top": sorted(({"key": key, "score": entry["score"], "sets": entry["sets"]}
+                           for key, entry in entries.items()), key=lambda item: (-item["score"], item["key"]))
+        }
+    }
+
+def table_document(table: Dict, max_stack: int) -> Dict:
+    """Contenu de data/enchantment_table.json (sans les identifiants, déjà dans la clé)."""
+    stacks = {key: {field: value for field, value in entry.items() if field not in ("ids", "oppositions")}
+              for key, entry in sorted(table["entries"].items())}
+    return {"format_version": TABLE_FORMAT_VERSION, "max_stack": max_stack, "separator": KEY_SEPARATOR,
+            "stacks": stacks, "conflicts": table["conflicts"]}
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande enchantments."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py enchantments",
+                                     description="Précalcule les piles d'enchantements et leurs interactions")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--max-stack", "-n", type=int, default=DEFAULT_MAX_STACK,
+                        help=f"Taille maximale des piles précalculées (défaut: {DEFAULT_MAX_STACK})")
+    parser.add_argument("--output", "-o", default=DEFAULT_TABLE_PATH,
+                        help=f"Table compilée, relative au projet (défaut: {DEFAULT_TABLE_PATH})")
+    parser.add_argument("--top", type=int, default=10, help="Piles affichées par rubrique du rapport")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+    if args.max_stack < 1:
+        parser.error("--max-stack doit être au moins 1")
+
+    project_root = Path(args.project_root)
+    try:
+        corpus = load_corpus(project_root / "data", strict=True)
+        catalog = load_catalog(corpus.get("enchantments", {}))
+        if not catalog["enchantments"]:
+            raise ValueError("enchantments.json ne contient aucun enchantement")
+        table = build_table(catalog, args.max_stack)
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    output = project_root / args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(table_document(table, args.max_stack), ensure_ascii=False, separators=(",", ":")) + "\n",
+                      encoding="utf-8")
+    report = table["report"]
+
+    if args.json:
+        print(json.dumps({"output": str(output), **{k: (v[:args.top] if isinstance(v, list) else v)
+                                                  for k, v in report.items()}}, indent=2, ensure_ascii=False))
+        return 0
+
+    sizes = ", ".join(f"{count} × {size}" for size, count in report["by_size"].items())
+    print(f"✨ {report['stacks']} piles légales ({sizes}) -> {output} ({output.stat().st_size / 1024:.0f} Ko)")
+    for set_id, missing in report["unknown_set_members"].items():
+        print(f"  ⚠️ Ensemble {set_id}: enchantement(s) inconnu(s) {', '.join(missing)}")
+    if report["conflicts"]:
+        print(f"\n⛔ {len(report['conflicts'])} paire(s) illégale(s):")
+        for key, reason in sorted(report["conflicts"].items())[:args.top]:
+            print(f"  {key}: {reason}")
+    if report["overpowered"]:
+        print(f"\n💥 {len(report['overpowered'])} pile(s) surpuissante(s) (score ≥ {SUPERADDITIVE_RATIO} × somme des membres):")
+        for item in report["overpowered"][:args.top]:
+            sets = f" [{', '.join(item['sets'])}]" if item["sets"] else ""
+            print(f"  {item['key']}: {item['score']} contre {item['members_score']} (×{item['ratio']}){sets}")
+    if report["capped"]:
+        print(f"\n🧱 {len(report['capped'])} pile(s) atteignant le plafond ({CAPPED_FRACTION:.0%}) par cumul:")
+        for item in report["capped"][:args.top]:
+            print(f"  {item['key']}: {', '.join(f'{k}={v}' for k, v in item['effects'].items())}")
+    if report["redundant"]:
+        print(f"\n🪞 {len(report['redundant'])} membre(s) redondant(s) (aucun effet ajouté):")
+        for item in report["redundant"][:args.top]:
+            print(f"  {item['member']} dans {item['key']}")
+    if report["oppositions"]:
+        print(f"\n☠️ {len(report['oppositions'])} pile(s) où une malédiction contrarie un effet béni")
+    print(f"\n🏆 Meilleurs scores:")
+    for item in report["top"][:args.top]:
+        print(f"  {item['score']:>8} {item['key']}" + (f" [{', '.join(item['sets'])}]" if item["sets"] else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
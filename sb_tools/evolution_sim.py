@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+🦋 Evolution Sim - Simulateur de progression évolutive des créatures
+===================================================================
+Rejoue des calendriers d'observation synthétiques (un par style de joueur)
+sur chaque créature de creature_database.json, selon la chaîne
+observe_creature → update_observation_data → check_evolution_threshold →
+trigger_evolution d'ObservationManager.gd (une évolution au plus par
+observation).
+
+Deux jeux de règles :
+- data (défaut) : evolutions.stage_N.requirements de la base créatures.
+  observation_count, time_observed (secondes cumulées) et environment sont
+  simulés ; les autres prérequis (player_interaction, story_trigger...) sont
+  supposés remplis, ou bloquants avec --external block.
+- script : seuils globaux evolution_thresholds, seule règle appliquée
+  aujourd'hui par check_evolution_threshold.
+
+L'intensité d'observation n'intervient pas dans les seuils (elle ne nourrit
+que l'amplification magique), le type d'observation n'est donc pas simulé.
+
+Les calendriers sont rangés dans un arbre de préfixes : un préfixe commun à
+plusieurs calendriers n'est rejoué qu'une fois, et les transitions d'état
+(stade, compteurs plafonnés) sont mémoïsées par créature.
+
+Usage: python godot_project_fixer.py evolution [chemin_projet] [--schedules N] [--hours H] [--styles casual,scientist] [--json]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sb_tools.data_pipeline import load_corpus
+
+# Miroir de ObservationManager.default_config et de l'enum EvolutionStage
+DEFAULT_EVOLUTION_THRESHOLDS = [0, 3, 7, 12, 20]
+MAX_STAGE = 4  # EvolutionStage.STAGE_4_LEGENDARY
+
+SIMULATED_REQUIREMENTS = ("observation_count", "time_observed", "environment")
+OTHER_ENVIRONMENT = "other"
+
+# Styles de joueur : écart entre observations, durée d'observation (secondes)
+# et probabilité d'observer dans un environnement requis par une évolution
+PLAYER_STYLES = {
+    "casual": {"gap_s": [120, 300, 600], "duration_s": [5, 10, 20], "environment_focus": 0.2},
+    "explorer": {"gap_s": [60, 120, 300], "duration_s": [10, 20, 30], "environment_focus": 0.6},
+    "naturalist": {"gap_s": [30, 60, 120], "duration_s": [20, 30, 60], "environment_focus": 0.4},
+    "scientist": {"gap_s": [30, 60], "duration_s": [30, 60, 120], "environment_focus": 0.8}
+}
+
+def _entries(creatures_db: Dict) -> Dict[str, Dict]:
+    """Ignore les métadonnées (version, total_creatures...) de la base créatures."""
+    return {key: value for key, value in creatures_db.items() if isinstance(value, dict) and "id" in value}
+
+def compile_stages(creature: Dict, rules: str, thresholds: List[int], external: str) -> Tuple[List[Dict], List[str]]:
+    """Prérequis successifs d'une créature. Retourne (stades, raisons de blocage)."""
+    if rules == "script":
+        return [{"observation_count": int(count), "time_observed": 0, "environment": None, "blocked": False}
+                for count in thresholds[1:MAX_STAGE + 1]], []
+
+    stages = []
+    reasons = []
+    evolutions = creature.get("evolutions", {})
+    for stage in range(1, MAX_STAGE + 1):
+        evolution = evolutions.get(f"stage_{stage}")
+        if not isinstance(evolution, dict):
+            later = [key for key in evolutions if key.startswith("stage_") and key > f"stage_{stage}"]
+            if later:
+                reasons.append(f"stage_{stage} manquant alors que {', '.join(sorted(later))} existe")
+            break
+
+        requirements = evolution.get("requirements") or {}
+        others = sorted(key for key in requirements if key not in SIMULATED_REQUIREMENTS)
+        blocked = external == "block" and bool(others)
+        if blocked:
+            reasons.append(f"stage_{stage} exige {', '.join(others)} (hors observation)")
+        stages.append({
+            "observation_count": int(requirements.get("observation_count", 0)),
+            "time_observed": float(requirements.get("time_observed", 0)),
+            "environment": requirements.get("environment"),
+            "external": others,
+            "blocked": blocked
+        })
+    return stages, reasons
+
+class EvolutionModel:
+    """Transitions d'état mémoïsées d'une créature : (stade, observations, secondes observées)."""
+
+    def __init__(self, stages: List[Dict]):
+        self.stages = stages
+        # Compteurs plafonnés au dernier seuil utile : l'espace d'état reste petit
+        self.count_cap = max([s["observation_count"] for s in stages] + [0])
+        self.time_cap = max([s["time_observed"] for s in stages] + [0])
+        self.cache = {}
+        self.hits = 0
+
+    def step(self, state: Tuple, event: Tuple) -> Tuple:
+        """Applique une observation (écart, durée, environnement) à l'état."""
+        key = (state, event)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        stage, count, observed = state
+        _, duration, environment = event
+        count = min(count + 1, self.count_cap)
+        observed = min(observed + duration, self.time_cap)
+        if stage < len(self.stages):
+            requirements = self.stages[stage]
+            if (not requirements["blocked"]
+                    and count >= requirements["observation_count"]
+                    and observed >= requirements["time_observed"]
+                    and requirements["environment"] in (None, environment)):
+                stage += 1
+
+        result = (stage, count, observed)
+        self.cache[key] = result
+        return result
+
+def generate_schedules(style: Dict, environments: List[str], count: int, horizon_s: int, seed: int) -> List[List[Tuple]]:
+    """Calendriers d'observation d'un style : listes d'événements (écart, durée, environnement)."""
+    rng = random.Random(seed)
+    schedules = []
+    for _ in range(count):
+        schedule = []
+        elapsed = 0
+        while True:
+            gap = rng.choice(style["gap_s"])
+            duration = rng.choice(style["duration_s"])
+            elapsed += gap + duration
+            if elapsed > horizon_s:
+                break
+            if environments and rng.random() < style["environment_focus"]:
+                environment = rng.choice(environments)
+            else:
+                environment = OTHER_ENVIRONMENT
+            schedule.append((gap, duration, environment))
+        schedules.append(schedule)
+    return schedules
+
+def build_schedule_trie(schedules: List[List[Tuple]]) -> Tuple[List, int]:
+    """Arbre de préfixes des calendriers. Nœud = [enfants, fins, poids]. Retourne (racine, nœuds)."""
+    root = [{}, 0, 0]
+    nodes = 1
+    for schedule in schedules:
+        node = root
+        node[2] += 1
+        for event in schedule:
+            child = node[0].get(event)
+            if child is None:
+                child = node[0][event] = [{}, 0, 0]
+                nodes += 1
+            child[2] += 1
+            node = child
+        node[1] += 1
+    return root, nodes
+
+def replay_trie(root: List, model: EvolutionModel) -> List[Tuple[int, Tuple]]:
+    """Parcourt l'arbre une fois. Retourne (poids, ((secondes, observations) par stade atteint))."""
+    final_stage = len(model.stages)
+    results = []
+    stack = [(root, (0, 0, 0), 0, 0, ())]
+    while stack:
+        node, state, elapsed, count, reached = stack.pop()
+        if state[0] >= final_stage:
+            # Stade final atteint : la suite des calendriers ne change plus rien
+            results.append((node[2], reached))
+            continue
+        if node[1]:
+            results.append((node[1], reached))
+        for event, child in node[0].items():
+            new_state = model.step(state, event)
+            moment = elapsed + event[0] + event[1]
+            new_reached = reached + ((moment, count + 1),) if new_state[0] > state[0] else reached
+            stack.append((child, new_state, moment, count + 1, new_reached))
+    return results
+
+def _weighted_percentiles(samples: List[Tuple[float, int]], points=(10, 50, 90)) -> Dict[str, float]:
+    if not samples:
+        return {}
+    samples = sorted(samples)
+    total = sum(weight for _, weight in samples)
+    result = {}
+    for point in points:
+        target = total * point / 100.0
+        running = 0
+        for value, weight in samples:
+            running += weight
+            if running >= target:
+                result[f"p{point}"] = round(value, 2)
+                break
+    return result
+
+def summarize_creature(results: List[Tuple[int, Tuple]], stages: List[Dict]) -> Dict:
+    """Taux d'atteinte et distributions de temps (minutes) et d'observations par stade."""
+    total = sum(weight for weight, _ in results)
+    summary = []
+    for index in range(len(stages)):
+        times = [(reached[index][0] / 60.0, weight) for weight, reached in results if len(reached) > index]
+        counts = [(reached[index][1], weight) for weight, reached in results if len(reached) > index]
+        summary.append({
+            "stage": index + 1,
+            "reach_rate": round(sum(weight for _, weight in times) / total, 4) if total else 0.0,
+            "minutes": _weighted_percentiles(times),
+            "observations": _weighted_percentiles(counts)
+        })
+    return {"stages": summary, "schedules": total}
+
+def run_style(task: Dict) -> Dict:
+    """Simule un style de joueur sur toutes les créatures (exécuté dans un processus)."""
+    started = time.perf_counter()
+    schedules = generate_schedules(task["style"], task["environments"], task["schedules"],
+                                   task["horizon_s"], task["seed"])
+    root, nodes = build_schedule_trie(schedules)
+    events = sum(len(schedule) for schedule in schedules)
+
+    creatures = {}
+    transitions = 0
+    cache_hits = 0
+    for creature_id, stages in task["stages"].items():
+        model = EvolutionModel(stages)
+        creatures[creature_id] = summarize_creature(replay_trie(root, model), stages)
+        transitions += len(model.cache)
+        cache_hits += model.hits
+
+    return {
+        "style": task["name"],
+        "creatures": creatures,
+        "events": events,
+        "trie_nodes": nodes,
+        "computed_transitions": transitions,
+        "cache_hits": cache_hits,
+        "duration_s": round(time.perf_counter() - started, 3)
+    }
+
+def build_creature_stages(creatures: Dict[str, Dict], rules: str, thresholds: List[int], external: str) -> Tuple[Dict, Dict]:
+    """Prérequis compilés de chaque créature et raisons de blocage statiques."""
+    stages = {}
+    blocked = {}
+    for creature_id, creature in creatures.items():
+        stages[creature_id], reasons = compile_stages(creature, rules, thresholds, external)
+        if reasons:
+            blocked[creature_id] = reasons
+    return stages, blocked
+
+def script_mismatches(creatures: Dict[str, Dict], thresholds: List[int]) -> List[Dict]:
+    """Stades dont observation_count diffère des seuils réellement appliqués par le script."""
+    mismatches = []
+    for creature_id, creature in creatures.items():
+        for stage, evolution in sorted(creature.get("evolutions", {}).items()):
+            if not isinstance(evolution, dict) or not stage.startswith("stage_"):
+                continue
+            index = int(stage.split("_")[1])
+            expected = (evolution.get("requirements") or {}).get("observation_count")
+            actual = thresholds[index] if index < len(thresholds) else None
+            if expected is not None and expected != actual:
+                mismatches.append({"creature": creature_id, "stage": stage, "data": expected, "script": actual})
+    return mismatches
+
+def run_simulation(tasks: List[Dict], jobs: int = None) -> List[Dict]:
+    """Lance les styles (en parallèle si plusieurs)."""
+    if len(tasks) <= 1 or jobs == 1:
+        return [run_style(task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(run_style, tasks))
+
+def never_evolving(results: List[Dict], stages: Dict[str, List[Dict]], blocked: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Créatures sans évolution possible : blocage statique ou aucun calendrier n'atteint stage_1."""
+    never = {}
+    for creature_id, creature_stages in stages.items():
+        reasons = list(blocked.get(creature_id, []))
+        if not creature_stages:
+            never[creature_id] = reasons + ["aucune évolution définie"]
+            continue
+        if any(result["creatures"][creature_id]["stages"][0]["reach_rate"] > 0 for result in results):
+            continue
+        requirements = creature_stages[0]
+        if not requirements["blocked"]:
+            reasons.append(f"stage_1 jamais atteint (observation_count {requirements['observation_count']}, "
+                           f"time_observed {requirements['time_observed']:g}, "
+                           f"environment {requirements['environment'] or '-'})")
+        never[creature_id] = reasons
+    return never
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande evolution."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py evolution",
+                                     description="Simule la progression évolutive des créatures")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--schedules", "-n", type=int, default=1000, help="Calendriers par style de joueur")
+    parser.add_argument("--hours", type=float, default=3.0, help="Durée de jeu simulée (heures)")
+    parser.add_argument("--styles", default=",".join(PLAYER_STYLES), help=f"Styles: {', '.join(PLAYER_STYLES)}")
+    parser.add_argument("--creatures", default="", help="Créatures (défaut: toutes), séparées par des virgules")
+    parser.add_argument("--rules", choices=["data", "script"], default="data",
+                        help="Prérequis de creature_database.json ou seuils globaux du script")
+    parser.add_argument("--external", choices=["assume", "block"], default="assume",
+                        help="Prérequis hors observation supposés remplis ou bloquants")
+    parser.add_argument("--thresholds", default="", help="evolution_thresholds (défaut: 0,3,7,12,20)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de base")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    styles = [s for s in args.styles.split(",") if s]
+    unknown = [s for s in styles if s not in PLAYER_STYLES]
+    if unknown or not styles:
+        parser.error(f"Style inconnu: {', '.join(unknown)}")
+    thresholds = [int(v) for v in args.thresholds.split(",") if v] or DEFAULT_EVOLUTION_THRESHOLDS
+
+    try:
+        corpus = load_corpus(Path(args.project_root) / "data")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    creatures = _entries(corpus.get("creatures", {}))
+    wanted = [c for c in args.creatures.split(",") if c]
+    missing = [c for c in wanted if c not in creatures]
+    if missing:
+        print(f"❌ Créature(s) inconnue(s): {', '.join(missing)}")
+        return 1
+    if wanted:
+        creatures = {creature_id: creatures[creature_id] for creature_id in wanted}
+
+    stages, blocked = build_creature_stages(creatures, args.rules, thresholds, args.external)
+    environments = sorted({stage["environment"] for creature_stages in stages.values()
+                           for stage in creature_stages if stage["environment"]})
+    tasks = [{
+        "name": name,
+        "style": PLAYER_STYLES[name],
+        "environments": environments,
+        "schedules": args.schedules,
+        "horizon_s": int(args.hours * 3600),
+        "seed": args.seed * 1000003 + index,
+        "stages": stages
+    } for index, name in enumerate(styles)]
+
+    started = time.perf_counter()
+    results = run_simulation(tasks, args.jobs)
+    duration = time.perf_counter() - started
+    never = never_evolving(results, stages, blocked)
+    mismatches = script_mismatches(creatures, thresholds) if args.rules == "data" else []
+
+    if args.json:
+        print(json.dumps({"rules": args.rules, "external": args.external, "styles": results,
+                          "never_evolving": never, "script_threshold_mismatches": mismatches,
+                          "duration_s": round(duration, 3)}, indent=2, ensure_ascii=False))
+        return 0
+
+    events = sum(result["events"] for result in results)
+    nodes = sum(result["trie_nodes"] for result in results)
+    print(f"🦋 {len(creatures)} créature(s) × {len(styles)} style(s), {args.schedules} calendrier(s) "
+          f"de {args.hours:g} h en {duration:.2f} s (règles: {args.rules})")
+    print(f"  {events} observations, {nodes} nœuds de préfixes rejoués "
+          f"({sum(r['cache_hits'] for r in results)} transitions en cache)")
+
+    print(f"\n  {'créature':<24} {'style':<11} {'stade final':>11} {'min→1 p50':>10} {'min→final p50':>14}")
+    for creature_id in creatures:
+        for result in results:
+            summary = result["creatures"][creature_id]["stages"]
+            if not summary:
+                continue
+            first, last = summary[0], summary[-1]
+            print(f"  {creature_id:<24} {result['style']:<11} {last['reach_rate']:>11.1%} "
+                  f"{first['minutes'].get('p50', '-'):>10} {last['minutes'].get('p50', '-'):>14}")
+
+    if never:
+        print(f"\n🚫 {len(never)} créature(s) qui n'évolueront jamais:")
+        for creature_id, reasons in never.items():
+            print(f"  {creature_id}: {'; '.join(reasons)}")
+    if mismatches:
+        print(f"\n⚠️ {len(mismatches)} seuil(s) de la base différents de evolution_thresholds "
+              f"(seuls appliqués par check_evolution_threshold):")
+        for entry in mismatches:
+            print(f"  {entry['creature']} {entry['stage']}: données {entry['data']}, script {entry['script']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
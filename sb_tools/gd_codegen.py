@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+🏭 GD Codegen - Génération de scripts GDScript à partir de templates
+=====================================================================
+Les scripts produits par le fixer (Player, Creature, NPC, stubs UIManager et
+AudioManager) sont des templates sur disque (sb_tools/templates/gdscript/*.gd.tmpl)
+rendus depuis une spec déclarative (sb_tools/templates/gdscript_specs.json) :
+en-tête, class_name, signaux, groupes d'exports, nœuds @onready et références
+aux managers (AutoLoad).
+
+Chaque template est lu et compilé une seule fois en fonction Python ; rendre
+des dizaines de variantes (une par créature ou personnage des données, copies
+multiples pour les tests de charge) ne coûte plus qu'un appel par script.
+
+Syntaxe des templates :
+  {{ chemin.vers.valeur }}            insertion (erreur si la variable est inconnue)
+  {% for x in liste %} ... {% endfor %}
+  {% if valeur %} ... {% else %} ... {% endif %}
+  {% include "_partiel" %}            rendu d'un autre template avec le même contexte
+Une balise {% %} seule sur sa ligne disparaît avec sa ligne.
+
+Variantes (--spec) : {"variants": [{"base": "creature", "output": "scripts/...",
+"exports": {"creature_id": "rat_common"}, ...}]}. Les exports sont remplacés
+par nom, les autres clés remplacent celles de la spec de base ; sans class_name
+explicite, une variante n'en déclare pas (Godot refuse les doublons).
+
+Usage: python godot_project_fixer.py codegen [chemin_projet] [--spec variantes.json] [--from-data] [--copies N] [--output-dir scripts/generated] [--dry-run]
+"""
+
+import re
+import sys
+import json
+import copy
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from sb_tools.tscn_model import godot_value
+
+TEMPLATES_DIR = Path(__file__).parent / "templates" / "gdscript"
+SPECS_PATH = Path(__file__).parent / "templates" / "gdscript_specs.json"
+SPECS_FORMAT_VERSION = 1
+TEMPLATE_SUFFIX = ".gd.tmpl"
+DEFAULT_OUTPUT_DIR = "scripts/generated"
+
+# Balise seule sur sa ligne (supprimée avec la ligne), balise en ligne, insertion
+TAG_PATTERN = re.compile(r"^[ \t]*\{%\s*(.*?)\s*%\}[ \t]*(?:\n|\Z)|\{%\s*(.*?)\s*%\}|\{\{\s*(.*?)\s*\}\}",
+                         re.MULTILINE)
+PATH_PATTERN = re.compile(r"^[A-Za-z_]\w*(?:\.\w+)*$")
+
+class TemplateError(ValueError):
+    """Template invalide, variable inconnue ou spec incohérente."""
+
+# ================================
+# COMPILATION DES TEMPLATES
+# ================================
+
+def _lookup(scope: Dict, path: str, name: str, line: int):
+    value = scope
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise TemplateError(f"{name}:{line}: variable inconnue '{path}'")
+        value = value[part]
+    return value
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+def _path(expression: str, name: str, line: int) -> str:
+    if not PATH_PATTERN.match(expression):
+        raise TemplateError(f"{name}:{line}: expression non supportée '{expression}'")
+    return expression
+
+def compile_template(source: str, name: str = "<template>") -> Callable[[Dict, Callable], str]:
+    """Compile un template en fonction render(scope, include) -> str."""
+    code = ["def render(scope, include):", " out = []", " append = out.append"]
+    stack: List[Tuple[str, int, int]] = []
+    position, loops = 0, 0
+
+    def emit(statement: str):
+        code.append(" " * (len(stack) + 1) + statement)
+
+    for match in TAG_PATTERN.finditer(source):
+        if match.start() > position:
+            emit(f"append({source[position:match.start()]!r})")
+        position = match.end()
+        line = source.count("\n", 0, match.start()) + 1
+
+        if match.group(3) is not None:
+            emit(f"append(_text(_lookup(scope, {_path(match.group(3), name, line)!r}, {name!r}, {line})))")
+            continue
+
+        words = (match.group(1) if match.group(1) is not None else match.group(2)).split()
+        keyword = words[0] if words else ""
+        if keyword == "for" and len(words) == 4 and words[2] == "in":
+            loops += 1
+            variable = _path(words[1], name, line)
+            emit(f"_saved{loops} = scope")
+            emit(f"for _item{loops} in _lookup(scope, {_path(words[3], name, line)!r}, {name!r}, {line}):")
+            stack.append(("for", line, loops))
+            emit(f"scope = dict(_saved{loops}, **{{{variable!r}: _item{loops}}})")
+        elif keyword == "if" and len(words) == 2:
+            emit(f"if _lookup(scope, {_path(words[1], name, line)!r}, {name!r}, {line}):")
+            stack.append(("if", line, 0))
+            emit("pass")
+        elif keyword == "else" and len(words) == 1 and stack and stack[-1][0] == "if":
+            stack.pop()
+            emit("else:")
+            stack.append(("else", line, 0))
+            emit("pass")
+        elif keyword == "endif" and len(words) == 1 and stack and stack[-1][0] in ("if", "else"):
+            stack.pop()
+        elif keyword == "endfor" and len(words) == 1 and stack and stack[-1][0] == "for":
+            _, _, loop = stack.pop()
+            emit(f"scope = _saved{loop}")
+        elif keyword == "include" and len(words) == 2 and words[1][:1] in "\"'" and words[1][-1:] == words[1][:1]:
+            emit(f"append(include({words[1][1:-1]!r}, scope))")
+        else:
+            raise TemplateError(f"{name}:{line}: balise invalide '{{% {' '.join(words)} %}}'")
+
+    if stack:
+        kind, line, _ = stack[-1]
+        raise TemplateError(f"{name}:{line}: bloc '{kind}' non fermé")
+    if position < len(source):
+        emit(f"append({source[position:]!r})")
+    code.append(" return ''.join(out)")
+
+    namespace = {"_lookup": _lookup, "_text": _text}
+    exec(compile("\n".join(code), f"<template {name}>", "exec"), namespace)
+    return namespace["render"]
+
+# Templates compilés par dossier, invalidés si un fichier change
+_TEMPLATE_CACHE: Dict[Path, Tuple[Tuple, Dict[str, Callable]]] = {}
+
+def load_templates(directory: Path = TEMPLATES_DIR) -> Dict[str, Callable]:
+    """Lit et compile une fois tous les templates d'un dossier (nom sans suffixe -> fonction)."""
+    directory = Path(directory).resolve()
+    paths = sorted(directory.glob("*" + TEMPLATE_SUFFIX))
+    signature = tuple((path.name, path.stat().st_mtime_ns) for path in paths)
+    cached = _TEMPLATE_CACHE.get(directory)
+    if cached and cached[0] == signature:
+        return cached[1]
+    templates = {}
+    for path in paths:
+        name = path.name[:-len(TEMPLATE_SUFFIX)]
+        templates[name] = compile_template(path.read_text(encoding="utf-8"), name)
+    _TEMPLATE_CACHE[directory] = (signature, templates)
+    return templates
+
+def render_template(templates: Dict[str, Callable], name: str, context: Dict) -> str:
+    """Rend un template compilé ; les include sont résolus dans le même jeu de templates."""
+    def include(partial: str, scope: Dict) -> str:
+        if partial not in templates:
+            raise TemplateError(f"template inconnu '{partial}'")
+        return templates[partial](scope, include)
+    return include(name, context)
+
+# ================================
+# SPECS DE SCRIPTS
+# ================================
+
+_SPEC_CACHE: Dict[Path, Dict[str, Dict]] = {}
+
+def load_specs(path: Path = SPECS_PATH) -> Dict[str, Dict]:
+    """Specs des scripts de base (nom -> spec), lues une fois par processus."""
+    path = Path(path).resolve()
+    if path not in _SPEC_CACHE:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("format_version") != SPECS_FORMAT_VERSION:
+            raise TemplateError(f"{path}: format_version {data.get('format_version')} non supportée")
+        _SPEC_CACHE[path] = data["scripts"]
+    return _SPEC_CACHE[path]
+
+def script_context(spec: Dict) -> Dict:
+    """Contexte de rendu : spec + nom du fichier + littéraux GDScript des exports."""
+    context = dict(spec)
+    context["script_name"] = Path(spec["output"]).name
+    context["export_groups"] = [
+        {"name": group["name"], "exports": [
+            dict(export, literal=godot_value(float(export["value"]) if export["type"] == "float" else export["value"]))
+            for export in group["exports"]]}
+        for group in spec.get("export_groups", [])
+    ]
+    return context
+
+def render_script(spec: Dict, templates: Dict[str, Callable] = None) -> str:
+    """Rend un script complet depuis sa spec."""
+    templates = templates if templates is not None else load_templates()
+    return render_template(templates, spec["template"], script_context(spec))
+
+def render_base_script(name: str) -> str:
+    """Script de base du fixer (player, creature, npc, ui_manager_stub, audio_manager_stub)."""
+    return render_script(load_specs()[name])
+
+def resolve_variant(specs: Dict[str, Dict], variant: Dict) -> Dict:
+    """Spec complète d'une variante : base + remplacements (exports par nom)."""
+    base_name = variant.get("base")
+    if base_name not in specs:
+        raise TemplateError(f"variante {variant.get('output')}: base inconnue '{base_name}'")
+    if "output" not in variant:
+        raise TemplateError(f"variante de {base_name} sans 'output'")
+    spec = copy.deepcopy(specs[base_name])
+    spec["class_name"] = None
+    for key, value in variant.items():
+        if key == "base":
+            continue
+        if key != "exports":
+            spec[key] = value
+            continue
+        exports = {export["name"]: export for group in spec.get("export_groups", []) for export in group["exports"]}
+        for export_name, export_value in value.items():
+            if export_name not in exports:
+                raise TemplateError(f"{variant['output']}: export inconnu '{export_name}' pour {base_name}")
+            exports[export_name]["value"] = export_value
+    return spec
+
+def variants_from_data(corpus: Dict, output_dir: str, copies: int = 1) -> List[Dict]:
+    """Une variante Creature par créature et une variante NPC par personnage des données."""
+    from sb_tools.data_index import _entries
+
+    variants = []
+    sources = [("creature", "creatures", "creatures"), ("npc", "characters", "npcs")]
+    for base, data_type, folder in sources:
+        for entry_id, entry in sorted(_entries(corpus.get(data_type, {})).items()):
+            if base == "creature":
+                exports = {"creature_id": entry_id, "display_name": entry.get("name", entry_id),
+                           "magic_affinity": entry.get("base_stats", {}).get("magic_affinity", 1.0)}
+            else:
+                exports = {"npc_id": entry_id, "display_name": entry.get("name", entry_id),
+                           "faction": entry.get("faction", "neutral")}
+            for number in range(1, copies + 1):
+                suffix = f"_{number:03d}" if copies > 1 else ""
+                variants.append({
+                    "base": base,
+                    "output": f"{output_dir}/{folder}/{entry_id}{suffix}.gd",
+                    "title": f"{entry.get('name', entry_id)} (GÉNÉRÉ)",
+                    "exports": exports
+                })
+    return variants
+
+def render_variants(variants: List[Dict], specs: Dict[str, Dict],
+                    templates: Dict[str, Callable]) -> Iterator[Tuple[str, str]]:
+    """Rend toutes les variantes en une passe : (chemin relatif, contenu)."""
+    protected = {spec["output"] for spec in specs.values()}
+    for variant in variants:
+        spec = resolve_variant(specs, variant)
+        if spec["output"] in protected:
+            raise TemplateError(f"{spec['output']}: une variante ne peut pas remplacer un script de base")
+        yield spec["output"], render_script(spec, templates)
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande codegen."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py codegen",
+                                     description="Rend les scripts GDScript depuis les templates et les specs")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--spec", help="Fichier JSON de variantes ({\"variants\": [...]})")
+    parser.add_argument("--from-data", action="store_true",
+                        help="Une variante par créature (creatures.json) et par personnage (characters.json)")
+    parser.add_argument("--copies", type=int, default=1, help="Copies de chaque variante issue des données")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"Dossier des variantes issues des données (défaut: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--dry-run", action="store_true", help="Rend sans écrire")
+    args = parser.parse_args(argv)
+    if args.copies < 1:
+        parser.error("--copies doit être au moins 1")
+
+    project_root = Path(args.project_root)
+    started = time.perf_counter()
+    try:
+        templates = load_templates()
+        specs = load_specs()
+        compiled_ms = (time.perf_counter() - started) * 1000
+        variants = []
+        if args.spec:
+            spec_data = json.loads(Path(args.spec).read_text(encoding="utf-8"))
+            variants.extend(spec_data["variants"] if isinstance(spec_data, dict) else spec_data)
+        if args.from_data:
+            from sb_tools.data_pipeline import load_corpus
+            variants.extend(variants_from_data(load_corpus(project_root / "data", strict=True),
+                                               args.output_dir.rstrip("/"), args.copies))
+
+        if not variants:
+            # Sans variantes : validation des scripts de base
+            for name, spec in specs.items():
+                content = render_script(spec, templates)
+                print(f"  {name:<20} -> {spec['output']} ({len(content.splitlines())} lignes)")
+            print(f"✅ {len(specs)} script(s) de base rendus, {len(templates)} template(s) "
+                  f"compilés en {compiled_ms:.1f} ms")
+            return 0
+
+        rendered = list(render_variants(variants, specs, templates))
+    except (TemplateError, OSError, KeyError, json.JSONDecodeError) as e:
+        print(f"❌ {e}")
+        return 1
+    render_ms = (time.perf_counter() - started) * 1000 - compiled_ms
+
+    written = unchanged = 0
+    for relative_path, content in rendered:
+        if args.dry_run:
+            continue
+        path = project_root / relative_path
+        if path.exists() and path.read_text(encoding="utf-8") == content:
+            unchanged += 1
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        written += 1
+
+    total_lines = sum(content.count("\n") for _, content in rendered)
+    print(f"🏭 {len(rendered)} variante(s), {total_lines} lignes rendues en {render_ms:.1f} ms "
+          f"(templates compilés en {compiled_ms:.1f} ms)")
+    if not args.dry_run:
+        print(f"   {written} écrite(s), {unchanged} inchangée(s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
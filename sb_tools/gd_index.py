@@ -0,0 +1,598 @@
+# -*- coding: utf-8 -*-
+"""
+🔎 GD Index - Index statique des scripts GDScript du projet
+===========================================================
+Parse chaque fichier .gd de l'arborescence (scripts/ par défaut) et extrait
+class_name, extends, classes internes, signaux, signatures de fonctions, enums,
+constantes, variables @export / @onready, recherches de nœuds (get_node,
+get_node_or_null, $Chemin), accès aux noms globaux (Data.xxx), émissions et
+connexions de signaux et appels internes de chaque fonction. Sert de table des
+symboles aux vérifications de cohérence (autoloads, signaux, code mort...).
+
+Cache : .sb_cache/gd_index.json, par fichier (mtime + taille, puis md5 quand
+le mtime a changé sans changement de contenu, ex: changement de branche) et
+par contenu (md5 -> symboles), pour qu'un retour sur une branche déjà indexée
+ne reparse rien.
+
+Usage: python godot_project_fixer.py gdindex [chemin_projet] [--dir scripts] [--find NOM] [--class NOM] [--lookups [CHEMIN]] [--no-cache] [--jobs N] [--json]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+INDEX_FORMAT_VERSION = 4
+DEFAULT_CACHE_PATH = ".sb_cache/gd_index.json"
+DEFAULT_SCRIPT_DIRS = ("scripts",)
+# Contenus gardés en cache (branches multiples), au-delà des fichiers présents
+MAX_CACHED_BLOBS = 512
+
+CLASS_NAME_RE = re.compile(r"^class_name\s+(\w+)(?:\s+extends\s+(\S+))?")
+EXTENDS_RE = re.compile(r"^extends\s+(\S+)")
+INNER_CLASS_RE = re.compile(r"^class\s+(\w+)(?:\s+extends\s+(\S+))?\s*:")
+SIGNAL_RE = re.compile(r"^signal\s+(\w+)\s*(?:\((.*)\))?")
+FUNC_RE = re.compile(r"^(static\s+)?func\s+(\w+)\s*\((.*)\)\s*(?:->\s*([\w\[\]\.]+))?\s*:")
+VAR_RE = re.compile(r"^(?:static\s+)?var\s+(\w+)\s*(?::\s*([\w\[\]\.]+))?\s*(?::?=\s*(.*))?")
+ENUM_RE = re.compile(r"^enum\s*(\w+)?\s*\{(.*)\}")
+CONST_RE = re.compile(r"^const\s+(\w+)\s*(?::\s*([\w\[\]\.]+))?\s*:?=")
+ANNOTATION_RE = re.compile(r"^@(\w+)(\((?:[^()]|\([^()]*\))*\))?\s*")
+GET_NODE_RE = re.compile(r"\bget_node(?:_or_null)?\s*\(\s*[\"']([^\"']+)[\"']")
+DOLLAR_RE = re.compile(r"\$(?:\"([^\"]+)\"|([A-Za-z_][\w/\.]*))")
+STRING_RE = re.compile(r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'")
+# Accès à un nom global (autoload, class_name, classe du moteur) : Data.get_creature(...)
+GLOBAL_REF_RE = re.compile(r"(?<![\w.$])([A-Z]\w*)\s*\.")
+# Signaux : émissions, connexions (Signal.connect / Object.connect) et gardes has_signal
+RECEIVER = r"((?:[A-Za-z_]\w*(?:\([^()]*\))?\.)*)"
+EMIT_RE = re.compile(r"(?<![\w.])" + RECEIVER + r"([A-Za-z_]\w*)\.emit\(")
+EMIT_SIGNAL_RE = re.compile(r"(?<![\w.])" + RECEIVER + r"emit_signal\(\s*[\"'](\w+)[\"']")
+CONNECT_RE = re.compile(r"(?<![\w.])" + RECEIVER + r"(\w+)\.connect\(")
+OBJECT_CONNECT_RE = re.compile(r"(?<![\w.])" + RECEIVER + r"connect\(")
+AWAIT_RE = re.compile(r"\bawait\s+" + RECEIVER + r"([A-Za-z_]\w*)\s*(?=$|[)\],])")
+HAS_SIGNAL_RE = re.compile(r"\bhas_signal\(\s*[\"'](\w+)[\"']")
+HANDLER_RE = re.compile(r"^([A-Za-z_][\w.]*?)(?:\.(?:bind|bindv|unbind)\b.*)?$")
+CALL_RE = re.compile(r"(?<![\w.])([a-z_]\w*)\s*\(")
+METHOD_CALL_RE = re.compile(r"\.([a-z_]\w*)\s*\(|\bcall(?:_deferred)?\(\s*[\"'](\w+)[\"']")
+ASSIGN_RE = re.compile(r"^(?:var\s+)?([A-Za-z_]\w*)\s*(?::\s*[\w\[\]\.]*)?\s*:?=\s*")
+KEYWORDS = {"if", "elif", "while", "for", "match", "return", "func", "and", "or", "not", "in",
+            "await", "preload", "load", "print", "assert", "str", "int", "float", "bool", "len",
+            "range", "super", "is_instance_valid", "typeof", "var", "signal"}
+
+OPENERS, CLOSERS = "([{", ")]}"
+TRIPLE_QUOTES = ('"""', "'''")
+# Seuls éléments lexicaux utiles au découpage des lignes : chaînes, commentaires, parenthèses
+TOKEN_RE = re.compile(r"\"\"\"|'''|\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|#.*|[()\[\]{}]")
+
+# ================================
+# PARSING
+# ================================
+
+def _indent_level(line: str) -> int:
+    """Niveau d'indentation (tabulations, ou groupes de 4 espaces)."""
+    stripped = line.lstrip(" \t")
+    prefix = line[:len(line) - len(stripped)]
+    return prefix.count("\t") + prefix.count(" ") // 4
+
+def _strip_line(line: str, in_triple: str, depth: int) -> Tuple[str, str, int]:
+    """Retire commentaires et contenu des chaînes triples d'une ligne et suit la
+    profondeur des parenthèses. Renvoie (code, chaîne triple restée ouverte, profondeur)."""
+    pieces, pos = [], 0
+    if in_triple:
+        end = line.find(in_triple)
+        if end < 0:
+            return "", in_triple, depth
+        pieces.append('""')
+        pos, in_triple = end + 3, ""
+
+    while True:
+        match = TOKEN_RE.search(line, pos)
+        if match is None:
+            pieces.append(line[pos:])
+            break
+        token = match.group()
+        pieces.append(line[pos:match.start()])
+        pos = match.end()
+        if token.startswith("#"):
+            break
+        if token in TRIPLE_QUOTES:
+            end = line.find(token, pos)
+            pieces.append('""')
+            if end < 0:
+                in_triple = token
+                break
+            pos = end + 3
+            continue
+        if token in OPENERS:
+            depth += 1
+        elif token in CLOSERS:
+            depth = max(0, depth - 1)
+        pieces.append(token)
+    return "".join(pieces).rstrip(), in_triple, depth
+
+def _logical_lines(text: str) -> Iterator[Tuple[int, int, str]]:
+    """(ligne, indentation, code) sans commentaires ni contenu des chaînes triples,
+    les lignes entre parenthèses/crochets ou terminées par \\ étant jointes."""
+    in_triple = ""
+    pending, start, indent, depth = [], 0, 0, 0
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        text_line, in_triple, depth = _strip_line(line, in_triple, depth)
+        if not pending:
+            if not text_line:
+                continue
+            start, indent = lineno, _indent_level(line)
+        pending.append(text_line.strip())
+
+        if in_triple or depth > 0 or text_line.endswith("\\"):
+            if text_line.endswith("\\"):
+                pending[-1] = pending[-1][:-1]
+            continue
+        yield start, indent, " ".join(part for part in pending if part)
+        pending = []
+
+    if pending:
+        yield start, indent, " ".join(part for part in pending if part)
+
+def _split_top_level(text: str) -> List[str]:
+    """Découpe sur les virgules hors parenthèses, crochets et chaînes."""
+    parts, current, depth, quote = [], [], 0, ""
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'":
+            quote = char
+        elif char in OPENERS:
+            depth += 1
+        elif char in CLOSERS:
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+def _parse_params(text: str) -> List[Dict]:
+    """Paramètres d'une signature : nom, type et valeur par défaut (texte source)."""
+    params = []
+    for part in _split_top_level(text or ""):
+        default = None
+        if ":=" in part:
+            part, default = (piece.strip() for piece in part.split(":=", 1))
+        elif "=" in part:
+            part, default = (piece.strip() for piece in part.split("=", 1))
+        name, _, type_name = part.partition(":")
+        param = {"name": name.strip(), "type": type_name.strip() or None}
+        if default is not None:
+            param["default"] = default
+        params.append(param)
+    return params
+
+def parse_gdscript(text: str) -> Dict:
+    """Symboles d'un script GDScript."""
+    symbols = {
+        "class_name": None, "extends": None, "inner_classes": [],
+        "signals": [], "functions": [], "exports": [], "onready": [],
+        "variables": [], "constants": [], "enums": [], "node_lookups": [],
+        "global_refs": {}, "emits": [], "connections": [], "method_refs": []
+    }
+    calls: Dict[str, set] = {}
+    guards: Dict[str, set] = {}
+    method_refs = set()
+    annotations: List[Tuple[str, str]] = []
+    export_group = None
+    inner_class, inner_indent = None, 0
+    current_func, func_indent = None, 0
+
+    for lineno, indent, code in _logical_lines(text):
+        if inner_class and indent <= inner_indent:
+            inner_class = None
+        if current_func and indent <= func_indent:
+            current_func = None
+
+        # Annotations en tête de ligne (@export, @export_range(...), @onready...)
+        while code.startswith("@"):
+            match = ANNOTATION_RE.match(code)
+            if not match:
+                break
+            annotations.append((match.group(1), match.group(2) or ""))
+            code = code[match.end():]
+        if not code:
+            for name, args in annotations:
+                if name in ("export_group", "export_category"):
+                    export_group = args.strip("()\"' ") or None
+            annotations = [(name, args) for name, args in annotations if name not in ("export_group", "export_category", "export_subgroup", "tool", "icon")]
+            continue
+
+        assigned = ASSIGN_RE.match(code)
+        target = assigned.group(1) if assigned and assigned.group(1) not in KEYWORDS else None
+        for match in GET_NODE_RE.finditer(code):
+            symbols["node_lookups"].append({"path": match.group(1), "line": lineno, "function": current_func, "kind": "get_node", "target": target})
+        for match in DOLLAR_RE.finditer(code):
+            symbols["node_lookups"].append({"path": match.group(1) or match.group(2), "line": lineno, "function": current_func, "kind": "dollar", "target": target})
+        if current_func:
+            _signal_usage(code, lineno, current_func, symbols, guards.setdefault(current_func, set()))
+            calls.setdefault(current_func, set()).update(name for name in CALL_RE.findall(code) if name not in KEYWORDS)
+        for method, named in METHOD_CALL_RE.findall(code):
+            method_refs.add(method or named)
+        for name in GLOBAL_REF_RE.findall(STRING_RE.sub('""', code)):
+            symbols["global_refs"][name] = symbols["global_refs"].get(name, 0) + 1
+
+        member_level = 0 if inner_class is None else inner_indent + 1
+        if current_func or indent != member_level:
+            annotations = []
+            continue
+
+        match = FUNC_RE.match(code)
+        if match:
+            params = _parse_params(match.group(3))
+            symbols["functions"].append({
+                "name": match.group(2), "line": lineno, "class": inner_class,
+                "static": bool(match.group(1)), "params": params,
+                "return_type": match.group(4),
+                "required": sum(1 for param in params if "default" not in param)
+            })
+            current_func, func_indent = match.group(2), indent
+            annotations = []
+            continue
+
+        match = VAR_RE.match(code)
+        if match:
+            names = [name for name, _ in annotations]
+            var = {"name": match.group(1), "line": lineno, "class": inner_class, "type": match.group(2),
+                   "default": (match.group(3) or "").strip() or None}
+            if any(name.startswith("export") for name in names):
+                export = dict(var, group=export_group, annotation=next(n for n in names if n.startswith("export")))
+                symbols["exports"].append(export)
+            elif "onready" in names:
+                symbols["onready"].append(var)
+            else:
+                symbols["variables"].append(var)
+            annotations = []
+            continue
+        annotations = []
+
+        match = CONST_RE.match(code)
+        if match:
+            symbols["constants"].append({"name": match.group(1), "line": lineno, "class": inner_class, "type": match.group(2)})
+            continue
+        match = ENUM_RE.match(code)
+        if match:
+            values = [part.split("=", 1)[0].strip() for part in _split_top_level(match.group(2))]
+            symbols["enums"].append({"name": match.group(1), "line": lineno, "class": inner_class, "values": values})
+            continue
+        match = SIGNAL_RE.match(code)
+        if match:
+            symbols["signals"].append({"name": match.group(1), "line": lineno, "class": inner_class,
+                                       "params": _parse_params(match.group(2))})
+            continue
+        if inner_class is None:
+            match = CLASS_NAME_RE.match(code)
+            if match:
+                symbols["class_name"] = match.group(1)
+                if match.group(2):
+                    symbols["extends"] = match.group(2).strip("\"'")
+                continue
+            match = EXTENDS_RE.match(code)
+            if match:
+                symbols["extends"] = match.group(1).strip("\"'")
+                continue
+            match = INNER_CLASS_RE.match(code)
+            if match:
+                symbols["inner_classes"].append({"name": match.group(1), "line": lineno,
+                                                 "extends": (match.group(2) or "").strip("\"'") or None})
+                inner_class, inner_indent = match.group(1), indent
+
+    for func in symbols["functions"]:
+        func["calls"] = sorted(calls.get(func["name"], set()) - {func["name"]})
+    symbols["method_refs"] = sorted(method_refs)
+    return symbols
+
+def _call_args(code: str, start: int) -> List[str]:
+    """Arguments de l'appel dont la parenthèse ouvrante précède start."""
+    depth, quote = 1, ""
+    for position in range(start, len(code)):
+        char = code[position]
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'":
+            quote = char
+        elif char in OPENERS:
+            depth += 1
+        elif char in CLOSERS:
+            depth -= 1
+            if depth == 0:
+                return _split_top_level(code[start:position])
+    return _split_top_level(code[start:])
+
+def _handler(text: str) -> Dict:
+    """Cible d'un Callable : objet (None = self) et méthode, ou lambda."""
+    text = text.strip()
+    if text.startswith("func"):
+        return {"target": None, "method": "<lambda>"}
+    match = HANDLER_RE.match(text.split("(")[0] if ".bind" not in text else text)
+    if not match:
+        return {"target": None, "method": None}
+    target, _, method = match.group(1).rpartition(".")
+    return {"target": target or None, "method": method}
+
+def _receiver(text: str) -> Optional[str]:
+    receiver = text.rstrip(".")
+    return None if receiver in ("", "self") else receiver
+
+def _signal_usage(code: str, lineno: int, function: str, symbols: Dict, guards: set):
+    """Émissions, connexions et gardes has_signal d'une ligne de fonction."""
+    guards.update(HAS_SIGNAL_RE.findall(code))
+    for match in EMIT_RE.finditer(code):
+        symbols["emits"].append({"signal": match.group(2), "receiver": _receiver(match.group(1)),
+                                 "line": lineno, "function": function})
+    for match in EMIT_SIGNAL_RE.finditer(code):
+        symbols["emits"].append({"signal": match.group(2), "receiver": _receiver(match.group(1)),
+                                 "line": lineno, "function": function})
+
+    for match in CONNECT_RE.finditer(code):
+        args = _call_args(code, match.end())
+        signal_name = match.group(2)
+        # objet.connect("signal", callable) : "connect" est précédé de l'objet, pas d'un signal
+        is_object_form = args and (args[0][:1] in "\"'&" or (len(args) >= 2 and "CONNECT_" not in args[1] and not args[1].isdigit()))
+        if is_object_form:
+            literal = args[0].lstrip("&").strip("\"'") if args[0][:1] in "\"'&" else None
+            receiver = _receiver(match.group(1) + signal_name)
+            handler = _handler(args[1]) if len(args) > 1 else {"target": None, "method": None}
+            symbols["connections"].append({"signal": literal, "dynamic": None if literal else args[0],
+                                           "receiver": receiver, **handler, "line": lineno, "function": function,
+                                           "guarded": literal in guards})
+        elif args:
+            symbols["connections"].append({"signal": signal_name, "dynamic": None, "receiver": _receiver(match.group(1)),
+                                           **_handler(args[0]), "line": lineno, "function": function,
+                                           "guarded": signal_name in guards})
+    # await objet.signal : la fonction reprend à l'émission, c'est un écouteur
+    for match in AWAIT_RE.finditer(code):
+        symbols["connections"].append({"signal": match.group(2), "dynamic": None, "receiver": _receiver(match.group(1)),
+                                       "target": None, "method": function, "await": True, "line": lineno,
+                                       "function": function, "guarded": False})
+    for match in OBJECT_CONNECT_RE.finditer(code):
+        if match.group(1):
+            continue
+        args = _call_args(code, match.end())
+        if len(args) >= 2 and args[0][:1] in "\"'&":
+            literal = args[0].lstrip("&").strip("\"'")
+            symbols["connections"].append({"signal": literal, "dynamic": None, "receiver": None, **_handler(args[1]),
+                                           "line": lineno, "function": function, "guarded": literal in guards})
+
+def parse_file(path: str) -> Dict:
+    """Parse un fichier (point d'entrée des processus de travail)."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return parse_gdscript(f.read())
+
+# ================================
+# INDEX ET CACHE
+# ================================
+
+def res_path(relative: str) -> str:
+    """Chemin Godot (res://) d'un fichier relatif à la racine du projet."""
+    return "res://" + relative
+
+def collect_scripts(root: Path, dirs: Tuple[str, ...] = DEFAULT_SCRIPT_DIRS) -> List[Path]:
+    """Fichiers .gd des dossiers demandés, triés."""
+    files = []
+    for name in dirs:
+        folder = root / name
+        if folder.is_dir():
+            files.extend(folder.rglob("*.gd"))
+    return sorted(set(files))
+
+def load_cache(cache_path: Path) -> Dict:
+    """Cache précédent, ou cache vide s'il est absent, illisible ou d'un autre format."""
+    empty = {"format": INDEX_FORMAT_VERSION, "files": {}, "blobs": {}}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(cache, dict) or cache.get("format") != INDEX_FORMAT_VERSION:
+        return empty
+    return cache
+
+def save_cache(cache_path: Path, cache: Dict):
+    """Écrit le cache en ne gardant que MAX_CACHED_BLOBS contenus (ceux des fichiers présents d'abord)."""
+    live = {entry["md5"] for entry in cache["files"].values()}
+    blobs = cache["blobs"]
+    extra = [md5 for md5 in blobs if md5 not in live]
+    for md5 in extra[:max(0, len(blobs) - MAX_CACHED_BLOBS)]:
+        del blobs[md5]
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, cache_path)
+
+def _parse_all(paths: List[str], jobs: int = None) -> List[Dict]:
+    if len(paths) <= 1 or jobs == 1:
+        return [parse_file(path) for path in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(parse_file, paths))
+
+def build_index(project_root: str = ".", dirs: Tuple[str, ...] = DEFAULT_SCRIPT_DIRS,
+                cache_path: Optional[str] = DEFAULT_CACHE_PATH, jobs: int = None) -> Dict:
+    """Index {chemin relatif: symboles} ; seuls les fichiers modifiés sont reparsés."""
+    started = time.perf_counter()
+    root = Path(project_root)
+    cache_file = root / cache_path if cache_path else None
+    cache = load_cache(cache_file) if cache_file else {"format": INDEX_FORMAT_VERSION, "files": {}, "blobs": {}}
+
+    files, stale, stats = {}, {}, {"cached": 0, "rehashed": 0, "parsed": 0}
+    for path in collect_scripts(root, dirs):
+        relative = path.relative_to(root).as_posix()
+        stat = path.stat()
+        entry = cache["files"].get(relative)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size and entry["md5"] in cache["blobs"]:
+            files[relative] = entry
+            stats["cached"] += 1
+            continue
+
+        md5 = hashlib.md5(path.read_bytes()).hexdigest()
+        files[relative] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "md5": md5}
+        if md5 in cache["blobs"]:
+            stats["rehashed"] += 1
+        else:
+            stale[relative] = str(path)
+
+    for relative, symbols in zip(stale, _parse_all(list(stale.values()), jobs)):
+        cache["blobs"][files[relative]["md5"]] = symbols
+    stats["parsed"] = len(stale)
+
+    changed = bool(stale) or stats["rehashed"] > 0 or set(files) != set(cache["files"])
+    cache["files"] = files
+    if cache_file and changed:
+        save_cache(cache_file, cache)
+
+    scripts = {relative: cache["blobs"][entry["md5"]] for relative, entry in files.items()}
+    stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return {"root": str(root), "scripts": scripts, "stats": stats}
+
+# ================================
+# REQUÊTES
+# ================================
+
+def build_lookup(index: Dict) -> Dict:
+    """Tables de recherche : classes nommées, symboles par nom, recherches de nœuds par chemin."""
+    classes, symbols, lookups = {}, {}, {}
+    kinds = (("signals", "signal"), ("functions", "func"), ("exports", "export"),
+             ("onready", "onready"), ("variables", "var"), ("constants", "const"), ("enums", "enum"))
+    for script, data in index["scripts"].items():
+        if data["class_name"]:
+            classes[data["class_name"]] = script
+        for inner in data["inner_classes"]:
+            symbols.setdefault(inner["name"], []).append({"kind": "class", "script": script, **inner})
+        for key, kind in kinds:
+            for item in data[key]:
+                if item["name"] is None:
+                    continue
+                symbols.setdefault(item["name"], []).append({"kind": kind, "script": script, **item})
+        for lookup in data["node_lookups"]:
+            lookups.setdefault(lookup["path"], []).append({"script": script, **lookup})
+    return {"classes": classes, "symbols": symbols, "lookups": lookups}
+
+def find_symbol(lookup: Dict, name: str) -> List[Dict]:
+    """Définitions portant ce nom (fonctions, signaux, variables, constantes, classes internes)."""
+    return lookup["symbols"].get(name, [])
+
+def find_class(index: Dict, lookup: Dict, name: str) -> Optional[Dict]:
+    """Script déclarant ce class_name, avec sa chaîne d'héritage connue."""
+    script = lookup["classes"].get(name)
+    if script is None:
+        return None
+    chain, current = [], index["scripts"][script]["extends"]
+    while current and current not in chain:
+        chain.append(current)
+        parent = lookup["classes"].get(current)
+        current = index["scripts"][parent]["extends"] if parent else None
+    return {"script": script, **index["scripts"][script], "inherits": chain}
+
+def root_lookups(lookup: Dict) -> Dict[str, List[Dict]]:
+    """Recherches absolues (/root/...) : ce qui doit exister comme autoload."""
+    return {path: refs for path, refs in lookup["lookups"].items() if path.startswith("/root/")}
+
+# ================================
+# CLI
+# ================================
+
+def _signature(item: Dict) -> str:
+    params = ", ".join(p["name"] + (f": {p['type']}" if p["type"] else "") + (f" = {p['default']}" if "default" in p else "")
+                       for p in item.get("params", []))
+    text = f"{item['name']}({params})"
+    if item.get("return_type"):
+        text += f" -> {item['return_type']}"
+    return text
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande gdindex."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py gdindex",
+                                     description="Index statique des scripts GDScript")
+    parser.add_argument("project", nargs="?", default=".", help="Racine du projet Godot")
+    parser.add_argument("--dir", action="append", dest="dirs", help="Dossier de scripts (répétable, défaut: scripts)")
+    parser.add_argument("--find", default="", help="Définitions d'un symbole")
+    parser.add_argument("--class", dest="class_name", default="", help="Détail d'une classe (class_name)")
+    parser.add_argument("--lookups", nargs="?", const="/root/", default=None, help="Recherches de nœuds (préfixe, défaut: /root/)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore et n'écrit pas le cache")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--json", action="store_true", help="Résultat JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Projet introuvable: {args.project}")
+        return 1
+    index = build_index(args.project, tuple(args.dirs or DEFAULT_SCRIPT_DIRS),
+                        None if args.no_cache else DEFAULT_CACHE_PATH, args.jobs)
+    lookup = build_lookup(index)
+    stats = index["stats"]
+
+    if args.class_name:
+        result = find_class(index, lookup, args.class_name)
+        if result is None:
+            print(f"❌ Classe inconnue: {args.class_name}")
+            return 1
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+            return 0
+        print(f"🏷️ {args.class_name} ({result['script']}) extends {' < '.join(result['inherits']) or '-'}")
+        for signal in result["signals"]:
+            print(f"  📡 signal {_signature(signal)}")
+        for export in result["exports"]:
+            print(f"  ⚙️ @{export['annotation']} {export['name']}: {export['type'] or '?'}" + (f" [{export['group']}]" if export["group"] else ""))
+        for func in result["functions"]:
+            owner = f"{func['class']}." if func["class"] else ""
+            print(f"  🔧 {owner}{_signature(func)}  (l.{func['line']})")
+        return 0
+
+    if args.find:
+        matches = find_symbol(lookup, args.find)
+        if args.json:
+            print(json.dumps(matches, indent=2, ensure_ascii=False))
+            return 0 if matches else 1
+        if not matches:
+            print(f"❌ Aucun symbole: {args.find}")
+            return 1
+        for match in matches:
+            label = _signature(match) if match["kind"] in ("func", "signal") else match["name"]
+            print(f"  {match['kind']:<8} {match['script']}:{match['line']}  {label}")
+        return 0
+
+    if args.lookups is not None:
+        found = {path: refs for path, refs in lookup["lookups"].items() if path.startswith(args.lookups)}
+        if args.json:
+            print(json.dumps(found, indent=2, ensure_ascii=False))
+            return 0
+        for path in sorted(found):
+            print(f"  🌳 {path} ({len(found[path])})")
+            for ref in found[path]:
+                print(f"     {ref['script']}:{ref['line']}" + (f" dans {ref['function']}()" if ref["function"] else ""))
+        return 0
+
+    if args.json:
+        print(json.dumps(index, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"🔎 {len(index['scripts'])} script(s) indexé(s) en {stats['duration_ms']} ms "
+          f"({stats['parsed']} parsé(s), {stats['cached']} en cache, {stats['rehashed']} revérifié(s) par md5)")
+    for script, data in index["scripts"].items():
+        name = data["class_name"] or "-"
+        print(f"  {script:<42} {name:<20} {len(data['functions']):>4} func {len(data['signals']):>3} signaux "
+              f"{len(data['exports']):>3} exports {len(data['node_lookups']):>3} nœuds")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
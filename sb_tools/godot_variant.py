@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+🧬 Godot Variant - Sérialisation binaire compatible FileAccess.store_var/get_var
+================================================================================
+Implémente le sous-ensemble du format marshalls de Godot 4 utilisé par nos
+données : null, bool, int, float, String, Dictionary, Array et PackedByteArray.
+"""
+
+import struct
+from typing import Tuple
+
+# Types Variant de Godot 4 (enum Variant::Type)
+TYPE_NIL = 0
+TYPE_BOOL = 1
+TYPE_INT = 2
+TYPE_FLOAT = 3
+TYPE_STRING = 4
+TYPE_STRING_NAME = 21
+TYPE_DICTIONARY = 27
+TYPE_ARRAY = 28
+TYPE_PACKED_BYTE_ARRAY = 29
+
+HEADER_TYPE_MASK = 0xFF
+HEADER_DATA_FLAG_64 = 1 << 16
+# Conteneurs typés (Godot 4.x) : 0 = non typé, 1 = type builtin
+TYPED_ARRAY_SHIFT = 16
+TYPED_DICT_KEY_SHIFT = 16
+TYPED_DICT_VALUE_SHIFT = 18
+TYPED_CONTAINER_MASK = 0b11
+TYPED_CONTAINER_BUILTIN = 1
+
+class VariantError(ValueError):
+    """Donnée impossible à encoder ou décoder au format Variant."""
+
+def _pad4(length: int) -> int:
+    return (4 - length % 4) % 4
+
+def encode_variant(value, numbers_as_float: bool = False) -> bytes:
+    """Encode une valeur Python comme encode_variant() de Godot.
+
+    numbers_as_float reproduit le parseur JSON de Godot 4, qui produit des float
+    pour tous les nombres.
+    """
+    out = bytearray()
+    _encode_into(out, value, numbers_as_float)
+    return bytes(out)
+
+def _encode_into(out: bytearray, value, numbers_as_float: bool):
+    if value is None:
+        out += struct.pack("<I", TYPE_NIL)
+    elif isinstance(value, bool):
+        out += struct.pack("<II", TYPE_BOOL, 1 if value else 0)
+    elif isinstance(value, int) and not numbers_as_float:
+        if -(1 << 31) <= value < (1 << 31):
+            out += struct.pack("<Ii", TYPE_INT, value)
+        else:
+            out += struct.pack("<Iq", TYPE_INT | HEADER_DATA_FLAG_64, value)
+    elif isinstance(value, (int, float)):
+        value = float(value)
+        # float32 si la valeur est exactement représentable, comme Godot
+        single = struct.unpack("<f", struct.pack("<f", value))[0] if abs(value) < 3.4e38 else None
+        if single == value:
+            out += struct.pack("<If", TYPE_FLOAT, value)
+        else:
+            out += struct.pack("<Id", TYPE_FLOAT | HEADER_DATA_FLAG_64, value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += struct.pack("<II", TYPE_STRING, len(data))
+        out += data + b"\0" * _pad4(len(data))
+    elif isinstance(value, dict):
+        out += struct.pack("<II", TYPE_DICTIONARY, len(value))
+        for key, item in value.items():
+            _encode_into(out, key, numbers_as_float)
+            _encode_into(out, item, numbers_as_float)
+    elif isinstance(value, (list, tuple)):
+        out += struct.pack("<II", TYPE_ARRAY, len(value))
+        for item in value:
+            _encode_into(out, item, numbers_as_float)
+    elif isinstance(value, (bytes, bytearray)):
+        out += struct.pack("<II", TYPE_PACKED_BYTE_ARRAY, len(value))
+        out += bytes(value) + b"\0" * _pad4(len(value))
+    else:
+        raise VariantError(f"Type non supporté: {type(value).__name__}")
+
+def decode_variant(buffer: bytes, offset: int = 0) -> Tuple[object, int]:
+    """Décode un Variant à partir de offset. Retourne (valeur, nouvel offset)."""
+    header, = struct.unpack_from("<I", buffer, offset)
+    offset += 4
+    var_type = header & HEADER_TYPE_MASK
+
+    if var_type == TYPE_NIL:
+        return None, offset
+    if var_type == TYPE_BOOL:
+        value, = struct.unpack_from("<I", buffer, offset)
+        return bool(value), offset + 4
+    if var_type == TYPE_INT:
+        if header & HEADER_DATA_FLAG_64:
+            return struct.unpack_from("<q", buffer, offset)[0], offset + 8
+        return struct.unpack_from("<i", buffer, offset)[0], offset + 4
+    if var_type == TYPE_FLOAT:
+        if header & HEADER_DATA_FLAG_64:
+            return struct.unpack_from("<d", buffer, offset)[0], offset + 8
+        return struct.unpack_from("<f", buffer, offset)[0], offset + 4
+    if var_type in (TYPE_STRING, TYPE_STRING_NAME):
+        length, = struct.unpack_from("<I", buffer, offset)
+        offset += 4
+        text = bytes(buffer[offset:offset + length]).decode("utf-8")
+        return text, offset + length + _pad4(length)
+    if var_type == TYPE_DICTIONARY:
+        offset = _skip_container_type(buffer, offset, (header >> TYPED_DICT_KEY_SHIFT) & TYPED_CONTAINER_MASK)
+        offset = _skip_container_type(buffer, offset, (header >> TYPED_DICT_VALUE_SHIFT) & TYPED_CONTAINER_MASK)
+        count, = struct.unpack_from("<I", buffer, offset)
+        offset += 4
+        result = {}
+        for _ in range(count & 0x7FFFFFFF):
+            key, offset = decode_variant(buffer, offset)
+            value, offset = decode_variant(buffer, offset)
+            result[key] = value
+        return result, offset
+    if var_type == TYPE_ARRAY:
+        offset = _skip_container_type(buffer, offset, (header >> TYPED_ARRAY_SHIFT) & TYPED_CONTAINER_MASK)
+        count, = struct.unpack_from("<I", buffer, offset)
+        offset += 4
+        result = []
+        for _ in range(count & 0x7FFFFFFF):
+            value, offset = decode_variant(buffer, offset)
+            result.append(value)
+        return result, offset
+    if var_type == TYPE_PACKED_BYTE_ARRAY:
+        length, = struct.unpack_from("<I", buffer, offset)
+        offset += 4
+        return bytes(buffer[offset:offset + length]), offset + length + _pad4(length)
+
+    raise VariantError(f"Type Variant non supporté: {var_type}")
+
+def _skip_container_type(buffer: bytes, offset: int, typed: int) -> int:
+    """Ignore l'information de type d'un conteneur typé (builtin uniquement)."""
+    if typed == 0:
+        return offset
+    if typed == TYPED_CONTAINER_BUILTIN:
+        return offset + 4
+    raise VariantError("Conteneurs typés par classe ou script non supportés")
+
+def store_var(value, numbers_as_float: bool = False) -> bytes:
+    """Équivalent de FileAccess.store_var : longueur sur 32 bits puis Variant."""
+    payload = encode_variant(value, numbers_as_float)
+    return struct.pack("<I", len(payload)) + payload
+
+def get_var(buffer: bytes, offset: int = 0) -> Tuple[object, int]:
+    """Équivalent de FileAccess.get_var. Retourne (valeur, offset après la valeur)."""
+    length, = struct.unpack_from("<I", buffer, offset)
+    offset += 4
+    if offset + length > len(buffer):
+        raise VariantError("Variant tronqué")
+    value, end = decode_variant(buffer[offset:offset + length])
+    return value, offset + length
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+"""
+🔮 Magic Sim - Estimateur Monte Carlo du chaos Octarine et des cascades
+======================================================================
+Réimplémente en tableaux NumPy les règles aléatoires de MagicSystem.gd
+(calculate_chaos_chance, choose_chaos_type, update_ambient_magic,
+check_octarine_surge, décroissance ambiante) et d'ObservationManager.gd
+(calculate_observation_intensity, update_magic_amplification,
+roll_magic_cascade). Des milliers de sessions de jeu avancent en parallèle,
+seconde par seconde, pour estimer les surgissements Octarine par heure.
+
+Paramètres lus dans data/magic_system.json : chaos_base_chance,
+ambient_magic_decay, max_ambient_level, cascade_threshold (seuil du chaos
+secondaire de _on_magic_cascade, codé 3.0 dans le script) et
+chaos_effect_weights (mêmes seuils que choose_chaos_type).
+Les multiplicateurs d'école reprennent le match de calculate_chaos_chance ;
+--school-modifiers json utilise plutôt les chaos_modifier du fichier.
+
+NumPy est requis pour cette sous-commande uniquement.
+
+Usage: python godot_project_fixer.py magic [chemin_projet] [--sessions N] [--hours H] [--casts-per-minute R] [--json]
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # Dépendance optionnelle, vérifiée dans main()
+    np = None
+
+from sb_tools.data_pipeline import load_corpus
+
+# Miroir de MagicSystem.default_config
+DEFAULT_MAGIC_CONFIG = {
+    "chaos_base_chance": 0.20,
+    "octarine_amplification": 1.0,
+    "ambient_magic_decay": 0.01,
+    "cascade_threshold": 3,
+    "max_ambient_level": 10.0
+}
+
+# Miroir de ObservationManager.default_config (+ valeur par défaut de update_magic_amplification)
+DEFAULT_OBSERVATION_CONFIG = {
+    "magic_amplification_rate": 0.1,
+    "magic_amplification_max": 5.0,
+    "cascade_base_chance": 0.15,
+    "disruption_decay_rate": 0.01
+}
+
+# Miroir de l'enum MagicSystem.MagicSchool
+MAGIC_SCHOOLS = ["elemental", "headology", "wizardry", "divine", "chaos", "death_magic", "lspace", "narrative"]
+
+# Multiplicateurs codés dans calculate_chaos_chance (les autres écoles valent 1.0)
+CODE_SCHOOL_MULTIPLIERS = {"chaos": 2.0, "headology": 0.5, "divine": 0.7, "death_magic": 1.5}
+
+# Miroir de l'enum MagicSystem.ChaosType, dans l'ordre des seuils de choose_chaos_type
+CHAOS_TYPES = ["minor_mishap", "spell_reversal", "wild_magic", "reality_hiccup", "narrative_twist", "octarine_overflow"]
+CODE_CHAOS_WEIGHTS = [0.4, 0.2, 0.2, 0.1, 0.07, 0.03]
+OCTARINE_OVERFLOW = CHAOS_TYPES.index("octarine_overflow")
+
+# Miroir de l'enum ObservationManager.ObservationType et de calculate_observation_intensity
+OBSERVATION_INTENSITIES = {"passive": 0.5, "active": 1.0, "detailed": 2.0, "scientific": 3.0}
+
+# Constantes codées dans les scripts
+SURGE_AMBIENT_THRESHOLD = 8.0   # check_octarine_surge
+SURGE_CHANCE = 0.1
+SURGE_AMBIENT_FACTOR = 0.6      # trigger_octarine_surge
+OVERFLOW_OCTARINE_BONUS = 0.5   # handle_octarine_overflow
+AMBIENT_DECAY_PERIOD = 10       # start_ambient_decay_timer (secondes)
+AMBIENT_FLOOR = 0.1             # _process_ambient_decay
+OBSERVED_CASCADE_CHANCE = 0.1   # _on_creature_observed (magic_potential absent du résultat)
+CASCADE_CHAOS_CHANCE = 0.3      # _on_magic_cascade
+
+CHUNK_SIZE = 5000
+
+def require_numpy():
+    """Lève une erreur explicite si NumPy n'est pas installé."""
+    if np is None:
+        raise ValueError("NumPy est requis pour la sous-commande magic (pip install numpy)")
+
+def load_magic_config(corpus: Dict, overrides: Dict = None) -> Dict:
+    """Fusionne les valeurs par défaut des scripts, magic_system.json et les surcharges."""
+    magic = corpus.get("magic", {})
+    config = dict(DEFAULT_MAGIC_CONFIG)
+    config.update(DEFAULT_OBSERVATION_CONFIG)
+    for key in DEFAULT_MAGIC_CONFIG:
+        if key in magic:
+            config[key] = magic[key]
+
+    weights = magic.get("chaos_effect_weights", {})
+    config["chaos_weights"] = [weights.get(name, default) for name, default in zip(CHAOS_TYPES, CODE_CHAOS_WEIGHTS)]
+    config["school_modifiers"] = {name: school.get("chaos_modifier", 1.0)
+                                  for name, school in magic.get("magic_schools", {}).items()
+                                  if isinstance(school, dict)}
+    config.update(overrides or {})
+    return config
+
+def school_multiplier(school: int, config: Dict, source: str = "code") -> float:
+    """Multiplicateur de chaos d'une école (match du script ou chaos_modifier du JSON)."""
+    name = MAGIC_SCHOOLS[school] if 0 <= school < len(MAGIC_SCHOOLS) else ""
+    if source == "json":
+        return config["school_modifiers"].get(name, 1.0)
+    return CODE_SCHOOL_MULTIPLIERS.get(name, 1.0)
+
+def compile_spells(spell_db: Dict, config: Dict, spell_ids: List[str] = None, source: str = "code") -> Dict:
+    """Tableaux des sorts : chance de base × école et puissance."""
+    spells = spell_db.get("spells", spell_db)
+    ids = spell_ids or [key for key, spell in spells.items() if isinstance(spell, dict)]
+    missing = [spell_id for spell_id in ids if spell_id not in spells]
+    if missing:
+        raise ValueError(f"Sort(s) inconnu(s): {', '.join(missing)}")
+    if not ids:
+        raise ValueError("Aucun sort à simuler")
+
+    base = [spells[i].get("chaos_chance", config["chaos_base_chance"])
+            * school_multiplier(int(spells[i].get("school", 0)), config, source) for i in ids]
+    return {
+        "ids": ids,
+        "base_chance": np.array(base, dtype=np.float64),
+        "power": np.array([int(spells[i].get("power", 0)) for i in ids], dtype=np.int64)
+    }
+
+def chaos_chance(base_chance, octarine, ambient, affinity):
+    """calculate_chaos_chance vectorisé (diffusion NumPy sur tous les arguments)."""
+    chance = base_chance * octarine * (1.0 + ambient * 0.1) * (2.0 - affinity)
+    return np.clip(chance, 0.0, 0.95)
+
+def chaos_thresholds(config: Dict):
+    """Seuils cumulés de choose_chaos_type, le dernier type absorbant le reste."""
+    cumulative = np.cumsum(config["chaos_weights"])
+    return cumulative[:-1]
+
+def choose_chaos_types(rng, count: int, thresholds):
+    """choose_chaos_type vectorisé : indices dans CHAOS_TYPES."""
+    return np.searchsorted(thresholds, rng.random(count), side="right")
+
+def probability_surface(spells: Dict, ambient_levels, affinities, octarine_levels) -> Dict:
+    """Chance de chaos pour chaque sort × octarine × magie ambiante × affinité."""
+    surface = chaos_chance(spells["base_chance"][:, None, None, None],
+                           np.asarray(octarine_levels)[None, :, None, None],
+                           np.asarray(ambient_levels)[None, None, :, None],
+                           np.asarray(affinities)[None, None, None, :])
+    return {
+        "spells": spells["ids"],
+        "octarine_levels": [float(v) for v in octarine_levels],
+        "ambient_levels": [float(v) for v in ambient_levels],
+        "affinities": [float(v) for v in affinities],
+        "chaos_chance": np.round(surface, 6).tolist()
+    }
+
+class SessionBatch:
+    """État de MagicSystem et ObservationManager pour un lot de sessions."""
+
+    def __init__(self, size: int, config: Dict, creature_count: int):
+        self.config = config
+        self.ambient = np.ones(size)
+        self.octarine = np.ones(size)
+        self.amplification = np.ones(size)
+        self.disruption = np.zeros(size)
+        self.observation_counts = np.zeros((size, creature_count), dtype=np.int64)
+        self.surges = np.zeros(size, dtype=np.int64)
+        self.first_surge = np.full(size, -1, dtype=np.int64)
+        self.casts = np.zeros(size, dtype=np.int64)
+        self.chaos_events = np.zeros((size, len(CHAOS_TYPES)), dtype=np.int64)
+        self.cascades = np.zeros(size, dtype=np.int64)
+        self.cascade_chaos = np.zeros(size, dtype=np.int64)
+        self.seconds_above_surge = np.zeros(size, dtype=np.int64)
+
+    def update_ambient_magic(self, rng, idx, power_level, second: int):
+        """update_ambient_magic + check_octarine_surge pour les sessions idx (distinctes)."""
+        if idx.size == 0:
+            return
+        level = np.clip(self.ambient[idx] + power_level * 0.1, 0.0, self.config["max_ambient_level"])
+        surge = (level > SURGE_AMBIENT_THRESHOLD) & (rng.random(idx.size) < SURGE_CHANCE)
+        level[surge] *= SURGE_AMBIENT_FACTOR
+        self.ambient[idx] = level
+
+        surged = idx[surge]
+        self.surges[surged] += 1
+        first = surged[self.first_surge[surged] < 0]
+        self.first_surge[first] = second
+
+    def cast_spells(self, rng, idx, spells: Dict, affinity: float, thresholds, second: int):
+        """cast_spell : test de chaos, sinon effet normal et hausse de la magie ambiante."""
+        if idx.size == 0:
+            return
+        chosen = rng.integers(len(spells["ids"]), size=idx.size)
+        chance = chaos_chance(spells["base_chance"][chosen], self.octarine[idx], self.ambient[idx], affinity)
+        chaos = rng.random(idx.size) < chance
+        self.casts[idx] += 1
+
+        chaotic = idx[chaos]
+        types = choose_chaos_types(rng, chaotic.size, thresholds)
+        self.chaos_events[chaotic, types] += 1
+        self.octarine[chaotic[types == OCTARINE_OVERFLOW]] += OVERFLOW_OCTARINE_BONUS
+
+        # Un sort chaotique retourne avant update_ambient_magic
+        self.update_ambient_magic(rng, idx[~chaos], spells["power"][chosen[~chaos]], second)
+
+    def observe(self, rng, idx, type_intensities, difficulty: float, thresholds, second: int):
+        """observe_creature puis les réactions de MagicSystem, dans l'ordre des signaux."""
+        if idx.size == 0:
+            return
+        config = self.config
+        creature = rng.integers(self.observation_counts.shape[1], size=idx.size)
+        self.observation_counts[idx, creature] += 1
+
+        familiarity = np.minimum(self.observation_counts[idx, creature] * 0.1, 1.0)
+        base = type_intensities[rng.integers(type_intensities.size, size=idx.size)]
+        intensity = base * (1.0 + familiarity) * difficulty * self.amplification[idx]
+
+        self.amplification[idx] = np.minimum(
+            self.amplification[idx] + intensity * config["magic_amplification_rate"] * 0.01,
+            config["magic_amplification_max"])
+        self.disruption[idx] = np.minimum(self.disruption[idx] + intensity * 0.02, 1.0)
+
+        # creature_observed -> MagicSystem._on_creature_observed -> trigger_magic_cascade(0.5)
+        observed = rng.random(idx.size) < OBSERVED_CASCADE_CHANCE
+        self.update_ambient_magic(rng, idx[observed], 1, second)
+
+        # roll_magic_cascade -> magic_cascade_triggered -> MagicSystem._on_magic_cascade
+        cascade_chance = config["cascade_base_chance"] * intensity * self.disruption[idx]
+        triggered = rng.random(idx.size) < cascade_chance
+        cascading = idx[triggered]
+        cascade_intensity = (intensity[triggered] * self.amplification[cascading]
+                             * rng.uniform(0.5, 1.5, size=cascading.size))
+        self.cascades[cascading] += 1
+        self.update_ambient_magic(rng, cascading, cascade_intensity.astype(np.int64), second)
+
+        secondary = (cascade_intensity > config["cascade_threshold"]) & (rng.random(cascading.size) < CASCADE_CHAOS_CHANCE)
+        self.cascade_chaos[cascading[secondary]] += 1
+
+    def tick_timers(self, second: int):
+        """Timers de décroissance : magie ambiante (10 s) et perturbation (1 s)."""
+        if second % AMBIENT_DECAY_PERIOD == 0:
+            self.ambient = np.maximum(AMBIENT_FLOOR, self.ambient - self.config["ambient_magic_decay"])
+        self.disruption = np.maximum(0.0, self.disruption - self.config["disruption_decay_rate"])
+
+def run_chunk(task: Dict) -> Dict:
+    """Simule un lot de sessions avec sa propre graine (exécuté dans un processus)."""
+    rng = np.random.default_rng([task["seed"], task["chunk_index"]])
+    config = task["config"]
+    spells = task["spells"]
+    size = task["size"]
+    thresholds = chaos_thresholds(config)
+    type_intensities = np.array([OBSERVATION_INTENSITIES[t] for t in task["observation_types"]])
+    cast_p = task["casts_per_minute"] / 60.0
+    observe_p = task["observations_per_minute"] / 60.0
+
+    batch = SessionBatch(size, config, task["creature_count"])
+    for second in range(1, task["seconds"] + 1):
+        batch.cast_spells(rng, np.flatnonzero(rng.random(size) < cast_p), spells,
+                          task["affinity"], thresholds, second)
+        batch.observe(rng, np.flatnonzero(rng.random(size) < observe_p), type_intensities,
+                      task["difficulty"], thresholds, second)
+        batch.tick_timers(second)
+        batch.seconds_above_surge += batch.ambient > SURGE_AMBIENT_THRESHOLD
+
+    return {
+        "surges": batch.surges,
+        "first_surge": batch.first_surge,
+        "casts": batch.casts,
+        "chaos_events": batch.chaos_events,
+        "cascades": batch.cascades,
+        "cascade_chaos": batch.cascade_chaos,
+        "seconds_above_surge": batch.seconds_above_surge,
+        "ambient": batch.ambient,
+        "octarine": batch.octarine,
+        "amplification": batch.amplification
+    }
+
+def build_tasks(params: Dict, sessions: int, seed: int) -> List[Dict]:
+    """Découpe les sessions en lots de CHUNK_SIZE à graines déterministes."""
+    tasks = []
+    for chunk_index, start in enumerate(range(0, sessions, CHUNK_SIZE)):
+        task = dict(params)
+        task.update({"seed": seed, "chunk_index": chunk_index, "size": min(CHUNK_SIZE, sessions - start)})
+        tasks.append(task)
+    return tasks
+
+def _percentiles(values, points=(50, 90, 99)) -> Dict[str, float]:
+    if values.size == 0:
+        return {}
+    return {f"p{p}": round(float(np.percentile(values, p)), 3) for p in points}
+
+def summarize(chunks: List[Dict], hours: float) -> Dict:
+    """Agrège les lots : fréquences par heure, distributions et répartition du chaos."""
+    merged = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+    sessions = merged["surges"].size
+    surges_per_hour = merged["surges"] / hours
+    first_surge = merged["first_surge"][merged["first_surge"] >= 0] / 60.0
+    chaos_by_type = merged["chaos_events"].sum(axis=0)
+    total_casts = int(merged["casts"].sum())
+    total_chaos = int(chaos_by_type.sum())
+
+    return {
+        "sessions": sessions,
+        "hours": hours,
+        "surges_per_hour": round(float(surges_per_hour.mean()), 4),
+        "surges_per_hour_percentiles": _percentiles(surges_per_hour),
+        "sessions_with_surge": round(float((merged["surges"] > 0).mean()), 4),
+        "first_surge_minutes": _percentiles(first_surge),
+        "time_above_surge_threshold": round(float(merged["seconds_above_surge"].mean() / (hours * 3600)), 4),
+        "casts_per_hour": round(total_casts / sessions / hours, 3),
+        "chaos_rate_per_cast": round(total_chaos / total_casts, 4) if total_casts else 0.0,
+        "chaos_per_hour": round(total_chaos / sessions / hours, 3),
+        "chaos_types": {name: int(count) for name, count in zip(CHAOS_TYPES, chaos_by_type)},
+        "cascades_per_hour": round(float(merged["cascades"].mean() / hours), 3),
+        "cascade_chaos_per_hour": round(float(merged["cascade_chaos"].mean() / hours), 3),
+        "final_ambient_mean": round(float(merged["ambient"].mean()), 3),
+        "final_octarine_mean": round(float(merged["octarine"].mean()), 3),
+        "final_amplification_mean": round(float(merged["amplification"].mean()), 3)
+    }
+
+def run_simulation(params: Dict, sessions: int, seed: int = 0, jobs: int = None) -> Dict:
+    """Lance la simulation (en parallèle si plusieurs lots)."""
+    tasks = build_tasks(params, sessions, seed)
+    if len(tasks) <= 1 or jobs == 1:
+        chunks = [run_chunk(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunks = list(pool.map(run_chunk, tasks))
+    return summarize(chunks, params["seconds"] / 3600.0)
+
+def _floats(text: str) -> List[float]:
+    return [float(value) for value in text.split(",") if value]
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande magic."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py magic",
+                                     description="Estime le chaos Octarine, les cascades et les surgissements")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--sessions", "-n", type=int, default=10000, help="Sessions simulées")
+    parser.add_argument("--hours", type=float, default=1.0, help="Durée de jeu par session (heures)")
+    parser.add_argument("--casts-per-minute", type=float, default=2.0, help="Sorts lancés par minute")
+    parser.add_argument("--observations-per-minute", type=float, default=1.0, help="Observations par minute")
+    parser.add_argument("--observation-types", default="passive,active,detailed,scientific",
+                        help="Types d'observation tirés uniformément")
+    parser.add_argument("--creatures", type=int, default=5, help="Créatures distinctes observées")
+    parser.add_argument("--difficulty", type=float, default=1.0, help="observation_difficulty des créatures")
+    parser.add_argument("--spells", default="", help="Sorts lancés (défaut: tous), séparés par des virgules")
+    parser.add_argument("--affinity", type=float, default=1.0, help="Affinité magique du lanceur")
+    parser.add_argument("--school-modifiers", choices=["code", "json"], default="code",
+                        help="Multiplicateurs d'école: match du script ou chaos_modifier du JSON")
+    parser.add_argument("--ambient-levels", default="0,1,2,3,4,5,6,7,8,9,10", help="Grille de magie ambiante")
+    parser.add_argument("--affinities", default="0.5,1.0,1.5", help="Grille d'affinités")
+    parser.add_argument("--octarine-levels", default="1.0,1.5,2.0", help="Grille de concentration Octarine")
+    parser.add_argument("--config", default="{}", help="Surcharges JSON (magic_system.json et observation_system)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de base")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    observation_types = [t for t in args.observation_types.split(",") if t]
+    unknown = [t for t in observation_types if t not in OBSERVATION_INTENSITIES]
+    if unknown or not observation_types:
+        parser.error(f"Type d'observation inconnu: {', '.join(unknown)}")
+
+    try:
+        require_numpy()
+        corpus = load_corpus(Path(args.project_root) / "data")
+        config = load_magic_config(corpus, json.loads(args.config))
+        spells = compile_spells(corpus.get("spells", {}), config,
+                                [s for s in args.spells.split(",") if s], args.school_modifiers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    started = time.perf_counter()
+    surface = probability_surface(spells, _floats(args.ambient_levels), _floats(args.affinities),
+                                  _floats(args.octarine_levels))
+    params = {
+        "config": config,
+        "spells": spells,
+        "seconds": int(round(args.hours * 3600)),
+        "casts_per_minute": args.casts_per_minute,
+        "observations_per_minute": args.observations_per_minute,
+        "observation_types": observation_types,
+        "creature_count": max(1, args.creatures),
+        "difficulty": args.difficulty,
+        "affinity": args.affinity
+    }
+    report = run_simulation(params, args.sessions, args.seed, args.jobs)
+    duration = time.perf_counter() - started
+
+    chaos_distribution = dict(zip(CHAOS_TYPES, np.diff(np.concatenate([[0.0], chaos_thresholds(config), [1.0]]))))
+    if args.json:
+        print(json.dumps({
+            "config": {key: value for key, value in config.items() if key != "school_modifiers"},
+            "chaos_type_distribution": {name: round(float(p), 4) for name, p in chaos_distribution.items()},
+            "surface": surface,
+            "simulation": report,
+            "duration_s": round(duration, 3)
+        }, indent=2, ensure_ascii=False))
+        return 0
+
+    # Tranche de la surface : octarine et affinité au plus proche de 1.0
+    octarine_index = int(np.argmin(np.abs(np.array(surface["octarine_levels"]) - 1.0)))
+    affinity_index = int(np.argmin(np.abs(np.array(surface["affinities"]) - 1.0)))
+    print(f"🔮 Chance de chaos (octarine {surface['octarine_levels'][octarine_index]}, "
+          f"affinité {surface['affinities'][affinity_index]}) selon la magie ambiante:")
+    print(f"  {'sort':<28}" + "".join(f"{level:>7g}" for level in surface["ambient_levels"]))
+    for spell_id, table in zip(surface["spells"], surface["chaos_chance"]):
+        row = [per_ambient[affinity_index] for per_ambient in table[octarine_index]]
+        print(f"  {spell_id:<28}" + "".join(f"{value:>7.1%}" for value in row))
+
+    print(f"\n⚡ {report['sessions']} session(s) de {report['hours']:g} h simulées en {duration:.2f} s")
+    print(f"  Surgissements Octarine/heure: {report['surges_per_hour']} "
+          f"(p50 {report['surges_per_hour_percentiles'].get('p50', 0)}, "
+          f"p90 {report['surges_per_hour_percentiles'].get('p90', 0)})")
+    print(f"  Sessions avec surgissement: {report['sessions_with_surge']:.1%}, "
+          f"premier surgissement p50: {report['first_surge_minutes'].get('p50', '-')} min")
+    print(f"  Temps au-dessus du seuil ({SURGE_AMBIENT_THRESHOLD:g}): {report['time_above_surge_threshold']:.1%}")
+    print(f"  Chaos: {report['chaos_rate_per_cast']:.1%} des sorts, {report['chaos_per_hour']}/h "
+          f"(+{report['cascade_chaos_per_hour']}/h via cascades)")
+    print(f"  Cascades/heure: {report['cascades_per_hour']}, octarine finale: {report['final_octarine_mean']}, "
+          f"amplification finale: {report['final_amplification_mean']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
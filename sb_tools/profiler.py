@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+🔬 Profiler - Sondes de temps injectées dans les fonctions chaudes
+==================================================================
+Mode opt-in du fixer : --instrument enveloppe les fonctions appelées à chaque
+frame (Player._physics_process, Creature._physics_process / update_behavior,
+NPC._physics_process, GameHUD._process / update_all_displays,
+GameManager._process) dans des sondes Profiler.enter / Profiler.exit
+(Time.get_ticks_usec) et enregistre l'AutoLoad Profiler
+(scripts/debug/FrameProfiler.gd : histogrammes par pile d'appels, tampon
+circulaire, dump JSON dans user://profiles/ à la sortie du jeu).
+
+Transformation réversible : la fonction d'origine est renommée
+<nom>__profiled (corps intact) et une enveloppe du même nom l'appelle entre
+les deux sondes. Chaque ligne ajoutée porte le marqueur "# @profiler", la
+ligne renommée "# @profiler:rename" : --strip restaure les fichiers à l'octet
+près et retire l'AutoLoad. L'aller-retour est vérifié avant toute écriture ;
+--check échoue s'il reste une sonde (à lancer avant un export).
+
+--report agrège un ou plusieurs dumps (défaut : dossier user:// du projet) :
+arbre des piles façon flame graph (temps total, propre, appels, p95, max) et
+--folded écrit le format "A;B;C µs" de flamegraph.pl / speedscope.
+
+Usage: python godot_project_fixer.py profile [chemin_projet] (--instrument | --strip | --check | --report [DUMP...]) [--probe Classe.fonction] [--folded FICHIER] [--top N] [--json]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sb_tools.autoload_check import _atomic_write_text, apply_project_fixes, parse_autoloads
+from sb_tools.gd_index import FUNC_RE, build_index, build_lookup, collect_scripts
+
+DEFAULT_PROBES = (
+    "Player._physics_process",
+    "Creature._physics_process",
+    "Creature.update_behavior",
+    "NPC._physics_process",
+    "GameHUD._process",
+    "GameHUD.update_all_displays",
+    "GameManager._process"
+)
+PROBE_MARKER = "# @profiler"
+RENAME_MARKER = "# @profiler:rename"
+RENAMED_SUFFIX = "__profiled"
+RESULT_VARIABLE = "__profiled_result"
+PROFILER_AUTOLOAD = "Profiler"
+PROFILER_SCRIPT = "res://scripts/debug/FrameProfiler.gd"
+DUMP_FORMAT_VERSION = 1
+DUMP_SUBDIR = "profiles"
+
+RENAMED_DEF_RE = re.compile(r"^(\s*(?:static\s+)?func\s+\w+?)" + RENAMED_SUFFIX + r"\(")
+RETURN_VALUE_RE = re.compile(r"^\s*return\s+\S")
+
+class ProfilerError(ValueError):
+    """Fonction introuvable ou transformation non réversible."""
+
+# ================================
+# INSTRUMENTATION
+# ================================
+
+def _split_lines(text: str) -> Tuple[List[str], str]:
+    newline = "\r\n" if "\r\n" in text else "\n"
+    return text.split(newline), newline
+
+def _function_body(lines: List[str], def_index: int) -> List[str]:
+    """Lignes du corps d'une fonction de premier niveau (jusqu'au prochain code non indenté)."""
+    body = []
+    for line in lines[def_index + 1:]:
+        if line and not line[0].isspace() and not line.startswith("#"):
+            break
+        body.append(line)
+    return body
+
+def _indent_unit(body: List[str]) -> str:
+    for line in body:
+        if line.strip():
+            return line[:len(line) - len(line.lstrip())]
+    return "\t"
+
+def instrument_source(text: str, probes: List[Tuple[str, Dict]]) -> Tuple[str, List[str], Dict[str, str]]:
+    """Enveloppe les fonctions (libellé, symbole gd_index) ; retourne texte, libellés faits et ignorés."""
+    lines, newline = _split_lines(text)
+    done, skipped = [], {}
+    # Du bas vers le haut : les insertions ne décalent pas les lignes restant à traiter
+    for label, function in sorted(probes, key=lambda item: -item[1]["line"]):
+        index = function["line"] - 1
+        name = function["name"]
+        line = lines[index]
+        match = FUNC_RE.match(line.lstrip())
+        if function["class"] is not None or line[:1].isspace():
+            skipped[label] = "fonction de classe interne"
+            continue
+        if not match or match.group(2) != name:
+            skipped[label] = "signature sur plusieurs lignes"
+            continue
+        if any(RENAME_MARKER in other and f"func {name}{RENAMED_SUFFIX}(" in other for other in lines):
+            skipped[label] = "déjà instrumentée"
+            continue
+        body = _function_body(lines, index)
+        if any(re.search(r"\bawait\b", body_line) for body_line in body):
+            skipped[label] = "coroutine (await)"
+            continue
+
+        unit = _indent_unit(body)
+        returns_value = (function["return_type"] not in (None, "void")
+                         or (function["return_type"] is None and any(RETURN_VALUE_RE.match(b) for b in body)))
+        call = f"{name}{RENAMED_SUFFIX}({', '.join(param['name'] for param in function['params'])})"
+        wrapper = [f"{match.group(0)}  {PROBE_MARKER}",
+                   f'{unit}Profiler.enter(&"{label}")  {PROBE_MARKER}']
+        if returns_value:
+            wrapper += [f"{unit}var {RESULT_VARIABLE} = {call}  {PROBE_MARKER}",
+                        f"{unit}Profiler.exit()  {PROBE_MARKER}",
+                        f"{unit}return {RESULT_VARIABLE}  {PROBE_MARKER}"]
+        else:
+            wrapper += [f"{unit}{call}  {PROBE_MARKER}",
+                        f"{unit}Profiler.exit()  {PROBE_MARKER}"]
+        wrapper.append(PROBE_MARKER)
+
+        lines[index] = line.replace(f"func {name}(", f"func {name}{RENAMED_SUFFIX}(", 1) + "  " + RENAME_MARKER
+        lines[index:index] = wrapper
+        done.append(label)
+    return newline.join(lines), sorted(done), skipped
+
+def strip_source(text: str) -> str:
+    """Transformation inverse : retire les lignes marquées et rend son nom à la fonction d'origine."""
+    lines, newline = _split_lines(text)
+    kept = []
+    for line in lines:
+        if line.endswith("  " + RENAME_MARKER):
+            kept.append(RENAMED_DEF_RE.sub(r"\1(", line[:-len("  " + RENAME_MARKER)], count=1))
+        elif line == PROBE_MARKER or line.endswith("  " + PROBE_MARKER):
+            continue
+        else:
+            kept.append(line)
+    return newline.join(kept)
+
+def is_instrumented(text: str) -> bool:
+    return any(line == PROBE_MARKER or line.endswith("  " + PROBE_MARKER) or line.endswith("  " + RENAME_MARKER)
+               for line in _split_lines(text)[0])
+
+def resolve_probes(index: Dict, probes: List[str]) -> Tuple[Dict[str, List[Tuple[str, Dict]]], Dict[str, str]]:
+    """Sondes par script ; "Classe.fonction" désigne un class_name ou, à défaut, le nom du fichier."""
+    lookup = build_lookup(index)
+    by_stem = {}
+    for script in index["scripts"]:
+        by_stem.setdefault(Path(script).stem, []).append(script)
+
+    resolved, unknown = {}, {}
+    for label in probes:
+        owner, _, function_name = label.partition(".")
+        script = lookup["classes"].get(owner)
+        if script is None and len(by_stem.get(owner, [])) == 1:
+            script = by_stem[owner][0]
+        if script is None:
+            unknown[label] = f"aucun script pour {owner}"
+            continue
+        function = next((f for f in index["scripts"][script]["functions"]
+                         if f["name"] == function_name and f["class"] is None), None)
+        if function is None:
+            unknown[label] = f"{script} ne définit pas {function_name}"
+            continue
+        resolved.setdefault(script, []).append((label, function))
+    return resolved, unknown
+
+def project_with_profiler(text: str) -> str:
+    """project.godot avec l'AutoLoad Profiler (inchangé s'il y est déjà)."""
+    if any(autoload["name"] == PROFILER_AUTOLOAD for autoload in parse_autoloads(text)):
+        return text
+    return apply_project_fixes(text, {"renames": {}, "register": [{"name": PROFILER_AUTOLOAD, "path": PROFILER_SCRIPT}]})
+
+def project_without_profiler(text: str) -> str:
+    """project.godot sans l'AutoLoad Profiler enregistré par --instrument."""
+    lines = text.split("\n")
+    for autoload in reversed(parse_autoloads(text)):
+        if autoload["name"] == PROFILER_AUTOLOAD and autoload["path"] == PROFILER_SCRIPT:
+            del lines[autoload["line"]]
+    return "\n".join(lines)
+
+def instrument_project(project_root: Path, probes: List[str]) -> Dict:
+    """Instrumente les scripts et enregistre l'AutoLoad ; rien n'est écrit si un aller-retour échoue."""
+    index = build_index(str(project_root))
+    resolved, unknown = resolve_probes(index, probes)
+    writes, done, skipped = {}, [], dict(unknown)
+    for script, script_probes in resolved.items():
+        original = (project_root / script).read_text(encoding="utf-8")
+        instrumented, script_done, script_skipped = instrument_source(original, script_probes)
+        skipped.update(script_skipped)
+        if not script_done:
+            continue
+        if strip_source(instrumented) != original:
+            raise ProfilerError(f"{script}: le retrait des sondes ne restaurerait pas le fichier (marqueurs déjà présents ?)")
+        writes[script] = instrumented
+        done.extend(script_done)
+
+    project_file = project_root / "project.godot"
+    if writes and project_file.exists():
+        text = project_file.read_text(encoding="utf-8")
+        updated = project_with_profiler(text)
+        if updated != text:
+            writes["project.godot"] = updated
+    for relative, content in writes.items():
+        _atomic_write_text(project_root / relative, content)
+    return {"instrumented": sorted(done), "skipped": skipped, "files": sorted(writes)}
+
+def strip_project(project_root: Path) -> List[str]:
+    """Retire toutes les sondes des scripts et l'AutoLoad Profiler ; retourne les fichiers restaurés."""
+    restored = []
+    for path in collect_scripts(project_root):
+        text = path.read_text(encoding="utf-8")
+        if is_instrumented(text):
+            _atomic_write_text(path, strip_source(text))
+            restored.append(path.relative_to(project_root).as_posix())
+    project_file = project_root / "project.godot"
+    if project_file.exists():
+        text = project_file.read_text(encoding="utf-8")
+        stripped = project_without_profiler(text)
+        if stripped != text:
+            _atomic_write_text(project_file, stripped)
+            restored.append("project.godot")
+    return restored
+
+def leftover_probes(project_root: Path) -> List[str]:
+    """Fichiers contenant encore des sondes ou l'AutoLoad Profiler."""
+    leftovers = [path.relative_to(project_root).as_posix() for path in collect_scripts(project_root)
+                 if is_instrumented(path.read_text(encoding="utf-8"))]
+    project_file = project_root / "project.godot"
+    if project_file.exists() and project_without_profiler(project_file.read_text(encoding="utf-8")) != project_file.read_text(encoding="utf-8"):
+        leftovers.append("project.godot")
+    return leftovers
+
+# ================================
+# RAPPORTS
+# ================================
+
+def user_data_dir(project_root: Path) -> Optional[Path]:
+    """Dossier user:// du projet (app_userdata/<config/name>) selon la plateforme."""
+    project_file = project_root / "project.godot"
+    if not project_file.exists():
+        return None
+    match = re.search(r'^config/name="(.*)"', project_file.read_text(encoding="utf-8"), re.MULTILINE)
+    if not match:
+        return None
+    if sys.platform == "win32":
+        base = Path(os.environ.get("APPDATA", Path.home())) / "Godot"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support" / "Godot"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "godot"
+    return base / "app_userdata" / match.group(1)
+
+def collect_dumps(sources: List[str]) -> List[Path]:
+    dumps = []
+    for source in sources:
+        path = Path(source)
+        dumps.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return dumps
+
+def aggregate(dumps: List[Dict]) -> Dict:
+    """Somme des dumps : statistiques et échantillons du tampon par pile d'appels."""
+    stacks: Dict[str, Dict] = {}
+    frames = duration = 0
+    for dump in dumps:
+        if dump.get("format_version") != DUMP_FORMAT_VERSION:
+            raise ProfilerError(f"format_version {dump.get('format_version')} non supportée")
+        frames += dump.get("frames", 0)
+        duration += dump.get("duration_usec", 0)
+        names = []
+        for entry in dump["paths"]:
+            names.append(entry["stack"])
+            stats = stacks.setdefault(entry["stack"], {"calls": 0, "total_usec": 0, "self_usec": 0, "max_usec": 0,
+                                                       "histogram": [0] * len(entry["histogram"]), "samples": []})
+            stats["calls"] += entry["calls"]
+            stats["total_usec"] += entry["total_usec"]
+            stats["self_usec"] += entry["self_usec"]
+            stats["max_usec"] = max(stats["max_usec"], entry["max_usec"])
+            stats["histogram"] = [a + b for a, b in zip(stats["histogram"], entry["histogram"])]
+        ring = dump.get("ring", {})
+        for path_id, sample in zip(ring.get("paths", []), ring.get("durations_usec", [])):
+            stacks[names[path_id]]["samples"].append(sample)
+    return {"dumps": len(dumps), "frames": frames, "duration_usec": duration, "stacks": stacks}
+
+def percentile(stats: Dict, ratio: float) -> Tuple[float, bool]:
+    """Percentile exact sur les échantillons du tampon, sinon borne haute du seau d'histogramme."""
+    samples = sorted(stats["samples"])
+    if samples:
+        return float(samples[min(int(ratio * len(samples)), len(samples) - 1)]), True
+    target = ratio * sum(stats["histogram"])
+    seen = 0
+    for bucket, count in enumerate(stats["histogram"]):
+        seen += count
+        if count and seen >= target:
+            return float(2 ** (bucket + 1)), False
+    return 0.0, False
+
+def flame_rows(report: Dict) -> List[Dict]:
+    """Lignes de l'arbre des piles, parents d'abord et enfants triés par temps total."""
+    stacks = report["stacks"]
+    children: Dict[str, List[str]] = {}
+    for stack in stacks:
+        parent = stack.rpartition(";")[0]
+        children.setdefault(parent, []).append(stack)
+
+    rows = []
+    def visit(parent: str, depth: int):
+        for stack in sorted(children.get(parent, []), key=lambda s: -stacks[s]["total_usec"]):
+            stats = stacks[stack]
+            p95, exact = percentile(stats, 0.95)
+            rows.append({"stack": stack, "name": stack.rpartition(";")[2], "depth": depth,
+                         "calls": stats["calls"], "total_usec": stats["total_usec"], "self_usec": stats["self_usec"],
+                         "avg_usec": stats["total_usec"] / stats["calls"] if stats["calls"] else 0.0,
+                         "p95_usec": p95, "p95_exact": exact, "max_usec": stats["max_usec"]})
+            visit(stack, depth + 1)
+    visit("", 0)
+    return rows
+
+def folded_stacks(report: Dict) -> str:
+    """Format replié (flamegraph.pl, speedscope) : "A;B;C temps_propre_µs" par ligne."""
+    return "".join(f"{stack} {stats['self_usec']}\n" for stack, stats in sorted(report["stacks"].items())
+                   if stats["self_usec"] > 0)
+
+def print_report(report: Dict, rows: List[Dict], top: int):
+    frames = report["frames"]
+    print(f"🔬 {report['dumps']} dump(s), {frames} frames, {report['duration_usec'] / 1e6:.1f} s")
+    if not rows:
+        print("  (aucune sonde déclenchée)")
+        return
+    roots_total = sum(row["total_usec"] for row in rows if row["depth"] == 0) or 1
+    print(f"\n🔥 {'Pile':<44} {'total ms':>9} {'%':>5} {'propre ms':>9} {'appels':>8} {'/frame':>7} "
+          f"{'moy µs':>8} {'p95 µs':>8} {'max µs':>8}")
+    for row in rows:
+        share = row["total_usec"] / roots_total
+        label = ("  " * row["depth"] + row["name"])[:44]
+        per_frame = row["calls"] / frames if frames else 0.0
+        p95 = f"{row['p95_usec']:.0f}" if row["p95_exact"] else f"~{row['p95_usec']:.0f}"
+        print(f"   {label:<44} {row['total_usec'] / 1000:>9.1f} {share:>5.0%} {row['self_usec'] / 1000:>9.1f} "
+              f"{row['calls']:>8} {per_frame:>7.2f} {row['avg_usec']:>8.1f} {p95:>8} {row['max_usec']:>8}")
+        bar = "█" * max(1, round(share * 40)) if share > 0 else ""
+        print(f"   {'  ' * row['depth']}{bar}")
+
+    hottest = sorted(rows, key=lambda row: -row["self_usec"])[:top]
+    print(f"\n🌡️ Temps propre le plus élevé:")
+    for row in hottest:
+        per_frame = row["self_usec"] / frames / 1000 if frames else 0.0
+        print(f"  {row['self_usec'] / 1000:>9.1f} ms ({per_frame:.3f} ms/frame) {row['stack']}")
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande profile."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py profile",
+                                     description="Instrumente les fonctions chaudes et agrège les profils")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--instrument", action="store_true", help="Injecte les sondes et l'AutoLoad Profiler")
+    action.add_argument("--strip", action="store_true", help="Retire toutes les sondes (transformation inverse)")
+    action.add_argument("--check", action="store_true", help="Échoue s'il reste des sondes (avant un export)")
+    action.add_argument("--report", nargs="*", metavar="DUMP", help="Dumps ou dossiers (défaut: user://profiles)")
+    parser.add_argument("--probe", action="append", metavar="Classe.fonction",
+                        help=f"Fonction à instrumenter (répétable ; défaut: {', '.join(DEFAULT_PROBES)})")
+    parser.add_argument("--folded", help="Écrit les piles au format replié (flamegraph.pl, speedscope)")
+    parser.add_argument("--top", type=int, default=10, help="Piles affichées au classement du temps propre")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    try:
+        if args.instrument:
+            result = instrument_project(project_root, args.probe or list(DEFAULT_PROBES))
+            for label in result["instrumented"]:
+                print(f"🔬 {label}")
+            for label, reason in sorted(result["skipped"].items()):
+                print(f"⚠️ {label}: {reason}")
+            if result["files"]:
+                print(f"✅ {len(result['instrumented'])} sonde(s) dans {', '.join(result['files'])}")
+                print("   Retrait: python godot_project_fixer.py profile --strip")
+            return 0 if result["instrumented"] else 1
+
+        if args.strip:
+            restored = strip_project(project_root)
+            print(f"🧹 {len(restored)} fichier(s) restauré(s)" + (f": {', '.join(restored)}" if restored else ""))
+            return 0
+
+        if args.check:
+            leftovers = leftover_probes(project_root)
+            if leftovers:
+                print(f"❌ Sondes de profilage présentes: {', '.join(leftovers)}")
+                print("   python godot_project_fixer.py profile --strip")
+                return 1
+            print("✅ Aucune sonde de profilage")
+            return 0
+
+        sources = args.report
+        if not sources:
+            user_dir = user_data_dir(project_root)
+            if user_dir is None:
+                print("❌ Dossier user:// introuvable (project.godot sans config/name) : passer les dumps en argument")
+                return 1
+            sources = [str(user_dir / DUMP_SUBDIR)]
+        dump_paths = collect_dumps(sources)
+        if not dump_paths:
+            print(f"❌ Aucun dump dans {', '.join(sources)}")
+            return 1
+        report = aggregate([json.loads(path.read_text(encoding="utf-8")) for path in dump_paths])
+    except (ProfilerError, OSError, json.JSONDecodeError, KeyError, IndexError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    rows = flame_rows(report)
+    if args.folded:
+        Path(args.folded).write_text(folded_stacks(report), encoding="utf-8")
+    if args.json:
+        print(json.dumps({key: value for key, value in report.items() if key != "stacks"} | {"rows": rows},
+                         indent=2, ensure_ascii=False))
+    else:
+        print_report(report, rows, args.top)
+        if args.folded:
+            print(f"\n📄 Piles repliées: {args.folded}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
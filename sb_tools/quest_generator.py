@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""
+🎯 Quest Generator - Génération procédurale de quêtes en masse
+==============================================================
+Compile une seule fois les formules de quest_templates.json (récompenses des
+templates, difficulty_scaling et reward_scaling de procedural_generation) en
+expressions arithmétiques vérifiées (ast : nombres, variables connues,
++ - * / // % **, min/max/round), puis produit des milliers de quêtes
+reproductibles (graine) pour chaque acte et ses location_restrictions,
+écrites au fil de l'eau en JSON Lines.
+
+Règles de génération :
+- seuls les templates des catégories auto_generation sont tirés ;
+- difficulty_multiplier = base_difficulty × poids de difficulté du template
+  × (1 ± random_variance) × (1 + story_progression_modifier × indice d'acte) ;
+- xp = formule du template × xp_multiplier de la catégorie + xp_base ;
+- monnaie = fourchette du template ("2-5 AM_dollars") + currency_base ;
+- réputation = valeur du template (fourchettes "variable (-20 to +30)"
+  tirées), reputation_base pour les valeurs sans fourchette ;
+- niveau du joueur tiré dans ACT_LEVEL_RANGES, borné par level_min.
+
+Le rapport donne la distribution des récompenses par acte, la couverture
+des templates et des pools (créatures, lieux, PNJ, variables non résolues)
+et la santé du tableau de quêtes : combinaisons distinctes par acte, jours de
+contenu neuf à daily_refresh_rate et doublons dans un tableau de
+max_active_procedural quêtes.
+
+Usage: python godot_project_fixer.py quests [chemin_projet] [--count N] [--seed S] [--output quests.jsonl] [--set variable=valeur] [--json]
+"""
+
+import re
+import ast
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sb_tools.data_pipeline import load_corpus
+
+ACTS = ["prologue", "act1", "act2", "act3"]
+
+# Hypothèse de progression : niveaux du joueur rencontrés dans chaque acte
+ACT_LEVEL_RANGES = {
+    "prologue": (1, 3),
+    "act1": (2, 10),
+    "act2": (8, 25),
+    "act3": (20, 50)
+}
+
+# Restrictions valant "tous les lieux connus"
+LOCATION_WILDCARDS = {"all_ankh_morpork", "all_regions"}
+
+DIFFICULTY_WEIGHTS = {"trivial": 0.5, "easy": 1.0, "medium": 1.5, "hard": 2.0, "epic": 3.0}
+RARITY_LEVELS = {"common": 1, "uncommon": 2, "rare": 3, "very_rare": 4, "legendary": 5, "unique": 5}
+
+# Variables des formules sans source dans les données (surchargeables par --set)
+DEFAULT_VARIABLES = {
+    "economic_inflation": 1.0,
+    "faction_importance": 1.0,
+    "complexity_factor": 2.0
+}
+KNOWN_VARIABLES = {"player_level", "difficulty_multiplier", "creature_rarity"} | set(DEFAULT_VARIABLES)
+
+SAFE_FUNCTIONS = {"min": min, "max": max, "round": round, "abs": abs}
+SAFE_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+              ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd)
+
+RANGE_PATTERN = re.compile(r"(-?\+?\d+(?:\.\d+)?)\s*(?:-|to)\s*(-?\+?\d+(?:\.\d+)?)")
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+def compile_formula(source: str, known: set = KNOWN_VARIABLES) -> Dict:
+    """Compile une formule texte ("player_level / 5") après vérification de l'arbre syntaxique."""
+    try:
+        tree = ast.parse(source.replace("^", "**"), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Formule invalide '{source}': {e.msg}")
+    variables = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, SAFE_NODES):
+            raise ValueError(f"Formule non autorisée '{source}': {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Formule non autorisée '{source}': constante {node.value!r}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in SAFE_FUNCTIONS):
+            raise ValueError(f"Fonction non autorisée dans '{source}'")
+        if isinstance(node, ast.Name) and node.id not in SAFE_FUNCTIONS:
+            variables.add(node.id)
+    unknown = sorted(variables - set(known))
+    if unknown:
+        raise ValueError(f"Variable(s) inconnue(s) dans '{source}': {', '.join(unknown)}")
+    return {"source": source, "variables": sorted(variables), "code": compile(tree, "<formula>", "eval")}
+
+def evaluate(formula: Dict, env: Dict[str, float]) -> float:
+    """Évalue une formule compilée sans builtins."""
+    return float(eval(formula["code"], {"__builtins__": {}}, {**SAFE_FUNCTIONS, **env}))
+
+def parse_range(text) -> Tuple[float, float]:
+    """"2-5 AM_dollars" -> (2, 5) ; "variable (-20 to +30)" -> (-20, 30) ; nombre -> (n, n)."""
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return float(text), float(text)
+    match = RANGE_PATTERN.search(str(text))
+    if not match:
+        return None
+    low, high = float(match.group(1)), float(match.group(2))
+    return min(low, high), max(low, high)
+
+def compile_templates(quests_data: Dict, creatures_data: Dict) -> Dict:
+    """Compile templates, formules et pools ; les erreurs sont collectées par template."""
+    procedural = quests_data.get("procedural_generation", {})
+    categories = quests_data.get("template_categories", {})
+    creatures = {key: value for key, value in creatures_data.items() if isinstance(value, dict) and "id" in value}
+
+    scaling = {}
+    errors = []
+    for block in ("difficulty_scaling", "reward_scaling"):
+        for key, value in procedural.get(block, {}).items():
+            if isinstance(value, str):
+                try:
+                    scaling[key] = compile_formula(value)
+                except ValueError as e:
+                    errors.append({"template": f"procedural_generation.{block}", "error": str(e)})
+
+    restrictions = procedural.get("location_restrictions", {})
+    known_locations = set()
+    for locations in restrictions.values():
+        known_locations.update(location for location in locations if location not in LOCATION_WILDCARDS)
+
+    templates, excluded = {}, {}
+    for template_id, template in quests_data.get("quest_templates", {}).items():
+        category = categories.get(template.get("category"), {})
+        if not category.get("auto_generation", False):
+            excluded[template_id] = f"catégorie {template.get('category')} sans auto_generation"
+            continue
+        rewards = template.get("rewards", {})
+        try:
+            xp = compile_formula(str(rewards["xp"])) if "xp" in rewards else None
+        except ValueError as e:
+            errors.append({"template": template_id, "error": str(e)})
+            excluded[template_id] = "formule d'xp invalide"
+            continue
+        params = template.get("generation_params") or {}
+        known_locations.update(params.get("location_pool", []))
+        templates[template_id] = {
+            "id": template_id,
+            "template": template,
+            "difficulty": DIFFICULTY_WEIGHTS.get(template.get("difficulty"), 1.0),
+            "xp_multiplier": float(category.get("xp_multiplier", 1.0)),
+            "xp": xp,
+            "currency": parse_range(rewards.get("currency", 0)) or (0.0, 0.0),
+            "reputation": {faction: parse_range(value) for faction, value in rewards.get("reputation", {}).items()},
+            "level_min": int((template.get("requirements") or {}).get("level_min", 1)),
+            "creature_pool": list(params.get("creature_pool", [])) or sorted(creatures),
+            "uses_creature": "creature_pool" in params or "{creature" in json.dumps(template),
+            "location_pool": list(params.get("location_pool", [])),
+            "npc_pool": list(params.get("npc_pool", [])),
+            "options": {key: value for key, value in params.items() if isinstance(value, dict)}
+        }
+
+    acts = {}
+    for act in ACTS:
+        allowed = restrictions.get(act, [])
+        wildcard = any(location in LOCATION_WILDCARDS for location in allowed)
+        acts[act] = {
+            "index": ACTS.index(act),
+            "levels": ACT_LEVEL_RANGES[act],
+            "locations": sorted(known_locations) if wildcard else sorted(set(allowed))
+        }
+
+    return {
+        "templates": templates,
+        "excluded": excluded,
+        "errors": errors,
+        "scaling": scaling,
+        "variance": float(procedural.get("difficulty_scaling", {}).get("random_variance", 0.0)),
+        "story_modifier": float(procedural.get("difficulty_scaling", {}).get("story_progression_modifier", 0.0)),
+        "max_active": int(procedural.get("max_active_procedural", 10)),
+        "daily_refresh": int(procedural.get("daily_refresh_rate", 1)),
+        "acts": acts,
+        "creatures": creatures
+    }
+
+def template_locations(model: Dict, template: Dict, act: str) -> List[str]:
+    """Lieux où le template peut apparaître dans l'acte."""
+    allowed = model["acts"][act]["locations"]
+    if template["location_pool"]:
+        return [location for location in template["location_pool"] if location in allowed]
+    return allowed
+
+def eligible_templates(model: Dict, act: str) -> List[Dict]:
+    """Templates générables dans l'acte (lieu autorisé et niveau atteignable)."""
+    max_level = model["acts"][act]["levels"][1]
+    return [template for template in model["templates"].values()
+            if template_locations(model, template, act) and template["level_min"] <= max_level]
+
+def _fill(value, values: Dict[str, str], unresolved: set):
+    """Remplace les variables {…} dans les chaînes, listes et dictionnaires."""
+    if isinstance(value, str):
+        def substitute(match):
+            if match.group(1) in values:
+                return str(values[match.group(1)])
+            unresolved.add(match.group(1))
+            return match.group(0)
+        return PLACEHOLDER_PATTERN.sub(substitute, value)
+    if isinstance(value, list):
+        return [_fill(item, values, unresolved) for item in value]
+    if isinstance(value, dict):
+        return {_fill(key, values, unresolved): _fill(item, values, unresolved) for key, item in value.items()}
+    return value
+
+def generate_quest(model: Dict, template: Dict, act: str, rng: random.Random, variables: Dict, number: int) -> Dict:
+    """Une quête concrète : variables tirées, formules évaluées, récompenses arrondies."""
+    act_info = model["acts"][act]
+    low, high = act_info["levels"]
+    player_level = rng.randint(max(low, template["level_min"]), max(high, template["level_min"]))
+    location = rng.choice(template_locations(model, template, act))
+    creature_id = rng.choice(template["creature_pool"])
+    creature = model["creatures"].get(creature_id, {})
+
+    values = {
+        "location": location,
+        "destination": location,
+        "creature_id": creature_id,
+        "creature_type": creature.get("name", creature_id),
+        "creature_name": creature.get("name", creature_id),
+        "count": template["template"].get("objectives", {}).get("primary", [{}])[0].get("count", 1)
+    }
+    if template["npc_pool"]:
+        values["quest_giver"] = values["npc_name"] = values["target_npc"] = rng.choice(template["npc_pool"])
+    picks = {}
+    for option_name, options in template["options"].items():
+        choice = rng.choice(sorted(options))
+        picks[option_name] = choice
+        prefix = option_name.replace("_options", "").replace("_types", "")
+        values[f"{prefix}_faction"] = values[f"{prefix}_type"] = values[prefix] = choice
+        for key, value in options[choice].items():
+            if isinstance(value, str):
+                values[f"{prefix}_{key}"] = value
+            elif isinstance(value, list) and value and key.endswith("_pool"):
+                values[f"{prefix}_{key[:-len('_pool')]}"] = rng.choice(value)
+
+    env = dict(variables)
+    env["player_level"] = player_level
+    env["creature_rarity"] = RARITY_LEVELS.get(creature.get("rarity"), 1)
+    env["difficulty_multiplier"] = 1.0
+    base = evaluate(model["scaling"]["base_difficulty"], env) if "base_difficulty" in model["scaling"] else 1.0
+    env["difficulty_multiplier"] = (base * template["difficulty"]
+                                    * (1.0 + rng.uniform(-model["variance"], model["variance"]))
+                                    * (1.0 + model["story_modifier"] * act_info["index"]))
+
+    def scaled(key: str) -> float:
+        return evaluate(model["scaling"][key], env) if key in model["scaling"] else 0.0
+
+    xp = (evaluate(template["xp"], env) if template["xp"] else 0.0) * template["xp_multiplier"] + scaled("xp_base")
+    currency_low, currency_high = template["currency"]
+    currency = rng.uniform(currency_low, currency_high) + scaled("currency_base")
+    reputation = {}
+    for faction, span in template["reputation"].items():
+        amount = rng.uniform(*span) if span else scaled("reputation_base")
+        reputation[faction] = int(round(amount))
+
+    unresolved = set()
+    raw = template["template"]
+    quest = {
+        "id": f"proc_{template['id']}_{act}_{number}",
+        "template": template["id"],
+        "act": act,
+        "player_level": player_level,
+        "location": location,
+        "creature": creature_id if template["uses_creature"] else None,
+        "giver": values.get("quest_giver"),
+        "options": picks,
+        "title": _fill(raw.get("title_template", template["id"]), values, unresolved),
+        "description": _fill(raw.get("description_template", ""), values, unresolved),
+        "objectives": _fill(raw.get("objectives", {}), values, unresolved),
+        "difficulty_multiplier": round(env["difficulty_multiplier"], 3),
+        "rewards": {"xp": int(round(xp)), "currency": int(round(currency)),
+                    "reputation": _fill(reputation, values, unresolved)}
+    }
+    quest["unresolved"] = sorted(unresolved)
+    return quest
+
+def iter_quests(model: Dict, act: str, count: int, seed: int, variables: Dict):
+    """Flux reproductible de count quêtes pour un acte."""
+    templates = eligible_templates(model, act)
+    if not templates:
+        return
+    rng = random.Random(seed * 1000003 + model["acts"][act]["index"])
+    for number in range(count):
+        yield generate_quest(model, rng.choice(templates), act, rng, variables, number)
+
+def quest_signature(quest: Dict) -> Tuple:
+    """Deux quêtes de même signature sont perçues comme la même quête."""
+    return (quest["template"], quest["location"], quest["creature"], quest["giver"],
+            tuple(sorted(quest["options"].items())))
+
+def combination_space(model: Dict, act: str) -> int:
+    """Nombre de signatures distinctes possibles dans l'acte."""
+    total = 0
+    for template in eligible_templates(model, act):
+        size = len(template_locations(model, template, act))
+        if template["uses_creature"]:
+            size *= len(template["creature_pool"])
+        size *= max(1, len(template["npc_pool"]))
+        for options in template["options"].values():
+            size *= len(options)
+        total += size
+    return total
+
+def distribution(values: List[float]) -> Dict:
+    """Min, quantiles, max et moyenne."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    quantile = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"min": ordered[0], "p10": quantile(0.1), "p50": quantile(0.5), "p90": quantile(0.9),
+            "max": ordered[-1], "mean": round(sum(ordered) / len(ordered), 2)}
+
+def generate(model: Dict, count: int, seed: int, variables: Dict, sink=None) -> Dict:
+    """Génère count quêtes par acte, les écrit dans sink (JSON Lines) et agrège le rapport."""
+    report = {"acts": {}, "template_usage": {template_id: {} for template_id in model["templates"]},
+              "unresolved": {}, "pool_usage": {"creatures": {}, "locations": {}, "givers": {}}}
+    for act in ACTS:
+        xp, currency, reputation = [], [], []
+        signatures, board, board_duplicates, boards = set(), [], 0, 0
+        generated = 0
+        for quest in iter_quests(model, act, count, seed, variables):
+            generated += 1
+            if sink:
+                sink.write(json.dumps(quest, ensure_ascii=False) + "\n")
+            xp.append(quest["rewards"]["xp"])
+            currency.append(quest["rewards"]["currency"])
+            reputation.extend(value for value in quest["rewards"]["reputation"].values())
+            usage = report["template_usage"][quest["template"]]
+            usage[act] = usage.get(act, 0) + 1
+            for placeholder in quest["unresolved"]:
+                report["unresolved"].setdefault(quest["template"], set()).add(placeholder)
+            for pool, value in (("creatures", quest["creature"]), ("locations", quest["location"]),
+                                ("givers", quest["giver"])):
+                if value:
+                    report["pool_usage"][pool][value] = report["pool_usage"][pool].get(value, 0) + 1
+
+            # Tableau de quêtes : max_active quêtes consécutives
+            signature = quest_signature(quest)
+            signatures.add(signature)
+            board.append(signature)
+            if len(board) == model["max_active"]:
+                boards += 1
+                board_duplicates += len(board) - len(set(board))
+                board = []
+
+        space = combination_space(model, act)
+        report["acts"][act] = {
+            "generated": generated,
+            "templates": [template["id"] for template in eligible_templates(model, act)],
+            "combinations": space,
+            "distinct_generated": len(signatures),
+            "fresh_days": round(space / model["daily_refresh"], 1) if model["daily_refresh"] else None,
+            "board_duplicate_rate": round(board_duplicates / (boards * model["max_active"]), 4) if boards else None,
+            "board_fill": min(space, model["max_active"]),
+            "xp": distribution(xp),
+            "currency": distribution(currency),
+            "reputation": distribution(reputation)
+        }
+    report["unresolved"] = {template_id: sorted(values) for template_id, values in report["unresolved"].items()}
+    return report
+
+def unknown_references(model: Dict) -> Dict[str, List[str]]:
+    """Créatures des pools absentes de creature_database.json."""
+    return {template_id: [creature for creature in template["creature_pool"] if creature not in model["creatures"]]
+            for template_id, template in model["templates"].items()
+            if any(creature not in model["creatures"] for creature in template["creature_pool"])}
+
+def parse_overrides(pairs: List[str]) -> Dict[str, float]:
+    """--set economic_inflation=1.3 -> {"economic_inflation": 1.3}."""
+    overrides = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        if name not in DEFAULT_VARIABLES:
+            raise ValueError(f"Variable non surchargeable: {name} (possibles: {', '.join(sorted(DEFAULT_VARIABLES))})")
+        try:
+            overrides[name] = float(value)
+        except ValueError:
+            raise ValueError(f"Valeur invalide pour {name}: {value}")
+    return overrides
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande quests."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py quests",
+                                     description="Génère des quêtes procédurales en masse et mesure leur couverture")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--count", type=int, default=2000, help="Quêtes générées par acte (défaut: 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de génération")
+    parser.add_argument("--output", "-o", default="", help="Fichier JSON Lines des quêtes générées")
+    parser.add_argument("--set", action="append", default=[], metavar="VARIABLE=VALEUR",
+                        help="Surcharge une variable de formule (economic_inflation, faction_importance...)")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    try:
+        corpus = load_corpus(Path(args.project_root) / "data", strict=True)
+        model = compile_templates(corpus.get("quests", {}), corpus.get("creatures", {}))
+        variables = {**DEFAULT_VARIABLES, **parse_overrides(args.set)}
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as sink:
+                report = generate(model, args.count, args.seed, variables, sink)
+        else:
+            report = generate(model, args.count, args.seed, variables)
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    report["excluded"] = model["excluded"]
+    report["errors"] = model["errors"]
+    report["unknown_creatures"] = unknown_references(model)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"🎯 {args.count} quête(s) par acte, {len(model['templates'])} template(s) procéduraux "
+          f"(tableau: {model['max_active']} actives, {model['daily_refresh']} nouvelles/jour)"
+          + (f" -> {args.output}" if args.output else ""))
+    for error in model["errors"]:
+        print(f"  ❌ {error['template']}: {error['error']}")
+    for template_id, reason in model["excluded"].items():
+        print(f"  ⏭️ {template_id}: {reason}")
+
+    for act, stats in report["acts"].items():
+        if not stats["generated"]:
+            print(f"\n⚠️ {act}: aucun template générable")
+            continue
+        print(f"\n📜 {act}: {len(stats['templates'])} template(s), {stats['combinations']} combinaison(s), "
+              f"{stats['fresh_days']} jour(s) de contenu neuf")
+        print(f"  XP {stats['xp']['p10']}-{stats['xp']['p90']} (médiane {stats['xp']['p50']}), "
+              f"monnaie {stats['currency']['p10']}-{stats['currency']['p90']} (médiane {stats['currency']['p50']})")
+        if stats["combinations"] < model["max_active"]:
+            print(f"  ⚠️ Moins de combinaisons ({stats['combinations']}) que de quêtes actives ({model['max_active']})")
+        if stats["board_duplicate_rate"]:
+            print(f"  ⚠️ {stats['board_duplicate_rate']:.1%} de doublons dans un tableau de {model['max_active']} quêtes")
+
+    print("\n🧭 Couverture des templates:")
+    for template_id, usage in report["template_usage"].items():
+        missing = [act for act in ACTS if act not in usage]
+        print(f"  {'✅' if not missing else '⚠️'} {template_id}: {sum(usage.values())} quête(s)"
+              + (f", absent de {', '.join(missing)}" if missing else ""))
+    for template_id, placeholders in report["unresolved"].items():
+        print(f"  🧩 {template_id}: variables non résolues {', '.join('{' + p + '}' for p in placeholders)}")
+    for template_id, creatures in report["unknown_creatures"].items():
+        print(f"  🔗 {template_id}: créature(s) inconnue(s) {', '.join(creatures)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
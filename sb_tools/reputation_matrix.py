@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+🏛️ Reputation Matrix - Compilation des cascades de réputation entre factions
+============================================================================
+Transforme faction_relationships.json en matrice dense faction × faction :
+- cascade directe : facteurs de process_reputation_cascade (0.3 / 0.1 /
+  -0.1 / -0.2 selon la force de la relation) ;
+- cascade exacte : pour chaque faction source et chaque variation entière,
+  la récursion du script rejouée hors ligne (troncature int à chaque
+  rebond) donne les variations finales de chaque faction et leur amplitude
+  cumulée. Une source n'est compilée que jusqu'à la première variation dont
+  un rebond ou un total atteint le seuil de réaction publique ;
+- cascade totale : propagations sur plusieurs rebonds P = F + F² + ... + F^d,
+  diagonale comprise (retour de la cascade sur la source). Approximation
+  linéaire utilisée par le rejeu groupé : d est choisi pour minimiser
+  l'écart avec la cascade récursive (ou fixé par --depth).
+
+Produit data/reputation_matrix.json, chargé par ReputationSystem.gd : une
+modification de réputation coûte alors une entrée de la table exacte, quel
+que soit le nombre de factions. Le script revient à la récursion hors de la
+plage compilée ou quand une faction touchée pourrait traverser une zone de
+conflit (±60) pendant la cascade. Les seuils d'accès aux services sont
+précalculés en valeur de réputation minimale.
+
+L'API apply_deltas rejoue une séquence de variations en une seule opération
+matricielle, pas à pas pour les seules factions qui atteignent une borne
+(NumPy requis pour --replay et --random).
+
+Usage: python godot_project_fixer.py reputation [chemin_projet] [--output data/reputation_matrix.json] [--replay session.json] [--random N]
+"""
+
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Dépendance optionnelle, vérifiée à l'usage
+    np = None
+
+from sb_tools.data_pipeline import load_corpus
+
+# Doit correspondre à ReputationSystem.REPUTATION_MATRIX_FORMAT_VERSION
+MATRIX_FORMAT_VERSION = 2
+DEFAULT_MATRIX_PATH = "data/reputation_matrix.json"
+
+# Miroir de ReputationSystem.reputation_config et reputation_levels
+MIN_REPUTATION = -100
+MAX_REPUTATION = 100
+CONFLICT_THRESHOLD = 60
+CONFLICT_EXTREME = 60
+PUBLIC_REACTION_THRESHOLD = 30
+LEVEL_HIERARCHY = ["hostile", "unfriendly", "neutral", "friendly", "allied", "devoted"]
+DEFAULT_REPUTATION_SCALE = {
+    "hostile": [-100, -51],
+    "unfriendly": [-50, -21],
+    "neutral": [-20, 20],
+    "friendly": [21, 50],
+    "allied": [51, 80],
+    "devoted": [81, 100]
+}
+
+# Profondeurs de propagation évaluées contre la cascade récursive du script
+MAX_CASCADE_DEPTH = 8
+
+def cascade_factor(relationship_strength: float) -> float:
+    """Miroir du calcul de cascade_factor dans process_reputation_cascade."""
+    if relationship_strength > 50:
+        return 0.3
+    if relationship_strength > 20:
+        return 0.1
+    if relationship_strength < -50:
+        return -0.2
+    if relationship_strength < -20:
+        return -0.1
+    return 0.0
+
+def _matmul(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    size = len(a)
+    return [[sum(a[i][k] * b[k][j] for k in range(size)) for j in range(size)] for i in range(size)]
+
+def cascade_series(direct: List[List[float]], depth: int) -> List[List[float]]:
+    """Somme F + F² + ... + F^depth : propagation sur depth rebonds au plus."""
+    total = [row[:] for row in direct]
+    term = [row[:] for row in direct]
+    for _ in range(depth - 1):
+        term = _matmul(term, direct)
+        for i, row in enumerate(term):
+            for j, value in enumerate(row):
+                total[i][j] += value
+    return total
+
+def spectral_radius(direct: List[List[float]], power: int = 64) -> float:
+    """Estimation ||F^k||^(1/k) : au-delà de 1, la série complète diverge."""
+    term = [row[:] for row in direct]
+    for _ in range(power - 1):
+        term = _matmul(term, direct)
+    norm = max((sum(abs(value) for value in row) for row in term), default=0.0)
+    return norm ** (1.0 / power) if norm > 0 else 0.0
+
+def cascade_steps(model: Dict, faction_id: str, change: int, steps: List[Tuple[str, int]] = None) -> List[Tuple[str, int]]:
+    """Rebonds de process_reputation_cascade récursif (sans borne), dans l'ordre d'application."""
+    if steps is None:
+        steps = []
+    i = model["factions"].index(faction_id)
+    for j, target in enumerate(model["factions"]):
+        factor = model["direct"][i][j]
+        cascade_change = int(change * factor)
+        if factor != 0.0 and cascade_change != 0:
+            steps.append((target, cascade_change))
+            cascade_steps(model, target, cascade_change, steps)
+    return steps
+
+def exact_cascades(model: Dict, max_change: int = MAX_REPUTATION - MIN_REPUTATION) -> Dict:
+    """Table {source: {"range", "changes": {variation: {"deltas", "reach"}}}} de la cascade récursive.
+
+    deltas : variation finale de chaque faction ; reach : somme des |rebonds|,
+    qui borne sa trajectoire intermédiaire. La plage s'arrête avant la
+    première variation (en valeur absolue) dont un rebond ou un total
+    déclencherait une réaction publique, que la table ne rejoue pas.
+    """
+    table = {}
+    for source in model["factions"]:
+        changes = {}
+        limit = 0
+        for magnitude in range(1, max_change + 1):
+            entries = {}
+            for change in (magnitude, -magnitude):
+                steps = cascade_steps(model, source, change)
+                deltas, reach = {}, {}
+                for target, step in steps:
+                    deltas[target] = deltas.get(target, 0) + step
+                    reach[target] = reach.get(target, 0) + abs(step)
+                if any(abs(step) >= PUBLIC_REACTION_THRESHOLD for _, step in steps) or \
+                        any(abs(total) >= PUBLIC_REACTION_THRESHOLD for total in deltas.values()):
+                    entries = None
+                    break
+                if steps:
+                    entries[str(change)] = {"deltas": {t: d for t, d in deltas.items() if d}, "reach": reach}
+            if entries is None:
+                break
+            changes.update(entries)
+            limit = magnitude
+        table[source] = {"range": limit, "changes": changes}
+    return table
+
+def compile_reputation(factions_data: Dict, cascade_depth: int = None) -> Dict:
+    """Matrices de cascade, seuils de niveaux et seuils d'accès aux services."""
+    factions = list(factions_data.get("factions", {}))
+    if not factions:
+        raise ValueError("Aucune faction dans faction_relationships.json")
+    relationships = factions_data.get("inter_faction_relationships", {}).get("relationship_matrix", {})
+
+    direct = [[0.0] * len(factions) for _ in factions]
+    for i, source in enumerate(factions):
+        for j, target in enumerate(factions):
+            if source != target:
+                direct[i][j] = cascade_factor(relationships.get(source, {}).get(target, 0))
+    model = {"factions": factions, "direct": direct}
+    depth_errors = {}
+    for candidate in range(1, MAX_CASCADE_DEPTH + 1):
+        model["total"] = cascade_series(direct, candidate)
+        depth_errors[candidate] = approximation_report(model)["mean_max_error"]
+    depth = cascade_depth or min(depth_errors, key=lambda d: (depth_errors[d], d))
+
+    scale = factions_data.get("faction_system", {}).get("reputation_scale", DEFAULT_REPUTATION_SCALE)
+    level_thresholds = {level: scale[level][0] for level in LEVEL_HIERARCHY if level in scale}
+
+    service_thresholds = {}
+    for faction_id, faction in factions_data["factions"].items():
+        service_thresholds[faction_id] = {
+            service_id: level_thresholds.get(service.get("access_level", "neutral"), 0)
+            for service_id, service in faction.get("services", {}).items()
+        }
+
+    return {
+        "factions": factions,
+        "starting_reputation": {f: factions_data["factions"][f].get("starting_reputation", 0) for f in factions},
+        "direct": direct,
+        "exact": exact_cascades(model),
+        "total": cascade_series(direct, depth),
+        "depth": depth,
+        "depth_errors": depth_errors,
+        "spectral_radius": round(spectral_radius(direct), 4),
+        "level_thresholds": level_thresholds,
+        "service_thresholds": service_thresholds
+    }
+
+def _sparse(matrix: List[List[float]], factions: List[str]) -> Dict[str, Dict[str, float]]:
+    return {source: {target: round(matrix[i][j], 6) for j, target in enumerate(factions)
+                     if abs(matrix[i][j]) >= 1e-6}
+            for i, source in enumerate(factions)}
+
+def matrix_document(model: Dict) -> Dict:
+    """Fichier lu par ReputationSystem.load_reputation_matrix."""
+    return {
+        "format_version": MATRIX_FORMAT_VERSION,
+        "factions": model["factions"],
+        "exact_cascade": model["exact"],
+        "cascade": _sparse(model["total"], model["factions"]),
+        "direct_cascade": _sparse(model["direct"], model["factions"]),
+        "level_thresholds": model["level_thresholds"],
+        "service_thresholds": model["service_thresholds"]
+    }
+
+def reference_cascade(model: Dict, reputations: Dict[str, int], faction_id: str, change: int):
+    """Miroir de modify_reputation + process_reputation_cascade récursif (troncature int, bornes)."""
+    old = reputations[faction_id]
+    new = max(MIN_REPUTATION, min(MAX_REPUTATION, old + change))
+    if new == old:
+        return
+    reputations[faction_id] = new
+    i = model["factions"].index(faction_id)
+    for j, target in enumerate(model["factions"]):
+        factor = model["direct"][i][j]
+        cascade_change = int(change * factor)
+        if factor != 0.0 and cascade_change != 0:
+            reference_cascade(model, reputations, target, cascade_change)
+
+def compiled_cascade(model: Dict, reputations: Dict[str, int], faction_id: str, change: int):
+    """Même variation avec la matrice totale (approximation linéaire du rejeu groupé)."""
+    old = reputations[faction_id]
+    new = max(MIN_REPUTATION, min(MAX_REPUTATION, old + change))
+    if new == old:
+        return
+    reputations[faction_id] = new
+    i = model["factions"].index(faction_id)
+    for j, target in enumerate(model["factions"]):
+        cascade_change = int(change * model["total"][i][j])
+        if cascade_change != 0:
+            reputations[target] = max(MIN_REPUTATION, min(MAX_REPUTATION, reputations[target] + cascade_change))
+
+def approximation_report(model: Dict, changes=(-50, -30, -10, 10, 30, 50)) -> Dict:
+    """Écart entre cascade récursive du script et matrice totale, depuis la réputation neutre."""
+    worst = {"error": 0}
+    total_error = 0
+    cases = 0
+    for faction_id in model["factions"]:
+        for change in changes:
+            recursive = {f: 0 for f in model["factions"]}
+            compiled = {f: 0 for f in model["factions"]}
+            reference_cascade(model, recursive, faction_id, change)
+            compiled_cascade(model, compiled, faction_id, change)
+            error = max(abs(recursive[f] - compiled[f]) for f in model["factions"])
+            total_error += error
+            cases += 1
+            if error > worst["error"]:
+                worst = {"error": error, "faction": faction_id, "change": change}
+    return {"cases": cases, "mean_max_error": round(total_error / cases, 3), "worst": worst}
+
+def require_numpy():
+    """Lève une erreur explicite si NumPy n'est pas installé."""
+    if np is None:
+        raise ValueError("NumPy est requis pour rejouer des sessions (pip install numpy)")
+
+def apply_deltas(model: Dict, start: Dict[str, int], deltas: List[Tuple[str, int]]) -> Dict:
+    """Rejoue une séquence (faction, variation) en une opération matricielle.
+
+    Chaque variation est propagée par (I + P) et cumulée. Les factions dont la
+    trajectoire sort de [-100, 100] sont rejouées pas à pas avec la borne
+    appliquée à chaque étape, comme le chemin compilé (listées dans
+    "saturated") ; la troncature entière par étape n'est pas reproduite.
+    """
+    require_numpy()
+    factions = model["factions"]
+    index = {faction_id: i for i, faction_id in enumerate(factions)}
+    unknown = sorted({faction_id for faction_id, _ in deltas if faction_id not in index})
+    if unknown:
+        raise ValueError(f"Faction(s) inconnue(s): {', '.join(unknown)}")
+
+    propagation = np.eye(len(factions)) + np.array(model["total"])
+    changes = np.zeros((len(deltas), len(factions)))
+    for step, (faction_id, change) in enumerate(deltas):
+        changes[step, index[faction_id]] = change
+
+    origin = np.array([start.get(f, 0) for f in factions], dtype=np.float64)
+    steps = changes @ propagation
+    trajectory = origin + np.cumsum(steps, axis=0)
+    # Une borne atteinte change la suite : borner la somme finale ne suffit plus
+    saturated = np.flatnonzero(((trajectory < MIN_REPUTATION) | (trajectory > MAX_REPUTATION)).any(axis=0))
+    for column in saturated:
+        value = origin[column]
+        for step in range(len(steps)):
+            value = min(max(value + steps[step, column], MIN_REPUTATION), MAX_REPUTATION)
+            trajectory[step, column] = value
+    trajectory = np.vstack([origin, trajectory])
+
+    # Niveaux : indice du dernier seuil atteint dans LEVEL_HIERARCHY
+    levels = [level for level in LEVEL_HIERARCHY if level in model["level_thresholds"]]
+    thresholds = np.array([model["level_thresholds"][level] for level in levels])
+    level_index = np.searchsorted(thresholds, np.floor(trajectory), side="right") - 1
+
+    services = [(faction_id, service_id, threshold)
+                for faction_id in factions
+                for service_id, threshold in model["service_thresholds"].get(faction_id, {}).items()]
+    if services:
+        columns = np.array([index[f] for f, _, _ in services])
+        minimums = np.array([threshold for _, _, threshold in services])
+        available = np.floor(trajectory[:, columns]) >= minimums
+    else:
+        available = np.zeros((len(trajectory), 0), dtype=bool)
+
+    high = trajectory > CONFLICT_EXTREME
+    low = trajectory < -CONFLICT_EXTREME
+    conflicts = sorted({tuple(sorted((factions[a], factions[b])))
+                        for step in np.flatnonzero(high.any(axis=1) & low.any(axis=1))
+                        for a in np.flatnonzero(high[step]) for b in np.flatnonzero(low[step])
+                        if abs(trajectory[step, a] - trajectory[step, b]) >= CONFLICT_THRESHOLD})
+
+    final = {f: int(trajectory[-1, i]) for i, f in enumerate(factions)}
+    gained = [f"{f}/{s}" for k, (f, s, _) in enumerate(services) if available[-1, k] and not available[0, k]]
+    lost = [f"{f}/{s}" for k, (f, s, _) in enumerate(services) if available[0, k] and not available[-1, k]]
+    return {
+        "steps": len(deltas),
+        "final": final,
+        "final_levels": {f: levels[max(0, level_index[-1, i])] for i, f in enumerate(factions)},
+        "level_changes": int((np.diff(level_index, axis=0) != 0).sum()),
+        "services_gained": gained,
+        "services_lost": lost,
+        "conflicts": [list(pair) for pair in conflicts],
+        "saturated": [factions[column] for column in saturated],
+        "trajectory": trajectory
+    }
+
+def random_session(model: Dict, steps: int, seed: int) -> List[Tuple[str, int]]:
+    """Session synthétique : variations typiques de quêtes et dialogues."""
+    rng = random.Random(seed)
+    return [(rng.choice(model["factions"]), rng.choice([-15, -10, -5, -2, 2, 5, 10, 15])) for _ in range(steps)]
+
+def load_session(path: Path) -> List[Tuple[str, int]]:
+    """Session JSON : [{"faction": "watch", "change": 10}, ...] ou [["watch", 10], ...]."""
+    entries = json.loads(path.read_text(encoding="utf-8"))
+    return [(entry["faction"], int(entry["change"])) if isinstance(entry, dict) else (entry[0], int(entry[1]))
+            for entry in entries]
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande reputation."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py reputation",
+                                     description="Compile les cascades de réputation en matrice de factions")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--output", "-o", default=DEFAULT_MATRIX_PATH,
+                        help=f"Fichier compilé, relatif au projet (défaut: {DEFAULT_MATRIX_PATH})")
+    parser.add_argument("--replay", default="", help="Session JSON de variations à rejouer")
+    parser.add_argument("--random", type=int, default=0, help="Rejoue une session synthétique de N variations")
+    parser.add_argument("--depth", type=int, default=None,
+                        help=f"Rebonds de la matrice totale du rejeu groupé (défaut: meilleur accord avec le script, "
+                             f"1 à {MAX_CASCADE_DEPTH})")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de la session synthétique")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    try:
+        corpus = load_corpus(project_root / "data", strict=True)
+        model = compile_reputation(corpus.get("factions", {}), args.depth)
+        deltas = []
+        if args.replay:
+            deltas = load_session(Path(args.replay))
+        elif args.random:
+            deltas = random_session(model, args.random, args.seed)
+        replay = apply_deltas(model, model["starting_reputation"], deltas) if deltas else None
+    except (ValueError, OSError, KeyError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    output = project_root / args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Table exacte : une entrée par variation, écrite compacte
+    output.write_text(json.dumps(matrix_document(model), ensure_ascii=False, separators=(",", ":")) + "\n",
+                      encoding="utf-8")
+    approximation = approximation_report(model)
+
+    if args.json:
+        if replay:
+            replay = {key: value for key, value in replay.items() if key != "trajectory"}
+        print(json.dumps({"output": str(output), "depth": model["depth"], "depth_errors": model["depth_errors"],
+                          "exact_ranges": {f: model["exact"][f]["range"] for f in model["factions"]},
+                          "spectral_radius": model["spectral_radius"],
+                          "approximation": approximation, "replay": replay}, indent=2, ensure_ascii=False))
+        return 0
+
+    factions = model["factions"]
+    print(f"🏛️ Matrice écrite: {output} ({len(factions)} factions, cascade sur {model['depth']} rebond(s))")
+    if model["spectral_radius"] >= 1.0:
+        print(f"  ⚠️ Rayon spectral {model['spectral_radius']} : sans troncature entière, les cascades s'amplifieraient")
+    print(f"  {'cascade totale':<18}" + "".join(f"{f[:8]:>9}" for f in factions))
+    for i, source in enumerate(factions):
+        print(f"  {source:<18}" + "".join(f"{model['total'][i][j]:>9.3f}" for j in range(len(factions))))
+    print("  Cascade exacte compilée jusqu'à: "
+          + ", ".join(f"{f} ±{model['exact'][f]['range']}" for f in factions))
+    worst = approximation["worst"]
+    print(f"  Écart de la matrice totale (rejeu groupé) avec la cascade récursive: "
+          f"{approximation['mean_max_error']} point(s) en moyenne"
+          + (f", au pire {worst['error']} ({worst['faction']} {worst['change']:+d})" if worst["error"] else ""))
+
+    if replay:
+        print(f"\n🔁 Session rejouée: {replay['steps']} variation(s), {replay['level_changes']} changement(s) de niveau")
+        for faction_id in factions:
+            print(f"  {faction_id:<18} {model['starting_reputation'][faction_id]:>5} -> {replay['final'][faction_id]:>5} "
+                  f"({replay['final_levels'][faction_id]})")
+        if replay["services_gained"]:
+            print(f"  ➕ Services débloqués: {', '.join(replay['services_gained'])}")
+        if replay["services_lost"]:
+            print(f"  ➖ Services perdus: {', '.join(replay['services_lost'])}")
+        for pair in replay["conflicts"]:
+            print(f"  ⚔️ Conflit possible: {pair[0]} / {pair[1]}")
+        if replay["saturated"]:
+            print(f"  🧱 Bornes atteintes (rejouées pas à pas): {', '.join(replay['saturated'])}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
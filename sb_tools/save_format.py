@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+🧱 Save Format - Format de sauvegarde par sections (implémentation de référence)
+================================================================================
+Miroir Python de SaveSystem.write_chunked_save_file / read_save_sections :
+
+    "SBS2"                      4 octets (SAVE_CHUNKED_MAGIC)
+    longueur de l'en-tête       uint32 little-endian (FileAccess.store_32)
+    en-tête                     JSON UTF-8
+    sections                    gzip(JSON UTF-8) concaténés
+
+L'en-tête contient les métadonnées de la sauvegarde ("meta" : save_version,
+timestamp, description...), un résumé pour les écrans de slots ("summary",
+mêmes champs que SaveSystem.update_save_metadata) et l'index des sections :
+{nom: {offset, size, raw_size, md5}}, offset relatif à la fin de l'en-tête.
+Le jeu y ajoute "session" et, par section, la "revision" du manager qui l'a
+produite : une section dont le manager n'a pas changé depuis (même session,
+même révision) est recopiée sans appel à get_save_data(). Ces champs ne sont
+pas écrits ici : un fichier réencodé par les outils est toujours resérialisé.
+
+Une section par manager (observation, dialogue, quest, reputation, combat...)
+plus player_data et world_state : chacune est compressée indépendamment, se
+lit seule et, si son md5 n'a pas changé, est recopiée sans recompression lors
+d'une réécriture ; le md5 est vérifié à la lecture.
+Une section compactée porte donc sa propre table de chaînes ; meta et summary
+restent en clair pour les écrans de slots.
+"""
+
+import gzip
+import json
+import struct
+import hashlib
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Doivent correspondre aux constantes de SaveSystem.gd
+SAVE_CHUNKED_MAGIC = b"SBS2"
+SAVE_CHUNKED_FORMAT = 2
+TOP_LEVEL_SECTIONS = ("player_data", "world_state")
+
+def is_chunked(raw: bytes) -> bool:
+    """Vrai si le fichier utilise le format par sections."""
+    return raw[:4] == SAVE_CHUNKED_MAGIC
+
+def split_sections(save_data: Dict) -> Tuple[Dict, Dict[str, object]]:
+    """Sépare métadonnées (en-tête) et sections d'une sauvegarde complète."""
+    # Un dictionnaire managers vide reste dans l'en-tête : aucune section ne le porterait
+    meta = {key: value for key, value in save_data.items()
+            if key not in TOP_LEVEL_SECTIONS and (key != "managers" or not value)}
+    sections = dict(save_data.get("managers", {}))
+    for name in TOP_LEVEL_SECTIONS:
+        if name in save_data:
+            sections[name] = save_data[name]
+    return meta, sections
+
+def join_sections(meta: Dict, sections: Dict[str, object]) -> Dict:
+    """Reconstitue le dictionnaire attendu par SaveSystem.apply_save_data."""
+    save_data = dict(meta)
+    managers = {name: value for name, value in sections.items() if name not in TOP_LEVEL_SECTIONS}
+    if managers:
+        save_data["managers"] = managers
+    for name in TOP_LEVEL_SECTIONS:
+        if name in sections:
+            save_data[name] = sections[name]
+    return save_data
+
+def save_summary(save_data: Dict) -> Dict:
+    """Résumé lu par get_save_info sans décompresser les sections."""
+    player = save_data.get("player_data", {}) or {}
+    return {
+        "timestamp": save_data.get("timestamp", 0),
+        "play_time": save_data.get("play_time", 0),
+        "description": save_data.get("description", ""),
+        "save_type": save_data.get("save_type", "MANUAL"),
+        "level": player.get("level", 1),
+        "current_scene": player.get("current_scene", ""),
+        "version": save_data.get("save_version", "")
+    }
+
+def read_header(raw: bytes) -> Dict:
+    """Lit uniquement l'en-tête d'un fichier par sections."""
+    if not is_chunked(raw):
+        raise ValueError("Pas une sauvegarde par sections (en-tête SBS2 absent)")
+    length, = struct.unpack_from("<I", raw, 4)
+    header = json.loads(raw[8:8 + length].decode("utf-8"))
+    if header.get("format") != SAVE_CHUNKED_FORMAT:
+        raise ValueError(f"Format de sections non supporté: {header.get('format')}")
+    header["data_offset"] = 8 + length
+    return header
+
+def _section_bytes(raw: bytes, header: Dict, name: str) -> bytes:
+    entry = header["sections"][name]
+    start = header["data_offset"] + entry["offset"]
+    chunk = raw[start:start + entry["size"]]
+    if len(chunk) != entry["size"]:
+        raise ValueError(f"Section tronquée: {name}")
+    return chunk
+
+def read_section_text(raw: bytes, header: Dict, name: str) -> bytes:
+    """JSON décompressé d'une section, contrôlé par le md5 de l'index."""
+    text = gzip.decompress(_section_bytes(raw, header, name))
+    expected = header["sections"][name].get("md5")
+    if expected is not None and hashlib.md5(text).hexdigest() != expected:
+        raise ValueError(f"Section corrompue (md5): {name}")
+    return text
+
+def read_sections(raw: bytes, names: Iterable[str] = None) -> Dict[str, object]:
+    """Décompresse les sections demandées (toutes par défaut)."""
+    header = read_header(raw)
+    wanted = list(header["sections"]) if names is None else [name for name in names if name in header["sections"]]
+    return {name: json.loads(read_section_text(raw, header, name).decode("utf-8")) for name in wanted}
+
+def decode_chunked(raw: bytes, names: Iterable[str] = None) -> Dict:
+    """Sauvegarde complète (ou partielle si names) au format de apply_save_data."""
+    header = read_header(raw)
+    return join_sections(header.get("meta", {}), read_sections(raw, names))
+
+def encode_chunked(save_data: Dict, previous: bytes = None,
+                   section_transform: Optional[Callable[[Dict], Dict]] = None) -> bytes:
+    """Encode une sauvegarde ; une section au même md5 que dans previous y est recopiée sans recompression.
+
+    section_transform (table de chaînes...) s'applique à chaque section dictionnaire,
+    jamais à meta ni au résumé construits depuis save_data.
+    """
+    meta, sections = split_sections(save_data)
+    old_header = read_header(previous) if previous and is_chunked(previous) else {"sections": {}}
+    old_sections = old_header["sections"]
+
+    index, chunks, offset = {}, [], 0
+    for name, value in sections.items():
+        if section_transform is not None and isinstance(value, dict):
+            value = section_transform(value)
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        md5 = hashlib.md5(text).hexdigest()
+        if name in old_sections and old_sections[name].get("md5") == md5:
+            chunk = _section_bytes(previous, old_header, name)
+            entry = {key: value for key, value in old_sections[name].items() if key != "revision"}
+        else:
+            chunk = gzip.compress(text, mtime=0)
+            entry = {"raw_size": len(text), "md5": md5}
+        entry.update({"offset": offset, "size": len(chunk)})
+        index[name] = entry
+        chunks.append(chunk)
+        offset += len(chunk)
+
+    header = {"format": SAVE_CHUNKED_FORMAT, "meta": meta, "summary": save_summary(save_data), "sections": index}
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return SAVE_CHUNKED_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(chunks)
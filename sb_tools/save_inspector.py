@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+💾 Save Inspector - Inspection, migration et compactage des sauvegardes
+=======================================================================
+Décode les fichiers .sbsave écrits par SaveSystem.write_save_file :
+format par sections "SBS2" (sb_tools.save_format), ancien format
+FileAccess.store_var (longueur 32 bits + Variant) d'un PackedByteArray
+contenant le JSON compressé en gzip, ou JSON texte si la compression est
+désactivée. --chunked convertit vers le format par sections.
+
+- inspection : version, tailles brute/compressée par section, chaînes
+  répétées (observed_creatures, mémoire des PNJ...) ;
+- migration : miroir de SaveSystem.migrate_save_data (0.8.0 -> 0.9.0 ->
+  SAVE_VERSION), appliqué à tout un dossier en parallèle ;
+- compactage : JSON sans espaces, gzip niveau 9 et table de chaînes. Chaque
+  chaîne (valeur ou clé) répétée est stockée une fois dans "string_table" et
+  remplacée par STRING_REF_PREFIX + indice ; SaveSystem.read_save_file
+  reconstruit les chaînes au chargement. Au format par sections, chaque
+  section a sa propre table : l'en-tête (meta, summary) reste lisible.
+
+Usage: python godot_project_fixer.py saves <fichier.sbsave|dossier>... [--migrate] [--compact] [--chunked] [--output DOSSIER | --in-place] [--jobs N] [--json]
+"""
+
+import os
+import sys
+import zlib
+import gzip
+import json
+import struct
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sb_tools.godot_variant import get_var, store_var
+from sb_tools.save_format import is_chunked, read_header, read_sections, join_sections, encode_chunked
+
+# Doivent correspondre aux constantes de SaveSystem.gd
+SAVE_VERSION = "1.0.0"
+SAVE_FILE_EXTENSION = ".sbsave"
+STRING_TABLE_KEY = "string_table"
+# Préfixe imprimable (un caractère de contrôle serait échappé en \u00XX dans le JSON) ;
+# son absence en tête des chaînes est vérifiée avant compactage
+STRING_REF_PREFIX = "§"
+
+MIN_SHARED_LENGTH = 4
+GZIP_LEVEL = 9
+
+def decode_save(raw: bytes) -> Tuple[Dict, Dict]:
+    """Décode un fichier de sauvegarde. Retourne (données, informations de format)."""
+    info = {"file_bytes": len(raw)}
+    if is_chunked(raw):
+        header = read_header(raw)
+        info["framing"] = "chunked"
+        info["compressed_bytes"] = sum(entry["size"] for entry in header["sections"].values())
+        info["json_bytes"] = sum(entry["raw_size"] for entry in header["sections"].values())
+        sections = read_sections(raw)
+        meta = header.get("meta", {})
+        info["string_table"] = STRING_TABLE_KEY in meta or any(
+            isinstance(section, dict) and STRING_TABLE_KEY in section for section in sections.values())
+        sections = {name: expand_strings(section) if isinstance(section, dict) else section
+                    for name, section in sections.items()}
+        # Table globale dans meta : fichiers compactés avant les tables par section
+        return expand_strings(join_sections(meta, sections)), info
+    payload, variant_error = None, "aucun Variant"
+    try:
+        payload, _ = get_var(raw)
+    except (ValueError, struct.error) as e:
+        variant_error = str(e)
+    if isinstance(payload, bytes):
+        info["framing"] = "store_var"
+        info["compressed_bytes"] = len(payload)
+        text = gzip.decompress(payload).decode("utf-8")
+    elif isinstance(payload, str):
+        info["framing"] = "store_var_text"
+        text = payload
+    else:
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValueError(f"Format de sauvegarde inconnu ({variant_error if payload is None else type(payload).__name__})")
+        info["framing"] = "text"
+    info["json_bytes"] = len(text.encode("utf-8"))
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("La sauvegarde n'est pas un dictionnaire JSON")
+    info["string_table"] = STRING_TABLE_KEY in data
+    return expand_strings(data), info
+
+def encode_save(data: Dict, compressed: bool = True, compact: bool = False, chunked: bool = False) -> bytes:
+    """Réencode comme write_save_file (sections, store_var d'un gzip, ou texte)."""
+    if chunked:
+        return encode_chunked(data, section_transform=share_strings if compact else None)
+    if compact:
+        data = share_strings(data)
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":") if compact else None)
+    if not compressed:
+        return text.encode("utf-8")
+    return store_var(gzip.compress(text.encode("utf-8"), compresslevel=GZIP_LEVEL if compact else 6, mtime=0))
+
+def _count_strings(value, counts: Dict[str, int]):
+    if isinstance(value, str):
+        counts[value] = counts.get(value, 0) + 1
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            counts[key] = counts.get(key, 0) + 1
+            _count_strings(item, counts)
+    elif isinstance(value, list):
+        for item in value:
+            _count_strings(item, counts)
+
+def share_strings(data: Dict) -> Dict:
+    """Remplace les chaînes répétées par des références vers string_table."""
+    counts: Dict[str, int] = {}
+    _count_strings(data, counts)
+    if any(text.startswith(STRING_REF_PREFIX) for text in counts):
+        raise ValueError("Chaîne commençant par le préfixe de référence : compactage impossible")
+    # Partage rentable seulement si les références coûtent moins que les copies
+    reference_bytes = len(STRING_REF_PREFIX.encode("utf-8")) + len(str(len(counts)))
+    shared = [text for text, count in counts.items()
+              if len(text) >= MIN_SHARED_LENGTH and (count - 1) * len(text.encode("utf-8")) > count * reference_bytes + 3]
+    # Les plus fréquentes d'abord : leurs indices sont les plus courts
+    shared.sort(key=lambda text: (-counts[text], text))
+    if not shared:
+        return data
+    index = {text: f"{STRING_REF_PREFIX}{i}" for i, text in enumerate(shared)}
+
+    def replace(value):
+        if isinstance(value, str):
+            return index.get(value, value)
+        if isinstance(value, dict):
+            return {index.get(key, key): replace(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [replace(item) for item in value]
+        return value
+
+    result = replace(data)
+    result[STRING_TABLE_KEY] = shared
+    return result
+
+def expand_strings(data: Dict) -> Dict:
+    """Inverse de share_strings (miroir de SaveSystem.expand_save_strings)."""
+    if STRING_TABLE_KEY not in data:
+        return data
+    table = data[STRING_TABLE_KEY]
+
+    def resolve(text: str) -> str:
+        if text.startswith(STRING_REF_PREFIX):
+            return table[int(text[len(STRING_REF_PREFIX):])]
+        return text
+
+    def expand(value):
+        if isinstance(value, str):
+            return resolve(value)
+        if isinstance(value, dict):
+            return {resolve(key): expand(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [expand(item) for item in value]
+        return value
+
+    return expand({key: value for key, value in data.items() if key != STRING_TABLE_KEY})
+
+# Miroir de SaveSystem.migrate_from_* : une fonction par version source
+def migrate_from_0_8_0_to_0_9_0(data: Dict) -> Dict:
+    return data
+
+def migrate_from_0_9_0(data: Dict) -> Dict:
+    if "old_format_data" in data:
+        data["new_format_data"] = data.pop("old_format_data")
+    return data
+
+MIGRATIONS = {
+    "0.9.0": [migrate_from_0_9_0],
+    "0.8.0": [migrate_from_0_8_0_to_0_9_0, migrate_from_0_9_0]
+}
+
+def migrate_save(data: Dict) -> Tuple[Dict, List[str]]:
+    """Migre vers SAVE_VERSION. Retourne (données, avertissements)."""
+    old_version = data.get("save_version", "0.0.0")
+    if old_version == SAVE_VERSION:
+        return data, []
+    warnings = []
+    steps = MIGRATIONS.get(old_version)
+    if steps is None:
+        # Comme le script : version mise à jour malgré l'absence de migration
+        warnings.append(f"version {old_version} sans migration")
+    for step in steps or []:
+        data = step(data)
+    data["save_version"] = SAVE_VERSION
+    return data, warnings
+
+def section_sizes(data: Dict) -> Dict[str, int]:
+    """Taille JSON compacte de chaque section (managers détaillés)."""
+    sizes = {}
+    for key, value in data.items():
+        if key == "managers" and isinstance(value, dict):
+            for manager, section in value.items():
+                sizes[f"managers.{manager}"] = len(json.dumps(section, ensure_ascii=False, separators=(",", ":")))
+        else:
+            sizes[key] = len(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+def repeated_strings(data: Dict, limit: int = 5) -> Dict:
+    """Chaînes répétées : octets récupérables par la table de chaînes."""
+    counts: Dict[str, int] = {}
+    _count_strings(data, counts)
+    repeated = [(text, count) for text, count in counts.items() if count > 1 and len(text) >= MIN_SHARED_LENGTH]
+    saved = sum(len(text.encode("utf-8")) * (count - 1) for text, count in repeated)
+    top = sorted(repeated, key=lambda item: -len(item[0].encode("utf-8")) * (item[1] - 1))[:limit]
+    return {"distinct": len(repeated), "bytes_saved": saved, "top": [{"text": t[:60], "count": c} for t, c in top]}
+
+def process_save(task: Dict) -> Dict:
+    """Inspecte, migre et/ou compacte un fichier (exécuté par un processus de travail)."""
+    path = Path(task["path"])
+    started = time.perf_counter()
+    report = {"path": str(path)}
+    try:
+        data, info = decode_save(path.read_bytes())
+        report.update(info)
+        report["version"] = data.get("save_version", "0.0.0")
+        report["sections"] = section_sizes(data)
+        report["repeated"] = repeated_strings(data)
+        if task["migrate"]:
+            data, report["warnings"] = migrate_save(data)
+        if task["destination"]:
+            chunked = task["chunked"] or info["framing"] == "chunked"
+            encoded = encode_save(data, compressed=info["framing"] != "text", compact=task["compact"], chunked=chunked)
+            # Vérification avant écriture : avec --in-place, la destination est l'unique copie
+            if decode_save(encoded)[0] != data:
+                raise ValueError("Relecture différente après réencodage (fichier non modifié)")
+            destination = Path(task["destination"])
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            temporary = destination.with_suffix(destination.suffix + ".tmp")
+            try:
+                temporary.write_bytes(encoded)
+                os.replace(temporary, destination)
+            finally:
+                if temporary.exists():
+                    temporary.unlink()
+            report["written"] = str(destination)
+            report["written_bytes"] = len(encoded)
+        report["status"] = "ok"
+    except (OSError, ValueError, zlib.error) as e:
+        report["status"] = "error"
+        report["error"] = str(e)
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return report
+
+def collect_saves(paths: List[str]) -> List[Path]:
+    """Fichiers .sbsave désignés directement ou contenus dans des dossiers."""
+    files = []
+    for name in paths:
+        path = Path(name)
+        if path.is_dir():
+            files.extend(sorted(path.rglob(f"*{SAVE_FILE_EXTENSION}")))
+        elif path.exists():
+            files.append(path)
+        else:
+            raise ValueError(f"Introuvable: {name}")
+    return files
+
+def run(tasks: List[Dict], jobs: int = None) -> List[Dict]:
+    """Traite les sauvegardes (en parallèle si plusieurs processus)."""
+    if len(tasks) <= 1 or jobs == 1:
+        return [process_save(task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(process_save, tasks))
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande saves."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py saves",
+                                     description="Inspecte, migre et compacte les sauvegardes .sbsave")
+    parser.add_argument("paths", nargs="+", help="Fichiers .sbsave ou dossiers de sauvegardes")
+    parser.add_argument("--migrate", action="store_true", help=f"Migre vers la version {SAVE_VERSION}")
+    parser.add_argument("--compact", action="store_true", help="Table de chaînes, JSON compact et gzip niveau 9")
+    parser.add_argument("--chunked", action="store_true", help="Convertit vers le format par sections (SBS2)")
+    parser.add_argument("--output", "-o", default="", help="Dossier de sortie (arborescence conservée)")
+    parser.add_argument("--in-place", action="store_true", help="Réécrit les fichiers sur place")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Nombre de processus (défaut: CPU)")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    if args.output and args.in_place:
+        print("❌ --output et --in-place sont incompatibles")
+        return 1
+    if (args.migrate or args.compact or args.chunked) and not (args.output or args.in_place):
+        print("❌ --migrate, --compact et --chunked demandent --output DOSSIER ou --in-place")
+        return 1
+    try:
+        files = collect_saves(args.paths)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    tasks = []
+    for path in files:
+        destination = ""
+        if args.in_place:
+            destination = str(path)
+        elif args.output:
+            root = next((Path(p) for p in args.paths if Path(p).is_dir() and Path(p) in path.parents), path.parent)
+            destination = str(Path(args.output) / path.relative_to(root))
+        tasks.append({"path": str(path), "migrate": args.migrate, "compact": args.compact, "chunked": args.chunked, "destination": destination})
+
+    started = time.perf_counter()
+    reports = run(tasks, args.jobs)
+    total_ms = round((time.perf_counter() - started) * 1000, 3)
+    failed = [report for report in reports if report["status"] == "error"]
+
+    if args.json:
+        print(json.dumps({"saves": reports, "duration_ms": total_ms}, indent=2, ensure_ascii=False))
+        return 1 if failed else 0
+
+    for report in reports:
+        if report["status"] == "error":
+            print(f"❌ {report['path']}: {report['error']}")
+            continue
+        print(f"💾 {report['path']} (v{report['version']}, {report['framing']}): "
+              f"{report['file_bytes']} o sur disque, {report['json_bytes']} o de JSON")
+        for section, size in list(report["sections"].items())[:4]:
+            print(f"  {section:<28} {size:>9} o")
+        repeated = report["repeated"]
+        if repeated["bytes_saved"]:
+            print(f"  🔁 {repeated['distinct']} chaîne(s) répétée(s), {repeated['bytes_saved']} o partageables")
+        for warning in report.get("warnings", []):
+            print(f"  ⚠️ {warning}")
+        if "written" in report:
+            gain = 1 - report["written_bytes"] / report["file_bytes"] if report["file_bytes"] else 0.0
+            print(f"  ✅ -> {report['written']} ({report['written_bytes']} o, {gain:+.1%} de gain)")
+    print(f"\n⏱️ {len(reports)} sauvegarde(s) en {total_ms} ms, {len(failed)} erreur(s)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+📡 Signal Graph - Graphe émetteurs -> signaux -> handlers des scripts GDScript
+=============================================================================
+Construit, à partir de l'index GDScript (sb_tools.gd_index, mis en cache), le
+graphe complet des signaux du projet :
+  - émissions (signal.emit(...), emit_signal("...")) par fonction ;
+  - connexions (signal.connect(...), objet.connect("...", ...), gardées ou non
+    par has_signal) et [connection] des scènes .tscn.
+
+Le receveur d'une connexion (dialogue_manager.dialogue_started) est résolu vers
+un script par : variable locale ou membre affectée depuis get_node("/root/X")
+(AutoLoads de project.godot), type déclaré, class_name, puis nom de la variable
+(quest_manager -> QuestManager). Un receveur non résolu dont le signal n'est
+déclaré que par des scripts du projet est relié à chacun d'eux ("inferred").
+Un await objet.signal compte comme un écouteur.
+
+Rapport :
+  - signaux jamais connectés, jamais émis ;
+  - connexions vers un signal inexistant (handler jamais appelé) ;
+  - handlers _on_* jamais connectés ni appelés ;
+  - fan-out : signaux aux nombreux handlers, émis depuis _process /
+    _physics_process (chaque frame) ou _input (chaque événement).
+
+Usage: python godot_project_fixer.py signals [chemin_projet] [--dot graphe.dot] [--json graphe.json] [--top N]
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sb_tools.gd_index import DEFAULT_CACHE_PATH, build_index, build_lookup
+from sb_tools.autoload_check import _resolve_script, _script_path, read_autoloads
+
+# Points d'entrée appelés par le moteur à haute fréquence
+HOT_CALLBACKS = {"_process": "frame", "_physics_process": "frame",
+                 "_input": "event", "_unhandled_input": "event", "_gui_input": "event"}
+HANDLER_PREFIX = "_on_"
+SCENE_CONNECTION_RE = re.compile(r'^\[connection signal="(\w+)" from="([^"]*)" to="([^"]*)" method="(\w+)"')
+
+# ================================
+# RÉSOLUTION
+# ================================
+
+def _camel(name: str) -> str:
+    return "".join(part.capitalize() for part in name.split("_"))
+
+class _Resolver:
+    """Résout un receveur (variable, nom global) vers un script du projet."""
+
+    def __init__(self, index: Dict, autoloads: List[Dict]):
+        self.scripts = index["scripts"]
+        self.classes = build_lookup(index)["classes"]
+        self.autoload_scripts = {autoload["name"]: _script_path(autoload["path"]) for autoload in autoloads}
+        self.stems = {Path(path).stem: path for path in self.scripts}
+
+    def global_script(self, name: str) -> Optional[str]:
+        """Script d'un nom global : AutoLoad, class_name ou nom de fichier."""
+        for table in (self.autoload_scripts, self.classes, self.stems):
+            if name in table and table[name] in self.scripts:
+                return table[name]
+        return None
+
+    def root_script(self, path: str) -> Optional[str]:
+        """Script d'une recherche /root/<Nom>."""
+        if not path.startswith("/root/"):
+            return None
+        name = path[len("/root/"):].split("/", 1)[0]
+        return _resolve_script(name, self.scripts, self.autoload_scripts) if name else None
+
+    def receiver_script(self, script: str, function: Optional[str], receiver: Optional[str]) -> Tuple[Optional[str], str]:
+        """(script, méthode de résolution) ; (None, "engine") pour un objet hors projet."""
+        if receiver is None:
+            return script, "self"
+        if "." in receiver or "(" in receiver:
+            return None, "engine"
+        if receiver[:1].isupper():
+            found = self.global_script(receiver)
+            return (found, "global") if found else (None, "engine")
+
+        data = self.scripts[script]
+        lookups = [lookup for lookup in data["node_lookups"] if lookup.get("target") == receiver]
+        for lookup in sorted(lookups, key=lambda item: item["function"] != function):
+            found = self.root_script(lookup["path"])
+            if found:
+                return found, "get_node"
+        for var in data["variables"] + data["onready"] + data["exports"]:
+            if var["name"] == receiver and var["type"]:
+                found = self.global_script(var["type"])
+                return (found, "type") if found else (None, "engine")
+        found = self.global_script(_camel(receiver))
+        if found:
+            return found, "name"
+        return None, "engine"
+
+    def declared_signals(self, script: str) -> Dict[str, Dict]:
+        """Signaux d'un script et de ses parents du projet."""
+        signals, seen = {}, set()
+        while script and script not in seen:
+            seen.add(script)
+            data = self.scripts[script]
+            for signal in data["signals"]:
+                signals.setdefault(signal["name"], dict(signal, script=script))
+            parent = data["extends"] or ""
+            script = _script_path(parent) if parent.startswith("res://") else self.classes.get(parent)
+        return signals
+
+    def declaring_scripts(self, name: str) -> List[str]:
+        """Scripts déclarant un signal de ce nom (receveur non résolu : liens déduits)."""
+        return [script for script, data in self.scripts.items()
+                if any(signal["name"] == name and not signal.get("class") for signal in data["signals"])]
+
+    def label(self, script: str) -> str:
+        return self.scripts[script]["class_name"] or Path(script).stem
+
+# ================================
+# GRAPHE
+# ================================
+
+def _hot_functions(data: Dict) -> Dict[str, str]:
+    """Fonctions atteintes depuis _process / _input... par appels internes -> fréquence."""
+    calls = {func["name"]: func.get("calls", []) for func in data["functions"] if func["class"] is None}
+    hot = {}
+    for callback, frequency in sorted(HOT_CALLBACKS.items(), key=lambda item: item[1] != "frame"):
+        stack = [callback] if callback in calls else []
+        while stack:
+            name = stack.pop()
+            if name in hot:
+                continue
+            hot[name] = frequency
+            stack.extend(callee for callee in calls.get(name, []) if callee in calls)
+    return hot
+
+def scene_connections(project_root: Path) -> List[Dict]:
+    """[connection ...] des scènes : signal, nœuds source/cible et méthode."""
+    found = []
+    for scene in sorted(project_root.rglob("*.tscn")):
+        with open(scene, "r", encoding="utf-8", errors="replace") as f:
+            for number, line in enumerate(f, 1):
+                match = SCENE_CONNECTION_RE.match(line)
+                if match:
+                    found.append({"scene": scene.relative_to(project_root).as_posix(), "line": number,
+                                  "signal": match.group(1), "from": match.group(2),
+                                  "to": match.group(3), "method": match.group(4)})
+    return found
+
+def build_graph(project_root=".", use_cache: bool = True) -> Dict:
+    """Graphe des signaux du projet et constats (signaux morts, handlers inatteignables, fan-out)."""
+    root = Path(project_root)
+    index = build_index(str(root), cache_path=DEFAULT_CACHE_PATH if use_cache else None)
+    resolver = _Resolver(index, read_autoloads(root))
+    scripts = index["scripts"]
+
+    signals: Dict[str, Dict] = {}
+    for script in scripts:
+        for name, signal in resolver.declared_signals(script).items():
+            if signal["script"] != script or signal.get("class"):
+                continue
+            signals[f"{resolver.label(script)}.{name}"] = {
+                "script": script, "name": name, "line": signal["line"],
+                "params": [param["name"] for param in signal["params"]], "emits": [], "handlers": []
+            }
+
+    def signal_id(script: str, name: str) -> Optional[str]:
+        signal = resolver.declared_signals(script).get(name)
+        return f"{resolver.label(signal['script'])}.{name}" if signal else None
+
+    unknown_emits, unknown_connections, dynamic, engine = [], [], [], 0
+    # Méthodes atteignables : handlers de connexions valides et appels internes
+    referenced = set()
+    hot_by_script = {script: _hot_functions(data) for script, data in scripts.items()}
+
+    for script, data in scripts.items():
+        for emit in data["emits"]:
+            owner, how = resolver.receiver_script(script, emit["function"], emit["receiver"])
+            key = signal_id(owner, emit["signal"]) if owner else None
+            site = {"script": script, "function": emit["function"], "line": emit["line"],
+                    "hot": hot_by_script[script].get(emit["function"])}
+            if key:
+                signals[key]["emits"].append(site)
+            elif how != "engine":
+                unknown_emits.append(dict(site, signal=emit["signal"]))
+
+        for connection in data["connections"]:
+            site = {"script": script, "function": connection["function"], "line": connection["line"],
+                    "guarded": connection["guarded"]}
+            handler_script, _ = resolver.receiver_script(script, connection["function"], connection["target"])
+            handler = {"handler_script": handler_script, "handler": connection["method"]}
+            if connection["signal"] is None:
+                dynamic.append(dict(site, expression=connection["dynamic"], receiver=connection["receiver"], **handler))
+                referenced.add((handler_script, connection["method"]))
+                continue
+
+            source, how = resolver.receiver_script(script, connection["function"], connection["receiver"])
+            key = signal_id(source, connection["signal"]) if source else None
+            site["await"] = connection.get("await", False)
+            if key:
+                signals[key]["handlers"].append(dict(site, resolution=how, **handler))
+            elif how == "engine" and connection["receiver"] and resolver.declaring_scripts(connection["signal"]):
+                # Objet inconnu (variable non typée) mais signal propre au projet : un lien par déclaration
+                for declaring in resolver.declaring_scripts(connection["signal"]):
+                    signals[signal_id(declaring, connection["signal"])]["handlers"].append(
+                        dict(site, resolution="inferred", **handler))
+            elif source and how != "self":
+                # Objet du projet identifié, signal absent : le handler ne sera jamais appelé
+                unknown_connections.append(dict(site, signal=connection["signal"], source=source, **handler))
+                continue
+            else:
+                engine += 1
+            referenced.add((handler_script, connection["method"]))
+
+        for func in data["functions"]:
+            referenced.update((script, callee) for callee in func.get("calls", []))
+
+    scene_links = scene_connections(root)
+
+    # Appels via un objet (x._on_y()) et méthodes des [connection] de scènes : par nom seulement
+    method_refs = {name for data in scripts.values() for name in data["method_refs"]}
+    method_refs.update(link["method"] for link in scene_links)
+
+    unreachable = []
+    for key, signal in signals.items():
+        if signal["handlers"] and not signal["emits"]:
+            for handler in signal["handlers"]:
+                unreachable.append({"reason": f"{key} jamais émis", "script": handler["handler_script"],
+                                    "handler": handler["handler"], "line": handler["line"]})
+    for connection in unknown_connections:
+        unreachable.append({"reason": f"signal inexistant: {resolver.label(connection['source'])}.{connection['signal']}",
+                            "script": connection["handler_script"], "handler": connection["handler"],
+                            "line": connection["line"]})
+    reported = {(item["script"], item["handler"]) for item in unreachable}
+    for script, data in scripts.items():
+        for func in data["functions"]:
+            name = func["name"]
+            if (name.startswith(HANDLER_PREFIX) and (script, name) not in referenced
+                    and (script, name) not in reported and name not in method_refs):
+                unreachable.append({"reason": "jamais connecté ni appelé", "script": script,
+                                    "handler": name, "line": func["line"]})
+
+    hotspots = []
+    for key, signal in signals.items():
+        fan_out = len(signal["handlers"])
+        hot = sorted({emit["hot"] for emit in signal["emits"] if emit["hot"]})
+        if not signal["emits"] or not fan_out:
+            continue
+        hotspots.append({"signal": key, "handlers": fan_out, "emit_sites": len(signal["emits"]),
+                         "hot": hot, "score": fan_out * (100 if "frame" in hot else 10 if hot else 1)})
+    hotspots.sort(key=lambda item: (-item["score"], -item["handlers"], item["signal"]))
+
+    return {
+        "signals": signals,
+        "never_connected": sorted(key for key, signal in signals.items() if not signal["handlers"]),
+        "never_emitted": sorted(key for key, signal in signals.items() if not signal["emits"]),
+        "unknown_emits": unknown_emits,
+        "unknown_connections": unknown_connections,
+        "dynamic_connections": dynamic,
+        "scene_connections": scene_links,
+        "engine_connections": engine,
+        "unreachable_handlers": unreachable,
+        "hotspots": hotspots,
+        "stats": index["stats"]
+    }
+
+# ================================
+# EXPORT
+# ================================
+
+def _dot_id(text: str) -> str:
+    return '"' + text.replace('"', '\\"') + '"'
+
+def to_dot(graph: Dict) -> str:
+    """Graphe Graphviz : fonctions émettrices -> signaux -> handlers, regroupés par script."""
+    lines = ["digraph signals {", "  rankdir=LR;", "  node [fontname=\"Helvetica\", fontsize=10];"]
+    functions: Dict[str, set] = {}
+    edges = []
+    for key, signal in sorted(graph["signals"].items()):
+        hot = any(emit["hot"] == "frame" for emit in signal["emits"])
+        dead = not signal["emits"] or not signal["handlers"]
+        style = "color=red, fontcolor=red" if hot else "color=gray, fontcolor=gray" if dead else ""
+        lines.append(f"  {_dot_id(key)} [shape=ellipse{', ' + style if style else ''}];")
+        for emit in signal["emits"]:
+            function = f"{Path(emit['script']).stem}::{emit['function']}"
+            functions.setdefault(emit["script"], set()).add(function)
+            edges.append(f"  {_dot_id(function)} -> {_dot_id(key)} [style=dashed];")
+        for handler in signal["handlers"]:
+            owner = handler["handler_script"] or "?"
+            function = f"{Path(owner).stem}::{handler['handler']}"
+            functions.setdefault(owner, set()).add(function)
+            edges.append(f"  {_dot_id(key)} -> {_dot_id(function)}{' [style=dotted]' if handler['guarded'] else ''};")
+    for connection in graph["unknown_connections"]:
+        owner = connection["handler_script"] or "?"
+        function = f"{Path(owner).stem}::{connection['handler']}"
+        functions.setdefault(owner, set()).add(function)
+        missing = f"{Path(connection['source']).stem}.{connection['signal']} ?"
+        lines.append(f"  {_dot_id(missing)} [shape=ellipse, color=orange, fontcolor=orange];")
+        edges.append(f"  {_dot_id(missing)} -> {_dot_id(function)} [color=orange];")
+
+    for number, (script, names) in enumerate(sorted(functions.items())):
+        lines.append(f"  subgraph cluster_{number} {{")
+        lines.append(f"    label={_dot_id(script)};")
+        for name in sorted(names):
+            lines.append(f"    {_dot_id(name)} [shape=box, label={_dot_id(name.split('::', 1)[1])}];")
+        lines.append("  }")
+    lines.extend(sorted(set(edges)))
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+# ================================
+# CLI
+# ================================
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande signals."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py signals",
+                                     description="Graphe des signaux GDScript et rapport des signaux morts")
+    parser.add_argument("project", nargs="?", default=".", help="Racine du projet Godot")
+    parser.add_argument("--dot", default="", help="Exporte le graphe au format Graphviz DOT")
+    parser.add_argument("--json", default="", help="Exporte le graphe et le rapport en JSON")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de points chauds affichés")
+    parser.add_argument("--no-cache", action="store_true", help="N'utilise pas le cache de l'index GDScript")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Projet introuvable: {args.project}")
+        return 1
+    graph = build_graph(args.project, use_cache=not args.no_cache)
+
+    if args.dot:
+        Path(args.dot).write_text(to_dot(graph), encoding="utf-8")
+        print(f"💾 Graphe DOT: {args.dot}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(graph, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"💾 Graphe JSON: {args.json}")
+
+    signals = graph["signals"]
+    connected = sum(len(signal["handlers"]) for signal in signals.values())
+    emitted = sum(len(signal["emits"]) for signal in signals.values())
+    print(f"📡 {len(signals)} signal(aux) déclaré(s), {emitted} émission(s), {connected} connexion(s) "
+          f"(+{graph['engine_connections']} vers des signaux du moteur, {len(graph['dynamic_connections'])} dynamique(s))")
+
+    print(f"\n🔥 Fan-out ({min(args.top, len(graph['hotspots']))}/{len(graph['hotspots'])}):")
+    for hotspot in graph["hotspots"][:args.top]:
+        hot = f"  ⚠️ émis par frame/événement ({', '.join(hotspot['hot'])})" if hotspot["hot"] else ""
+        print(f"  {hotspot['signal']:<48} {hotspot['handlers']:>3} handler(s) {hotspot['emit_sites']:>3} émission(s){hot}")
+
+    dynamic_note = " ; hors connexions dynamiques ci-dessous" if graph["dynamic_connections"] else ""
+    print(f"\n🔇 Jamais connectés ({len(graph['never_connected'])}{dynamic_note}):")
+    for key in graph["never_connected"]:
+        print(f"  {key}" + ("" if signals[key]["emits"] else "  (jamais émis non plus)"))
+    silent = [key for key in graph["never_emitted"] if signals[key]["handlers"]]
+    print(f"\n📭 Connectés mais jamais émis ({len(silent)}):")
+    for key in silent:
+        print(f"  {key} ({len(signals[key]['handlers'])} handler(s))")
+
+    print(f"\n🚫 Handlers inatteignables ({len(graph['unreachable_handlers'])}):")
+    for item in graph["unreachable_handlers"]:
+        print(f"  {item['script'] or '?'}:{item['line']} {item['handler']}  ({item['reason']})")
+    for emit in graph["unknown_emits"]:
+        print(f"  ⚠️ émission d'un signal non déclaré: {emit['signal']} ({emit['script']}:{emit['line']})")
+    for connection in graph["dynamic_connections"]:
+        print(f"  ℹ️ connexion dynamique ({connection['expression']}) : {connection['script']}:{connection['line']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
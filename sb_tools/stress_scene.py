@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+🏟️ Stress Scene - Scènes de benchmark à N créatures / PNJ
+=========================================================
+Génère des scènes .tscn paramétrées (sb_tools.tscn_model, écriture en flux)
+peuplées de centaines ou de milliers de créatures (creature_database.json) et
+de PNJ (character_data.json) autour d'un joueur, en grille ou en disposition
+aléatoire à graine fixe, pour mesurer comment Player._physics_process,
+find_best_observation_target, update_observation et les boucles des
+créatures / PNJ tiennent la charge.
+
+Chaque scène embarque un nœud FrameTimeRecorder (scripts/debug) qui, après
+un préchauffage, enregistre les temps de frame puis écrit un JSON dans
+user://benchmarks/ et quitte. --report lit ces fichiers et indique le premier
+scénario dont le p95 dépasse le budget de frame.
+
+Usage: python godot_project_fixer.py stress [chemin_projet] [--creatures 100,500,1000] [--npcs 25,100,250] [--layout grid|random] [--seed S]
+       python godot_project_fixer.py stress --report <dossier_résultats> [--budget-ms 16.67]
+"""
+
+import sys
+import json
+import math
+import shlex
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sb_tools.data_index import _entries
+from sb_tools.data_pipeline import load_corpus
+from sb_tools.profiler import user_data_dir
+from sb_tools.tscn_model import (add_ext_resource, add_node, add_sub_resource, color, ext_ref, new_scene,
+                                 node_section, resource_uid, save_scene, scene_uid, sub_ref, vector2)
+
+DEFAULT_OUTPUT_DIR = "scenes/benchmark"
+RECORDER_SCRIPT = "res://scripts/debug/FrameTimeRecorder.gd"
+SCRIPTS = {
+    "player": "res://scripts/core/Player.gd",
+    "creature": "res://scripts/core/Creature.gd",
+    "npc": "res://scripts/core/NPC.gd",
+}
+LAYOUTS = ("grid", "random")
+DEFAULT_SPACING = 64.0
+DEFAULT_BUDGET_MS = 1000.0 / 60.0
+
+# ================================
+# DISPOSITION
+# ================================
+
+def grid_positions(count: int, spacing: float) -> List[Tuple[float, float]]:
+    """Grille carrée centrée sur l'origine (où se tient le joueur), case centrale exclue."""
+    side = math.ceil(math.sqrt(count + 1))
+    offset = (side - 1) / 2.0
+    cells = [((column - offset) * spacing, (row - offset) * spacing)
+             for row in range(side) for column in range(side)]
+    # Les plus proches du joueur d'abord : un petit scénario reste dense autour de lui
+    cells.sort(key=lambda cell: (cell[0] ** 2 + cell[1] ** 2, cell[1], cell[0]))
+    return [cell for cell in cells if cell != (0.0, 0.0)][:count]
+
+def random_positions(count: int, spacing: float, rng: random.Random) -> List[Tuple[float, float]]:
+    """Disposition uniforme sur un carré de même densité moyenne que la grille."""
+    half = math.sqrt(count + 1) * spacing / 2.0
+    return [(round(rng.uniform(-half, half), 1), round(rng.uniform(-half, half), 1)) for _ in range(count)]
+
+def layout_positions(count: int, layout: str, spacing: float, rng: random.Random) -> List[Tuple[float, float]]:
+    if layout == "grid":
+        return grid_positions(count, spacing)
+    return random_positions(count, spacing, rng)
+
+# ================================
+# SCÈNE
+# ================================
+
+def scenario_name(creatures: int, npcs: int, layout: str, seed: int) -> str:
+    name = f"stress_c{creatures}_n{npcs}_{layout}"
+    return name if layout == "grid" else f"{name}_s{seed}"
+
+def build_assignments(corpus: Dict, creatures: int, npcs: int, layout: str, spacing: float,
+                      seed: int) -> Tuple[List[Tuple], List[Tuple]]:
+    """(id, nom, position[, faction]) des créatures et PNJ, tirés de la base avec graine fixe."""
+    rng = random.Random(seed)
+    creature_db = _entries(corpus.get("creatures", {}))
+    character_db = _entries(corpus.get("characters", {}))
+    if creatures and not creature_db:
+        raise ValueError("creature_database.json ne contient aucune créature")
+    if npcs and not character_db:
+        raise ValueError("character_data.json ne contient aucun personnage")
+
+    # Créatures et PNJ se partagent les emplacements, mélangés
+    positions = layout_positions(creatures + npcs, layout, spacing, rng)
+    rng.shuffle(positions)
+    creature_ids, character_ids = sorted(creature_db), sorted(character_db)
+    creature_slots = [(cid, creature_db[cid].get("name", cid), position)
+                      for cid, position in zip((rng.choice(creature_ids) for _ in range(creatures)), positions)]
+    npc_slots = [(cid, character_db[cid].get("name", cid), position, character_db[cid].get("faction", "citizens"))
+                 for cid, position in zip((rng.choice(character_ids) for _ in range(npcs)), positions[creatures:])]
+    return creature_slots, npc_slots
+
+def _creature_nodes(slots: List[Tuple], script_id: str, shape_id: str) -> Iterator[Dict]:
+    """Nœuds d'une créature : ceux attendus par les @onready de Creature.gd."""
+    for index, (creature_id, name, position) in enumerate(slots, 1):
+        node = f"Creature{index:05d}"
+        path = f"Creatures/{node}"
+        yield node_section(node, "CharacterBody2D", "Creatures", {
+            "position": vector2(*position), "script": ext_ref(script_id),
+            "creature_id": creature_id, "display_name": name}, groups=["creatures"])
+        yield node_section("Sprite2D", "Sprite2D", path, {"modulate": color(0.8, 0.6, 0.4, 1)})
+        yield node_section("CollisionShape2D", "CollisionShape2D", path, {"shape": sub_ref(shape_id)})
+        yield node_section("AnimationPlayer", "AnimationPlayer", path)
+
+def _npc_nodes(slots: List[Tuple], script_id: str, shape_id: str, area_id: str) -> Iterator[Dict]:
+    """Nœuds d'un PNJ : ceux attendus par les @onready de NPC.gd."""
+    for index, (character_id, name, position, faction) in enumerate(slots, 1):
+        node = f"NPC{index:05d}"
+        path = f"NPCs/{node}"
+        yield node_section(node, "CharacterBody2D", "NPCs", {
+            "position": vector2(*position), "script": ext_ref(script_id),
+            "character_id": character_id, "character_name": name, "faction_id": faction}, groups=["npcs"])
+        yield node_section("Sprite", "AnimatedSprite2D", path, {"modulate": color(1, 0.8, 0.6, 1)})
+        yield node_section("CollisionShape2D", "CollisionShape2D", path, {"shape": sub_ref(shape_id)})
+        yield node_section("InteractionArea", "Area2D", path)
+        yield node_section("CollisionShape2D", "CollisionShape2D", f"{path}/InteractionArea", {"shape": sub_ref(area_id)})
+        yield node_section("DialogueIndicator", "Node2D", path)
+        yield node_section("MoodIndicator", "Node2D", path)
+        for timer in ("MovementTimer", "MoodTimer", "PatrolTimer"):
+            yield node_section(timer, "Timer", path)
+
+def write_stress_scene(project_root: Path, output_dir: str, corpus: Dict, creatures: int, npcs: int,
+                       layout: str = "grid", spacing: float = DEFAULT_SPACING, seed: int = 0,
+                       warmup: float = 2.0, duration: float = 10.0, budget_ms: float = DEFAULT_BUDGET_MS) -> Dict:
+    """Écrit une scène de stress ; les nœuds sont produits et écrits au fil de l'eau."""
+    name = scenario_name(creatures, npcs, layout, seed)
+    res_path = f"res://{output_dir.strip('/')}/{name}.tscn"
+    creature_slots, npc_slots = build_assignments(corpus, creatures, npcs, layout, spacing, seed)
+    scenario = {"name": name, "creatures": creatures, "npcs": npcs, "layout": layout,
+                "spacing": spacing, "seed": seed}
+
+    scene = new_scene(scene_uid(res_path))
+    ids = {key: add_ext_resource(scene, "Script", path, resource_uid(project_root, path))
+           for key, path in SCRIPTS.items()}
+    recorder_id = add_ext_resource(scene, "Script", RECORDER_SCRIPT, resource_uid(project_root, RECORDER_SCRIPT))
+    body_shape = add_sub_resource(scene, "RectangleShape2D", {"size": vector2(32, 48)})
+    interaction_shape = add_sub_resource(scene, "CircleShape2D", {"radius": 50.0})
+    observation_shape = add_sub_resource(scene, "CircleShape2D", {"radius": 80.0})
+
+    add_node(scene, "StressScene", "Node2D")
+    add_node(scene, "FrameTimeRecorder", "Node", ".", {
+        "script": ext_ref(recorder_id), "warmup_seconds": float(warmup), "duration_seconds": float(duration),
+        "frame_budget_ms": round(budget_ms, 2), "output_path": f"user://benchmarks/{name}.json",
+        "scenario": scenario})
+    add_node(scene, "Player", "CharacterBody2D", ".", {"script": ext_ref(ids["player"])}, groups=["player"])
+    add_node(scene, "Sprite2D", "Sprite2D", "Player", {"modulate": color(0.3, 0.6, 1, 1)})
+    add_node(scene, "CollisionShape2D", "CollisionShape2D", "Player", {"shape": sub_ref(body_shape)})
+    add_node(scene, "InteractionArea", "Area2D", "Player")
+    add_node(scene, "CollisionShape2D", "CollisionShape2D", "Player/InteractionArea", {"shape": sub_ref(interaction_shape)})
+    add_node(scene, "ObservationArea", "Area2D", "Player")
+    add_node(scene, "CollisionShape2D", "CollisionShape2D", "Player/ObservationArea", {"shape": sub_ref(observation_shape)})
+    add_node(scene, "Camera2D", "Camera2D", "Player")
+    add_node(scene, "Creatures", "Node2D", ".")
+    add_node(scene, "NPCs", "Node2D", ".")
+
+    def nodes():
+        yield from _creature_nodes(creature_slots, ids["creature"], body_shape)
+        yield from _npc_nodes(npc_slots, ids["npc"], body_shape, interaction_shape)
+
+    output = Path(project_root) / output_dir / f"{name}.tscn"
+    save_scene(output, scene, nodes())
+    return {**scenario, "path": res_path, "file": str(output), "bytes": output.stat().st_size}
+
+# ================================
+# RAPPORT
+# ================================
+
+def load_results(results_dir: Path) -> List[Dict]:
+    """Résultats FrameTimeRecorder, du plus petit au plus grand nombre d'entités."""
+    results = []
+    for path in sorted(Path(results_dir).glob("*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {path}: {e}")
+            continue
+        if isinstance(data, dict) and "stats" in data:
+            results.append(data)
+    scenario = lambda result: result.get("scenario", {})
+    return sorted(results, key=lambda r: (scenario(r).get("creatures", 0) + scenario(r).get("npcs", 0),
+                                          scenario(r).get("name", "")))
+
+def budget_collapse(results: List[Dict], budget_ms: float) -> Dict:
+    """Premier scénario dont le p95 dépasse le budget (None si tous tiennent)."""
+    for result in results:
+        if result["stats"].get("p95_ms", 0.0) > budget_ms:
+            return result
+    return None
+
+def print_report(results: List[Dict], budget_ms: float):
+    print(f"⏱️ {len(results)} résultat(s), budget {budget_ms:.2f} ms")
+    print(f"   {'scénario':<34} {'entités':>8} {'moy':>7} {'p95':>7} {'p99':>7} {'max':>8} {'hors budget':>11}")
+    for result in results:
+        scenario, stats = result.get("scenario", {}), result["stats"]
+        entities = scenario.get("creatures", 0) + scenario.get("npcs", 0)
+        marker = "❌" if stats.get("p95_ms", 0.0) > budget_ms else "✅"
+        print(f"{marker} {scenario.get('name', '?'):<34} {entities:>8} {stats.get('avg_ms', 0):>7.2f} "
+              f"{stats.get('p95_ms', 0):>7.2f} {stats.get('p99_ms', 0):>7.2f} {stats.get('max_ms', 0):>8.2f} "
+              f"{stats.get('over_budget_ratio', 0) * 100:>10.1f}%")
+    collapse = budget_collapse(results, budget_ms)
+    if collapse:
+        scenario = collapse.get("scenario", {})
+        print(f"\n📉 Budget dépassé à partir de {scenario.get('creatures', 0)} créatures "
+              f"+ {scenario.get('npcs', 0)} PNJ ({scenario.get('name', '?')})")
+    elif results:
+        print("\n📈 Tous les scénarios tiennent le budget")
+
+def user_benchmarks_dir(project_root: Path) -> Optional[Path]:
+    """Dossier user://benchmarks du projet selon la plateforme (None sans config/name)."""
+    user_dir = user_data_dir(Path(project_root))
+    return user_dir / "benchmarks" if user_dir else None
+
+# ================================
+# CLI
+# ================================
+
+def _counts(text: str) -> List[int]:
+    return [int(value) for value in text.split(",") if value.strip()]
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande stress."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py stress",
+                                     description="Génère des scènes de benchmark à N créatures / PNJ")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--creatures", default="100,250,500,1000,2000", help="Créatures par scène, séparées par des virgules")
+    parser.add_argument("--npcs", default="0", help="PNJ par scène (une valeur pour toutes, ou une par scène)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="grid", help="Disposition des entités")
+    parser.add_argument("--spacing", type=float, default=DEFAULT_SPACING, help="Espacement moyen en pixels")
+    parser.add_argument("--seed", type=int, default=0, help="Graine (tirage des créatures, disposition aléatoire)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Dossier des scènes (relatif au projet)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Préchauffage avant mesure (s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de mesure (s)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Budget de frame (ms)")
+    parser.add_argument("--report", help="Dossier des résultats JSON (user://benchmarks) à analyser")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    if args.report:
+        results = load_results(Path(args.report))
+        if args.json:
+            collapse = budget_collapse(results, args.budget_ms)
+            print(json.dumps({"results": [{"scenario": r.get("scenario", {}), "stats": r["stats"]} for r in results],
+                              "collapse": collapse.get("scenario") if collapse else None},
+                             indent=2, ensure_ascii=False))
+        else:
+            print_report(results, args.budget_ms)
+        return 0 if results else 1
+
+    try:
+        creature_counts, npc_counts = _counts(args.creatures), _counts(args.npcs)
+    except ValueError:
+        parser.error("--creatures et --npcs attendent des entiers séparés par des virgules")
+    if len(npc_counts) == 1:
+        npc_counts *= len(creature_counts)
+    if not creature_counts or len(npc_counts) != len(creature_counts):
+        parser.error("--npcs doit avoir une valeur, ou autant de valeurs que --creatures")
+
+    project_root = Path(args.project_root)
+    if not (project_root / RECORDER_SCRIPT.replace("res://", "")).exists():
+        print(f"⚠️ {RECORDER_SCRIPT} absent : les scènes ne mesureront rien")
+    try:
+        corpus = load_corpus(project_root / "data")
+        scenes = [write_stress_scene(project_root, args.output_dir, corpus, creatures, npcs, args.layout,
+                                     args.spacing, args.seed, args.warmup, args.duration, args.budget_ms)
+                  for creatures, npcs in zip(creature_counts, npc_counts)]
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(scenes, indent=2, ensure_ascii=False))
+        return 0
+    for entry in scenes:
+        print(f"🏟️ {entry['path']}: {entry['creatures']} créatures, {entry['npcs']} PNJ "
+              f"({entry['layout']}, {entry['bytes'] / 1024:.0f} Ko)")
+    # Chemins cités pour le shell : le nom du projet contient "&"
+    benchmarks_dir = user_benchmarks_dir(project_root)
+    print(f"\n▶️ Lancer: godot --path {shlex.quote(str(project_root))} {shlex.quote(scenes[0]['path'])}")
+    print(f"📊 Puis: python godot_project_fixer.py stress --report "
+          f"{shlex.quote(str(benchmarks_dir)) if benchmarks_dir else '<dossier_résultats>'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Stub Generator - Stubs headless dérivés des vrais managers
+=============================================================
+Les stubs UIManager / AudioManager écrits à la main par le fixer divergeaient
+des vrais managers (800 lignes contre 40). Ils sont maintenant dérivés de la
+surface publique du script qui déclare le class_name, lue dans l'index
+GDScript (cache .sb_cache/gd_index.json, seuls les scripts modifiés sont
+reparsés) :
+
+  - le stub est autonome : il étend la classe moteur du manager (CanvasLayer,
+    Node...) sans jamais charger le vrai script ni ses dépendances ;
+  - il déclare les mêmes signaux, enums, constantes et variables publiques
+    (valeur neutre du type, défaut littéral conservé) et chaque fonction
+    publique avec la même signature et un corps vide ;
+  - les types propres au projet (class_name, classes internes) sont retirés
+    des déclarations : le stub n'a pas de class_name, les appelants passent
+    par Node et has_method ;
+  - stub_source donne le chemin du vrai manager : GameManager reconnaît
+    l'AutoLoad remplacé et n'instancie pas le vrai manager en plus ;
+  - _ready ne construit rien : is_initialized et manager_initialized sont
+    positionnés / émis comme par le vrai manager ;
+  - --instrument counters|timing ajoute compteurs d'appels et instants du
+    premier / dernier appel, affichés à la sortie de l'arbre.
+
+--override écrit override.cfg (lu par Godot avant project.godot) pour que les
+AutoLoads de ces managers chargent les stubs : une exécution headless démarre
+sans interface ni audio. --clear-override le supprime.
+
+Usage: python godot_project_fixer.py stubs [chemin_projet] [--class UIManager,AudioManager] [--instrument none|counters|timing] [--output-dir scripts/stubs/headless] [--override | --clear-override] [--no-cache]
+"""
+
+import re
+import sys
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sb_tools.gd_index import DEFAULT_CACHE_PATH, _logical_lines, build_index, build_lookup, res_path
+from sb_tools.gd_codegen import load_templates, render_template
+
+STUB_CLASSES = ("UIManager", "AudioManager")
+DEFAULT_STUB_DIR = "scripts/stubs/headless"
+INSTRUMENT_LEVELS = ("none", "counters", "timing")
+OVERRIDE_FILENAME = "override.cfg"
+
+READY_SIGNALS = ("manager_initialized", "manager_ready")
+HEADER_RE = re.compile(r"^# (\S+) \w+\.gd - ")
+IDENT_RE = re.compile(r"(?<![\w.])[A-Za-z_]\w*")
+STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+LITERAL_RE = re.compile(r'^(-?\d+(\.\d+)?|true|false|null|"[^"]*"|\[\]|\{\})$')
+MAX_EXTENDS_DEPTH = 16
+
+RETURN_DEFAULTS = {
+    "bool": "false", "int": "0", "float": "0.0", "String": '""', "StringName": '&""',
+    "Array": "[]", "Dictionary": "{}", "NodePath": "NodePath()", "Color": "Color()", "Rect2": "Rect2()",
+    "Vector2": "Vector2.ZERO", "Vector2i": "Vector2i.ZERO", "Vector3": "Vector3.ZERO", "Vector3i": "Vector3i.ZERO"
+}
+
+# Types conservés tels quels ; tout autre nom de classe (projet, classe interne,
+# classe absente) est retiré : un stub non typé reste valide
+BUILTIN_TYPES = set(RETURN_DEFAULTS) | {
+    "Variant", "Object", "Callable", "Signal", "Rect2i", "Vector4", "Vector4i", "Transform2D",
+    "Transform3D", "Basis", "Quaternion", "AABB", "Plane", "Projection", "RID"
+}
+ENGINE_TYPES = {
+    "Node", "Node2D", "Node3D", "CanvasItem", "CanvasLayer", "Control", "Container", "Panel",
+    "PanelContainer", "MarginContainer", "VBoxContainer", "HBoxContainer", "GridContainer",
+    "ScrollContainer", "Label", "RichTextLabel", "Button", "TextureRect", "ColorRect", "ProgressBar",
+    "Timer", "Tween", "Camera2D", "Sprite2D", "AnimationPlayer", "Resource", "Texture2D", "Theme",
+    "Font", "AudioStream", "AudioStreamPlayer", "AudioStreamPlayer2D", "AudioStreamPlayer3D",
+    "InputEvent", "SceneTree", "Window", "Viewport"
+}
+
+# ================================
+# SURFACE D'UN MANAGER
+# ================================
+
+def default_return(type_name: Optional[str], enums: set) -> Optional[str]:
+    """Valeur neutre renvoyée par un corps vide (None : pas de return)."""
+    if not type_name or type_name == "void":
+        return None
+    if type_name.startswith("Array["):
+        return "[]"
+    if type_name.startswith("Packed"):
+        return f"{type_name}()"
+    if type_name in RETURN_DEFAULTS:
+        return RETURN_DEFAULTS[type_name]
+    if type_name in enums:
+        return f"0 as {type_name}"
+    return "null"
+
+def engine_base(index: Dict, lookup: Dict, extends: Optional[str]) -> str:
+    """Première classe moteur de la chaîne d'héritage (les scripts du projet ne sont pas chargés)."""
+    for _ in range(MAX_EXTENDS_DEPTH):
+        if not extends:
+            return "Node"
+        if extends.startswith("res://"):
+            script = extends[len("res://"):]
+        elif extends in lookup["classes"]:
+            script = lookup["classes"][extends]
+        else:
+            return extends
+        if script not in index["scripts"]:
+            return "Node"
+        extends = index["scripts"][script]["extends"]
+    return "Node"
+
+class StubSurface:
+    """Réécrit les déclarations du manager sans ses types propres au projet."""
+
+    def __init__(self, class_name: str, symbols: Dict, project_classes: set):
+        self.prefix = class_name + "."
+        self.enums = {enum["name"] for enum in symbols["enums"] if enum["name"] and enum["class"] is None}
+        self.known = BUILTIN_TYPES | ENGINE_TYPES | self.enums | {"Array", "Dictionary"}
+        inner = {item["name"] for item in symbols["inner_classes"]}
+        self.foreign = (project_classes | inner) - self.known
+
+    def is_foreign(self, name: str) -> bool:
+        """Classe du projet ou inconnue (les CONSTANTES et identifiants minuscules passent)."""
+        if name in self.known:
+            return False
+        return name in self.foreign or (name[0].isupper() and not name.isupper())
+
+    def clean(self, text: Optional[str]) -> Optional[str]:
+        """Expression sans préfixe de la classe ; None si elle dépend d'une classe non autonome."""
+        if text is None:
+            return None
+        text = text.replace(self.prefix, "")
+        names = IDENT_RE.findall(STRING_RE.sub('""', text))
+        return None if any(self.is_foreign(name) for name in names) else text
+
+    def clean_type(self, type_name: Optional[str]) -> Optional[str]:
+        """Type autonome ; Array[T] non reproductible devient Array, sinon None (non typé)."""
+        cleaned = self.clean(type_name)
+        if cleaned is None and type_name and type_name.startswith("Array["):
+            return "Array"
+        return cleaned
+
+    def params(self, params: List[Dict]) -> str:
+        """Paramètres nettoyés ; un défaut non reproductible devient null (non typé)."""
+        parts = []
+        for param in params:
+            type_name = self.clean_type(param["type"])
+            text = param["name"]
+            if "default" in param:
+                default = self.clean(param["default"])
+                if default is None:
+                    type_name, default = None, "null"
+                text += (f": {type_name}" if type_name else "") + f" = {default}"
+            elif type_name:
+                text += f": {type_name}"
+            parts.append(text)
+        return ", ".join(parts)
+
+    def variable(self, var: Dict) -> str:
+        """Déclaration neutre : type conservé s'il est autonome, sinon défaut littéral."""
+        type_name = self.clean_type(var["type"])
+        if type_name:
+            return f"var {var['name']}: {type_name}"
+        default = (var["default"] or "").strip()
+        if LITERAL_RE.match(default):
+            return f"var {var['name']} = {default}"
+        return f"var {var['name']}"
+
+def source_declarations(text: str, lines: set) -> Dict[int, str]:
+    """Code logique (lignes jointes, sans commentaires) des déclarations demandées."""
+    return {lineno: code for lineno, _, code in _logical_lines(text) if lineno in lines}
+
+def stub_declarations(surface: StubSurface, symbols: Dict, text: str) -> Dict[str, List[str]]:
+    """Enums et constantes recopiés, variables et signaux réécrits."""
+    enums = [enum for enum in symbols["enums"] if enum["class"] is None and enum["name"]]
+    constants = [const for const in symbols["constants"] if const["class"] is None]
+    code = source_declarations(text, {item["line"] for item in enums + constants})
+
+    declared, enum_lines, constant_lines = set(), [], []
+    for enum in enums:
+        if enum["name"] not in declared:
+            declared.add(enum["name"])
+            enum_lines.append(code[enum["line"]])
+    for const in constants:
+        if const["name"] in declared:
+            continue
+        declared.add(const["name"])
+        line = code[const["line"]].replace(surface.prefix, "")
+        value = line.split("=", 1)[1] if "=" in line else ""
+        if "load(" in value or surface.clean(value) is None:
+            line = f"const {const['name']} = null"
+        constant_lines.append(line)
+
+    variables = []
+    for var in symbols["variables"] + symbols["exports"] + symbols["onready"]:
+        if var["class"] is None and not var["name"].startswith("_") and var["name"] not in declared:
+            declared.add(var["name"])
+            variables.append(surface.variable(var))
+
+    signals = []
+    for signal in symbols["signals"]:
+        if signal["class"] is None and signal["name"] not in declared:
+            declared.add(signal["name"])
+            params = surface.params(signal["params"])
+            signals.append(f"signal {signal['name']}" + (f"({params})" if params else ""))
+    return {"signals": signals, "enums": enum_lines, "constants": constant_lines, "variables": variables}
+
+def stub_functions(surface: StubSurface, symbols: Dict, instrument: bool) -> List[Dict]:
+    """Fonctions publiques, paramètres préfixés par _ (inutilisés)."""
+    functions, seen = [], set()
+    for function in symbols["functions"]:
+        name = function["name"]
+        if function["class"] is not None or function["static"] or name.startswith("_") or name in seen:
+            continue
+        seen.add(name)
+        params = [dict(param, name="_" + param["name"].lstrip("_")) for param in function["params"]]
+        return_type = surface.clean_type(function["return_type"])
+        signature = f"{name}({surface.params(params)})" + (f" -> {return_type}" if return_type else "")
+        if return_type:
+            value = default_return(return_type, surface.enums)
+        else:
+            value = None if function["return_type"] in (None, "void") else "null"
+        functions.append({
+            "name": name,
+            "signature": signature,
+            "value": value,
+            "empty": value is None and not instrument
+        })
+    return functions
+
+def find_manager(lookup: Dict, index: Dict, class_name: str, output_dir: str) -> Optional[Tuple[str, Dict]]:
+    """Script déclarant ce class_name (hors stubs générés) et ses symboles."""
+    script = lookup["classes"].get(class_name)
+    if script is None or script.startswith(output_dir.rstrip("/") + "/"):
+        return None
+    return script, index["scripts"][script]
+
+def stub_context(project_root: Path, index: Dict, lookup: Dict, class_name: str, script: str,
+                 symbols: Dict, output: str, instrument: str) -> Dict:
+    """Contexte du template headless_stub."""
+    text = (project_root / script).read_text(encoding="utf-8")
+    header = text.split("\n", 2)[:2]
+    match = HEADER_RE.match(header[1]) if len(header) > 1 else None
+    surface = StubSurface(class_name, symbols, set(lookup["classes"]))
+    declarations = stub_declarations(surface, symbols, text)
+    signals = {signal["name"]: signal for signal in symbols["signals"] if signal["class"] is None}
+    variables = {var["name"] for var in symbols["variables"] if var["class"] is None}
+    ready_signals = [name for name in READY_SIGNALS if name in signals and not signals[name]["params"]]
+    return {
+        "emoji": match.group(1) if match else "🧪",
+        "script_name": Path(output).name,
+        "title": f"Stub headless de {class_name}",
+        "class_name": class_name,
+        "source": res_path(script),
+        "base": engine_base(index, lookup, symbols["extends"]),
+        **declarations,
+        "instrument": instrument != "none",
+        "timing": instrument == "timing",
+        "initialized_flag": "is_initialized" in variables,
+        "ready_signals": ready_signals,
+        "ready_empty": instrument == "none" and "is_initialized" not in variables and not ready_signals,
+        "functions": stub_functions(surface, symbols, instrument != "none")
+    }
+
+def generate_stubs(project_root, classes=STUB_CLASSES, output_dir: str = DEFAULT_STUB_DIR,
+                   instrument: str = "none", use_cache: bool = True) -> Tuple[Dict[str, str], List[str]]:
+    """Stubs {chemin relatif: contenu} des managers trouvés, et classes sans implémentation."""
+    root = Path(project_root)
+    index = build_index(str(root), cache_path=DEFAULT_CACHE_PATH if use_cache else None)
+    lookup = build_lookup(index)
+    templates = load_templates()
+    stubs, missing = {}, []
+    for class_name in classes:
+        found = find_manager(lookup, index, class_name, output_dir)
+        if found is None:
+            missing.append(class_name)
+            continue
+        script, symbols = found
+        output = f"{output_dir.rstrip('/')}/{class_name}.gd"
+        context = stub_context(root, index, lookup, class_name, script, symbols, output, instrument)
+        stubs[output] = render_template(templates, "headless_stub", context)
+    return stubs, missing
+
+# ================================
+# OVERRIDE.CFG
+# ================================
+
+def override_text(autoloads: List[Dict], stubs: Dict[str, str], class_scripts: Dict[str, str]) -> str:
+    """override.cfg redirigeant vers les stubs les AutoLoads dont le script a été remplacé."""
+    replaced = {res_path(class_scripts[Path(path).stem]): res_path(path) for path in stubs}
+    lines = ["; Généré par: python godot_project_fixer.py stubs --override",
+             "; AutoLoads remplacés par leurs stubs headless (supprimer ce fichier pour revenir au jeu complet)",
+             "", "[autoload]", ""]
+    for autoload in autoloads:
+        if autoload["path"] in replaced:
+            star = "*" if autoload["singleton"] else ""
+            lines.append(f'{autoload["name"]}="{star}{replaced[autoload["path"]]}"')
+    return "\n".join(lines) + "\n"
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande stubs."""
+    from sb_tools.autoload_check import read_autoloads
+
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py stubs",
+                                     description="Génère des stubs headless depuis la surface des vrais managers")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--class", dest="classes", default=",".join(STUB_CLASSES),
+                        help=f"class_name des managers à remplacer (défaut: {','.join(STUB_CLASSES)})")
+    parser.add_argument("--instrument", choices=INSTRUMENT_LEVELS, default="none",
+                        help="Compteurs d'appels (counters) et instants d'appel (timing)")
+    parser.add_argument("--output-dir", default=DEFAULT_STUB_DIR, help=f"Dossier des stubs (défaut: {DEFAULT_STUB_DIR})")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--override", action="store_true", help=f"Écrit {OVERRIDE_FILENAME} : AutoLoads -> stubs")
+    group.add_argument("--clear-override", action="store_true", help=f"Supprime {OVERRIDE_FILENAME}")
+    parser.add_argument("--no-cache", action="store_true", help="N'utilise pas le cache de l'index GDScript")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    override_path = project_root / OVERRIDE_FILENAME
+    if args.clear_override:
+        if override_path.exists():
+            override_path.unlink()
+            print(f"🧹 {override_path} supprimé")
+        return 0
+
+    classes = [name.strip() for name in args.classes.split(",") if name.strip()]
+    try:
+        stubs, missing = generate_stubs(project_root, classes, args.output_dir, args.instrument,
+                                        use_cache=not args.no_cache)
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for class_name in missing:
+        print(f"⚠️ {class_name}: aucun script ne déclare ce class_name")
+    for relative_path, content in stubs.items():
+        path = project_root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        functions = sum(1 for line in content.splitlines() if line.startswith("func ") and " _stub_" not in line)
+        print(f"🧪 {relative_path}: {functions} fonction(s), {len(content.splitlines())} lignes")
+
+    if args.override and stubs:
+        index = build_index(str(project_root), cache_path=DEFAULT_CACHE_PATH if not args.no_cache else None)
+        class_scripts = build_lookup(index)["classes"]
+        override_path.write_text(override_text(read_autoloads(project_root), stubs, class_scripts), encoding="utf-8")
+        print(f"🔁 {override_path}: les AutoLoads chargent les stubs (--clear-override pour revenir)")
+    return 1 if missing and not stubs else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
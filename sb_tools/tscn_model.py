@@ -0,0 +1,611 @@
+# -*- coding: utf-8 -*-
+"""
+🎬 TSCN Model - Lecture et écriture des scènes texte Godot (.tscn / .tres)
+==========================================================================
+Modèle Python du format texte des scènes Godot 4 :
+
+    [gd_scene load_steps=5 format=3 uid="uid://..."]     en-tête
+    [ext_resource type="Script" uid="..." path="res://..." id="1_player"]
+    [sub_resource type="RectangleShape2D" id="player_shape"]
+    size = Vector2(32, 48)
+    [node name="Player" type="CharacterBody2D" parent="." groups=["player"]]
+    [connection signal="body_entered" from="Area" to="." method="_on_body_entered"]
+
+Une scène est un dictionnaire {"sections": [...], "trailing": n} ; chaque
+section est {"tag", "attrs": [(clé, texte brut)], "properties": [(clé, texte
+brut)], "gap": lignes vides avant la section}. Les valeurs restent du texte
+Godot brut (Vector2(...), ExtResource("..."), chaînes multi-lignes...) : la
+relecture puis l'écriture d'un fichier redonnent exactement les mêmes octets.
+
+Lecture et écriture travaillent ligne à ligne (iter_sections, iter_scene_lines,
+stream_scene) : une scène de stress se génère nœud par nœud sans construire
+de liste de chaînes géante. Le constructeur (new_scene, add_ext_resource,
+add_sub_resource, add_node, add_connection) tient load_steps à jour et
+réutilise une sub_resource identique au lieu de la dupliquer.
+
+Usage: python godot_project_fixer.py scene <fichier.tscn|dossier>... [--tree] [--dedupe] [--output FICHIER | --in-place]
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+HEADER_TAGS = ("gd_scene", "gd_resource")
+SCENE_FORMAT = 3
+SECTION_RE = re.compile(r'^\[(\w+)')
+ATTR_KEY_RE = re.compile(r'\s*([\w/]+)=')
+REF_RE = re.compile(r'\b(ExtResource|SubResource)\("([^"]*)"\)')
+PROPERTY_SEPARATOR = " = "
+
+# Alphabet de ResourceUID::id_to_text (a-y puis 0-8, base 34)
+UID_CHAR_COUNT = ord("z") - ord("a")
+UID_BASE = UID_CHAR_COUNT + (ord("9") - ord("0"))
+
+class SceneFormatError(ValueError):
+    """Texte de scène illisible (section ou propriété mal formée)."""
+
+class Expr(str):
+    """Texte Godot brut (constructeur, référence...) inséré tel quel par godot_value."""
+
+# ================================
+# VALEURS
+# ================================
+
+def _number(value) -> str:
+    """Nombre comme dans les constructeurs Godot (rtos : 32.0 -> 32)."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+def quote(text: str) -> str:
+    """Chaîne Godot (c_escape_multiline : les retours à la ligne restent réels)."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def unquote(raw: str) -> str:
+    """Inverse de quote ; un texte non entre guillemets est rendu tel quel."""
+    if len(raw) < 2 or raw[0] != '"' or raw[-1] != '"':
+        return raw
+    return re.sub(r'\\(.)', lambda match: {"n": "\n", "t": "\t"}.get(match.group(1), match.group(1)), raw[1:-1])
+
+def godot_value(value) -> str:
+    """Texte Godot d'une valeur Python (Expr passe inchangé)."""
+    if isinstance(value, Expr):
+        return str(value)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value) if not value.is_integer() else f"{value:.1f}"
+    if isinstance(value, str):
+        return quote(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(godot_value(item) for item in value) + "]"
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        return "{\n" + ",\n".join(f"{godot_value(key)}: {godot_value(item)}" for key, item in value.items()) + "\n}"
+    raise SceneFormatError(f"Valeur non représentable: {value!r}")
+
+def vector2(x, y) -> Expr:
+    return Expr(f"Vector2({_number(x)}, {_number(y)})")
+
+def color(r, g, b, a=1) -> Expr:
+    return Expr(f"Color({_number(r)}, {_number(g)}, {_number(b)}, {_number(a)})")
+
+def ext_ref(resource_id: str) -> Expr:
+    return Expr(f'ExtResource("{resource_id}")')
+
+def sub_ref(resource_id: str) -> Expr:
+    return Expr(f'SubResource("{resource_id}")')
+
+# ================================
+# UID
+# ================================
+
+def uid_text(value: int) -> str:
+    """Texte uid:// d'un identifiant, comme ResourceUID::id_to_text."""
+    chars = []
+    while True:
+        digit = value % UID_BASE
+        chars.append(chr(ord("a") + digit) if digit < UID_CHAR_COUNT else chr(ord("0") + digit - UID_CHAR_COUNT))
+        value //= UID_BASE
+        if not value:
+            break
+    return "uid://" + "".join(reversed(chars))
+
+def scene_uid(seed: str) -> str:
+    """UID stable dérivé d'une graine (chemin res://) : même scène, même UID."""
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    return uid_text(int.from_bytes(digest[:8], "little") & ((1 << 63) - 1))
+
+def resource_uid(project_root: Path, res_path: str) -> Optional[str]:
+    """UID d'une ressource du projet : fichier .uid (scripts Godot 4.4) ou en-tête .tscn/.tres."""
+    file_path = Path(project_root) / res_path.replace("res://", "", 1)
+    sidecar = file_path.with_name(file_path.name + ".uid")
+    if sidecar.exists():
+        return sidecar.read_text(encoding="utf-8").strip() or None
+    if file_path.suffix in (".tscn", ".tres") and file_path.exists():
+        header = read_header(file_path)
+        return get_attr(header, "uid") if header else None
+    return None
+
+# ================================
+# LECTURE
+# ================================
+
+def _scan(text: str, depth: int = 0, in_string: bool = False) -> Tuple[int, bool]:
+    """Profondeur de parenthèses/crochets et état de chaîne après text."""
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+    return depth, in_string
+
+def parse_attrs(line: str, line_number: int = 0) -> Tuple[str, List[Tuple[str, str]]]:
+    """(tag, attributs bruts) d'une ligne d'en-tête de section."""
+    match = SECTION_RE.match(line)
+    if not match or not line.endswith("]"):
+        raise SceneFormatError(f"Ligne {line_number}: en-tête de section invalide: {line}")
+    tag, position, attrs = match.group(1), match.end(), []
+    body_end = len(line) - 1
+    while position < body_end:
+        key_match = ATTR_KEY_RE.match(line, position)
+        if not key_match:
+            raise SceneFormatError(f"Ligne {line_number}: attribut invalide: {line[position:]}")
+        start = position = key_match.end()
+        # La valeur s'arrête au premier espace hors chaîne et hors crochets
+        while position < body_end:
+            depth, in_string = _scan(line[start:position])
+            if line[position] == " " and depth == 0 and not in_string:
+                break
+            position += 1
+        attrs.append((key_match.group(1), line[start:position]))
+    return tag, attrs
+
+def _split_lines(stream: TextIO) -> Iterator[str]:
+    """Lignes comme text.split("\\n"), sans lire tout le flux."""
+    last = "\n"
+    for last in stream:
+        yield last[:-1] if last.endswith("\n") else last
+    if last.endswith("\n"):
+        yield ""
+
+def iter_sections(stream: TextIO) -> Iterator[Dict]:
+    """Sections d'une scène au fil de la lecture ; la dernière valeur produite
+    est {"tag": None, "gap": n} pour les lignes vides finales."""
+    section, gap = None, 0
+    pending_key, pending_value, depth, in_string = None, [], 0, False
+    for line_number, line in enumerate(_split_lines(stream), 1):
+        if pending_key is not None:
+            pending_value.append(line)
+            depth, in_string = _scan("\n" + line, depth, in_string)
+            if depth <= 0 and not in_string:
+                section["properties"].append((pending_key, "\n".join(pending_value)))
+                pending_key = None
+            continue
+        if not line:
+            gap += 1
+            continue
+        if line.startswith("["):
+            if section is not None:
+                yield section
+            tag, attrs = parse_attrs(line, line_number)
+            section, gap = {"tag": tag, "attrs": attrs, "properties": [], "gap": gap}, 0
+            continue
+        if section is None or gap or PROPERTY_SEPARATOR not in line:
+            raise SceneFormatError(f"Ligne {line_number}: propriété hors section ou mal formée: {line}")
+        key, value = line.split(PROPERTY_SEPARATOR, 1)
+        depth, in_string = _scan(value)
+        if depth > 0 or in_string:
+            pending_key, pending_value = key, [value]
+        else:
+            section["properties"].append((key, value))
+    if pending_key is not None:
+        raise SceneFormatError(f"Valeur non terminée pour {pending_key}")
+    if section is not None:
+        yield section
+    yield {"tag": None, "gap": gap}
+
+def read_scene(stream: TextIO) -> Dict:
+    """Scène complète depuis un flux texte."""
+    sections = list(iter_sections(stream))
+    return {"sections": sections[:-1], "trailing": sections[-1]["gap"]}
+
+def parse_scene(text: str) -> Dict:
+    return read_scene(io.StringIO(text, newline=""))
+
+def load_scene(path: Path) -> Dict:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return read_scene(f)
+
+def read_header(path: Path) -> Optional[Dict]:
+    """Section d'en-tête seule (lecture de la première section uniquement)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        section = next(iter_sections(f))
+    return section if section["tag"] in HEADER_TAGS else None
+
+# ================================
+# ÉCRITURE
+# ================================
+
+def section_lines(section: Dict) -> Iterator[str]:
+    """Lignes d'une section, lignes vides de séparation comprises."""
+    for _ in range(section.get("gap", 0)):
+        yield ""
+    yield "[" + " ".join([section["tag"]] + [f"{key}={value}" for key, value in section["attrs"]]) + "]"
+    for key, value in section["properties"]:
+        yield f"{key}{PROPERTY_SEPARATOR}{value}"
+
+def iter_scene_lines(scene: Dict) -> Iterator[str]:
+    for section in scene["sections"]:
+        yield from section_lines(section)
+    for _ in range(scene.get("trailing", 1)):
+        yield ""
+
+def write_lines(lines: Iterable[str], out: TextIO):
+    """Écrit des lignes jointes par "\\n" sans les rassembler en mémoire."""
+    separator = ""
+    for line in lines:
+        out.write(separator + line)
+        separator = "\n"
+
+def scene_text(scene: Dict) -> str:
+    out = io.StringIO(newline="")
+    write_lines(iter_scene_lines(scene), out)
+    return out.getvalue()
+
+def stream_scene(out: TextIO, scene: Dict, nodes: Iterable[Dict] = (), connections: Iterable[Dict] = ()):
+    """Écrit scene puis des nœuds et connexions produits à la volée.
+
+    scene porte l'en-tête et les ressources (load_steps en dépend) ; les
+    sections de nodes / connections (voir node_section, connection_section)
+    ne sont jamais conservées.
+    """
+    update_load_steps(scene)
+
+    def lines():
+        for section in scene["sections"]:
+            yield from section_lines(section)
+        for section in nodes:
+            yield from section_lines(section)
+        for section in connections:
+            yield from section_lines(section)
+        for _ in range(scene.get("trailing", 1)):
+            yield ""
+
+    write_lines(lines(), out)
+
+def save_scene(path: Path, scene: Dict, nodes: Iterable[Dict] = (), connections: Iterable[Dict] = ()):
+    """Écrit une scène dans un fichier temporaire puis le renomme sur la cible."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp crée en 0600 : conserver les droits existants ou ceux du umask
+    if path.exists():
+        mode = path.stat().st_mode & 0o777
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            stream_scene(f, scene, nodes, connections)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+# ================================
+# ACCÈS
+# ================================
+
+def get_attr(section: Dict, key: str, default: Optional[str] = None) -> Optional[str]:
+    """Attribut décodé (chaînes sans guillemets)."""
+    for name, value in section["attrs"]:
+        if name == key:
+            return unquote(value)
+    return default
+
+def set_attr(section: Dict, key: str, value, before: Optional[str] = None):
+    """Remplace ou ajoute un attribut (avant l'attribut before s'il existe)."""
+    raw = godot_value(value)
+    attrs = section["attrs"]
+    for index, (name, _) in enumerate(attrs):
+        if name == key:
+            attrs[index] = (key, raw)
+            return
+    keys = [name for name, _ in attrs]
+    attrs.insert(keys.index(before) if before in keys else len(attrs), (key, raw))
+
+def remove_attr(section: Dict, key: str):
+    section["attrs"] = [(name, value) for name, value in section["attrs"] if name != key]
+
+def get_property(section: Dict, key: str) -> Optional[str]:
+    for name, value in section["properties"]:
+        if name == key:
+            return value
+    return None
+
+def sections_of(scene: Dict, tag: str) -> List[Dict]:
+    return [section for section in scene["sections"] if section["tag"] == tag]
+
+def header(scene: Dict) -> Optional[Dict]:
+    sections = scene["sections"]
+    return sections[0] if sections and sections[0]["tag"] in HEADER_TAGS else None
+
+def node_path(section: Dict) -> str:
+    """Chemin d'un nœud relatif à la racine ("." pour la racine)."""
+    parent = get_attr(section, "parent")
+    name = get_attr(section, "name", "")
+    if parent is None:
+        return "."
+    return name if parent == "." else f"{parent}/{name}"
+
+def expected_load_steps(scene: Dict) -> int:
+    return len(sections_of(scene, "ext_resource")) + len(sections_of(scene, "sub_resource")) + 1
+
+def update_load_steps(scene: Dict):
+    """load_steps = ressources externes + internes + 1 ; omis s'il vaut 1 (comme Godot)."""
+    section = header(scene)
+    if section is None:
+        return
+    steps = expected_load_steps(scene)
+    if steps > 1:
+        set_attr(section, "load_steps", Expr(str(steps)), before="format")
+    else:
+        remove_attr(section, "load_steps")
+
+# ================================
+# CONSTRUCTION
+# ================================
+
+def _short_id(*parts: str) -> str:
+    """Suffixe d'identifiant à 5 caractères, stable pour les mêmes parties."""
+    digest = int(hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest(), 16)
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789"
+    chars = []
+    for _ in range(5):
+        digest, digit = divmod(digest, len(alphabet))
+        chars.append(alphabet[digit])
+    return "".join(chars)
+
+def _properties(properties: Optional[Dict]) -> List[Tuple[str, str]]:
+    return [(key, godot_value(value)) for key, value in (properties or {}).items()]
+
+def _insert_after(scene: Dict, tags: Tuple[str, ...], section: Dict):
+    """Insère section après la dernière section de l'un des tags (ou l'en-tête)."""
+    sections = scene["sections"]
+    position = 1 if header(scene) else 0
+    for index, existing in enumerate(sections):
+        if existing["tag"] in tags:
+            position = index + 1
+    sections.insert(position, section)
+
+def new_scene(uid: Optional[str] = None, resource_type: Optional[str] = None) -> Dict:
+    """Scène vide (gd_scene, ou gd_resource si resource_type)."""
+    attrs = []
+    if resource_type:
+        attrs.append(("type", quote(resource_type)))
+    attrs.append(("format", str(SCENE_FORMAT)))
+    if uid:
+        attrs.append(("uid", quote(uid)))
+    tag = "gd_resource" if resource_type else "gd_scene"
+    return {"sections": [{"tag": tag, "attrs": attrs, "properties": [], "gap": 0}], "trailing": 1}
+
+def add_ext_resource(scene: Dict, resource_type: str, path: str, uid: Optional[str] = None,
+                     resource_id: Optional[str] = None) -> str:
+    """Ajoute une ressource externe (une seule par chemin) et retourne son id."""
+    existing = sections_of(scene, "ext_resource")
+    for section in existing:
+        if get_attr(section, "path") == path:
+            return get_attr(section, "id")
+    resource_id = resource_id or f"{len(existing) + 1}_{_short_id(path)}"
+    attrs = [("type", quote(resource_type))]
+    if uid:
+        attrs.append(("uid", quote(uid)))
+    attrs += [("path", quote(path)), ("id", quote(resource_id))]
+    # Les ressources externes se suivent sans ligne vide, comme dans les .tscn de Godot
+    _insert_after(scene, ("ext_resource",), {"tag": "ext_resource", "attrs": attrs, "properties": [],
+                                            "gap": 0 if existing else 1})
+    update_load_steps(scene)
+    return resource_id
+
+def add_sub_resource(scene: Dict, resource_type: str, properties: Optional[Dict] = None,
+                     resource_id: Optional[str] = None, unique: bool = False) -> str:
+    """Ajoute une ressource interne et retourne son id ; une sub_resource de même
+    type et mêmes propriétés est réutilisée sauf si unique."""
+    props = _properties(properties)
+    if not unique:
+        for section in sections_of(scene, "sub_resource"):
+            if get_attr(section, "type") == resource_type and section["properties"] == props:
+                return get_attr(section, "id")
+    resource_id = resource_id or f"{resource_type}_{_short_id(resource_type, repr(props))}"
+    _insert_after(scene, ("ext_resource", "sub_resource"), {
+        "tag": "sub_resource", "attrs": [("type", quote(resource_type)), ("id", quote(resource_id))],
+        "properties": props, "gap": 1})
+    update_load_steps(scene)
+    return resource_id
+
+def node_section(name: str, node_type: Optional[str] = None, parent: Optional[str] = None,
+                 properties: Optional[Dict] = None, groups: Optional[List[str]] = None,
+                 instance: Optional[str] = None) -> Dict:
+    """Section [node] ; parent None pour la racine, "." pour ses enfants directs."""
+    attrs = [("name", quote(name))]
+    if node_type:
+        attrs.append(("type", quote(node_type)))
+    if parent is not None:
+        attrs.append(("parent", quote(parent)))
+    if instance:
+        attrs.append(("instance", ext_ref(instance)))
+    if groups:
+        attrs.append(("groups", godot_value(list(groups))))
+    return {"tag": "node", "attrs": attrs, "properties": _properties(properties), "gap": 1}
+
+def connection_section(signal: str, source: str, target: str, method: str, flags: int = 0) -> Dict:
+    attrs = [("signal", quote(signal)), ("from", quote(source)), ("to", quote(target)), ("method", quote(method))]
+    if flags:
+        attrs.append(("flags", str(flags)))
+    return {"tag": "connection", "attrs": attrs, "properties": [], "gap": 1}
+
+def add_node(scene: Dict, name: str, node_type: Optional[str] = None, parent: Optional[str] = None,
+             properties: Optional[Dict] = None, groups: Optional[List[str]] = None,
+             instance: Optional[str] = None) -> str:
+    """Ajoute un nœud après les nœuds existants et retourne son chemin."""
+    section = node_section(name, node_type, parent, properties, groups, instance)
+    _insert_after(scene, ("ext_resource", "sub_resource", "node"), section)
+    return node_path(section)
+
+def add_connection(scene: Dict, signal: str, source: str, target: str, method: str, flags: int = 0):
+    _insert_after(scene, ("ext_resource", "sub_resource", "node", "connection"),
+                  connection_section(signal, source, target, method, flags))
+
+def dedupe_sub_resources(scene: Dict) -> Dict[str, str]:
+    """Fusionne les sub_resources identiques (après réécriture des références)
+    et retourne {id supprimé: id conservé}."""
+    replaced, seen, kept = {}, {}, []
+
+    def rewrite(value: str) -> str:
+        return REF_RE.sub(lambda match: f'{match.group(1)}("{replaced.get(match.group(2), match.group(2))}")'
+                          if match.group(1) == "SubResource" else match.group(0), value)
+
+    for section in scene["sections"]:
+        if replaced:
+            section["properties"] = [(key, rewrite(value)) for key, value in section["properties"]]
+            section["attrs"] = [(key, rewrite(value)) for key, value in section["attrs"]]
+        if section["tag"] == "sub_resource" and get_property(section, "resource_local_to_scene") != "true":
+            key = (get_attr(section, "type"), tuple(section["properties"]))
+            if key in seen:
+                replaced[get_attr(section, "id")] = seen[key]
+                continue
+            seen[key] = get_attr(section, "id")
+        kept.append(section)
+    scene["sections"] = kept
+    if replaced:
+        update_load_steps(scene)
+    return replaced
+
+# ================================
+# RAPPORT
+# ================================
+
+def check_scene(scene: Dict) -> List[str]:
+    """Incohérences : load_steps, références vers des ressources non déclarées, parents absents."""
+    issues = []
+    section = header(scene)
+    if section is not None:
+        steps = get_attr(section, "load_steps")
+        expected = expected_load_steps(scene)
+        if (int(steps) if steps else 1) != expected:
+            issues.append(f"load_steps={steps or 1}, attendu {expected}")
+    declared = {"ExtResource": {get_attr(s, "id") for s in sections_of(scene, "ext_resource")},
+                "SubResource": {get_attr(s, "id") for s in sections_of(scene, "sub_resource")}}
+    paths = set()
+    for node in sections_of(scene, "node"):
+        parent = get_attr(node, "parent")
+        if parent is not None and parent != "." and parent not in paths:
+            issues.append(f"Nœud {node_path(node)}: parent {parent} absent")
+        paths.add(node_path(node))
+    for section in scene["sections"]:
+        for _, value in section["attrs"] + section["properties"]:
+            for kind, resource_id in REF_RE.findall(value):
+                if resource_id not in declared[kind]:
+                    issues.append(f"{kind}(\"{resource_id}\") non déclarée")
+    return issues
+
+def print_tree(scene: Dict):
+    for node in sections_of(scene, "node"):
+        path = node_path(node)
+        depth = 0 if path == "." else path.count("/") + 1
+        node_type = get_attr(node, "type") or f"instance {get_attr(node, 'instance')}"
+        print(f"   {'  ' * depth}{get_attr(node, 'name')} ({node_type})")
+
+def _scene_files(paths: List[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        files += sorted(path.rglob("*.tscn")) if path.is_dir() else [path]
+    return files
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py scene",
+                                     description="Lecture, vérification et réécriture des scènes .tscn")
+    parser.add_argument("paths", nargs="+", help="Fichiers .tscn/.tres ou dossiers")
+    parser.add_argument("--tree", action="store_true", help="Affiche l'arbre des nœuds")
+    parser.add_argument("--dedupe", action="store_true", help="Fusionne les sub_resources identiques")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", help="Fichier de sortie (une seule scène)")
+    target.add_argument("--in-place", action="store_true", help="Réécrit les scènes modifiées")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON")
+    args = parser.parse_args(argv)
+
+    files = _scene_files(args.paths)
+    if args.output and len(files) != 1:
+        print("❌ --output n'accepte qu'une seule scène")
+        return 1
+
+    reports, failures = [], 0
+    for path in files:
+        try:
+            raw = path.read_bytes()
+            scene = load_scene(path)
+        except (OSError, UnicodeDecodeError, SceneFormatError) as e:
+            print(f"❌ {path}: {e}")
+            failures += 1
+            continue
+        report = {
+            "path": str(path),
+            "round_trip": scene_text(scene).encode("utf-8") == raw,
+            "ext_resources": len(sections_of(scene, "ext_resource")),
+            "sub_resources": len(sections_of(scene, "sub_resource")),
+            "nodes": len(sections_of(scene, "node")),
+            "connections": len(sections_of(scene, "connection")),
+            "merged": dedupe_sub_resources(scene) if args.dedupe else {},
+        }
+        report["issues"] = check_scene(scene)
+        reports.append(report)
+        failures += not report["round_trip"]
+
+        if not args.json:
+            status = "✅" if report["round_trip"] else "❌ relecture non identique"
+            print(f"🎬 {path}: {report['nodes']} nœuds, {report['ext_resources']} ext, "
+                  f"{report['sub_resources']} sub, {report['connections']} connexions {status}")
+            for old, new in report["merged"].items():
+                print(f"   🔗 SubResource {old} -> {new}")
+            for issue in report["issues"]:
+                print(f"   ⚠️ {issue}")
+            if args.tree:
+                print_tree(scene)
+
+        if args.output:
+            save_scene(Path(args.output), scene)
+        elif args.in_place and report["merged"]:
+            save_scene(path, scene)
+
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""
+📈 XP Curve - Courbe d'expérience : vérification, ajustement et table dense
+===========================================================================
+progression_tables.json décrit la courbe d'XP par une formule texte
+("base_xp * (level^1.2) + (level * level_modifier)") et quelques valeurs
+calculées (niveaux 1, 2, 3 ... 100) qui ne la suivent pas forcément.
+
+Cet outil compile la formule une seule fois (sb_tools.quest_generator :
+arbre syntaxique vérifié, ^ = puissance), l'évalue d'un bloc sur tous les
+niveaux (NumPy si disponible) puis :
+  - confronte les valeurs stockées à trois lectures de la formule (XP total
+    du niveau L = f(L-1), f(L) ou somme des f des niveaux précédents) et
+    retient la plus proche ;
+  - ajuste a·(L-1)^p + b·(L-1) aux valeurs stockées (moindres carrés
+    relatifs, p balayé) ;
+  - écrit data/xp_table.json : XP totale de chaque niveau 1..max_level et des
+    niveaux de prestige (paliers au-delà de max_level multipliés par
+    prestige_multiplier), indexée directement par DataManager.get_xp_for_level ;
+  - simule le temps de jeu par niveau à partir des sources d'XP (quêtes de
+    quest_templates.json, combats et observations de progression_rewards) et
+    signale les pics et creux de la courbe.
+
+Par défaut la table suit les valeurs stockées interpolées : c'est la courbe
+que DataManager.get_xp_for_level recalcule quand data/xp_table.json manque,
+le jeu progresse donc de la même façon avec ou sans table compilée.
+
+Usage: python godot_project_fixer.py xp [chemin_projet] [--source stored|formula|fit] [--convention auto] [--output data/xp_table.json] [--rates quests=1.5,combat=4] [--check]
+"""
+
+import sys
+import json
+import math
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Dépendance optionnelle : évaluation niveau par niveau sinon
+    np = None
+
+from sb_tools.data_pipeline import load_corpus
+from sb_tools.quest_generator import (DEFAULT_VARIABLES, RARITY_LEVELS, compile_formula, compile_templates,
+                                      evaluate)
+
+# Doit correspondre à DataManager.XP_TABLE_FORMAT_VERSION
+XP_TABLE_FORMAT_VERSION = 1
+DEFAULT_TABLE_PATH = "data/xp_table.json"
+
+CONVENTIONS = ("offset", "direct", "cumulative")
+SOURCES = ("formula", "stored", "fit")
+
+# Activités par heure de jeu (hypothèses de simulation, surchargeables par --rates)
+DEFAULT_RATES = {"quests": 1.5, "combat": 4.0, "observation": 6.0}
+DEFAULT_COMBAT_DIFFICULTY = "medium"
+DEFAULT_SPIKE_RATIO = 1.5
+
+# ================================
+# FORMULES
+# ================================
+
+def evaluate_levels(formula: Dict, env: Dict, variable: str, values: List[float]) -> List[float]:
+    """Évalue une formule pour toutes les valeurs de variable en une fois."""
+    if not values:
+        return []
+    if np is not None:
+        array = np.asarray(values, dtype=float)
+        result = eval(formula["code"], {"__builtins__": {}}, {**env, variable: array})
+        return np.broadcast_to(np.asarray(result, dtype=float), array.shape).tolist()
+    return [evaluate(formula, {**env, variable: value}) for value in values]
+
+def xp_settings(progression: Dict) -> Dict:
+    """Formule compilée, constantes, valeurs stockées et paramètres de prestige."""
+    xp_table = progression.get("level_progression", {}).get("xp_table", {})
+    if "formula" not in xp_table:
+        raise ValueError("progression_tables.json: level_progression.xp_table.formula absent")
+    constants = {key: float(value) for key, value in xp_table.items()
+                 if isinstance(value, (int, float)) and not isinstance(value, bool)}
+    stored = {int(level): int(value) for level, value in xp_table.get("calculated_values", {}).items()}
+    metadata = progression.get("metadata", {})
+    prestige = progression.get("prestige_system", {})
+    return {
+        "formula": compile_formula(xp_table["formula"], known={"level"} | set(constants)),
+        "constants": constants,
+        "stored": dict(sorted(stored.items())),
+        "max_level": int(metadata.get("max_level") or max(stored, default=100)),
+        "prestige_levels": int(prestige.get("prestige_levels", metadata.get("prestige_levels", 0))),
+        "prestige_multiplier": constants.get("prestige_multiplier", 1.0),
+        "prestige_xp_bonus": _percent(prestige.get("benefits_per_level", {}).get("xp_bonus", 0)),
+        "milestones": sorted(int(level) for level in
+                             progression.get("level_progression", {}).get("level_rewards", {})
+                             .get("milestone_rewards", {}))
+    }
+
+def _percent(value) -> float:
+    """"2%" -> 0.02 ; un nombre est pris tel quel."""
+    if isinstance(value, str):
+        return float(value.strip().rstrip("%")) / 100.0 if value.strip().rstrip("%") else 0.0
+    return float(value)
+
+# ================================
+# COURBES
+# ================================
+
+def formula_thresholds(settings: Dict, convention: str, count: int) -> List[float]:
+    """XP totale des niveaux 1..count (T(1) = 0) selon la lecture de la formule."""
+    formula, env = settings["formula"], settings["constants"]
+    if convention == "offset":
+        values = evaluate_levels(formula, env, "level", list(range(1, count)))
+        return [0.0] + values
+    if convention == "direct":
+        values = evaluate_levels(formula, env, "level", list(range(2, count + 1)))
+        return [0.0] + values
+    totals, running = [0.0], 0.0
+    for value in evaluate_levels(formula, env, "level", list(range(1, count))):
+        running += value
+        totals.append(running)
+    return totals
+
+def stored_thresholds(stored: Dict[int, int], count: int) -> List[float]:
+    """Interpolation en loi de puissance de (L-1) entre les valeurs stockées (prolongée au-delà)."""
+    anchors = [(level, float(value)) for level, value in stored.items() if level >= 1]
+    if len(anchors) < 2:
+        raise ValueError("Au moins deux valeurs calculées sont nécessaires pour interpoler")
+    totals = []
+    for level in range(1, count + 1):
+        if level in stored:
+            totals.append(float(stored[level]))
+            continue
+        # Segment encadrant le niveau (ou dernier segment pour extrapoler)
+        lower, upper = anchors[-2], anchors[-1]
+        for left, right in zip(anchors, anchors[1:]):
+            if left[0] <= level <= right[0]:
+                lower, upper = left, right
+                break
+        (l0, v0), (l1, v1) = lower, upper
+        if v0 <= 0 or l0 <= 1:
+            totals.append(v0 + (v1 - v0) * (level - l0) / (l1 - l0))
+        else:
+            exponent = math.log(v1 / v0) / math.log((l1 - 1) / (l0 - 1))
+            totals.append(v0 * ((level - 1) / (l0 - 1)) ** exponent)
+    return totals
+
+def fit_curve(stored: Dict[int, int], exponents: Tuple[float, float, float] = (1.001, 3.0, 0.001)) -> Dict:
+    """Ajuste T(L) = a·(L-1)^p + b·(L-1) aux valeurs stockées (erreur relative quadratique minimale)."""
+    points = [(level - 1, float(value)) for level, value in stored.items() if level > 1 and value > 0]
+    if len(points) < 2:
+        raise ValueError("Au moins deux valeurs calculées non nulles sont nécessaires à l'ajustement")
+    low, high, step = exponents
+    best = None
+    for index in range(int(round((high - low) / step)) + 1):
+        p = low + index * step
+        s11 = s12 = s22 = r1 = r2 = 0.0
+        for n, value in points:
+            x1, x2 = n ** p / value, n / value
+            s11, s12, s22 = s11 + x1 * x1, s12 + x1 * x2, s22 + x2 * x2
+            r1, r2 = r1 + x1, r2 + x2
+        det = s11 * s22 - s12 * s12
+        if abs(det) < 1e-12:
+            continue
+        a, b = (r1 * s22 - r2 * s12) / det, (s11 * r2 - s12 * r1) / det
+        error = sum(((a * n ** p + b * n - value) / value) ** 2 for n, value in points)
+        if best is None or error < best[0]:
+            best = (error, p, a, b)
+    _, p, a, b = best
+    errors = [abs(a * n ** p + b * n - value) / value for n, value in points]
+    return {"base_xp": round(a, 4), "exponent": round(p, 4), "level_modifier": round(b, 4),
+            "formula": f"{a:.4g} * ((level - 1)^{p:.4g}) + ((level - 1) * {b:.4g})",
+            "mean_error": round(sum(errors) / len(errors), 4), "max_error": round(max(errors), 4)}
+
+def fit_thresholds(fit: Dict, count: int) -> List[float]:
+    a, p, b = fit["base_xp"], fit["exponent"], fit["level_modifier"]
+    return [a * n ** p + b * n for n in range(count)]
+
+def compare_stored(stored: Dict[int, int], thresholds: List[float]) -> List[Dict]:
+    """Écart entre valeurs stockées et courbe calculée, par niveau stocké."""
+    rows = []
+    for level, value in stored.items():
+        if 1 <= level <= len(thresholds):
+            computed = thresholds[level - 1]
+            error = abs(computed - value) / value if value else abs(computed)
+            rows.append({"level": level, "stored": value, "computed": int(round(computed)), "error": round(error, 4)})
+    return rows
+
+def choose_convention(settings: Dict) -> Tuple[str, Dict[str, float]]:
+    """Lecture de la formule la plus proche des valeurs stockées (erreur relative moyenne)."""
+    count = max(settings["max_level"], max(settings["stored"], default=1))
+    scores = {}
+    for convention in CONVENTIONS:
+        rows = compare_stored(settings["stored"], formula_thresholds(settings, convention, count))
+        scores[convention] = round(sum(row["error"] for row in rows) / len(rows), 4) if rows else 0.0
+    return min(CONVENTIONS, key=lambda convention: scores[convention]), scores
+
+def build_curve(settings: Dict, source: str, convention: str, fit: Optional[Dict]) -> List[float]:
+    """XP totale des niveaux 1..max_level + prestige_levels (niveaux de prestige non multipliés)."""
+    count = settings["max_level"] + settings["prestige_levels"]
+    if source == "stored":
+        return stored_thresholds(settings["stored"], count)
+    if source == "fit":
+        return fit_thresholds(fit, count)
+    return formula_thresholds(settings, convention, count)
+
+def split_prestige(curve: List[float], settings: Dict) -> Tuple[List[int], List[int]]:
+    """(table des niveaux, table de prestige) : chaque palier de prestige coûte
+    prestige_multiplier fois le palier correspondant de la courbe prolongée."""
+    max_level = settings["max_level"]
+    base = curve[max_level - 1]
+    levels = [int(round(value)) for value in curve[:max_level]]
+    prestige = [int(round(base + settings["prestige_multiplier"] * (value - base))) for value in curve[max_level:]]
+    return levels, prestige
+
+def monotonic_breaks(table: List[int], first_level: int = 1) -> List[int]:
+    """Niveaux dont l'XP totale n'augmente pas par rapport au précédent."""
+    return [first_level + index for index in range(1, len(table)) if table[index] <= table[index - 1]]
+
+# ================================
+# SIMULATION
+# ================================
+
+def xp_sources(corpus: Dict, levels: List[int], combat_difficulty: str) -> Dict[str, List[float]]:
+    """XP moyenne par activité pour chaque niveau du joueur."""
+    progression = corpus.get("progression", {})
+    rewards = progression.get("progression_rewards", {}).get("xp_sources", {})
+    creatures = {key: value for key, value in corpus.get("creatures", {}).items()
+                 if isinstance(value, dict) and "id" in value}
+    mean_rarity = (sum(RARITY_LEVELS.get(c.get("rarity"), 1) for c in creatures.values()) / len(creatures)
+                   if creatures else 1.0)
+    sources = {}
+
+    # Quêtes : moyenne des templates accessibles au niveau (xp × multiplicateur de catégorie + xp_base)
+    model = compile_templates(corpus.get("quests", {}), corpus.get("creatures", {}))
+    base_env = dict(DEFAULT_VARIABLES)
+    scaling = model["scaling"]
+    per_template = []
+    for template in model["templates"].values():
+        if not template["xp"]:
+            continue
+        pool = template["creature_pool"]
+        env = dict(base_env)
+        env["creature_rarity"] = (sum(RARITY_LEVELS.get(model["creatures"].get(cid, {}).get("rarity"), 1)
+                                      for cid in pool) / len(pool)) if pool else mean_rarity
+        env["difficulty_multiplier"] = 1.0
+        base = evaluate(scaling["base_difficulty"], {**env, "player_level": 1}) if "base_difficulty" in scaling else 1.0
+        env["difficulty_multiplier"] = base * template["difficulty"]
+        xp = evaluate_levels(template["xp"], env, "player_level", levels)
+        bonus = evaluate_levels(scaling["xp_base"], env, "player_level", levels) if "xp_base" in scaling else [0.0] * len(levels)
+        per_template.append((template["level_min"],
+                             [value * template["xp_multiplier"] + extra for value, extra in zip(xp, bonus)]))
+    quests = []
+    for index, level in enumerate(levels):
+        values = [xp[index] for level_min, xp in per_template if level_min <= level]
+        quests.append(sum(values) / len(values) if values else 0.0)
+    sources["quests"] = quests
+
+    # Combats : victoire contre un ennemi du niveau de la difficulté choisie
+    victory = rewards.get("combat", {}).get("victory")
+    encounter = progression.get("difficulty_scaling", {}).get("combat_encounters", {}).get(combat_difficulty)
+    if isinstance(victory, str) and isinstance(encounter, str):
+        enemy_levels = evaluate_levels(compile_formula(encounter, known={"player_level"}), {}, "player_level", levels)
+        sources["combat"] = evaluate_levels(compile_formula(victory, known={"enemy_level"}), {}, "enemy_level",
+                                            enemy_levels)
+
+    # Observations : première observation d'une créature de rareté moyenne
+    observation = rewards.get("creature_observation", {}).get("first_observation")
+    if isinstance(observation, str):
+        value = evaluate(compile_formula(observation, known={"creature_rarity"}), {"creature_rarity": mean_rarity})
+        sources["observation"] = [value] * len(levels)
+    return sources
+
+def simulate(levels_table: List[int], prestige_table: List[int], sources: Dict[str, List[float]],
+             rates: Dict[str, float], settings: Dict, difficulty_bonus: float, spike_ratio: float) -> Dict:
+    """Heures de jeu par niveau (puis par niveau de prestige) et pics de la courbe."""
+    max_level = settings["max_level"]
+
+    def hourly(index: int, prestige_rank: int = 0) -> float:
+        xp = sum(rates.get(name, 0.0) * values[min(index, len(values) - 1)] for name, values in sources.items())
+        return xp * difficulty_bonus * (1.0 + settings["prestige_xp_bonus"] * prestige_rank)
+
+    steps = []  # (niveau atteint, XP du palier, heures)
+    for index in range(1, len(levels_table)):
+        rate = hourly(index - 1)
+        xp = levels_table[index] - levels_table[index - 1]
+        steps.append((index + 1, xp, xp / rate if rate > 0 else math.inf))
+    previous = levels_table[-1]
+    for rank, total in enumerate(prestige_table, 1):
+        rate = hourly(max_level - 1, rank)
+        xp = total - previous
+        steps.append((max_level + rank, xp, xp / rate if rate > 0 else math.inf))
+        previous = total
+
+    cumulative, hours = [0.0], 0.0
+    for _, _, duration in steps:
+        hours += duration
+        cumulative.append(hours)
+
+    spikes = []
+    for (level, _, duration), (_, _, before) in zip(steps[1:], steps):
+        if before > 0 and duration > 0 and math.isfinite(duration) and math.isfinite(before):
+            ratio = duration / before
+            if ratio >= spike_ratio or ratio <= 1.0 / spike_ratio:
+                spikes.append({"level": level, "hours": round(duration, 3), "previous_hours": round(before, 3),
+                               "ratio": round(ratio, 3), "kind": "pic" if ratio > 1 else "creux"})
+    return {
+        "xp_per_hour": {level: round(hourly(level - 1), 1) for level in range(1, max_level + 1)},
+        "hours_per_level": {level: round(duration, 3) for level, _, duration in steps},
+        "hours_to_level": {level: round(cumulative[level - 1], 2) for level in range(1, len(cumulative) + 1)},
+        "spikes": spikes
+    }
+
+# ================================
+# DOCUMENT
+# ================================
+
+def table_document(settings: Dict, source: str, convention: str, levels: List[int], prestige: List[int],
+                   fit: Optional[Dict]) -> Dict:
+    """Contenu de data/xp_table.json chargé par DataManager.load_xp_table."""
+    return {
+        "format_version": XP_TABLE_FORMAT_VERSION,
+        "source": source,
+        "formula": settings["formula"]["source"] if source == "formula" else (fit["formula"] if source == "fit" else None),
+        "convention": convention if source == "formula" else None,
+        "max_level": settings["max_level"],
+        "experience_table": levels,
+        "prestige_multiplier": settings["prestige_multiplier"],
+        "prestige_experience_table": prestige
+    }
+
+def _parse_rates(text: str) -> Dict[str, float]:
+    rates = dict(DEFAULT_RATES)
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, value = item.partition("=")
+        if name not in DEFAULT_RATES or not value:
+            raise ValueError(f"Activité inconnue ou sans valeur: {item} (attendu: {', '.join(DEFAULT_RATES)})")
+        rates[name] = float(value)
+    return rates
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée de la sous-commande xp."""
+    parser = argparse.ArgumentParser(prog="godot_project_fixer.py xp",
+                                     description="Vérifie la courbe d'XP et écrit la table dense des niveaux")
+    parser.add_argument("project_root", nargs="?", default=".", help="Chemin vers le projet Godot")
+    parser.add_argument("--source", choices=SOURCES, default="stored",
+                        help="Courbe écrite : valeurs stockées interpolées (défaut, même courbe que le repli "
+                             "de DataManager sans table), formule ou ajustement")
+    parser.add_argument("--convention", choices=("auto",) + CONVENTIONS, default="auto",
+                        help="Lecture de la formule (défaut: la plus proche des valeurs stockées)")
+    parser.add_argument("--output", "-o", default=DEFAULT_TABLE_PATH,
+                        help=f"Table dense, relative au projet (défaut: {DEFAULT_TABLE_PATH})")
+    parser.add_argument("--rates", default="", help="Activités par heure: quests=1.5,combat=4,observation=6")
+    parser.add_argument("--difficulty", default="normal", help="Réglage de difficulté (bonus_multipliers)")
+    parser.add_argument("--combat-difficulty", default=DEFAULT_COMBAT_DIFFICULTY, help="Rencontres simulées")
+    parser.add_argument("--spike", type=float, default=DEFAULT_SPIKE_RATIO,
+                        help="Rapport d'heures entre deux niveaux signalé comme pic/creux")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="Écart relatif toléré avec les valeurs stockées")
+    parser.add_argument("--check", action="store_true", help="N'écrit rien ; échoue si les valeurs stockées s'écartent")
+    parser.add_argument("--json", action="store_true", help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    project_root = Path(args.project_root)
+    try:
+        corpus = load_corpus(project_root / "data", strict=True)
+        progression = corpus.get("progression", {})
+        settings = xp_settings(progression)
+        rates = _parse_rates(args.rates)
+        best, scores = choose_convention(settings)
+        convention = best if args.convention == "auto" else args.convention
+        fit = fit_curve(settings["stored"])
+        curve = build_curve(settings, args.source, convention, fit)
+        levels, prestige = split_prestige(curve, settings)
+        difficulty_bonus = float(progression.get("progression_rewards", {}).get("bonus_multipliers", {})
+                                 .get("difficulty_setting", {}).get(args.difficulty, 1.0))
+        sources = xp_sources(corpus, list(range(1, settings["max_level"] + 1)), args.combat_difficulty)
+    except (ValueError, OSError, KeyError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    checks = compare_stored(settings["stored"], curve)
+    mismatches = [row for row in checks if row["error"] > args.tolerance]
+    breaks = monotonic_breaks(levels) + monotonic_breaks(prestige, settings["max_level"] + 1)
+    simulation = simulate(levels, prestige, sources, rates, settings, difficulty_bonus, args.spike)
+
+    output = project_root / args.output
+    if not args.check:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        document = table_document(settings, args.source, convention, levels, prestige, fit)
+        output.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    failed = bool(breaks) or (args.check and bool(mismatches))
+
+    if args.json:
+        print(json.dumps({"output": None if args.check else str(output), "source": args.source,
+                          "convention": convention, "convention_errors": scores, "fit": fit,
+                          "stored_check": checks, "monotonic_breaks": breaks, "rates": rates,
+                          "simulation": simulation}, indent=2, ensure_ascii=False))
+        return 1 if failed else 0
+
+    max_level = settings["max_level"]
+    print(f"📈 Formule: {settings['formula']['source']} ({', '.join(f'{k}={v:g}' for k, v in settings['constants'].items())})")
+    print(f"  Lecture retenue: {convention} (écart moyen: "
+          + ", ".join(f"{name} {score:.1%}" for name, score in scores.items()) + ")")
+    print(f"  Ajustement des valeurs stockées: {fit['formula']} (écart moyen {fit['mean_error']:.1%}, max {fit['max_error']:.1%})")
+    print(f"\n  {'niveau':>6} {'stocké':>10} {args.source:>10} {'écart':>7}")
+    for row in checks:
+        marker = "⚠️" if row["error"] > args.tolerance else "  "
+        print(f"{marker}{row['level']:>6} {row['stored']:>10} {row['computed']:>10} {row['error']:>7.1%}")
+    if breaks:
+        print(f"\n❌ XP totale non croissante aux niveaux: {', '.join(map(str, breaks))}")
+
+    print(f"\n⏱️ Temps de jeu ({', '.join(f'{k} {v:g}/h' for k, v in rates.items())}, difficulté {args.difficulty})")
+    hours_to_level = simulation["hours_to_level"]
+    for level in sorted(set(settings["milestones"] + [max_level, max_level + len(prestige)])):
+        if level in hours_to_level:
+            print(f"  niveau {level:>4}: {hours_to_level[level]:>9.1f} h"
+                  + (f"  ({simulation['xp_per_hour'][level]:.0f} XP/h)" if level in simulation["xp_per_hour"] else ""))
+    for spike in simulation["spikes"]:
+        print(f"  ⚠️ {spike['kind']} au niveau {spike['level']}: {spike['hours']} h contre {spike['previous_hours']} h "
+              f"(×{spike['ratio']})")
+
+    if args.check:
+        print(f"\n{'❌' if failed else '✅'} {len(mismatches)} valeur(s) stockée(s) hors tolérance ({args.tolerance:.0%})")
+    else:
+        print(f"\n💾 Table écrite: {output} ({len(levels)} niveaux + {len(prestige)} de prestige, source {args.source})")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
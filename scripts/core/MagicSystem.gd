@@ -95,6 +95,11 @@ enum EnchantmentType {
 @export var spells_database_path: String = "res://data/spells_database.json"
 @export var enchantments_path: String = "res://data/enchantments.json"
 
+## Table des piles d'enchantements précalculée (python godot_project_fixer.py enchantments)
+const ENCHANTMENT_TABLE_PATH = "res://data/enchantment_table.json"
+const ENCHANTMENT_TABLE_FORMAT_VERSION = 1
+const ENCHANTMENT_GROUPS = ["enchantments", "cursed_enchantments", "legendary_enchantments"]
+
 ## Configuration système par défaut (fallback)
 var default_config: Dictionary = {
 	"chaos_base_chance": 0.20,        # 20% de chaos de base
@@ -112,12 +117,17 @@ var default_config: Dictionary = {
 var magic_config: Dictionary = {}
 var spells_database: Dictionary = {}
 var enchantments_database: Dictionary = {}
+var enchantment_combinations: Dictionary = {}
+var enchantment_table: Dictionary = {}
+var enchantment_table_max_stack: int = 0
+var enchantment_conflicts: Dictionary = {}
 
 ## État système global
 var ambient_magic_level: float = 1.0
 var total_chaos_events: int = 0
 var octarine_concentration: float = 1.0
 var active_enchantments: Dictionary = {}
+var enchantment_stacks: Dictionary = {}
 var magic_zones: Dictionary = {}
 
 ## État par entité
@@ -215,6 +225,7 @@ func _ready() -> void:
 	load_system_configuration()
 	load_spells_database()
 	load_enchantments_database()
+	load_enchantment_table()
 	
 	# Configuration initiale
 	setup_ambient_magic()
@@ -236,19 +247,19 @@ func _ready() -> void:
 
 func ensure_datamanager_ready() -> void:
 	"""S'assure que DataManager est prêt avant de continuer"""
-	if not get_node_or_null("/root/DataManager"):
+	if not get_node_or_null("/root/Data"):
 		if get_node_or_null("/root/GameManager"):
 			await get_node("/root/GameManager").manager_ready
 		else:
 			await get_tree().process_frame
 	
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	if data_manager and not data_manager.loading_complete:
 		await data_manager.all_data_loaded
 
 func load_system_configuration() -> void:
 	"""Charge la configuration depuis DataManager ou utilise les défauts"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	
 	if data_manager and data_manager.game_config.has("magic_system"):
 		magic_config = data_manager.game_config["magic_system"]
@@ -277,7 +288,11 @@ func load_enchantments_database() -> void:
 	if FileAccess.file_exists(enchantments_path):
 		var file_data = load_json_file(enchantments_path)
 		if file_data:
-			enchantments_database = file_data
+			# Enchantements, malédictions et légendaires partagent le même espace d'identifiants
+			enchantments_database.clear()
+			for group in ENCHANTMENT_GROUPS:
+				enchantments_database.merge(file_data.get(group, {}))
+			enchantment_combinations = file_data.get("enchantment_combinations", {})
 			if debug_mode:
 				print("✅ Base enchantements chargée:", enchantments_database.size(), "enchantements")
 	else:
@@ -285,6 +300,25 @@ func load_enchantments_database() -> void:
 		if debug_mode:
 			print("⚠️ Enchantements fallback utilisés")
 
+func load_enchantment_table() -> void:
+	"""Charge la table des piles ; sans elle, les effets sont cumulés à la volée"""
+	enchantment_table.clear()
+	enchantment_table_max_stack = 0
+	enchantment_conflicts.clear()
+	if not FileAccess.file_exists(ENCHANTMENT_TABLE_PATH):
+		return
+	
+	var table_data = load_json_file(ENCHANTMENT_TABLE_PATH)
+	if int(table_data.get("format_version", 0)) != ENCHANTMENT_TABLE_FORMAT_VERSION:
+		push_warning("[MagicSystem] Table d'enchantements obsolète, relancer: python godot_project_fixer.py enchantments")
+		return
+	
+	enchantment_table = table_data.get("stacks", {})
+	enchantment_table_max_stack = int(table_data.get("max_stack", 0))
+	enchantment_conflicts = table_data.get("conflicts", {})
+	if debug_mode:
+		print("✅ Table enchantements chargée:", enchantment_table.size(), "piles (max", enchantment_table_max_stack, ")")
+
 func setup_fallback_spells() -> void:
 	"""Configuration de sorts minimaux si JSON absent"""
 	spells_database = {
@@ -496,6 +530,14 @@ func apply_enchantment(target_id: String, enchantment_id: String, duration: floa
 	if not enchantment:
 		return false
 	
+	# Seules les paires connues comme exclusives sont refusées (l'illégalité est
+	# par paire) ; une pile hors table reste légale et est cumulée à la volée
+	var conflict = find_enchantment_conflict(get_active_enchantment_ids(target_id), enchantment_id)
+	if not conflict.is_empty():
+		if debug_mode:
+			print("⛔ Enchantements exclusifs:", conflict, "sur", target_id, "(", enchantment_conflicts[conflict], ")")
+		return false
+	
 	# Déterminer la durée
 	var actual_duration = duration
 	if actual_duration < 0:
@@ -516,6 +558,7 @@ func apply_enchantment(target_id: String, enchantment_id: String, duration: floa
 		active_enchantments[target_id] = []
 	
 	active_enchantments[target_id].append(active_enchant)
+	refresh_enchantment_stack(target_id)
 	
 	# Émission du signal
 	enchantment_applied.emit(target_id, enchantment_id, actual_duration)
@@ -534,6 +577,7 @@ func remove_enchantment(target_id: String, enchantment_id: String, reason: Strin
 	for i in range(enchantments.size() - 1, -1, -1):
 		if enchantments[i].id == enchantment_id:
 			enchantments.remove_at(i)
+			refresh_enchantment_stack(target_id)
 			enchantment_removed.emit(target_id, enchantment_id, reason)
 			
 			if debug_mode:
@@ -543,6 +587,106 @@ func remove_enchantment(target_id: String, enchantment_id: String, reason: Strin
 	
 	return false
 
+func get_active_enchantment_ids(target_id: String) -> Array:
+	"""Identifiants distincts des enchantements actifs sur une cible"""
+	var ids = []
+	for enchant in active_enchantments.get(target_id, []):
+		if not enchant.id in ids:
+			ids.append(enchant.id)
+	return ids
+
+func find_enchantment_conflict(active_ids: Array, enchantment_id: String) -> String:
+	"""Clé de la première paire exclusive (table "conflicts") formée avec les actifs, "" sinon"""
+	for active_id in active_ids:
+		var pair_key = get_enchantment_stack_key([active_id, enchantment_id])
+		if active_id != enchantment_id and enchantment_conflicts.has(pair_key):
+			return pair_key
+	return ""
+
+func get_enchantment_stack_key(ids: Array) -> String:
+	"""Clé de la table : identifiants triés joints par +"""
+	var sorted_ids = ids.duplicate()
+	sorted_ids.sort()
+	return "+".join(sorted_ids)
+
+func refresh_enchantment_stack(target_id: String) -> void:
+	"""Met en cache les effets cumulés d'une cible : une recherche dans la table"""
+	var ids = get_active_enchantment_ids(target_id)
+	if ids.is_empty():
+		enchantment_stacks.erase(target_id)
+		return
+	
+	var key = get_enchantment_stack_key(ids)
+	if enchantment_table.has(key):
+		enchantment_stacks[target_id] = enchantment_table[key]
+		return
+	
+	# Sans table, ou pile plus grande que max_stack : cumul à la volée
+	enchantment_stacks[target_id] = accumulate_enchantment_stack(ids)
+
+func accumulate_enchantment_stack(ids: Array) -> Dictionary:
+	"""Effets et synergies d'une pile, mêmes règles que sb_tools/enchant_resolver.py"""
+	var sorted_ids = ids.duplicate()
+	sorted_ids.sort()
+	
+	var effects = {}
+	for enchantment_id in sorted_ids:
+		var enchant_effects = enchantments_database.get(enchantment_id, {}).get("effects", {})
+		for effect in enchant_effects:
+			var value = enchant_effects[effect]
+			effects[effect] = combine_enchantment_value(effect, effects[effect], value) if effects.has(effect) else value
+	
+	var sets = []
+	var synergy = {}
+	var set_ids = enchantment_combinations.keys()
+	set_ids.sort()
+	for set_id in set_ids:
+		var combination = enchantment_combinations[set_id]
+		if not combination.get("enchantments", []).all(func(member): return member in sorted_ids):
+			continue
+		sets.append(set_id)
+		var bonus = combination.get("synergy_bonus", {})
+		for key in bonus:
+			synergy[key] = combine_synergy_value(key, synergy[key], bonus[key]) if synergy.has(key) else bonus[key]
+	
+	return {"effects": effects, "synergy": synergy, "sets": sets}
+
+func combine_enchantment_value(key: String, current, value):
+	"""Multiplicateurs multipliés, bonus additionnés, fractions 1 - Π(1 - v), listes unies"""
+	if typeof(current) in [TYPE_INT, TYPE_FLOAT] and typeof(value) in [TYPE_INT, TYPE_FLOAT]:
+		if key.ends_with("_multiplier"):
+			return snappedf(current * value, 0.000001)
+		if "bonus" in key or not (current >= 0 and current <= 1 and value >= 0 and value <= 1):
+			return snappedf(current + value, 0.000001)
+		return snappedf(1.0 - (1.0 - current) * (1.0 - value), 0.000001)
+	if current is Array or value is Array:
+		var merged = current.duplicate() if current is Array else [current]
+		for item in (value if value is Array else [value]):
+			if not item in merged:
+				merged.append(item)
+		return merged
+	if current is bool or value is bool:
+		# Une précision textuelle ("perfect") l'emporte sur un simple true
+		if current is bool and current:
+			return value
+		if value is bool and value:
+			return current
+		return current if current else value
+	# Valeurs exclusives : paire refusée par apply_enchantment, la dernière l'emporte
+	return value
+
+func combine_synergy_value(key: String, current, value):
+	"""Bonus de synergie : facteurs ≥ 1 multipliés, bonus additionnés"""
+	if typeof(current) in [TYPE_INT, TYPE_FLOAT] and typeof(value) in [TYPE_INT, TYPE_FLOAT]:
+		if not "bonus" in key and current >= 1 and value >= 1:
+			return snappedf(current * value, 0.000001)
+		return snappedf(current + value, 0.000001)
+	return combine_enchantment_value(key, current, value)
+
+func get_enchantment_stack(target_id: String) -> Dictionary:
+	"""Effets cumulés, synergies et ensembles actifs des enchantements d'une cible"""
+	return enchantment_stacks.get(target_id, {"effects": {}, "synergy": {}, "sets": []})
+
 # ============================================================================
 # SYSTÈMES SPÉCIALISÉS TERRY PRATCHETT
 # ============================================================================
@@ -700,13 +844,14 @@ func load_json_file(file_path: String) -> Dictionary:
 func connect_to_game_systems() -> void:
 	"""Connecte le MagicSystem aux autres managers"""
 	# Connexion avec ObservationManager pour cascades magiques
-	var observation_manager = get_node_or_null("/root/ObservationManager")
+	var observation_manager = get_node_or_null("/root/Observation")
 	if observation_manager:
 		observation_manager.creature_observed.connect(_on_creature_observed)
 		observation_manager.magic_cascade_triggered.connect(_on_magic_cascade)
 	
-	# Connexion avec CombatSystem pour sorts de combat
-	var combat_system = get_node_or_null("/root/CombatSystem")
+	# Connexion avec CombatSystem pour sorts de combat (enfant de GameManager, pas un AutoLoad)
+	var game_manager = get_node_or_null("/root/GameManager")
+	var combat_system = game_manager.get_manager("CombatSystem") if game_manager else null
 	if combat_system:
 		combat_system.action_performed.connect(_on_combat_action)
 	
@@ -745,6 +890,7 @@ func _cleanup_temporary_effects() -> void:
 	
 	for target_id in active_enchantments.keys():
 		var enchantments = active_enchantments[target_id]
+		var expired = false
 		
 		for i in range(enchantments.size() - 1, -1, -1):
 			var enchant = enchantments[i]
@@ -752,7 +898,11 @@ func _cleanup_temporary_effects() -> void:
 			
 			if enchant.type == EnchantmentType.TEMPORARY and elapsed >= enchant.duration:
 				enchantments.remove_at(i)
+				expired = true
 				enchantment_removed.emit(target_id, enchant.id, "expired")
+		
+		if expired:
+			refresh_enchantment_stack(target_id)
 
 # ============================================================================
 # HANDLERS D'ÉVÉNEMENTS
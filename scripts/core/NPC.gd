@@ -216,10 +216,10 @@ func setup_npc_components() -> void:
 
 func connect_to_managers() -> void:
 	"""Connecte le NPC aux managers du jeu"""
-	dialogue_manager = get_node_or_null("/root/DialogueManager")
-	quest_manager = get_node_or_null("/root/QuestManager")
+	dialogue_manager = get_node_or_null("/root/Dialogue")
+	quest_manager = get_node_or_null("/root/Quest")
 	reputation_manager = get_node_or_null("/root/ReputationManager")
-	ui_manager = get_node_or_null("/root/UIManager")
+	ui_manager = get_node_or_null("/root/UI")
 	
 	# Connexions de signaux
 	if dialogue_manager:
@@ -236,7 +236,7 @@ func connect_to_managers() -> void:
 
 func load_character_data() -> void:
 	"""Charge les données du personnage depuis DataManager"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	
 	if data_manager and not data_manager.characters_data.is_empty():
 		if data_manager.characters_data.has(character_id):
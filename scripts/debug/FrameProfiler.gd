@@ -0,0 +1,191 @@
+# ============================================================================
+# 🔬 FrameProfiler.gd - Sondes de profilage des fonctions chaudes (AutoLoad)
+# ============================================================================
+# STATUS: ✅ FONCTIONNEL | ROADMAP: Performance - Mesure de charge
+# PRIORITY: 🟡 P3 - Outil de développement
+# DEPENDENCIES: Aucune
+
+extends Node
+
+## Reçoit les sondes injectées par python godot_project_fixer.py profile --instrument
+## (Profiler.enter / Profiler.exit autour des fonctions chaudes), enregistré
+## sous le nom "Profiler" le temps de l'instrumentation (--strip le retire).
+## Par pile d'appels : nombre d'appels, temps total / propre / max et
+## histogramme log2 des durées (µs) ; les derniers échantillons bruts sont
+## gardés dans un tampon circulaire. Écrit user://profiles/*.json à la sortie.
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+const DUMP_FORMAT_VERSION = 1
+## Seau i : durées de [2^i, 2^(i+1)) µs (seau 0 : moins de 2 µs)
+const HISTOGRAM_BUCKETS = 24
+
+@export var ring_capacity: int = 16384
+@export var dump_directory: String = "user://profiles"
+## Écriture périodique en plus de celle de sortie (0 : seulement à la sortie)
+@export var dump_interval_seconds: float = 0.0
+
+# ============================================================================
+# VARIABLES
+# ============================================================================
+
+# Piles d'appels connues : id -> "A;B;C", et enfants de chaque id (id + 1, 0 pour la racine)
+var path_names: PackedStringArray = PackedStringArray()
+var path_children: Array[Dictionary] = [{}]
+
+# Statistiques par id de pile
+var call_counts: PackedInt64Array = PackedInt64Array()
+var total_usec: PackedInt64Array = PackedInt64Array()
+var self_usec: PackedInt64Array = PackedInt64Array()
+var max_usec: PackedInt64Array = PackedInt64Array()
+var histograms: PackedInt64Array = PackedInt64Array()
+
+# Pile des sondes ouvertes
+var stack_ids: PackedInt32Array = PackedInt32Array()
+var stack_starts: PackedInt64Array = PackedInt64Array()
+var stack_children_usec: PackedInt64Array = PackedInt64Array()
+
+# Tampon circulaire des derniers échantillons
+var ring_paths: PackedInt32Array = PackedInt32Array()
+var ring_durations: PackedInt64Array = PackedInt64Array()
+var ring_index: int = 0
+var ring_filled: bool = false
+
+var frames: int = 0
+var started_usec: int = 0
+var run_name: String = ""
+var dump_timer: float = 0.0
+
+# ============================================================================
+# INITIALISATION
+# ============================================================================
+
+func _ready() -> void:
+	# Compter les frames avant tous les autres nœuds
+	process_mode = Node.PROCESS_MODE_ALWAYS
+	process_priority = -1000
+	ring_paths.resize(ring_capacity)
+	ring_durations.resize(ring_capacity)
+	started_usec = Time.get_ticks_usec()
+	run_name = "profile_%d" % Time.get_unix_time_from_system()
+	print("🔬 Profiler: sondes actives, dump dans ", ProjectSettings.globalize_path(dump_directory))
+
+func _process(delta: float) -> void:
+	frames += 1
+	if dump_interval_seconds > 0.0:
+		dump_timer += delta
+		if dump_timer >= dump_interval_seconds:
+			dump_timer = 0.0
+			dump()
+
+func _exit_tree() -> void:
+	dump()
+
+# ============================================================================
+# SONDES
+# ============================================================================
+
+func enter(probe: StringName) -> void:
+	"""Ouvre une mesure ; la pile courante donne son chemin (parent;probe)"""
+	var parent = stack_ids[stack_ids.size() - 1] if not stack_ids.is_empty() else -1
+	var path_id = path_children[parent + 1].get(probe, -1)
+	if path_id < 0:
+		path_id = add_path(parent, probe)
+	stack_ids.append(path_id)
+	stack_starts.append(Time.get_ticks_usec())
+	stack_children_usec.append(0)
+
+func exit() -> void:
+	"""Ferme la mesure ouverte par le dernier enter()"""
+	var now = Time.get_ticks_usec()
+	var depth = stack_ids.size() - 1
+	if depth < 0:
+		return
+	var path_id = stack_ids[depth]
+	var elapsed = now - stack_starts[depth]
+	var own = elapsed - stack_children_usec[depth]
+	stack_ids.resize(depth)
+	stack_starts.resize(depth)
+	stack_children_usec.resize(depth)
+	if depth > 0:
+		stack_children_usec[depth - 1] += elapsed
+
+	call_counts[path_id] += 1
+	total_usec[path_id] += elapsed
+	self_usec[path_id] += own
+	max_usec[path_id] = maxi(max_usec[path_id], elapsed)
+	histograms[path_id * HISTOGRAM_BUCKETS + bucket_of(elapsed)] += 1
+
+	ring_paths[ring_index] = path_id
+	ring_durations[ring_index] = elapsed
+	ring_index += 1
+	if ring_index >= ring_capacity:
+		ring_index = 0
+		ring_filled = true
+
+func add_path(parent: int, probe: StringName) -> int:
+	var path_id = path_names.size()
+	path_names.append(String(probe) if parent < 0 else path_names[parent] + ";" + String(probe))
+	path_children[parent + 1][probe] = path_id
+	path_children.append({})
+	call_counts.append(0)
+	total_usec.append(0)
+	self_usec.append(0)
+	max_usec.append(0)
+	for i in HISTOGRAM_BUCKETS:
+		histograms.append(0)
+	return path_id
+
+func bucket_of(duration_usec: int) -> int:
+	var bucket = 0
+	var value = duration_usec >> 1
+	while value > 0 and bucket < HISTOGRAM_BUCKETS - 1:
+		value >>= 1
+		bucket += 1
+	return bucket
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+func dump() -> String:
+	"""Écrit les statistiques cumulées et le tampon circulaire (un fichier par exécution)"""
+	var paths = []
+	for path_id in path_names.size():
+		var offset = path_id * HISTOGRAM_BUCKETS
+		paths.append({
+			"stack": path_names[path_id],
+			"calls": call_counts[path_id],
+			"total_usec": total_usec[path_id],
+			"self_usec": self_usec[path_id],
+			"max_usec": max_usec[path_id],
+			"histogram": Array(histograms.slice(offset, offset + HISTOGRAM_BUCKETS))
+		})
+
+	# Tampon dans l'ordre chronologique (plus ancien d'abord)
+	var ring_ids = ring_paths.slice(ring_index) + ring_paths.slice(0, ring_index) if ring_filled else ring_paths.slice(0, ring_index)
+	var ring_values = ring_durations.slice(ring_index) + ring_durations.slice(0, ring_index) if ring_filled else ring_durations.slice(0, ring_index)
+
+	var result = {
+		"format_version": DUMP_FORMAT_VERSION,
+		"project": ProjectSettings.get_setting("application/config/name", ""),
+		"engine": Engine.get_version_info().get("string", ""),
+		"frames": frames,
+		"duration_usec": Time.get_ticks_usec() - started_usec,
+		"histogram_buckets": HISTOGRAM_BUCKETS,
+		"paths": paths,
+		"ring": {"paths": Array(ring_ids), "durations_usec": Array(ring_values)}
+	}
+
+	DirAccess.make_dir_recursive_absolute(dump_directory)
+	var output_path = dump_directory.path_join(run_name + ".json")
+	var file = FileAccess.open(output_path, FileAccess.WRITE)
+	if file == null:
+		push_error("🔬 Écriture impossible: " + output_path)
+		return ""
+	file.store_string(JSON.stringify(result))
+	file.close()
+	print("🔬 Profil écrit: ", ProjectSettings.globalize_path(output_path))
+	return output_path
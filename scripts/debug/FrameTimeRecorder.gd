@@ -0,0 +1,149 @@
+# ============================================================================
+# ⏱️ FrameTimeRecorder.gd - Enregistreur de temps de frame (scènes de stress)
+# ============================================================================
+# STATUS: ✅ FONCTIONNEL | ROADMAP: Performance - Mesure de charge
+# PRIORITY: 🟡 P3 - Outil de développement
+# DEPENDENCIES: Aucune
+
+class_name FrameTimeRecorder
+extends Node
+
+## Mesure les temps de frame d'une scène de benchmark
+## (python godot_project_fixer.py stress) et écrit le résultat en JSON.
+## Lancement: godot --path . res://scenes/benchmark/<scène>.tscn
+
+# ============================================================================
+# SIGNAUX
+# ============================================================================
+
+## Émis quand la mesure est terminée et le fichier écrit
+signal recording_finished(output_path: String, stats: Dictionary)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+@export_group("Recording")
+@export var warmup_seconds: float = 2.0
+@export var duration_seconds: float = 10.0
+@export var frame_budget_ms: float = 16.67
+@export var output_path: String = "user://benchmarks/benchmark.json"
+@export var quit_when_done: bool = true
+
+@export_group("Scenario")
+## Paramètres de génération recopiés dans le résultat (nombres, disposition, graine)
+@export var scenario: Dictionary = {}
+
+# ============================================================================
+# VARIABLES
+# ============================================================================
+
+var elapsed: float = 0.0
+var is_recording: bool = false
+var is_finished: bool = false
+var frame_times: PackedFloat32Array = PackedFloat32Array()
+var process_times: PackedFloat32Array = PackedFloat32Array()
+var physics_times: PackedFloat32Array = PackedFloat32Array()
+
+# ============================================================================
+# INITIALISATION
+# ============================================================================
+
+func _ready() -> void:
+	# Mesurer même si le jeu est en pause, après tous les autres nœuds
+	process_mode = Node.PROCESS_MODE_ALWAYS
+	process_priority = 1000
+	print("⏱️ FrameTimeRecorder: ", scenario, " - préchauffage ", warmup_seconds, "s")
+
+# ============================================================================
+# MESURE
+# ============================================================================
+
+func _process(delta: float) -> void:
+	if is_finished:
+		return
+
+	elapsed += delta
+	if not is_recording:
+		if elapsed >= warmup_seconds:
+			is_recording = true
+			elapsed = 0.0
+		return
+
+	frame_times.append(delta * 1000.0)
+	process_times.append(Performance.get_monitor(Performance.TIME_PROCESS) * 1000.0)
+	physics_times.append(Performance.get_monitor(Performance.TIME_PHYSICS_PROCESS) * 1000.0)
+
+	if elapsed >= duration_seconds:
+		finish_recording()
+
+func finish_recording() -> void:
+	"""Calcule les statistiques, écrit le fichier et quitte si demandé"""
+	is_finished = true
+	var stats = compute_stats()
+	var result = {
+		"scene": get_tree().current_scene.scene_file_path if get_tree().current_scene else "",
+		"scenario": scenario,
+		"engine": Engine.get_version_info().get("string", ""),
+		"warmup_seconds": warmup_seconds,
+		"duration_seconds": duration_seconds,
+		"frame_budget_ms": frame_budget_ms,
+		"stats": stats,
+		"frame_times_ms": Array(frame_times)
+	}
+
+	DirAccess.make_dir_recursive_absolute(output_path.get_base_dir())
+	var file = FileAccess.open(output_path, FileAccess.WRITE)
+	if file:
+		file.store_string(JSON.stringify(result, "\t"))
+		file.close()
+		print("⏱️ Résultats écrits: ", ProjectSettings.globalize_path(output_path))
+	else:
+		push_error("⏱️ Écriture impossible: " + output_path)
+
+	print("⏱️ Moyenne %.2f ms, p95 %.2f ms, max %.2f ms, %.1f%% hors budget" % [
+		stats.avg_ms, stats.p95_ms, stats.max_ms, stats.over_budget_ratio * 100.0])
+	recording_finished.emit(output_path, stats)
+
+	if quit_when_done:
+		get_tree().quit()
+
+func compute_stats() -> Dictionary:
+	"""Moyenne, percentiles et part des frames au-delà du budget"""
+	var sorted_times = Array(frame_times)
+	sorted_times.sort()
+	var count = sorted_times.size()
+	if count == 0:
+		return {"frames": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0,
+			"max_ms": 0.0, "over_budget_ratio": 0.0, "process_avg_ms": 0.0, "physics_avg_ms": 0.0}
+
+	var over_budget = 0
+	for frame_time in sorted_times:
+		if frame_time > frame_budget_ms:
+			over_budget += 1
+
+	return {
+		"frames": count,
+		"avg_ms": average(frame_times),
+		"p50_ms": percentile(sorted_times, 0.50),
+		"p95_ms": percentile(sorted_times, 0.95),
+		"p99_ms": percentile(sorted_times, 0.99),
+		"max_ms": sorted_times[count - 1],
+		"over_budget_ratio": float(over_budget) / count,
+		"process_avg_ms": average(process_times),
+		"physics_avg_ms": average(physics_times),
+		"node_count": Performance.get_monitor(Performance.OBJECT_NODE_COUNT),
+		"creatures": get_tree().get_nodes_in_group("creatures").size(),
+		"npcs": get_tree().get_nodes_in_group("npcs").size()
+	}
+
+func percentile(sorted_times: Array, ratio: float) -> float:
+	return sorted_times[mini(int(ratio * sorted_times.size()), sorted_times.size() - 1)]
+
+func average(values: PackedFloat32Array) -> float:
+	if values.is_empty():
+		return 0.0
+	var total = 0.0
+	for value in values:
+		total += value
+	return total / values.size()
@@ -142,6 +142,9 @@ var environmental_factors: Dictionary = {}
 var combat_statistics: Dictionary = {}
 var actions_history: Array[Dictionary] = []
 
+## Révision de get_save_data(), incrémentée à chaque modification (SaveSystem : sections non resérialisées)
+var save_revision: int = 0
+
 ## Flags système
 var system_initialized: bool = false
 var debug_mode: bool = false
@@ -315,13 +318,13 @@ func _ready() -> void:
 
 func ensure_datamanager_ready() -> void:
 	"""S'assure que DataManager est prêt"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	if data_manager and not data_manager.loading_complete:
 		await data_manager.all_data_loaded
 
 func load_combat_configuration() -> void:
 	"""Charge la configuration de combat"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	
 	if data_manager and data_manager.game_config.has("combat_system"):
 		var config = data_manager.game_config["combat_system"]
@@ -384,7 +387,7 @@ func connect_to_game_systems() -> void:
 		combat_ended.connect(_on_combat_ended_reputation_effects)
 	
 	# Connexion avec QuestManager pour progression
-	var quest_manager = get_node_or_null("/root/QuestManager")
+	var quest_manager = get_node_or_null("/root/Quest")
 	if quest_manager:
 		combat_ended.connect(_on_combat_ended_quest_effects)
 
@@ -423,6 +426,7 @@ func start_combat(combat_data: Dictionary) -> bool:
 	# Démarrage
 	combat_state = CombatState.INITIATIVE_ROLL
 	turn_number = 0
+	mark_save_dirty()
 	
 	# Émission signal
 	combat_started.emit(current_combat_id, get_participant_ids())
@@ -530,6 +534,7 @@ func start_next_turn() -> void:
 	turn_started.emit(combatant_id, turn_number)
 	
 	# Déterminer type de tour
+	mark_save_dirty()
 	match combatant.type:
 		CombatantType.PLAYER:
 			combat_state = CombatState.PLAYER_TURN
@@ -789,9 +794,9 @@ func trigger_octarine_chaos(caster: Combatant, spell_data: Dictionary, action_da
 	magic_chaos_triggered.emit(caster.id, chosen_effect, [])
 	
 	# Notifier ObservationManager de l'événement magique
-	var observation_manager = get_node_or_null("/root/ObservationManager")
+	var observation_manager = get_node_or_null("/root/Observation")
 	if observation_manager:
-		observation_manager._on_magic_cascade(Vector2(caster.position), 3.0)
+		observation_manager.roll_magic_cascade(Vector2(caster.position), 3.0)
 
 func apply_chaos_effect(caster: Combatant, effect_type: String, spell_data: Dictionary, action_data: Dictionary) -> void:
 	"""Applique un effet chaotique spécifique"""
@@ -944,6 +949,7 @@ func check_combat_end_conditions() -> bool:
 func end_combat(resolution: ResolutionType) -> void:
 	"""Termine le combat avec un type de résolution"""
 	combat_state = CombatState.ENDED
+	mark_save_dirty()
 	
 	# Calculer résultats
 	var results = calculate_combat_results(resolution)
@@ -1006,8 +1012,8 @@ func _on_combat_ended_reputation_effects(combat_id: String, resolution_type: Str
 
 func _on_combat_ended_quest_effects(combat_id: String, resolution_type: String, results: Dictionary) -> void:
 	"""Met à jour les quêtes après combat"""
-	var quest_manager = get_node_or_null("/root/QuestManager")
-	if not quest_manager:
+	var quest_manager = get_node_or_null("/root/Quest")
+	if not quest_manager or not quest_manager.has_method("trigger_dynamic_event"):
 		return
 	
 	# Notifier le QuestManager du résultat du combat
@@ -1065,6 +1071,7 @@ func cleanup_combat() -> void:
 	"""Nettoie les données du combat terminé"""
 	current_combat_id = ""
 	combat_state = CombatState.INACTIVE
+	mark_save_dirty()
 	current_turn_order.clear()
 	combat_participants.clear()
 	negotiation_progress.clear()
@@ -1093,6 +1100,10 @@ func force_end_combat(resolution: ResolutionType = ResolutionType.STALEMATE) ->
 # SYSTÈME DE SAUVEGARDE
 # ============================================================================
 
+func mark_save_dirty() -> void:
+	"""Signale que get_save_data() a changé depuis la dernière sauvegarde"""
+	save_revision += 1
+
 func get_save_data() -> Dictionary:
 	"""Retourne les données à sauvegarder"""
 	return {
@@ -1107,6 +1118,7 @@ func apply_save_data(save_data: Dictionary) -> void:
 	# Note: On ne restaure pas les combats en cours
 	# Les combats sont des états temporaires qui recommencent au chargement
 	combat_statistics = save_data.get("combat_statistics", {})
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("⚔️ Données de combat restaurées")
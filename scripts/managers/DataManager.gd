@@ -28,6 +28,15 @@ const DATA_PATHS = {
 	"config": "res://data/game_config.json"
 }
 
+# Bundle binaire précompilé (python godot_project_fixer.py bundle), à inclure
+# dans l'export via include_filter="data/data_bundle.bin" du preset
+const BUNDLE_PATH = "res://data/data_bundle.bin"
+const BUNDLE_FORMAT_VERSION = 2
+
+# Table d'XP dense précompilée (python godot_project_fixer.py xp)
+const XP_TABLE_PATH = "res://data/xp_table.json"
+const XP_TABLE_FORMAT_VERSION = 1
+
 # DLC Data paths (dynamiquement ajoutés)
 var dlc_data_paths: Dictionary = {}
 
@@ -43,6 +52,9 @@ var economy_data: Dictionary = {}
 var faction_relationships: Dictionary = {}
 var game_config: Dictionary = {}
 var localization_data: Dictionary = {}
+var bundled_data: Dictionary = {}  # Types sans variable dédiée (spells, magic, enchantments)
+var experience_table: Array = []  # XP totale par niveau (index = niveau - 1)
+var prestige_experience_table: Array = []  # XP totale par niveau de prestige au-delà du niveau max
 
 # État du chargement
 var loading_complete: bool = false
@@ -61,15 +73,23 @@ func _ready() -> void:
 	print("[DataManager] Toutes les données chargées avec succès")
 
 func load_all_data() -> void:
-	"""Charge toutes les données JSON séquentiellement"""
-	var load_order = ["config", "creatures", "characters", "dialogues", "quests", "progression", "economy", "factions"]
+	"""Charge toutes les données : bundle précompilé si disponible, sinon JSON séquentiellement"""
+	if load_data_bundle():
+		# Bundle compilé sans game_config.json (absent à la compilation)
+		if not data_loaded_flags.has("config") and FileAccess.file_exists(DATA_PATHS.config):
+			if await load_data_file("config"):
+				data_loaded.emit("config")
+	else:
+		var load_order = ["config", "creatures", "characters", "dialogues", "quests", "progression", "economy", "factions"]
+		
+		for data_type in load_order:
+			var success = await load_data_file(data_type)
+			if not success:
+				push_error("[DataManager] Échec du chargement: " + data_type)
+			else:
+				data_loaded.emit(data_type)
 	
-	for data_type in load_order:
-		var success = await load_data_file(data_type)
-		if not success:
-			push_error("[DataManager] Échec du chargement: " + data_type)
-		else:
-			data_loaded.emit(data_type)
+	load_xp_table()
 	
 	# Chargement de la localisation (plus complexe)
 	await load_localization_data("en")  # Langue par défaut
@@ -115,6 +135,7 @@ func load_data_file(data_type: String) -> bool:
 			dialogue_trees = data
 		"quests":
 			quest_templates = data
+			post_process_quests_data()
 		"characters":
 			characters_data = data
 			post_process_characters_data()
@@ -131,14 +152,105 @@ func load_data_file(data_type: String) -> bool:
 	print("[DataManager] Chargé avec succès: " + data_type)
 	return true
 
+# ================================
+# BUNDLE PRÉCOMPILÉ
+# ================================
+func load_data_bundle() -> bool:
+	"""Charge le bundle binaire (données validées, post-traitements déjà appliqués)"""
+	if not FileAccess.file_exists(BUNDLE_PATH):
+		return false
+	
+	var file = FileAccess.open(BUNDLE_PATH, FileAccess.READ)
+	if file == null:
+		return false
+	
+	# En-tête court (version, empreintes des sources) : décodé sans toucher aux données
+	var header = file.get_var()
+	if not header is Dictionary or header.get("format_version", 0) != BUNDLE_FORMAT_VERSION:
+		file.close()
+		push_warning("[DataManager] Format de bundle incompatible, chargement des fichiers JSON")
+		return false
+	
+	if OS.has_feature("editor") and is_bundle_outdated(header):
+		file.close()
+		print("[DataManager] Bundle obsolète, chargement des fichiers JSON")
+		return false
+	
+	var bundle = file.get_var()
+	file.close()
+	
+	if not bundle is Dictionary:
+		push_warning("[DataManager] Bundle illisible, chargement des fichiers JSON")
+		return false
+	
+	var data: Dictionary = bundle.get("data", {})
+	for data_type in data.keys():
+		match data_type:
+			"creatures":
+				creatures_db = data[data_type]
+			"dialogues":
+				dialogue_trees = data[data_type]
+			"quests":
+				quest_templates = data[data_type]
+			"characters":
+				characters_data = data[data_type]
+			"progression":
+				progression_tables = data[data_type]
+			"economy":
+				economy_data = data[data_type]
+			"factions":
+				faction_relationships = data[data_type]
+			"config":
+				game_config = data[data_type]
+			_:
+				bundled_data[data_type] = data[data_type]
+	
+	cached_lookups.merge(bundle.get("cached_lookups", {}), true)
+	
+	for data_type in data.keys():
+		data_loaded_flags[data_type] = true
+		data_loaded.emit(data_type)
+	
+	print("[DataManager] Bundle chargé: " + str(data.size()) + " types de données")
+	return true
+
+func is_bundle_outdated(header: Dictionary) -> bool:
+	"""Vérifie (éditeur uniquement) que chaque JSON source a encore le SHA-256 compilé dans l'en-tête"""
+	var sources: Dictionary = header.get("sources", {})
+	var source_hashes: Dictionary = header.get("source_hashes", {})
+	for data_type in sources.keys():
+		if FileAccess.get_sha256(sources[data_type]) != source_hashes.get(data_type, ""):
+			return true
+	return false
+
+func get_bundled_data(data_type: String) -> Dictionary:
+	"""Récupère un type de données chargé depuis le bundle (spells, magic, enchantments)"""
+	return bundled_data.get(data_type, {})
+
 # ================================
 # POST-PROCESSING DES DONNÉES
 # ================================
 func post_process_creatures_data() -> void:
 	"""Post-traitement des données de créatures"""
+	# Index inversés pour les requêtes par habitat/rareté
+	cached_lookups["creatures_by_habitat"] = {}
+	cached_lookups["creatures_by_rarity"] = {}
+	
 	# Validation et calculs dérivés
 	for creature_id in creatures_db.keys():
 		var creature = creatures_db[creature_id]
+		if not creature is Dictionary:
+			continue
+		
+		var habitat = creature.get("habitat", "")
+		if not cached_lookups["creatures_by_habitat"].has(habitat):
+			cached_lookups["creatures_by_habitat"][habitat] = []
+		cached_lookups["creatures_by_habitat"][habitat].append(creature_id)
+		
+		var rarity = creature.get("rarity", "common")
+		if not cached_lookups["creatures_by_rarity"].has(rarity):
+			cached_lookups["creatures_by_rarity"][rarity] = []
+		cached_lookups["creatures_by_rarity"][rarity].append(creature_id)
 		
 		# Calculs automatiques
 		if creature.has("base_stats"):
@@ -169,6 +281,57 @@ func post_process_characters_data() -> void:
 			cached_lookups["characters_by_faction"][faction] = []
 		cached_lookups["characters_by_faction"][faction].append(char_id)
 
+func post_process_quests_data() -> void:
+	"""Post-traitement des quêtes : mêmes index que le bundle (sb_tools/data_index.py)"""
+	cached_lookups["quest_references"] = {}
+	cached_lookups["quests_by_reference"] = {}
+	
+	var quests = quest_templates.get("quest_templates", {})
+	for quest_id in quests.keys():
+		var quest = quests[quest_id]
+		if not quest is Dictionary:
+			continue
+		
+		var refs = collect_quest_references(quest)
+		cached_lookups["quest_references"][quest_id] = refs
+		
+		# Index inverse : référence -> quêtes
+		for kind in refs:
+			for ref in refs[kind]:
+				if not cached_lookups["quests_by_reference"].has(ref):
+					cached_lookups["quests_by_reference"][ref] = []
+				if not quest_id in cached_lookups["quests_by_reference"][ref]:
+					cached_lookups["quests_by_reference"][ref].append(quest_id)
+
+func collect_quest_references(quest: Dictionary) -> Dictionary:
+	"""Personnages, créatures, lieux et cibles d'objectifs d'une quête (hors variables {…})"""
+	var requirements = quest.get("requirements", {}) if quest.get("requirements") is Dictionary else {}
+	var params = quest.get("generation_params", {}) if quest.get("generation_params") is Dictionary else {}
+	var targets = []
+	collect_objective_targets(quest.get("objectives", {}), targets)
+	
+	var refs = {
+		"characters": requirements.get("character_met", []) + params.get("npc_pool", []),
+		"creatures": params.get("creature_pool", []),
+		"locations": params.get("location_pool", []),
+		"targets": targets
+	}
+	for kind in refs:
+		refs[kind] = refs[kind].filter(func(ref): return not str(ref).begins_with("{"))
+	return refs
+
+func collect_objective_targets(node, found: Array) -> void:
+	"""Collecte récursivement les champs "target" des objectifs"""
+	if node is Dictionary:
+		for key in node:
+			if key == "target" and node[key] is String:
+				found.append(node[key])
+			else:
+				collect_objective_targets(node[key], found)
+	elif node is Array:
+		for item in node:
+			collect_objective_targets(item, found)
+
 func calculate_derived_stats(creature: Dictionary) -> void:
 	"""Calcule les statistiques dérivées pour une créature"""
 	var base_stats = creature["base_stats"]
@@ -245,19 +408,13 @@ func get_creature_evolution_data(creature_id: String, stage: int) -> Dictionary:
 func get_creatures_by_habitat(habitat: String) -> Array[String]:
 	"""Retourne la liste des créatures d'un habitat donné"""
 	var result: Array[String] = []
-	for creature_id in creatures_db.keys():
-		var creature = creatures_db[creature_id]
-		if creature.get("habitat", "") == habitat:
-			result.append(creature_id)
+	result.assign(cached_lookups.get("creatures_by_habitat", {}).get(habitat, []))
 	return result
 
 func get_creatures_by_rarity(rarity: String) -> Array[String]:
 	"""Retourne les créatures d'une rareté donnée"""
 	var result: Array[String] = []
-	for creature_id in creatures_db.keys():
-		var creature = creatures_db[creature_id]
-		if creature.get("rarity", "common") == rarity:
-			result.append(creature_id)
+	result.assign(cached_lookups.get("creatures_by_rarity", {}).get(rarity, []))
 	return result
 
 # ================================
@@ -269,11 +426,15 @@ func get_character_data(character_id: String) -> Dictionary:
 
 func get_characters_in_location(location: String) -> Array[String]:
 	"""Retourne tous les personnages dans une localisation"""
-	return cached_lookups.get("characters_by_location", {}).get(location, [])
+	var result: Array[String] = []
+	result.assign(cached_lookups.get("characters_by_location", {}).get(location, []))
+	return result
 
 func get_characters_by_faction(faction: String) -> Array[String]:
 	"""Retourne tous les personnages d'une faction"""
-	return cached_lookups.get("characters_by_faction", {}).get(faction, [])
+	var result: Array[String] = []
+	result.assign(cached_lookups.get("characters_by_faction", {}).get(faction, []))
+	return result
 
 func get_character_dialogue_tree(character_id: String) -> Dictionary:
 	"""Récupère l'arbre de dialogue d'un personnage"""
@@ -306,6 +467,16 @@ func get_quest_requirements(quest_id: String) -> Dictionary:
 	var quest = get_quest_template(quest_id)
 	return quest.get("requirements", {})
 
+func get_quests_referencing(reference_id: String) -> Array[String]:
+	"""Retourne les quêtes qui référencent un PNJ, une créature ou un lieu"""
+	var result: Array[String] = []
+	result.assign(cached_lookups.get("quests_by_reference", {}).get(reference_id, []))
+	return result
+
+func get_quest_references(quest_id: String) -> Dictionary:
+	"""Récupère les personnages/créatures/lieux référencés par une quête"""
+	return cached_lookups.get("quest_references", {}).get(quest_id, {})
+
 # ================================
 # GETTERS ÉCONOMIE
 # ================================
@@ -328,12 +499,83 @@ func get_faction_trade_modifier(faction: String) -> float:
 # ================================
 # GETTERS PROGRESSION
 # ================================
+func load_xp_table() -> void:
+	"""Charge la table d'XP dense ; sinon get_xp_for_level interpole les valeurs calculées"""
+	experience_table.clear()
+	prestige_experience_table.clear()
+	if not FileAccess.file_exists(XP_TABLE_PATH):
+		return
+	
+	var file = FileAccess.open(XP_TABLE_PATH, FileAccess.READ)
+	if file == null:
+		return
+	var json = JSON.new()
+	var parse_result = json.parse(file.get_as_text())
+	file.close()
+	
+	if parse_result != OK or not json.data is Dictionary:
+		push_warning("[DataManager] Table d'XP illisible: " + XP_TABLE_PATH)
+		return
+	if int(json.data.get("format_version", 0)) != XP_TABLE_FORMAT_VERSION:
+		push_warning("[DataManager] Table d'XP obsolète, relancer: python godot_project_fixer.py xp")
+		return
+	
+	# JSON donne des float : conversion unique en entiers
+	for xp in json.data.get("experience_table", []):
+		experience_table.append(int(xp))
+	for xp in json.data.get("prestige_experience_table", []):
+		prestige_experience_table.append(int(xp))
+
 func get_xp_for_level(level: int) -> int:
-	"""Récupère l'XP requis pour un niveau"""
-	var xp_table = progression_tables.get("experience_table", [])
-	if level > 0 and level <= xp_table.size():
-		return xp_table[level - 1]
-	return 0
+	"""Récupère l'XP totale requise pour un niveau (niveaux de prestige au-delà du niveau max)"""
+	if level > 0 and level <= experience_table.size():
+		return experience_table[level - 1]
+	var prestige_level = level - experience_table.size()
+	if not experience_table.is_empty() and prestige_level > 0 and prestige_level <= prestige_experience_table.size():
+		return prestige_experience_table[prestige_level - 1]
+	
+	# Sans table compilée : valeurs calculées éparses de progression_tables.json, interpolées
+	# comme xp_curve --source stored (paliers de prestige compris)
+	var xp_table = progression_tables.get("level_progression", {}).get("xp_table", {})
+	var stored = xp_table.get("calculated_values", {})
+	var max_level = int(progression_tables.get("metadata", {}).get("max_level", 0))
+	if max_level <= 0:
+		for key in stored.keys():
+			max_level = max(max_level, int(key))
+	var prestige_levels = int(progression_tables.get("prestige_system", {}).get("prestige_levels",
+		progression_tables.get("metadata", {}).get("prestige_levels", 0)))
+	if max_level > 0 and level > max_level and level <= max_level + prestige_levels:
+		var base = interpolate_stored_xp(stored, max_level)
+		var extended = interpolate_stored_xp(stored, level)
+		return roundi(base + float(xp_table.get("prestige_multiplier", 1.0)) * (extended - base))
+	return roundi(interpolate_stored_xp(stored, level))
+
+func interpolate_stored_xp(stored: Dictionary, level: int) -> float:
+	"""Loi de puissance de (niveau - 1) entre les deux valeurs stockées encadrantes (miroir de xp_curve.stored_thresholds)"""
+	if stored.has(str(level)):
+		return float(stored[str(level)])
+	
+	var anchors = []
+	for key in stored.keys():
+		if int(key) >= 1:
+			anchors.append(Vector2(int(key), float(stored[key])))
+	if anchors.size() < 2 or level < 1:
+		return 0.0
+	anchors.sort_custom(func(a, b): return a.x < b.x)
+	
+	# Segment encadrant le niveau (ou dernier segment pour extrapoler)
+	var lower = anchors[anchors.size() - 2]
+	var upper = anchors[anchors.size() - 1]
+	for i in range(anchors.size() - 1):
+		if anchors[i].x <= level and level <= anchors[i + 1].x:
+			lower = anchors[i]
+			upper = anchors[i + 1]
+			break
+	
+	if lower.y <= 0.0 or lower.x <= 1.0:
+		return lower.y + (upper.y - lower.y) * (level - lower.x) / (upper.x - lower.x)
+	var exponent = log(upper.y / lower.y) / log((upper.x - 1.0) / (lower.x - 1.0))
+	return lower.y * pow((level - 1.0) / (lower.x - 1.0), exponent)
 
 func get_skill_unlock_level(skill_id: String) -> int:
 	"""Récupère le niveau de déblocage d'une compétence"""
@@ -412,8 +654,9 @@ func validate_all_data() -> bool:
 	"""Valide l'intégrité de toutes les données chargées"""
 	var is_valid = true
 	
-	# Vérifier les références entre données
+	# Vérifier les références entre données (mêmes contrôles que data_index.py)
 	is_valid = validate_character_references() and is_valid
+	is_valid = validate_dialogue_references() and is_valid
 	is_valid = validate_quest_references() and is_valid
 	is_valid = validate_creature_references() and is_valid
 	
@@ -439,6 +682,22 @@ func validate_character_references() -> bool:
 	
 	return is_valid
 
+func validate_dialogue_references() -> bool:
+	"""Valide le personnage associé à chaque arbre de dialogue"""
+	var is_valid = true
+	
+	for tree_id in dialogue_trees.keys():
+		var tree = dialogue_trees[tree_id]
+		if not tree is Dictionary:
+			continue
+		
+		var speaker = tree.get("character", "")
+		if not str(speaker).is_empty() and not characters_data.has(speaker):
+			push_error("[DataManager] Personnage manquant pour dialogue " + tree_id + ": " + str(speaker))
+			is_valid = false
+	
+	return is_valid
+
 func validate_quest_references() -> bool:
 	"""Valide les références dans les données de quêtes"""
 	var is_valid = true
@@ -446,14 +705,16 @@ func validate_quest_references() -> bool:
 	for quest_id in quest_templates.keys():
 		var quest = quest_templates[quest_id]
 		
-		# Vérifier les prérequis de personnages
-		var requirements = quest.get("requirements", {})
-		if requirements.has("character_met"):
-			var char_list = requirements["character_met"]
-			for char_id in char_list:
-				if not characters_data.has(char_id):
-					push_error("[DataManager] Personnage manquant pour quête " + quest_id + ": " + char_id)
-					is_valid = false
+		# Prérequis et pools de génération (personnages et créatures)
+		var refs = collect_quest_references(quest)
+		for char_id in refs["characters"]:
+			if not characters_data.has(char_id):
+				push_error("[DataManager] Personnage manquant pour quête " + quest_id + ": " + char_id)
+				is_valid = false
+		for creature_id in refs["creatures"]:
+			if not creatures_db.has(creature_id):
+				push_error("[DataManager] Créature manquante pour quête " + quest_id + ": " + creature_id)
+				is_valid = false
 	
 	return is_valid
 
@@ -485,6 +746,7 @@ func reload_data() -> void:
 	loading_complete = false
 	data_loaded_flags.clear()
 	cached_lookups.clear()
+	bundled_data.clear()
 	
 	# Recharger
 	await load_all_data()
@@ -40,15 +40,22 @@ signal quest_trigger_from_dialogue(quest_id: String, trigger_data: Dictionary)
 @export var dialogue_trees_path: String = "res://data/dialogue_trees.json"
 @export var character_data_path: String = "res://data/character_data.json"
 @export var dialogue_config_path: String = "res://data/dialogue_config.json"
+@export var dialogue_table_path: String = "res://data/dialogue_compiled.json"
+
+## Tables compilées (python godot_project_fixer.py dialogue)
+const DIALOGUE_TABLE_FORMAT_VERSION = 1
 
 ## Bases de données chargées
 var dialogue_trees: Dictionary = {}
 var character_database: Dictionary = {}
 var dialogue_config: Dictionary = {}
+var dialogue_tables: Dictionary = {}
 
 ## État actuel du système
 var current_dialogue: Dictionary = {}
 var current_npc_id: String = ""
+var current_dialogue_id: String = ""
+var current_node_index: int = -1
 var conversation_history: Array = []
 var active_conversation: bool = false
 
@@ -96,6 +103,7 @@ func _ready() -> void:
 	"""Initialisation du système de dialogue"""
 	load_configuration()
 	load_dialogue_trees()
+	load_dialogue_tables()
 	load_character_database()
 	initialize_npc_memory()
 	connect_to_game_systems()
@@ -139,6 +147,24 @@ func load_dialogue_trees() -> void:
 		print("⚠️ Fichier dialogue_trees.json non trouvé, chargement données test")
 		setup_test_dialogues()
 
+func load_dialogue_tables() -> void:
+	"""Charge les tables plates des arbres ; sinon parcours des dictionnaires"""
+	dialogue_tables.clear()
+	if not FileAccess.file_exists(dialogue_table_path):
+		return
+	
+	var table_data = load_json_file(dialogue_table_path)
+	if int(table_data.get("format_version", 0)) != DIALOGUE_TABLE_FORMAT_VERSION:
+		print("⚠️ Tables dialogue obsolètes, relancer: python godot_project_fixer.py dialogue")
+		return
+	
+	# Seuls les arbres effectivement chargés sont indexés
+	var trees = table_data.get("trees", {})
+	for dialogue_id in trees:
+		if dialogue_trees.has(dialogue_id):
+			dialogue_tables[dialogue_id] = trees[dialogue_id]
+	print("✅ Tables dialogue chargées:", dialogue_tables.size(), " arbres")
+
 func load_character_database() -> void:
 	"""Charge la base de données des personnages"""
 	if FileAccess.file_exists(character_data_path):
@@ -377,7 +403,9 @@ func start_dialogue(npc_id: String, dialogue_id: String = "") -> bool:
 	
 	# Initialisation de la conversation
 	current_npc_id = npc_id
+	current_dialogue_id = final_dialogue_id
 	current_dialogue = dialogue_trees[final_dialogue_id]
+	current_node_index = int(dialogue_tables[final_dialogue_id].root) if dialogue_tables.has(final_dialogue_id) else -1
 	active_conversation = true
 	
 	# Mise à jour mémoire NPC
@@ -398,6 +426,9 @@ func get_current_dialogue_node() -> Dictionary:
 	if not active_conversation:
 		return {}
 	
+	if dialogue_tables.has(current_dialogue_id):
+		return get_compiled_dialogue_node()
+	
 	var current_node_id = current_dialogue.get("current_node", "start")
 	var nodes = current_dialogue.get("nodes", {})
 	
@@ -416,6 +447,35 @@ func get_current_dialogue_node() -> Dictionary:
 	print("❌ Nœud dialogue inexistant:", current_node_id)
 	return {}
 
+func get_compiled_dialogue_node() -> Dictionary:
+	"""Nœud actuel via les tables compilées : accès par indice, choix précalculés"""
+	var table = dialogue_tables[current_dialogue_id]
+	if current_node_index < 0 or current_node_index >= table.node_ids.size():
+		print("❌ Nœud dialogue inexistant:", current_node_index)
+		return {}
+	
+	var node_id = table.node_ids[current_node_index]
+	var source = current_dialogue.get("nodes", {}).get(node_id, {})
+	var node = source.duplicate()
+	node.text = process_dialogue_text(source.get("text", ""))
+	
+	var source_choices = source.get("choices", [])
+	var choices = []
+	for edge in range(int(table.choice_offsets[current_node_index]), int(table.choice_offsets[current_node_index + 1])):
+		var choice_index = int(table.choice_indexes[edge])
+		var choice = source_choices[choice_index].duplicate() if choice_index >= 0 else {"text": "..."}
+		
+		# Choix sans condition compilée : disponible sans réévaluation
+		if not table.choice_conditions[edge].is_empty() and not is_choice_available(choice):
+			continue
+		
+		choice["id"] = table.choice_ids[edge]
+		choice["next_index"] = int(table.choice_targets[edge])
+		choices.append(choice)
+	
+	node.choices = choices
+	return node
+
 func make_dialogue_choice(choice_id: String) -> bool:
 	"""Traite un choix de dialogue du joueur"""
 	if not active_conversation:
@@ -441,8 +501,15 @@ func make_dialogue_choice(choice_id: String) -> bool:
 	# Application des conséquences du choix
 	apply_choice_consequences(selected_choice)
 	
-	# Transition vers le prochain nœud
-	if selected_choice.has("next"):
+	# Transition vers le prochain nœud (-1 fin, -2 nœud inexistant)
+	if selected_choice.has("next_index"):
+		if selected_choice.next_index < 0:
+			if selected_choice.next_index == -2:
+				print("❌ Nœud dialogue inexistant après le choix:", choice_id)
+			end_dialogue(choice_id)
+			return true
+		current_node_index = selected_choice.next_index
+	elif selected_choice.has("next"):
 		current_dialogue.current_node = selected_choice.next
 	else:
 		# Fin de conversation
@@ -477,7 +544,7 @@ func end_dialogue(final_choice: String = "") -> void:
 	# Sauvegarde dans l'historique
 	conversation_history.append({
 		"npc_id": npc_id,
-		"dialogue_id": current_dialogue.get("id", "unknown"),
+		"dialogue_id": current_dialogue_id if current_dialogue_id != "" else "unknown",
 		"final_choice": final_choice,
 		"timestamp": Time.get_unix_time_from_system(),
 		"relationship_change": relationship_change
@@ -486,6 +553,8 @@ func end_dialogue(final_choice: String = "") -> void:
 	# Reset de l'état
 	active_conversation = false
 	current_npc_id = ""
+	current_dialogue_id = ""
+	current_node_index = -1
 	current_dialogue = {}
 	
 	# Émission signal
@@ -160,6 +160,9 @@ func initialize_all_managers() -> void:
 	"""Initialise tous les managers dans l'ordre correct"""
 	print("[GameManager] Initialisation des managers...")
 	
+	# Les AutoLoads déclarés après GameManager ne sont sous /root qu'à la frame suivante
+	await get_tree().process_frame
+	
 	# 1. DataManager (priorité absolue - charge les JSON)
 	data_manager = await create_and_initialize_manager("DataManager", "res://scripts/managers/DataManager.gd")
 	
@@ -181,10 +184,12 @@ func initialize_all_managers() -> void:
 
 func create_and_initialize_manager(manager_name: String, script_path: String) -> Node:
 	"""Crée et initialise un manager spécifique"""
-	# Vérifier si déjà chargé
-	var existing = get_node_or_null("/root/" + manager_name)
+	# Vérifier si déjà chargé (AutoLoad, même enregistré sous un autre nom)
+	var existing = find_loaded_manager(manager_name, script_path)
 	if existing:
 		print("[GameManager] Manager existant trouvé: " + manager_name)
+		managers[manager_name] = existing
+		managers_initialized[manager_name] = true
 		return existing
 	
 	# Vérifier si le fichier existe
@@ -219,6 +224,21 @@ func create_and_initialize_manager(manager_name: String, script_path: String) ->
 	
 	return manager_instance
 
+func find_loaded_manager(manager_name: String, script_path: String) -> Node:
+	"""Manager déjà présent sous /root : par nom, sinon par script (Data pour DataManager.gd...)
+	ou par stub headless qui le remplace (stub_source)"""
+	var existing = get_node_or_null("/root/" + manager_name)
+	if existing:
+		return existing
+	
+	for child in get_tree().root.get_children():
+		var child_script = child.get_script()
+		if child_script and child_script.resource_path == script_path:
+			return child
+		if "stub_source" in child and child.stub_source == script_path:
+			return child
+	return null
+
 func get_manager(manager_name: String) -> Node:
 	"""Récupère un manager par son nom"""
 	return managers.get(manager_name, null)
@@ -62,6 +62,9 @@ var magic_disruption_level: float = 0.0
 var evolution_cache: Dictionary = {}
 var ability_cache: Dictionary = {}
 
+## Révision de get_save_data(), incrémentée à chaque modification (SaveSystem : sections non resérialisées)
+var save_revision: int = 0
+
 ## Flags système
 var system_initialized: bool = false
 var debug_mode: bool = false
@@ -115,7 +118,7 @@ func _ready() -> void:
 func ensure_datamanager_ready() -> void:
 	"""S'assure que DataManager est prêt avant de continuer"""
 	# Attendre DataManager via GameManager
-	if not get_node_or_null("/root/DataManager"):
+	if not get_node_or_null("/root/Data"):
 		# Attendre que GameManager initialise DataManager
 		if get_node_or_null("/root/GameManager"):
 			await get_node("/root/GameManager").manager_ready
@@ -123,13 +126,13 @@ func ensure_datamanager_ready() -> void:
 			await get_tree().process_frame
 	
 	# Attendre que toutes les données soient chargées
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	if data_manager and not data_manager.loading_complete:
 		await data_manager.all_data_loaded
 
 func load_system_configuration() -> void:
 	"""Charge la configuration depuis DataManager ou utilise les défauts"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	
 	if data_manager and data_manager.game_config.has("observation_system"):
 		observation_config = data_manager.game_config["observation_system"]
@@ -142,7 +145,7 @@ func load_system_configuration() -> void:
 
 func load_creature_database() -> void:
 	"""Charge la base de données des créatures depuis DataManager"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	
 	if data_manager and not data_manager.creatures_db.is_empty():
 		creature_database = data_manager.creatures_db
@@ -189,6 +192,7 @@ func setup_magic_amplification() -> void:
 	"""Configure le système d'amplification magique"""
 	magic_amplification = 1.0
 	magic_disruption_level = 0.0
+	mark_save_dirty()
 	
 	# Timer pour décroissance naturelle de la perturbation
 	var decay_timer = Timer.new()
@@ -200,14 +204,13 @@ func setup_magic_amplification() -> void:
 func connect_to_game_systems() -> void:
 	"""Connecte l'ObservationManager aux autres systèmes"""
 	# Connexion avec QuestManager pour quêtes d'observation
-	var quest_manager = get_node_or_null("/root/QuestManager")
-	if quest_manager:
+	var quest_manager = get_node_or_null("/root/Quest")
+	if quest_manager and not creature_evolved.is_connected(quest_manager._on_creature_evolved):
 		creature_evolved.connect(quest_manager._on_creature_evolved)
-		magic_cascade_triggered.connect(quest_manager._on_magic_cascade)
 	
 	# Connexion avec GameManager pour événements globaux
 	var game_manager = get_node_or_null("/root/GameManager")
-	if game_manager:
+	if game_manager and game_manager.has_method("_on_magic_disruption_changed"):
 		magic_disruption_changed.connect(game_manager._on_magic_disruption_changed)
 
 # ============================================================================
@@ -266,6 +269,7 @@ func observe_creature(creature_id: String, observation_type: ObservationType, ob
 	roll_magic_cascade(observer_position, observation_intensity)
 	
 	total_observations += 1
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("🔍 Observation: ", creature_id, " (intensité: ", observation_intensity, ")")
@@ -288,12 +292,14 @@ func initialize_creature_observation(creature_id: String) -> void:
 		"observation_difficulty": creature_info.get("observation_difficulty", 1.0),
 		"total_observation_intensity": 0.0
 	}
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("🆕 Nouvelle créature initialisée: ", creature_id)
 
 func update_observation_data(creature_id: String, observation_type: ObservationType, creature_data: Dictionary) -> void:
 	"""Met à jour les données d'observation d'une créature"""
+	mark_save_dirty()
 	creature_data.observation_count += 1
 	creature_data.last_observation_time = Time.get_unix_time_from_system()
 	creature_data.observation_types.append(observation_type)
@@ -347,6 +353,7 @@ func update_magic_amplification(observation_intensity: float) -> void:
 	var old_disruption = magic_disruption_level
 	var disruption_increase = observation_intensity * 0.02
 	magic_disruption_level = min(magic_disruption_level + disruption_increase, 1.0)
+	mark_save_dirty()
 	
 	if abs(magic_disruption_level - old_disruption) > 0.01:
 		magic_disruption_changed.emit(old_disruption, magic_disruption_level)
@@ -383,6 +390,7 @@ func trigger_evolution(creature_id: String, creature_data: Dictionary, new_stage
 		"observation_count": creature_data.observation_count
 	}
 	creature_data.special_events.append(evolution_event)
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("🎉 Évolution! ", creature_id, ": Stage ", old_stage, " → ", new_stage)
@@ -540,6 +548,7 @@ func roll_magic_cascade(epicenter: Vector2, intensity: float) -> void:
 func update_evolution_cache(creature_id: String, stage: int) -> void:
 	"""Met à jour le cache d'évolution"""
 	evolution_cache[creature_id] = stage
+	mark_save_dirty()
 
 func _decay_magic_disruption() -> void:
 	"""Décroissance naturelle de la perturbation magique"""
@@ -547,6 +556,7 @@ func _decay_magic_disruption() -> void:
 		var old_level = magic_disruption_level
 		var decay_rate = observation_config.get("disruption_decay_rate", 0.01)
 		magic_disruption_level = max(0.0, magic_disruption_level - decay_rate)
+		mark_save_dirty()
 		
 		if abs(magic_disruption_level - old_level) > 0.001:
 			magic_disruption_changed.emit(old_level, magic_disruption_level)
@@ -593,6 +603,7 @@ func reset_observations() -> void:
 	total_observations = 0
 	evolution_cache.clear()
 	ability_cache.clear()
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("🔄 Observations reset")
@@ -601,6 +612,10 @@ func reset_observations() -> void:
 # SYSTÈME DE SAUVEGARDE
 # ============================================================================
 
+func mark_save_dirty() -> void:
+	"""Signale que get_save_data() a changé depuis la dernière sauvegarde"""
+	save_revision += 1
+
 func get_save_data() -> Dictionary:
 	"""Retourne les données à sauvegarder"""
 	return {
@@ -618,6 +633,7 @@ func apply_save_data(save_data: Dictionary) -> void:
 	magic_disruption_level = save_data.get("magic_disruption_level", 0.0)
 	total_observations = save_data.get("total_observations", 0)
 	evolution_cache = save_data.get("evolution_cache", {})
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("🔮 Données d'observation restaurées")
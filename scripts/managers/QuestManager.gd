@@ -1,5 +1,5 @@
 # ============================================================================ # 🎯 QuestManager.gd - Gestionnaire de Quêtes Narratives # ============================================================================ # STATUS: 🔄 IN_PROGRESS | ROADMAP: Mois 1, Semaine 2-3 - Core Architecture # PRIORITY: 🔴 CRITICAL - Progression narrative du jeu # DEPENDENCIES: GameManager, DataManager, DialogueManager
-class_name QuestManage
+class_name QuestManager
 extends Node
 
 #Gestionnaire central des quêtes et de la progression narrative
@@ -126,16 +126,17 @@ func _ready() -> void:
 func _connect_to_managers() -> void:
 	"""Connexion aux signaux des autres managers"""
 	# Connexion à DataManager pour chargement données
-	if DataManager:
-		DataManager.data_loaded.connect(_on_data_manager_loaded)
+	var data_manager = get_node_or_null("/root/Data")
+	if data_manager:
+		data_manager.data_loaded.connect(_on_data_manager_loaded)
 	# Connexion à ObservationManager pour quêtes d'observation
-	if ObservationManager:
-		ObservationManager.creature_evolved.connect(_on_creature_evolved)
-		ObservationManager.magic_cascade_triggered.connect(_on_magic_cascade)
+	var observation_manager = get_node_or_null("/root/Observation")
+	if observation_manager and not observation_manager.creature_evolved.is_connected(_on_creature_evolved):
+		observation_manager.creature_evolved.connect(_on_creature_evolved)
 	# Connexion à DialogueManager pour déclenchement quêtes
-	if DialogueManager:
-		DialogueManager.dialogue_choice_made.connect(_on_dialogue_choice)
-		DialogueManager.conversation_ended.connect(_on_conversation_ended)
+	var dialogue_manager = get_node_or_null("/root/Dialogue")
+	if dialogue_manager:
+		dialogue_manager.dialogue_choice_made.connect(_on_dialogue_choice)
 
 #============================================================================
 # CHARGEMENT DES DONNÉES
@@ -305,6 +306,10 @@ func complete_objective(quest_id: String, objective_id: String, completion_data:
 
 	return true
 
+func complete_quest(quest_id: String, completion_type: CompletionType, custom_rewards: Dictionary = {}) -> void:
+	"""Complète une quête depuis un autre système (NPC, dialogue...)"""
+	_complete_quest(quest_id, completion_type, custom_rewards)
+
 func _complete_quest(quest_id: String, completion_type: CompletionType, custom_rewards: Dictionary = {}) -> void:
 	"""Finalise une quête complétée"""
 
@@ -47,6 +47,14 @@ var player_reputations: Dictionary = {}
 var faction_relationships: Dictionary = {}
 var active_conflicts: Dictionary = {}
 
+## Matrice de cascade précompilée (python godot_project_fixer.py reputation)
+const REPUTATION_MATRIX_PATH = "res://data/reputation_matrix.json"
+const REPUTATION_MATRIX_FORMAT_VERSION = 2
+## Cascade compilée seulement si les factions touchées restent hors des zones de conflit (±60 de check_faction_conflicts)
+const EXACT_CASCADE_BAND = 60
+var exact_cascades: Dictionary = {}
+var service_thresholds: Dictionary = {}
+
 ## Configuration système
 var reputation_config: Dictionary = {
 	"max_reputation": 100,
@@ -77,6 +85,9 @@ var relationship_cache: Dictionary = {}
 var reputation_history: Array[Dictionary] = []
 var major_events: Array[Dictionary] = []
 
+## Révision de get_save_data(), incrémentée à chaque modification (SaveSystem : sections non resérialisées)
+var save_revision: int = 0
+
 ## Flags système
 var system_initialized: bool = false
 var debug_mode: bool = false
@@ -112,6 +123,7 @@ func _ready() -> void:
 	load_faction_data()
 	initialize_player_reputations()
 	setup_faction_relationships()
+	load_reputation_matrix()
 	
 	# Configuration système
 	setup_reputation_decay()
@@ -127,13 +139,13 @@ func _ready() -> void:
 
 func ensure_datamanager_ready() -> void:
 	"""S'assure que DataManager est prêt"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	if data_manager and not data_manager.loading_complete:
 		await data_manager.all_data_loaded
 
 func load_faction_data() -> void:
 	"""Charge les données des factions depuis DataManager"""
-	var data_manager = get_node_or_null("/root/DataManager")
+	var data_manager = get_node_or_null("/root/Data")
 	
 	if data_manager and not data_manager.faction_relationships.is_empty():
 		faction_data = data_manager.faction_relationships
@@ -172,6 +184,7 @@ func setup_fallback_faction_data() -> void:
 func initialize_player_reputations() -> void:
 	"""Initialise les réputations du joueur avec chaque faction"""
 	player_reputations.clear()
+	mark_save_dirty()
 	
 	if faction_data.has("factions"):
 		for faction_id in faction_data["factions"]:
@@ -185,7 +198,11 @@ func initialize_player_reputations() -> void:
 func setup_faction_relationships() -> void:
 	"""Configure les relations entre factions"""
 	if faction_data.has("inter_faction_relationships"):
-		faction_relationships = faction_data["inter_faction_relationships"]
+		var relationships = faction_data["inter_faction_relationships"]
+		# Les forces de relation sont sous relationship_matrix : lues à plat, aucune
+		# cascade ne se déclenchait. Les cascades entre factions sont donc actives,
+		# ce qui change l'équilibrage par rapport aux versions précédentes.
+		faction_relationships = relationships.get("relationship_matrix", relationships)
 		
 		# Précharger les conflits potentiels
 		if faction_data.has("faction_conflicts"):
@@ -193,6 +210,32 @@ func setup_faction_relationships() -> void:
 				var conflict = faction_data["faction_conflicts"][conflict_id]
 				conflict_cache[conflict_id] = conflict
 
+func load_reputation_matrix() -> void:
+	"""Charge la cascade exacte compilée ; sinon cascade récursive"""
+	exact_cascades.clear()
+	service_thresholds.clear()
+	if not FileAccess.file_exists(REPUTATION_MATRIX_PATH):
+		return
+	
+	var file = FileAccess.open(REPUTATION_MATRIX_PATH, FileAccess.READ)
+	if not file:
+		return
+	var json = JSON.new()
+	var parse_result = json.parse(file.get_as_text())
+	file.close()
+	
+	if parse_result != OK or not json.data is Dictionary:
+		push_warning("🏛️ Matrice de réputation illisible: " + REPUTATION_MATRIX_PATH)
+		return
+	if int(json.data.get("format_version", 0)) != REPUTATION_MATRIX_FORMAT_VERSION:
+		push_warning("🏛️ Matrice de réputation obsolète, relancer: python godot_project_fixer.py reputation")
+		return
+	
+	exact_cascades = json.data.get("exact_cascade", {})
+	service_thresholds = json.data.get("service_thresholds", {})
+	if debug_mode:
+		print("✅ Matrice de réputation chargée:", exact_cascades.size(), "factions")
+
 func setup_reputation_decay() -> void:
 	"""Configure la décroissance naturelle de réputation"""
 	if reputation_config.get("decay_enabled", true):
@@ -205,19 +248,19 @@ func setup_reputation_decay() -> void:
 func connect_to_game_systems() -> void:
 	"""Connecte le ReputationSystem aux autres managers"""
 	# Connexion avec QuestManager pour réputation par quêtes
-	var quest_manager = get_node_or_null("/root/QuestManager")
+	var quest_manager = get_node_or_null("/root/Quest")
 	if quest_manager:
 		quest_manager.quest_completed.connect(_on_quest_completed)
 		quest_manager.quest_failed.connect(_on_quest_failed)
 	
 	# Connexion avec DialogueManager pour choix de réputation
-	var dialogue_manager = get_node_or_null("/root/DialogueManager")
+	var dialogue_manager = get_node_or_null("/root/Dialogue")
 	if dialogue_manager:
-		dialogue_manager.choice_made.connect(_on_dialogue_choice_made)
-		dialogue_manager.conversation_ended.connect(_on_conversation_ended)
+		dialogue_manager.dialogue_choice_made.connect(_on_dialogue_choice_made)
+		dialogue_manager.dialogue_ended.connect(_on_dialogue_ended)
 	
 	# Connexion avec ObservationManager pour actions d'observation
-	var observation_manager = get_node_or_null("/root/ObservationManager")
+	var observation_manager = get_node_or_null("/root/Observation")
 	if observation_manager:
 		observation_manager.creature_evolved.connect(_on_creature_evolved)
 		observation_manager.magic_cascade_triggered.connect(_on_magic_cascade)
@@ -226,7 +269,7 @@ func connect_to_game_systems() -> void:
 # API PRINCIPALE - GESTION RÉPUTATION
 # ============================================================================
 
-func modify_reputation(faction_id: String, change: int, reason: String = "action") -> bool:
+func modify_reputation(faction_id: String, change: int, reason: String = "action", cascade: bool = true) -> bool:
 	"""
 	Modifie la réputation avec une faction
 	Retourne true si le changement a été appliqué
@@ -255,6 +298,7 @@ func modify_reputation(faction_id: String, change: int, reason: String = "action
 	
 	# Appliquer le changement
 	player_reputations[faction_id] = new_reputation
+	mark_save_dirty()
 	var new_level = get_reputation_level(faction_id)
 	
 	# Historique pour analytics
@@ -271,7 +315,8 @@ func modify_reputation(faction_id: String, change: int, reason: String = "action
 		check_faction_mastery(faction_id, new_reputation)
 	
 	# Effets en cascade sur autres factions
-	process_reputation_cascade(faction_id, change, reason)
+	if cascade:
+		process_reputation_cascade(faction_id, change, reason)
 	
 	# Vérifier déclenchement de conflits
 	check_faction_conflicts(faction_id)
@@ -326,6 +371,13 @@ func is_service_available(faction_id: String, service_id: String) -> bool:
 	if not services.has(service_id):
 		return false
 	
+	# Seuil précompilé : une comparaison au lieu du parcours des niveaux
+	var thresholds = service_thresholds.get(faction_id, {})
+	if thresholds.has(service_id):
+		var available = get_reputation(faction_id) >= int(thresholds[service_id])
+		service_cache[cache_key] = available
+		return available
+	
 	var service = services[service_id]
 	var required_level = service.get("access_level", "neutral")
 	var current_level = get_reputation_level(faction_id)
@@ -378,6 +430,10 @@ func update_service_cache(faction_id: String, new_level: String) -> void:
 
 func process_reputation_cascade(source_faction: String, change: int, reason: String) -> void:
 	"""Traite les effets en cascade sur les autres factions"""
+	# Chemin compilé : résultat de la récursion précalculé, sans récursion
+	if apply_compiled_cascade(source_faction, change):
+		return
+	
 	if not faction_relationships.has(source_faction):
 		return
 	
@@ -405,6 +461,29 @@ func process_reputation_cascade(source_faction: String, change: int, reason: Str
 			if cascade_change != 0:
 				modify_reputation(target_faction, cascade_change, "cascade_from_" + source_faction)
 
+func apply_compiled_cascade(source_faction: String, change: int) -> bool:
+	"""Applique la cascade exacte compilée ; false si seule la récursion la reproduit"""
+	if not exact_cascades.has(source_faction):
+		return false
+	var compiled = exact_cascades[source_faction]
+	if abs(change) > int(compiled.get("range", 0)):
+		return false
+	
+	# Trajectoire intermédiaire bornée par reach : elle ne doit toucher ni borne ni zone de conflit
+	var entry = compiled.get("changes", {}).get(str(change), {})
+	var reach = entry.get("reach", {})
+	for target_faction in reach:
+		if not player_reputations.has(target_faction):
+			return false
+		var reputation = player_reputations[target_faction]
+		if reputation - int(reach[target_faction]) < -EXACT_CASCADE_BAND or reputation + int(reach[target_faction]) > EXACT_CASCADE_BAND:
+			return false
+	
+	var deltas = entry.get("deltas", {})
+	for target_faction in deltas:
+		modify_reputation(target_faction, int(deltas[target_faction]), "cascade_from_" + source_faction, false)
+	return true
+
 func check_faction_conflicts(changed_faction: String) -> void:
 	"""Vérifie si des conflits entre factions doivent se déclencher"""
 	var conflict_threshold = reputation_config.conflict_threshold
@@ -429,6 +508,7 @@ func trigger_faction_conflict(faction1: String, faction2: String, conflict_type:
 	if active_conflicts.has(conflict_id):
 		return
 	
+	mark_save_dirty()
 	active_conflicts[conflict_id] = {
 		"faction1": faction1,
 		"faction2": faction2,
@@ -497,6 +577,7 @@ func check_faction_mastery(faction_id: String, reputation: int) -> void:
 		
 		if current_mastery != mastery_level:
 			faction_data["factions"][faction_id]["player_mastery"] = mastery_level
+			mark_save_dirty()
 			faction_mastery_achieved.emit(faction_id, mastery_level)
 			
 			# Événement majeur
@@ -515,10 +596,10 @@ func check_faction_mastery(faction_id: String, reputation: int) -> void:
 # INTÉGRATION AVEC AUTRES SYSTÈMES
 # ============================================================================
 
-func _on_quest_completed(quest_id: String, completion_data: Dictionary) -> void:
+func _on_quest_completed(quest_id: String, completion_type: String, rewards: Dictionary) -> void:
 	"""Réaction à la complétion d'une quête"""
 	# Vérifier si la quête a des effets de réputation
-	var quest_manager = get_node_or_null("/root/QuestManager")
+	var quest_manager = get_node_or_null("/root/Quest")
 	if not quest_manager:
 		return
 	
@@ -532,7 +613,7 @@ func _on_quest_completed(quest_id: String, completion_data: Dictionary) -> void:
 func _on_quest_failed(quest_id: String, failure_reason: String) -> void:
 	"""Réaction à l'échec d'une quête"""
 	# Échec de quête peut avoir des conséquences négatives
-	var quest_manager = get_node_or_null("/root/QuestManager")
+	var quest_manager = get_node_or_null("/root/Quest")
 	if not quest_manager:
 		return
 	
@@ -543,17 +624,23 @@ func _on_quest_failed(quest_id: String, failure_reason: String) -> void:
 			var change = effects[faction_id]
 			modify_reputation(faction_id, change, "quest_failure:" + quest_id)
 
-func _on_dialogue_choice_made(npc_id: String, choice_data: Dictionary) -> void:
+func _on_dialogue_choice_made(npc_id: String, choice_id: String, consequences: Dictionary) -> void:
 	"""Réaction aux choix de dialogue"""
-	if choice_data.has("reputation_effects"):
-		var effects = choice_data["reputation_effects"]
+	if consequences.has("reputation_effects"):
+		var effects = consequences["reputation_effects"]
 		for faction_id in effects:
 			var change = effects[faction_id]
 			modify_reputation(faction_id, change, "dialogue_choice:" + npc_id)
 
-func _on_conversation_ended(npc_id: String, conversation_data: Dictionary) -> void:
+func _on_dialogue_ended(npc_id: String, final_choice: String, relationship_change: float) -> void:
 	"""Réaction à la fin d'une conversation"""
 	# Certaines conversations entières peuvent affecter la réputation
+	var dialogue_manager = get_node_or_null("/root/Dialogue")
+	if not dialogue_manager or dialogue_manager.conversation_history.is_empty():
+		return
+	
+	var dialogue_id = dialogue_manager.conversation_history[-1].get("dialogue_id", "")
+	var conversation_data = dialogue_manager.dialogue_trees.get(dialogue_id, {})
 	if conversation_data.has("overall_reputation_effect"):
 		var effects = conversation_data["overall_reputation_effect"]
 		for faction_id in effects:
@@ -621,6 +708,7 @@ func record_reputation_change(faction_id: String, old_value: int, new_value: int
 	}
 	
 	reputation_history.append(record)
+	mark_save_dirty()
 	
 	# Garder seulement les 1000 derniers événements
 	if reputation_history.size() > 1000:
@@ -701,6 +789,10 @@ func force_reputation(faction_id: String, value: int) -> bool:
 # SYSTÈME DE SAUVEGARDE
 # ============================================================================
 
+func mark_save_dirty() -> void:
+	"""Signale que get_save_data() a changé depuis la dernière sauvegarde"""
+	save_revision += 1
+
 func get_save_data() -> Dictionary:
 	"""Retourne les données à sauvegarder"""
 	return {
@@ -727,6 +819,7 @@ func apply_save_data(save_data: Dictionary) -> void:
 	# Invalider tous les caches
 	service_cache.clear()
 	relationship_cache.clear()
+	mark_save_dirty()
 	
 	if debug_mode:
 		print("🏛️ Données de réputation restaurées")
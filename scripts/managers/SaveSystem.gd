@@ -58,6 +58,15 @@ const EXPORT_PATH = "user://exports/"
 const MAX_SLOTS = 12
 const MAX_BACKUPS = 5
 
+# Table de chaînes des sauvegardes compactées (python godot_project_fixer.py saves --compact)
+const SAVE_STRING_TABLE_KEY = "string_table"
+const SAVE_STRING_REF_PREFIX = "§"
+
+# Format par sections : en-tête indexé puis une section gzip par manager (sb_tools/save_format.py)
+const SAVE_CHUNKED_MAGIC = "SBS2"
+const SAVE_CHUNKED_FORMAT = 2
+const SAVE_TOP_LEVEL_SECTIONS = ["player_data", "world_state"]
+
 # Configuration système
 const AUTO_SAVE_INTERVAL = 30.0  # secondes
 const QUICK_SAVE_KEY = "F5"
@@ -69,6 +78,7 @@ const QUICK_LOAD_KEY = "F9"
 @export var auto_save_enabled: bool = true
 @export var backup_enabled: bool = true
 @export var compression_enabled: bool = true
+@export var chunked_saves_enabled: bool = true
 @export var cloud_sync_enabled: bool = false
 
 # État du système
@@ -91,12 +101,17 @@ var save_config: Dictionary = {
 # Métadonnées des sauvegardes
 var save_metadata: Dictionary = {}
 
+# Session courante : une révision de manager n'a de sens que dans la session qui l'a écrite
+var save_session_id: String = ""
+
 # Références managers
 var game_manager: GameManager
 var observation_manager: ObservationManager
 var dialogue_manager: DialogueManager
 var quest_manager: QuestManager
-var ui_manager: UIManager
+var ui_manager: Node  # UIManager ou son stub headless
+var reputation_system: ReputationSystem
+var combat_system: CombatSystem
 
 # ================================
 # INITIALISATION
@@ -104,6 +119,7 @@ var ui_manager: UIManager
 func _ready() -> void:
 	"""Initialisation complète du SaveSystem"""
 	print("💾 SaveSystem: Initialisation démarrée...")
+	save_session_id = str(Time.get_unix_time_from_system()) + "_" + str(randi())
 	
 	# Configuration répertoires
 	ensure_save_directories()
@@ -120,7 +136,7 @@ func _ready() -> void:
 	# Configuration input
 	setup_input_handling()
 	
-	# Récupération références managers
+	# Récupération références managers (les managers de gameplay sont créés après SaveSystem)
 	await get_tree().process_frame
 	get_manager_references()
 	
@@ -152,12 +168,44 @@ func setup_input_handling() -> void:
 	pass
 
 func get_manager_references() -> void:
-	"""Récupère les références vers les autres managers"""
+	"""Récupère les références vers les autres managers (rappelé avant chaque sauvegarde / chargement)"""
 	game_manager = get_node_or_null("/root/GameManager")
-	observation_manager = get_node_or_null("/root/ObservationManager")
-	dialogue_manager = get_node_or_null("/root/DialogueManager")
-	quest_manager = get_node_or_null("/root/QuestManager")
-	ui_manager = get_node_or_null("/root/UIManager")
+	observation_manager = resolve_manager("ObservationManager", "res://scripts/managers/ObservationManager.gd")
+	dialogue_manager = resolve_manager("DialogueManager", "res://scripts/managers/DialogueManager.gd")
+	quest_manager = resolve_manager("QuestManager", "res://scripts/managers/QuestManager.gd")
+	ui_manager = resolve_manager("UIManager", "res://scripts/stubs/UIManager.gd")
+	reputation_system = resolve_manager("ReputationSystem", "res://scripts/managers/ReputationSystem.gd")
+	combat_system = resolve_manager("CombatSystem", "res://scripts/managers/CombatSystem.gd")
+
+func resolve_manager(manager_name: String, script_path: String) -> Node:
+	"""Manager créé par GameManager (enfant de /root/GameManager) ou AutoLoad, quel que soit son nom d'enregistrement"""
+	if game_manager == null:
+		return null
+	var manager = game_manager.get_manager(manager_name)
+	if manager == null:
+		manager = game_manager.find_loaded_manager(manager_name, script_path)
+	return manager
+
+func get_section_revisions() -> Dictionary:
+	"""{section: save_revision} des managers qui suivent leurs modifications"""
+	var revisions = {}
+	var tracked = {"observation": observation_manager, "reputation": reputation_system, "combat": combat_system}
+	for name in tracked:
+		var manager = tracked[name]
+		if manager and "save_revision" in manager:
+			revisions[name] = manager.save_revision
+	return revisions
+
+func get_clean_sections(header: Dictionary, revisions: Dictionary) -> Array:
+	"""Sections du slot écrites dans cette session à la révision actuelle de leur manager"""
+	var clean = []
+	if header.get("session", "") != save_session_id:
+		return clean
+	var sections = header.get("sections", {})
+	for name in revisions:
+		if sections.has(name) and int(sections[name].get("revision", -1)) == revisions[name]:
+			clean.append(name)
+	return clean
 
 # ================================
 # SAUVEGARDE PRINCIPALE
@@ -176,12 +224,19 @@ func save_game(slot: int = SaveSlot.AUTO_SAVE, save_type: SaveType = SaveType.MA
 	save_started.emit(slot, SaveType.keys()[save_type])
 	
 	print("💾 SaveSystem: Début sauvegarde slot ", slot, " type ", SaveType.keys()[save_type])
+	get_manager_references()
+	
+	# Sections propres (manager inchangé depuis leur écriture dans ce slot) : ni get_save_data() ni JSON
+	var revisions = get_section_revisions()
+	var clean_sections = []
+	if compression_enabled and chunked_saves_enabled:
+		clean_sections = get_clean_sections(read_save_header(slot), revisions)
 	
 	# Compilation des données
-	var save_data = compile_complete_save_data(save_type, description)
+	var save_data = compile_complete_save_data(save_type, description, clean_sections)
 	
 	# Sauvegarde
-	var success = await write_save_file(slot, save_data)
+	var success = await write_save_file(slot, save_data, revisions)
 	
 	# Backup si activé
 	if success and backup_enabled and save_type != SaveType.AUTO:
@@ -198,8 +253,8 @@ func save_game(slot: int = SaveSlot.AUTO_SAVE, save_type: SaveType = SaveType.MA
 	print("💾 SaveSystem: Sauvegarde ", "réussie" if success else "échouée", " pour slot ", slot)
 	return success
 
-func compile_complete_save_data(save_type: SaveType, description: String) -> Dictionary:
-	"""Compile toutes les données de sauvegarde depuis tous les managers"""
+func compile_complete_save_data(save_type: SaveType, description: String, skip_sections: Array = []) -> Dictionary:
+	"""Compile toutes les données de sauvegarde depuis tous les managers (sauf sections propres de skip_sections)"""
 	var save_data = {
 		# Métadonnées système
 		"save_version": current_save_version,
@@ -222,7 +277,7 @@ func compile_complete_save_data(save_type: SaveType, description: String) -> Dic
 		save_data.managers["game"] = game_manager.get_save_data()
 	
 	# ObservationManager
-	if observation_manager and observation_manager.has_method("get_save_data"):
+	if observation_manager and observation_manager.has_method("get_save_data") and not "observation" in skip_sections:
 		save_data.managers["observation"] = observation_manager.get_save_data()
 	
 	# DialogueManager
@@ -233,6 +288,14 @@ func compile_complete_save_data(save_type: SaveType, description: String) -> Dic
 	if quest_manager and quest_manager.has_method("get_save_data"):
 		save_data.managers["quest"] = quest_manager.get_save_data()
 	
+	# ReputationSystem
+	if reputation_system and not "reputation" in skip_sections:
+		save_data.managers["reputation"] = reputation_system.get_save_data()
+	
+	# CombatSystem
+	if combat_system and not "combat" in skip_sections:
+		save_data.managers["combat"] = combat_system.get_save_data()
+	
 	# UIManager (configuration UI)
 	if ui_manager and ui_manager.has_method("get_save_data"):
 		save_data.managers["ui"] = ui_manager.get_save_data()
@@ -259,9 +322,13 @@ func compile_complete_save_data(save_type: SaveType, description: String) -> Dic
 	
 	return save_data
 
-func write_save_file(slot: int, save_data: Dictionary) -> bool:
-	"""Écrit les données de sauvegarde dans un fichier"""
+func write_save_file(slot: int, save_data: Dictionary, section_revisions: Dictionary = {}) -> bool:
+	"""Écrit les données de sauvegarde dans un fichier (temporaire puis renommé)"""
+	if compression_enabled and chunked_saves_enabled:
+		return write_chunked_save_file(slot, save_data, section_revisions)
+	
 	var file_path = get_save_file_path(slot)
+	var temp_path = file_path + ".tmp"
 	
 	# Conversion en JSON
 	var json_string = JSON.stringify(save_data)
@@ -271,9 +338,9 @@ func write_save_file(slot: int, save_data: Dictionary) -> bool:
 		json_string = compress_save_data(json_string)
 	
 	# Écriture fichier
-	var file = FileAccess.open(file_path, FileAccess.WRITE)
+	var file = FileAccess.open(temp_path, FileAccess.WRITE)
 	if file == null:
-		push_error("💾 SaveSystem: Impossible d'ouvrir le fichier: " + file_path)
+		push_error("💾 SaveSystem: Impossible d'ouvrir le fichier: " + temp_path)
 		return false
 	
 	if compression_enabled:
@@ -283,8 +350,97 @@ func write_save_file(slot: int, save_data: Dictionary) -> bool:
 	
 	file.close()
 	
+	return replace_save_file(temp_path, file_path)
+
+func replace_save_file(temp_path: String, file_path: String) -> bool:
+	"""Remplace le slot par le fichier temporaire complet : un arrêt pendant l'écriture laisse l'ancien slot intact"""
+	var error = DirAccess.rename_absolute(temp_path, file_path)
+	if error != OK:
+		push_error("💾 SaveSystem: Impossible de remplacer " + file_path + " (erreur " + str(error) + ")")
+		DirAccess.remove_absolute(temp_path)
+		return false
 	return true
 
+func write_chunked_save_file(slot: int, save_data: Dictionary, section_revisions: Dictionary = {}) -> bool:
+	"""Écrit l'en-tête indexé puis une section gzip par manager.
+
+	Une section propre (révision du manager inchangée, absente de save_data) ou au même md5
+	que dans l'ancien fichier est recopiée sans recompression.
+	"""
+	var file_path = get_save_file_path(slot)
+	var temp_path = file_path + ".tmp"
+	var previous = read_save_header(slot)
+	var previous_bytes = PackedByteArray()
+	if not previous.is_empty():
+		previous_bytes = FileAccess.get_file_as_bytes(file_path)
+	var previous_sections = previous.get("sections", {})
+	var clean_sections = get_clean_sections(previous, section_revisions)
+	
+	# Métadonnées dans l'en-tête, une section par manager et pour player_data / world_state
+	var meta = {}
+	var sections = {}
+	for name in clean_sections:
+		if not save_data.get("managers", {}).has(name):
+			sections[name] = null
+	for key in save_data:
+		if key == "managers" and (not save_data.managers.is_empty() or not sections.is_empty()):
+			sections.merge(save_data.managers)
+		elif key in SAVE_TOP_LEVEL_SECTIONS:
+			sections[key] = save_data[key]
+		else:
+			meta[key] = save_data[key]
+	
+	var index = {}
+	var chunks = PackedByteArray()
+	for name in sections:
+		var chunk: PackedByteArray
+		var entry: Dictionary
+		if sections[name] == null:
+			# Section propre : ni sérialisée ni recompressée
+			entry = previous_sections[name].duplicate()
+			var start = int(previous.data_offset) + int(entry.offset)
+			chunk = previous_bytes.slice(start, start + int(entry.size))
+		else:
+			var text = JSON.stringify(sections[name])
+			var md5 = text.md5_text()
+			if previous_sections.has(name) and previous_sections[name].get("md5", "") == md5:
+				entry = previous_sections[name].duplicate()
+				var start = int(previous.data_offset) + int(entry.offset)
+				chunk = previous_bytes.slice(start, start + int(entry.size))
+			else:
+				chunk = compress_save_data(text)
+				entry = {"raw_size": text.to_utf8_buffer().size(), "md5": md5}
+		# Révision seulement pour des données venant du manager (pas d'un import ou d'une migration)
+		if section_revisions.has(name):
+			entry["revision"] = section_revisions[name]
+		else:
+			entry.erase("revision")
+		entry["offset"] = chunks.size()
+		entry["size"] = chunk.size()
+		index[name] = entry
+		chunks.append_array(chunk)
+	
+	var header = {
+		"format": SAVE_CHUNKED_FORMAT,
+		"session": save_session_id,
+		"meta": meta,
+		"summary": build_save_summary(save_data),
+		"sections": index
+	}
+	var header_bytes = JSON.stringify(header).to_utf8_buffer()
+	
+	var file = FileAccess.open(temp_path, FileAccess.WRITE)
+	if file == null:
+		push_error("💾 SaveSystem: Impossible d'ouvrir le fichier: " + temp_path)
+		return false
+	
+	file.store_buffer(SAVE_CHUNKED_MAGIC.to_utf8_buffer())
+	file.store_32(header_bytes.size())
+	file.store_buffer(header_bytes)
+	file.store_buffer(chunks)
+	file.close()
+	return replace_save_file(temp_path, file_path)
+
 # ================================
 # CHARGEMENT
 # ================================
@@ -307,6 +463,7 @@ func load_game(slot: int = SaveSlot.AUTO_SAVE) -> bool:
 	load_started.emit(slot)
 	
 	print("💾 SaveSystem: Début chargement slot ", slot)
+	get_manager_references()
 	
 	# Lecture fichier
 	var save_data = await read_save_file(slot)
@@ -331,6 +488,10 @@ func load_game(slot: int = SaveSlot.AUTO_SAVE) -> bool:
 
 func read_save_file(slot: int) -> Dictionary:
 	"""Lit et décompresse un fichier de sauvegarde"""
+	# Format par sections, détecté par son en-tête
+	if not read_save_header(slot).is_empty():
+		return read_save_sections(slot)
+	
 	var file_path = get_save_file_path(slot)
 	var file = FileAccess.open(file_path, FileAccess.READ)
 	
@@ -357,7 +518,96 @@ func read_save_file(slot: int) -> Dictionary:
 		push_error("💾 SaveSystem: Erreur parsing JSON: " + json.get_error_message())
 		return {}
 	
-	return json.data
+	return resolve_string_table(json.data)
+
+func read_save_header(slot: int) -> Dictionary:
+	"""Lit uniquement l'en-tête d'une sauvegarde par sections ({} pour l'ancien format)"""
+	var file = FileAccess.open(get_save_file_path(slot), FileAccess.READ)
+	if file == null:
+		return {}
+	
+	if file.get_length() < 8 or file.get_buffer(4).get_string_from_utf8() != SAVE_CHUNKED_MAGIC:
+		file.close()
+		return {}
+	
+	var header_size = file.get_32()
+	var json = JSON.new()
+	var parse_result = json.parse(file.get_buffer(header_size).get_string_from_utf8())
+	file.close()
+	
+	if parse_result != OK or not json.data is Dictionary or int(json.data.get("format", 0)) != SAVE_CHUNKED_FORMAT:
+		return {}
+	
+	var header = json.data
+	header["data_offset"] = 8 + header_size
+	return header
+
+func read_save_sections(slot: int, names: Array = []) -> Dictionary:
+	"""Lit une sauvegarde par sections ; seules les sections demandées sont décompressées"""
+	var header = read_save_header(slot)
+	if header.is_empty():
+		return {}
+	
+	var file = FileAccess.open(get_save_file_path(slot), FileAccess.READ)
+	if file == null:
+		return {}
+	
+	var save_data = header.get("meta", {}).duplicate(true)
+	var managers = {}
+	for name in header.sections:
+		if not names.is_empty() and not name in names:
+			continue
+		
+		var entry = header.sections[name]
+		file.seek(int(header.data_offset) + int(entry.offset))
+		var text = decompress_save_data(file.get_buffer(int(entry.size)))
+		if entry.has("md5") and text.md5_text() != entry.md5:
+			push_error("💾 SaveSystem: Section corrompue (md5): " + name)
+			file.close()
+			return {}
+		var json = JSON.new()
+		if json.parse(text) != OK:
+			push_error("💾 SaveSystem: Section illisible: " + name)
+			file.close()
+			return {}
+		
+		# Chaque section compactée porte sa propre table de chaînes
+		var section = resolve_string_table(json.data)
+		if name in SAVE_TOP_LEVEL_SECTIONS:
+			save_data[name] = section
+		else:
+			managers[name] = section
+	file.close()
+	
+	if not managers.is_empty():
+		save_data["managers"] = managers
+	return resolve_string_table(save_data)
+
+func resolve_string_table(save_data):
+	"""Reconstruit les chaînes d'une sauvegarde compactée (table de chaînes)"""
+	if save_data is Dictionary and save_data.has(SAVE_STRING_TABLE_KEY):
+		var table = save_data[SAVE_STRING_TABLE_KEY]
+		save_data.erase(SAVE_STRING_TABLE_KEY)
+		save_data = expand_save_strings(save_data, table)
+	return save_data
+
+func expand_save_strings(value, table: Array):
+	"""Remplace les références "§indice" d'une sauvegarde compactée par leurs chaînes"""
+	if value is String:
+		if value.begins_with(SAVE_STRING_REF_PREFIX):
+			return table[value.substr(SAVE_STRING_REF_PREFIX.length()).to_int()]
+		return value
+	if value is Dictionary:
+		var expanded = {}
+		for key in value:
+			expanded[expand_save_strings(key, table)] = expand_save_strings(value[key], table)
+		return expanded
+	if value is Array:
+		var expanded = []
+		for item in value:
+			expanded.append(expand_save_strings(item, table))
+		return expanded
+	return value
 
 func apply_save_data(save_data: Dictionary) -> bool:
 	"""Applique les données de sauvegarde à tous les managers"""
@@ -386,6 +636,14 @@ func apply_save_data(save_data: Dictionary) -> bool:
 		if quest_manager.has_method("apply_save_data"):
 			quest_manager.apply_save_data(managers_data.quest)
 	
+	# ReputationSystem
+	if reputation_system and managers_data.has("reputation"):
+		reputation_system.apply_save_data(managers_data.reputation)
+	
+	# CombatSystem
+	if combat_system and managers_data.has("combat"):
+		combat_system.apply_save_data(managers_data.combat)
+	
 	# UIManager
 	if ui_manager and managers_data.has("ui"):
 		if ui_manager.has_method("apply_save_data"):
@@ -409,6 +667,14 @@ func get_save_info(slot: int) -> Dictionary:
 	if not has_save_in_slot(slot):
 		return {}
 	
+	# Métadonnées en mémoire d'abord, sans accès disque
+	if save_metadata.has(str(slot)):
+		return save_metadata[str(slot)]
+	
+	# Slot sans métadonnées (fichier copié...) : résumé de l'en-tête par sections, sans décompression
+	var header = read_save_header(slot)
+	if not header.is_empty():
+		save_metadata[str(slot)] = header.get("summary", {})
 	return save_metadata.get(str(slot), {})
 
 func has_save_in_slot(slot: int) -> bool:
@@ -684,7 +950,13 @@ func import_save(import_path: String, target_slot: int) -> bool:
 # ================================
 func update_save_metadata(slot: int, save_data: Dictionary) -> void:
 	"""Met à jour les métadonnées d'une sauvegarde"""
-	save_metadata[str(slot)] = {
+	save_metadata[str(slot)] = build_save_summary(save_data)
+	
+	save_save_metadata()
+
+func build_save_summary(save_data: Dictionary) -> Dictionary:
+	"""Résumé d'une sauvegarde pour les écrans de slots (aussi stocké dans l'en-tête par sections)"""
+	return {
 		"timestamp": save_data.get("timestamp", 0),
 		"play_time": save_data.get("play_time", 0),
 		"description": save_data.get("description", ""),
@@ -693,8 +965,6 @@ func update_save_metadata(slot: int, save_data: Dictionary) -> void:
 		"current_scene": save_data.get("player_data", {}).get("current_scene", ""),
 		"version": save_data.get("save_version", current_save_version)
 	}
-	
-	save_save_metadata()
 
 func load_save_metadata() -> void:
 	"""Charge les métadonnées des sauvegardes"""
@@ -612,7 +612,7 @@ func setup_cognitive_support() -> void:
 func connect_to_game_systems() -> void:
 	"""Connecte l'UIManager aux autres systèmes"""
 	# Connexion à GameManager
-	var game_manager = get_node_or_null("/root/Game")
+	var game_manager = get_node_or_null("/root/GameManager")
 	if game_manager:
 		if game_manager.has_signal("game_state_changed"):
 			game_manager.game_state_changed.connect(_on_game_state_changed)